@@ -1,23 +1,92 @@
+import time
+_PROCESS_START = time.perf_counter()  # as early as possible, for --profile-startup
+
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
+import argparse
+import dataclasses
 import json
-import pandas as pd
+import math
 import os
-from datetime import datetime
+import sqlite3
+import sys
+
+from labor_model import LEARNING_MODELS, Simulation, Worker, Task, Impact, OutputSettings, load_simulation_file
+from labor_binary import BINARY_EXTENSION, save_binary
+from labor_refresh import RefreshScheduler
+from labor_grid import TaskGrid
+from labor_workspace import Workspace
+from labor_session import save_session, load_session
+from labor_journal import (
+    AUTOSAVE_DIR, ChangeJournal, claim_session, discard, document_directory, recover, recoverable,
+    release_session,
+)
+from labor_export import ExportJob
+from labor_compute import ComputeService
+from labor_profile import profiler, timed, widget_count
+
+# Startup milestones for --profile-startup
+_IMPORTS_DONE = time.perf_counter()
+
+SIMULATION_FILETYPES = [("JSON files", "*.json"), ("Binary simulations", f"*{BINARY_EXTENSION}"),
+                        ("All files", "*.*")]
 
 class LaborSimulatorApp:
     VERSION = "V1.0"
+    LOAD_SECONDS_PER_1000_TASKS = 0.5  # load-time budget checked by load_simulation_data
+    EXPORT_POLL_MS = 100  # how often the export progress bar is updated
+    AUTOSAVE_COMPACT_MS = 60000  # how often each tab's autosave journal is folded into a snapshot
     
     def __init__(self, root):
         self.root = root
         self.root.title(f"Construction Labor Simulator {self.VERSION}")
 
         self.workers = []
-        self.tasks = []
         self.impact_entries = []
-        self.current_file_path = None
+        self.last_load_seconds = None
+        self.export_job = None
+        self.autosave = False    # journal every document's edits; on from start_autosave()
+        self.autosave_dir = AUTOSAVE_DIR
+        self.autosave_session = None  # (directory, lock) claimed by start_autosave()
+        self.autosave_documents = 0  # documents journaled so far, for their directory names
+        self.autosave_leftovers = []  # autosaves of crashed windows, recovered or declined
+
+        # Open simulations, one per tab. Only the active one has widgets;
+        # the others keep just their models and cached task results.
+        self.workspace = Workspace()
+        self.workspace.add()
+        self.tab_pages = []
+        self.updating_tabs = False
+
+        # Every trace asks for a refresh; the scheduler merges all requests
+        # made before Tk goes idle into one recompute and one relabel.
+        self.refresh = RefreshScheduler(self.root, self.update_output, on_run=self.show_refresh_stats)
+
+        # Analyses run here, off the Tk thread; the pool starts on first use
+        self.compute = ComputeService(self.root)
 
         self.create_widgets()
+        self.update_tabs()
+
+        # Ctrl+Shift+D: the debug panel, for LABOR_PROFILE sessions
+        self.root.bind("<Control-D>", lambda e: self.open_profiler())
+        profiler.add_source(self.profile_counters)
+
+    @property
+    def recalc(self):
+        """
+        Model behind the widgets (the active tab's); traces push edits into it
+        and it only recomputes the task results those edits affect.
+        """
+        return self.workspace.current.evaluator
+
+    @property
+    def current_file_path(self):
+        return self.workspace.current.file_path
+
+    @current_file_path.setter
+    def current_file_path(self, file_path):
+        self.workspace.current.file_path = file_path
 
     def create_widgets(self):
         # Top frame for simulation name and control buttons
@@ -27,6 +96,8 @@ class LaborSimulatorApp:
         ttk.Label(top_frame, text="Simulation Name:").grid(row=0, column=0, sticky="w")
         self.sim_name_entry = ttk.Entry(top_frame, width=30)
         self.sim_name_entry.grid(row=0, column=1, pady=5, sticky="w")
+        self.sim_name_entry.bind("<KeyRelease>", self.update_name)
+        self.sim_name_entry.bind("<FocusOut>", self.update_name)
 
         # Buttons frame
         button_frame = ttk.Frame(top_frame)
@@ -37,13 +108,45 @@ class LaborSimulatorApp:
         
         self.load_button = ttk.Button(button_frame, text="📂 Load", command=self.load_simulation)
         self.load_button.pack(side=tk.LEFT, padx=2)
+
+        self.import_button = ttk.Button(button_frame, text="📥 Import", command=self.open_import)
+        self.import_button.pack(side=tk.LEFT, padx=2)
         
         self.export_button = ttk.Button(button_frame, text="📊 Export", command=self.export_to_excel)
         self.export_button.pack(side=tk.LEFT, padx=2)
-        
+
+        # Shown only while an export is running
+        self.export_progress = ttk.Progressbar(button_frame, length=120, mode="determinate", maximum=100)
+        self.cancel_export_button = ttk.Button(button_frame, text="✖ Cancel", command=self.cancel_export)
+
+        self.sweep_button = ttk.Button(button_frame, text="📈 Sweep", command=self.open_sweep)
+        self.sweep_button.pack(side=tk.LEFT, padx=2)
+
+        self.optimize_button = ttk.Button(button_frame, text="⚙ Optimize Crew", command=self.open_crew_optimizer)
+        self.optimize_button.pack(side=tk.LEFT, padx=2)
+
+        self.schedule_button = ttk.Button(button_frame, text="📅 Schedule", command=self.open_schedule)
+        self.schedule_button.pack(side=tk.LEFT, padx=2)
+
+        self.library_button = ttk.Button(button_frame, text="📚 Library", command=self.open_library)
+        self.library_button.pack(side=tk.LEFT, padx=2)
+
+        self.project_button = ttk.Button(button_frame, text="🏗 Project", command=self.open_project)
+        self.project_button.pack(side=tk.LEFT, padx=2)
+
         self.restart_button = ttk.Button(button_frame, text="🔄 Restart", command=self.restart)
         self.restart_button.pack(side=tk.LEFT, padx=2)
 
+        # One tab per open simulation; the widgets below show the selected one
+        tab_frame = ttk.Frame(top_frame)
+        tab_frame.grid(row=1, column=0, columnspan=3, sticky="ew")
+        self.tab_bar = ttk.Notebook(tab_frame)
+        self.tab_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.tab_bar.bind("<<NotebookTabChanged>>", lambda e: self.switch_document(self.tab_bar.index("current")))
+        ttk.Button(tab_frame, text="➕ New Tab", command=self.new_document).pack(side=tk.LEFT, padx=2)
+        ttk.Button(tab_frame, text="✖ Close Tab", command=self.close_document).pack(side=tk.LEFT, padx=2)
+        ttk.Button(tab_frame, text="⚖ Compare", command=self.open_compare).pack(side=tk.LEFT, padx=2)
+
         # Continue with your existing widget creation
         ttk.Label(self.root, text="Crew:").grid(row=1, column=0, sticky="w")
         self.add_worker_button = ttk.Button(self.root, text="➕ Add Worker", command=self.add_worker)
@@ -59,6 +162,10 @@ class LaborSimulatorApp:
         self.task_frame = ttk.LabelFrame(self.root, text="Tasks")
         self.task_frame.grid(row=4, column=0, columnspan=4, sticky="we", padx=10, pady=5)
 
+        # One scrollable canvas for all tasks; only visible rows are drawn
+        self.task_grid = TaskGrid(self.task_frame, self)
+        self.task_grid.pack(fill=tk.BOTH, expand=True)
+
         self.output_frame = ttk.LabelFrame(self.root, text="Output")
         self.output_frame.grid(row=5, column=0, columnspan=4, sticky="we", padx=10, pady=10)
 
@@ -74,6 +181,10 @@ class LaborSimulatorApp:
         )
         version_label.pack(side=tk.RIGHT)
 
+        # Refresh statistics from the coalescing scheduler
+        self.refresh_status_label = ttk.Label(version_frame, text="", foreground="gray")
+        self.refresh_status_label.pack(side=tk.LEFT)
+
     def setup_output_section(self):
         ttk.Label(self.output_frame, text="Output Type:").grid(row=0, column=0, sticky="w")
         self.output_type_var = tk.StringVar(value="Square-foot")
@@ -113,6 +224,20 @@ class LaborSimulatorApp:
         ttk.Combobox(self.output_frame, textvariable=self.time_display_unit,
                      values=["minutes", "hours"], state="readonly", width=10).grid(row=2, column=3)
 
+        # Learning curve: the crew speeds up over repeated units
+        learning_frame = ttk.Frame(self.output_frame)
+        learning_frame.grid(row=2, column=4, columnspan=2, sticky="w", padx=(10, 0))
+        ttk.Label(learning_frame, text="Learning Curve:").grid(row=0, column=0, sticky="e")
+        self.learning_model_var = tk.StringVar(value="None")
+        ttk.Combobox(learning_frame, textvariable=self.learning_model_var, values=LEARNING_MODELS,
+                     state="readonly", width=9).grid(row=0, column=1)
+        ttk.Label(learning_frame, text="Rate (%):").grid(row=0, column=2, sticky="e", padx=(5, 0))
+        self.learning_rate_var = tk.DoubleVar(value=90)
+        ttk.Entry(learning_frame, textvariable=self.learning_rate_var, width=5).grid(row=0, column=3)
+        ttk.Label(learning_frame, text="Plateau at Unit:").grid(row=0, column=4, sticky="e", padx=(5, 0))
+        self.learning_plateau_var = tk.DoubleVar(value=0)
+        ttk.Entry(learning_frame, textvariable=self.learning_plateau_var, width=7).grid(row=0, column=5)
+
         self.impact_frame = ttk.Frame(self.output_frame)
         self.impact_frame.grid(row=3, column=0, columnspan=6, pady=(10, 0), sticky="w")
         ttk.Button(self.impact_frame, text="➕ Add Impact", command=self.add_impact).grid(row=0, column=0)
@@ -123,10 +248,19 @@ class LaborSimulatorApp:
         self.breakdown_label = ttk.Label(self.output_frame, text="", justify="left")
         self.breakdown_label.grid(row=5, column=0, columnspan=6, sticky="w")
 
-        self.length_var.trace_add("write", lambda *args: self.update_output())
-        self.height_var.trace_add("write", lambda *args: self.update_output())
-        self.target_var.trace_add("write", lambda *args: self.update_output())
-        self.time_display_unit.trace_add("write", lambda *args: self.update_output())
+        # Monte Carlo panel, built the first time it is opened
+        self.risk_panel = None
+        self.risk_panel_shown = False
+        self.risk_button = ttk.Button(self.output_frame, text="🎲 Risk Analysis ▸", command=self.toggle_risk_panel)
+        self.risk_button.grid(row=6, column=0, columnspan=2, pady=(10, 0), sticky="w")
+
+        self.length_var.trace_add("write", self.refresh.request)
+        self.height_var.trace_add("write", self.refresh.request)
+        self.target_var.trace_add("write", self.refresh.request)
+        self.time_display_unit.trace_add("write", self.refresh.request)
+        self.learning_model_var.trace_add("write", self.refresh.request)
+        self.learning_rate_var.trace_add("write", self.refresh.request)
+        self.learning_plateau_var.trace_add("write", self.refresh.request)
         
         # Initial UI setup based on default mode
         self.update_output_mode()
@@ -158,7 +292,7 @@ class LaborSimulatorApp:
             self.height_entry.grid_remove()
         
         # Update calculations
-        self.update_output()
+        self.refresh.request()
 
     def toggle_target_input(self):
         """
@@ -168,20 +302,14 @@ class LaborSimulatorApp:
         self.update_output_mode()
 
     def save_simulation(self):
-        """Save the current simulation to a JSON file."""
+        """Save the current simulation to a JSON file, or binary for *.lsb paths."""
         # Collect all simulation data
         simulation_data = {
             "simulation_name": self.sim_name_entry.get(),
             "workers": self.collect_worker_data(),
             "tasks": self.collect_task_data(),
             "impacts": self.collect_impact_data(),
-            "output_settings": {
-                "output_type": self.output_type_var.get(),
-                "length": self.length_var.get(),
-                "height": self.height_var.get(),
-                "target": self.target_var.get(),
-                "time_display_unit": self.time_display_unit.get()
-            },
+            "output_settings": self.read_output_settings().to_dict(),
             "version": self.VERSION
         }
         
@@ -190,16 +318,20 @@ class LaborSimulatorApp:
         if not file_path:
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".json",
-                filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+                filetypes=SIMULATION_FILETYPES,
                 initialfile=f"{self.sim_name_entry.get() or 'simulation'}.json"
             )
             if not file_path:  # User cancelled
                 return
             self.current_file_path = file_path
+            self.update_tabs()
             
         try:
-            with open(file_path, 'w') as f:
-                json.dump(simulation_data, f, indent=4)
+            if file_path.lower().endswith(BINARY_EXTENSION):
+                save_binary(Simulation.from_dict(simulation_data), file_path)
+            else:
+                with open(file_path, 'w') as f:
+                    json.dump(simulation_data, f, indent=4)
             messagebox.showinfo("Success", f"Simulation saved to {file_path}")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save simulation: {str(e)}")
@@ -216,22 +348,7 @@ class LaborSimulatorApp:
     
     def collect_task_data(self):
         """Collect data from all tasks."""
-        task_data = []
-        for task in self.tasks:
-            # Get assigned workers
-            assigned = []
-            for i, var in enumerate(task["assigned_workers"]):
-                if var.get():
-                    assigned.append(i)
-                    
-            task_data.append({
-                "name": task["task_name_var"].get(),
-                "base_time": task["base_time_var"].get(),
-                "time_unit": task["time_unit_var"].get(),
-                "material_unit": task["material_unit_var"].get(),
-                "assigned_workers": assigned
-            })
-        return task_data
+        return [task.to_dict() for task in self.recalc.model.tasks]
     
     def collect_impact_data(self):
         """Collect data from all impact entries."""
@@ -243,658 +360,585 @@ class LaborSimulatorApp:
             })
         return impact_data
 
-    def load_simulation(self):
-        """Load a simulation from a JSON file."""
-        file_path = filedialog.askopenfilename(
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+    @timed("build_simulation")
+    def build_simulation(self):
+        """Snapshot the current widgets into a headless Simulation model."""
+        workers = []
+        for worker in self.workers:
+            workers.append(Worker(name=worker["name_var"].get(),
+                                  efficiency=self.read_float(worker["efficiency_var"])))
+        return Simulation(
+            simulation_name=self.sim_name_entry.get(),
+            workers=workers,
+            tasks=[Task.from_dict(task_data, len(workers)) for task_data in self.collect_task_data()],
+            impacts=[Impact(**impact_data) for impact_data in self.collect_impact_data()],
+            output_settings=self.read_output_settings(),
+            version=self.VERSION
+        )
+
+    def read_output_settings(self):
+        """The output settings as entered; the learning rate is typed in percent."""
+        return OutputSettings(
+            output_type=self.output_type_var.get(),
+            length=self.length_var.get(),
+            height=self.height_var.get(),
+            target=self.target_var.get(),
+            time_display_unit=self.time_display_unit.get(),
+            learning_model=self.learning_model_var.get(),
+            learning_rate=self.learning_rate_var.get() / 100,
+            learning_plateau=self.learning_plateau_var.get(),
         )
+
+    @staticmethod
+    def read_float(var):
+        """Numeric value of a Tk variable, or nan while its entry can't be parsed."""
+        try:
+            return float(var.get())
+        except (tk.TclError, ValueError):
+            return float("nan")
+
+    def load_simulation(self):
+        """Load a simulation from a JSON or binary file."""
+        file_path = filedialog.askopenfilename(filetypes=SIMULATION_FILETYPES)
         if not file_path:  # User cancelled
             return
             
         try:
-            with open(file_path, 'r') as f:
-                simulation_data = json.load(f)
-                
-            # Reset current state before loading
-            self.restart()
-            
-            # Set the current file path
-            self.current_file_path = file_path
-            
-            # Load simulation name
-            self.sim_name_entry.delete(0, tk.END)
-            self.sim_name_entry.insert(0, simulation_data.get("simulation_name", ""))
-            
-            # Load workers
-            for worker_data in simulation_data.get("workers", []):
-                self.add_worker(worker_data)
-                
-            # Load tasks
-            for task_data in simulation_data.get("tasks", []):
-                self.add_task(task_data)
-                
-            # Load impacts
-            for impact_data in simulation_data.get("impacts", []):
-                self.add_impact(impact_data)
-                
-            # Load output settings
-            output_settings = simulation_data.get("output_settings", {})
-            
-            # Handle backward compatibility for renamed "Man Day" option
-            output_type = output_settings.get("output_type", "Square-foot")
-            if output_type == "Man Day":
-                output_type = "Man Day (SF)"
-            self.output_type_var.set(output_type)
-            
-            self.length_var.set(output_settings.get("length", 0))
-            self.height_var.set(output_settings.get("height", 0))
-            
-            # Support for both old and new formats
-            if "target_area" in output_settings:
-                self.target_var.set(output_settings.get("target_area", 0))
-            else:
-                self.target_var.set(output_settings.get("target", 0))
-                
-            self.time_display_unit.set(output_settings.get("time_display_unit", "minutes"))
-            
+            sim = self.load_simulation_data(load_simulation_file(file_path), file_path)
+
             # Check if the version is compatible
-            file_version = simulation_data.get("version", "V1.0")
-            if file_version != self.VERSION:
+            if sim.version != self.VERSION:
                 messagebox.showwarning("Version Mismatch", 
-                    f"The file was created with version {file_version}, current version is {self.VERSION}. Some features may not work correctly.")
-            
-            # Update UI based on loaded data
-            self.update_output_mode()
+                    f"The file was created with version {sim.version}, current version is {self.VERSION}. Some features may not work correctly.")
+
             messagebox.showinfo("Success", f"Simulation loaded from {file_path}")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load simulation: {str(e)}")
 
+    @timed("load_simulation")
+    def load_simulation_data(self, simulation_data, file_path=None):
+        """
+        Open simulation_data (a JSON-schema dict or a Simulation) in a new
+        tab, or in the active one if nothing has been entered there yet.
+
+        The model is built first, then every widget row is created in a single
+        pass with refreshes suspended, and the output is computed once at the end.
+        """
+        start = time.perf_counter()
+        if isinstance(simulation_data, Simulation):
+            sim = simulation_data
+        else:
+            sim = Simulation.from_dict(simulation_data)
+
+        if self.workspace.current.is_blank():
+            self.current_file_path = file_path
+            self.recalc.reset(sim)
+            self.show_model()
+            self.update_tabs()
+        else:
+            self.leave_document()
+            self.activate(self.add_document(sim, file_path))
+
+        self.last_load_seconds = time.perf_counter() - start
+        target = self.load_time_target(len(sim.tasks))
+        self.refresh_status_label.config(
+            text=f"Loaded {len(sim.tasks)} tasks in {self.last_load_seconds:.2f} s (target {target:.2f} s)"
+        )
+        return sim
+
+    def show_model(self):
+        """Rebuild the widgets for the active tab's model, leaving the model as it is."""
+        sim = self.recalc.model
+        self.clear_widgets()
+
+        with self.refresh.suspended():
+            self.sim_name_entry.insert(0, sim.simulation_name)
+
+            for w in range(len(sim.workers)):
+                self.build_worker_row(w)
+            for i in range(len(sim.impacts)):
+                self.build_impact_row(i)
+
+            settings = sim.output_settings
+            self.output_type_var.set(settings.output_type)
+            self.length_var.set(settings.length)
+            self.height_var.set(settings.height)
+            self.target_var.set(settings.target)
+            self.time_display_unit.set(settings.time_display_unit)
+            self.learning_model_var.set(settings.learning_model)
+            self.learning_rate_var.set(round(settings.learning_rate * 100, 6))
+            self.learning_plateau_var.set(settings.learning_plateau)
+
+            # Update UI based on loaded data
+            self.update_output_mode()
+
+        self.refresh.flush()
+        self.task_grid.refresh()
+
+    # Workspace tabs
+
+    def update_tabs(self):
+        """One tab per document, titled, with the active one selected."""
+        documents = self.workspace.documents
+        self.updating_tabs = True
+        try:
+            while len(self.tab_pages) < len(documents):
+                page = ttk.Frame(self.tab_bar, height=1)
+                self.tab_bar.add(page, text="")
+                self.tab_pages.append(page)
+            while len(self.tab_pages) > len(documents):
+                self.tab_bar.forget(self.tab_pages.pop())
+            for page, document in zip(self.tab_pages, documents):
+                self.tab_bar.tab(page, text=document.title)
+            self.tab_bar.select(self.tab_pages[self.workspace.active])
+        finally:
+            self.updating_tabs = False
+
+    def leave_document(self):
+        """Push pending edits into the active model before another tab is shown."""
+        self.task_grid.commit_edit()
+        self.refresh.flush()
+
+    def add_document(self, sim=None, file_path=None):
+        """Open a document in a new tab, journaled if autosave is on; returns its index."""
+        index = self.workspace.add(sim, file_path)
+        if self.autosave:
+            self.autosave_document(self.workspace.documents[index])
+        return index
+
+    def activate(self, index):
+        """Show document index."""
+        self.workspace.active = index
+        self.show_model()
+        self.update_tabs()
+
+    def switch_document(self, index):
+        if self.updating_tabs or index == self.workspace.active:
+            return
+        self.leave_document()
+        self.activate(index)
+
+    def new_document(self):
+        self.leave_document()
+        self.activate(self.add_document())
+
+    def close_document(self):
+        """Close the active tab; closing the last one just clears it."""
+        document = self.workspace.current
+        if not document.is_blank() and not messagebox.askyesno(
+                "Close Tab", f"Close '{document.title}'? Unsaved changes will be lost."):
+            return
+        if len(self.workspace.documents) == 1:
+            self.restart()
+            return
+        self.task_grid.cancel_edit()
+        self.refresh.cancel()  # a pending refresh belongs to the closed tab
+        journal, self.recalc.journal = self.recalc.journal, None
+        if journal is not None:
+            journal.discard()
+        self.workspace.remove(self.workspace.active)
+        self.activate(self.workspace.active)
+
+    def current_workspace(self):
+        """The workspace with the active tab's pending edits applied."""
+        self.leave_document()
+        return self.workspace
+
+    def open_compare(self):
+        """Compare two open simulations task by task."""
+        if len(self.workspace.documents) < 2:
+            messagebox.showwarning("Warning", "Open a second simulation in a new tab to compare.")
+            return
+        from labor_compare_dialog import CompareDialog
+        CompareDialog(self.root, self.current_workspace)
+
+    def load_time_target(self, task_count):
+        """Load-time budget in seconds for a file with task_count tasks."""
+        return max(1, task_count / 1000) * self.LOAD_SECONDS_PER_1000_TASKS
+
+    @timed("add_worker")
     def add_worker(self, worker_data=None):
         """Add a new worker, optionally with pre-loaded data."""
-        row = len(self.workers)
-        name_var = tk.StringVar()
-        efficiency_var = tk.DoubleVar(value=1.0)
-        
-        # If loading from a file, set the values
-        if worker_data:
-            name_var.set(worker_data.get("name", ""))
-            efficiency_var.set(worker_data.get("efficiency", 1.0))
+        w = self.recalc.add_worker(Worker.from_dict(worker_data or {}))
+        self.build_worker_row(w)
+
+        # New worker column in the task grid
+        self.task_grid.refresh()
+
+    @timed("build_worker_row")
+    def build_worker_row(self, w):
+        """Create the widgets for model worker w."""
+        worker = self.recalc.model.workers[w]
+        name_var = tk.StringVar(value=worker.name)
+        efficiency_var = tk.DoubleVar(value=worker.efficiency)
 
         name_entry = ttk.Entry(self.worker_frame, textvariable=name_var, width=20)
         efficiency_entry = ttk.Entry(self.worker_frame, textvariable=efficiency_var, width=10)
 
-        ttk.Label(self.worker_frame, text=f"Worker {row+1}").grid(row=row, column=0, padx=5, pady=2, sticky="e")
-        name_entry.grid(row=row, column=1, padx=5, pady=2)
-        ttk.Label(self.worker_frame, text="Efficiency:").grid(row=row, column=2, sticky="e")
-        efficiency_entry.grid(row=row, column=3, padx=5, pady=2)
+        ttk.Label(self.worker_frame, text=f"Worker {w+1}").grid(row=w, column=0, padx=5, pady=2, sticky="e")
+        name_entry.grid(row=w, column=1, padx=5, pady=2)
+        ttk.Label(self.worker_frame, text="Efficiency:").grid(row=w, column=2, sticky="e")
+        efficiency_entry.grid(row=w, column=3, padx=5, pady=2)
 
         self.workers.append({
             "name_var": name_var,
             "efficiency_var": efficiency_var
         })
 
-        # Update existing tasks with the new worker checkboxes
-        for task in self.tasks:
-            task_row_frame = task["task_row_frame"]
-            var = tk.BooleanVar()
-            cb = ttk.Checkbutton(task_row_frame, text=name_var.get() or f"Worker {len(self.workers)}", variable=var)
-            cb.grid(row=0, column=2+len(task["assigned_workers"]), padx=3)
-            task["assigned_workers"].append(var)
-            var.trace_add("write", task["update_adjusted_time"])
+        def update_efficiency(*args):
+            # Invalidates only the tasks this worker is assigned to
+            self.recalc.set_worker(w, efficiency=self.read_float(efficiency_var))
+            self.refresh.request()
 
-    def add_task(self, task_data=None):
-        """Add a new task, optionally with pre-loaded data."""
-        row = len(self.tasks)
-        task_row_frame = ttk.Frame(self.task_frame)
-        task_row_frame.grid(row=row, column=0, pady=4, sticky="w")
-
-        task_name_var = tk.StringVar()
-        base_time_var = tk.DoubleVar()
-        time_unit_var = tk.StringVar(value="Minutes")
-        material_unit_var = tk.StringVar(value="unit")
-        assigned_workers = []
-
-        # If loading from a file, set the values
-        if task_data:
-            task_name_var.set(task_data.get("name", ""))
-            base_time_var.set(task_data.get("base_time", 0.0))
-            time_unit_var.set(task_data.get("time_unit", "Minutes"))
-            material_unit_var.set(task_data.get("material_unit", "unit"))
-
-        ttk.Label(task_row_frame, text=f"Task {row+1}:").grid(row=0, column=0, padx=5, sticky="w")
-        task_name_entry = ttk.Entry(task_row_frame, textvariable=task_name_var, width=20)
-        task_name_entry.grid(row=0, column=1, padx=5)
-
-        for i, worker in enumerate(self.workers):
-            var = tk.BooleanVar()
-            cb = ttk.Checkbutton(task_row_frame, text=worker["name_var"].get() or f"Worker {i+1}", variable=var)
-            cb.grid(row=0, column=2+i, padx=3)
-            assigned_workers.append(var)
-            
-            # If loading from a file, set worker assignments
-            if task_data and "assigned_workers" in task_data and i in task_data["assigned_workers"]:
-                var.set(True)
-
-        ttk.Label(task_row_frame, text="Base Time:").grid(row=1, column=0, sticky="e", padx=5)
-        base_time_entry = ttk.Entry(task_row_frame, textvariable=base_time_var, width=10)
-        base_time_entry.grid(row=1, column=1, padx=5, sticky="w")
-
-        ttk.Label(task_row_frame, text="Time Unit:").grid(row=1, column=2, sticky="e")
-        time_unit_menu = ttk.Combobox(task_row_frame, textvariable=time_unit_var,
-                                      values=["Minutes", "Hours"], state="readonly", width=10)
-        time_unit_menu.grid(row=1, column=3, padx=5, sticky="w")
-
-        ttk.Label(task_row_frame, text="Per:").grid(row=1, column=4, sticky="e")
-        material_unit_entry = ttk.Entry(task_row_frame, textvariable=material_unit_var, width=10)
-        material_unit_entry.grid(row=1, column=5, padx=5, sticky="w")
-
-        result_label = ttk.Label(task_row_frame, text="Adjusted Time: ???")
-        result_label.grid(row=1, column=6, padx=10, sticky="w")
-
-        def update_adjusted_time(*args):
-            selected_efficiencies = []
-            worker_count = 0
-            for i, var in enumerate(assigned_workers):
-                if var.get():
-                    try:
-                        eff = float(self.workers[i]["efficiency_var"].get())
-                        selected_efficiencies.append(eff)
-                        worker_count += 1
-                    except:
-                        continue
-
-            if selected_efficiencies and worker_count > 0:
-                avg_eff = sum(selected_efficiencies) / len(selected_efficiencies)
-                try:
-                    base_time = base_time_var.get()
-                    time_unit = time_unit_var.get().lower()
-                    unit_factor = 1 if time_unit == "minutes" else 60
-                    adjusted_time = (base_time * unit_factor / avg_eff) * worker_count
-                    material_unit = material_unit_var.get()
-                    result_label.config(text=f"Adjusted Time: {adjusted_time:.2f} minutes/{material_unit}")
-                except:
-                    result_label.config(text="Adjusted Time: ???")
-            else:
-                result_label.config(text="Adjusted Time: ???")
+        def update_name(*args):
+            self.recalc.set_worker(w, name=name_var.get())
+            self.task_grid.refresh()
 
-            self.update_output()
+        efficiency_var.trace_add("write", update_efficiency)
+        name_var.trace_add("write", update_name)
 
-        base_time_var.trace_add("write", update_adjusted_time)
-        time_unit_var.trace_add("write", update_adjusted_time)
-        material_unit_var.trace_add("write", update_adjusted_time)
-        for worker_var in assigned_workers:
-            worker_var.trace_add("write", update_adjusted_time)
-        for worker in self.workers:
-            worker["efficiency_var"].trace_add("write", update_adjusted_time)
-
-        self.tasks.append({
-            "task_row_frame": task_row_frame,
-            "task_name_var": task_name_var,
-            "assigned_workers": assigned_workers,
-            "base_time_var": base_time_var,
-            "time_unit_var": time_unit_var,
-            "material_unit_var": material_unit_var,
-            "result_label": result_label,
-            "update_adjusted_time": update_adjusted_time
-        })
-        
-        # Trigger update to recalculate times
-        update_adjusted_time()
+    @timed("add_task")
+    def add_task(self, task_data=None):
+        """Add a new task, optionally with pre-loaded data."""
+        t = self.recalc.add_task(Task.from_dict(task_data or {}, len(self.workers)))
+        self.task_grid.see(t)
+        self.refresh.request()
+
+    # Data source and edit callbacks for the task grid
+
+    def task_count(self):
+        return len(self.recalc.model.tasks)
+
+    def worker_labels(self):
+        return [worker.name or f"Worker {w+1}" for w, worker in enumerate(self.recalc.model.workers)]
+
+    def task_cells(self, t):
+        task = self.recalc.model.tasks[t]
+        return task.name, task.base_time, task.time_unit, task.material_unit
+
+    def is_assigned(self, t, w):
+        return self.recalc.assignments.get(t, w)
+
+    def task_result_text(self, t):
+        """Adjusted time of task t, as shown in its row."""
+        adjusted_time, _, worker_count = self.recalc.task_result(t)
+        if worker_count and math.isfinite(adjusted_time):
+            material_unit = self.recalc.model.tasks[t].material_unit
+            return f"Adjusted Time: {adjusted_time:.2f} minutes/{material_unit}"
+        return "Adjusted Time: ???"
+
+    def task_efficiency_text(self, t, w):
+        efficiency = self.recalc.model.tasks[t].efficiency_overrides.get(w)
+        return "" if efficiency is None else f"{efficiency:g}"
+
+    def edit_efficiency(self, t, w):
+        """Ask for worker w's efficiency on task t alone; blank goes back to the worker's own."""
+        from tkinter import simpledialog
+
+        model = self.recalc.model
+        task, worker = model.tasks[t], model.workers[w]
+        current = task.efficiency_overrides.get(w)
+        text = simpledialog.askstring(
+            "Task Efficiency",
+            f"Efficiency of {worker.name or f'Worker {w+1}'} on {task.name or f'Task {t+1}'}\n"
+            f"(leave blank to use the worker's {worker.efficiency:g}):",
+            initialvalue="" if current is None else f"{current:g}", parent=self.root)
+        if text is None:
+            return
+        try:
+            efficiency = float(text) if text.strip() else None
+        except ValueError:
+            messagebox.showerror("Error", f"'{text}' is not a number.")
+            return
+        self.set_task_efficiency(t, w, efficiency)
+
+    @timed("set_task_efficiency")
+    def set_task_efficiency(self, t, w, efficiency):
+        """Set or clear one per-task efficiency; only task t is invalidated."""
+        self.recalc.set_task_efficiency(t, w, efficiency)
+        self.task_grid.refresh_rows([t])
+        self.refresh.request()
+
+    def toggle_assignment(self, t, w):
+        self.set_assignment(t, w, not self.recalc.assignments.get(t, w))
+
+    @timed("set_assignment")
+    def set_assignment(self, t, w, assigned):
+        """Assign or unassign worker w on task t; only task t is invalidated."""
+        self.recalc.set_assignment(t, w, assigned)
+        self.task_grid.refresh_rows([t])
+        self.refresh.request()
+
+    def edit_task(self, t, field, text):
+        """Commit an edited grid cell. Returns False if the value is rejected."""
+        if field == "base_time":
+            try:
+                value = float(text)
+            except ValueError:
+                return False
+        else:
+            value = text
+        self.set_task_field(t, field, value)
+        return True
+
+    @timed("set_task_field")
+    def set_task_field(self, t, field, value):
+        self.recalc.set_task(t, **{field: value})
+        self.task_grid.refresh_rows([t])
+        self.refresh.request()
+
+    @timed("insert_tasks")
+    def insert_tasks(self, tasks):
+        """Append many tasks with a single grid redraw and recompute."""
+        if not tasks:
+            return
+        with self.refresh.suspended():
+            for task in tasks:
+                t = self.recalc.add_task(task)
+            self.refresh.request()
+        self.task_grid.see(t)
+
+    @timed("insert_workers")
+    def insert_workers(self, workers):
+        """Append many workers with a single grid redraw and recompute."""
+        with self.refresh.suspended():
+            for worker in workers:
+                self.build_worker_row(self.recalc.add_worker(Worker(worker.name, worker.efficiency)))
+            self.refresh.request()
+        self.task_grid.refresh()
+
+    @timed("import_takeoff")
+    def import_takeoff(self, tasks, workers):
+        """Append imported workers, then tasks that may be assigned to them, as one batch."""
+        with self.refresh.suspended():
+            if workers:
+                self.insert_workers(workers)
+            self.insert_tasks(tasks)
 
     def add_impact(self, impact_data=None):
         """Add a new impact, optionally with pre-loaded data."""
-        row = len(self.impact_entries) + 1
-        name_var = tk.StringVar()
-        time_var = tk.DoubleVar()
-        
-        # If loading from a file, set the values
-        if impact_data:
-            name_var.set(impact_data.get("name", ""))
-            time_var.set(impact_data.get("time", 0.0))
+        i = self.recalc.add_impact(Impact.from_dict(impact_data or {}))
+        self.build_impact_row(i)
+        self.refresh.request()
+
+    def build_impact_row(self, i):
+        """Create the widgets for model impact i."""
+        impact = self.recalc.model.impacts[i]
+        row = i + 1
+        name_var = tk.StringVar(value=impact.name)
+        time_var = tk.DoubleVar(value=impact.time)
 
         ttk.Entry(self.impact_frame, textvariable=name_var, width=20).grid(row=row, column=0, padx=5, pady=2)
         ttk.Entry(self.impact_frame, textvariable=time_var, width=10).grid(row=row, column=1, padx=5, pady=2)
         ttk.Label(self.impact_frame, text="minutes").grid(row=row, column=2)
-        time_var.trace_add("write", lambda *args: self.update_output())
+
+        def update_impact(*args):
+            self.recalc.set_impact(i, name=name_var.get(), time=self.read_float(time_var))
+            self.refresh.request()
+
+        name_var.trace_add("write", update_impact)
+        time_var.trace_add("write", update_impact)
         self.impact_entries.append((name_var, time_var))
-        self.update_output()
 
+    @timed("update_output")
     def update_output(self):
-        if not self.tasks:
+        if not self.recalc.model.tasks:
             return
 
+        # Recompute only the invalidated tasks; redraw the grid if any is visible
+        self.task_grid.refresh_rows(self.recalc.refresh())
+
         try:
-            breakdown = ""
-            material_unit = self.tasks[0]["material_unit_var"].get()
+            material_unit = self.recalc.model.tasks[0].material_unit
             self.material_unit_display.config(state="normal")
             self.material_unit_display.delete(0, tk.END)
             self.material_unit_display.insert(0, material_unit)
             self.material_unit_display.config(state="readonly")
 
-            unit_length = self.length_var.get()
-            unit_height = self.height_var.get()
-            unit_sqft = unit_length * unit_height
-            total_workers = len(self.workers)
-
-            total_time_per_unit = 0
-            for task in self.tasks:
-                selected_efficiencies = []
-                worker_count = 0
-                for i, assigned in enumerate(task["assigned_workers"]):
-                    if assigned.get():
-                        eff = float(self.workers[i]["efficiency_var"].get())
-                        selected_efficiencies.append(eff)
-                        worker_count += 1
-
-                if selected_efficiencies and worker_count > 0:
-                    avg_eff = sum(selected_efficiencies) / len(selected_efficiencies)
-                    base_time = task["base_time_var"].get()
-                    time_unit = task["time_unit_var"].get().lower()
-                    unit_factor = 1 if time_unit == "minutes" else 60
-                    adjusted_time = (base_time * unit_factor / avg_eff) * worker_count
-                    total_time_per_unit += adjusted_time
-                    breakdown += f"- {task['task_name_var'].get() or 'Task'}: {adjusted_time:.2f} min/unit\n"
-
-            impact_time = sum(t[1].get() * total_workers for t in self.impact_entries)
-            for name_var, time_var in self.impact_entries:
-                breakdown += f"- Impact '{name_var.get() or 'Unnamed'}': {time_var.get():.2f} min × {total_workers} workers = {time_var.get() * total_workers:.2f} min\n"
-
-            mode = self.output_type_var.get()
-            if mode == "Square-foot":
-                total_area = self.target_var.get()
-                units_needed = total_area / unit_sqft if unit_sqft > 0 else 0
-                total_time = total_time_per_unit * units_needed + impact_time
-                breakdown += f"\nUnits needed: {units_needed:.2f} → Task time: {total_time_per_unit:.2f} × {units_needed:.2f} = {total_time_per_unit * units_needed:.2f} min"
-                breakdown += f"\n+ Impacts: {impact_time:.2f} min → Total: {total_time:.2f} min"
-
-                if self.time_display_unit.get() == "hours":
-                    total_time /= 60
-                    breakdown += f"\n\nDisplayed in hours: {total_time:.2f} hours"
-
-                self.final_output_label.config(
-                    text=f"Total Time: {total_time:.2f} {self.time_display_unit.get()} to complete {total_area:.0f} sqft"
-                )
-                
-            elif mode == "Linear-Foot":
-                target_length = self.target_var.get()
-                # For linear foot, units needed is directly target_length / unit_length
-                units_needed = target_length / unit_length if unit_length > 0 else 0
-                total_time = total_time_per_unit * units_needed + impact_time
-                
-                breakdown += f"\nTarget length: {target_length:.2f} lf"
-                breakdown += f"\nUnit length: {unit_length:.2f} lf"
-                breakdown += f"\nUnits needed: {target_length:.2f} ÷ {unit_length:.2f} = {units_needed:.2f} units"
-                breakdown += f"\nTask time: {total_time_per_unit:.2f} min/unit × {units_needed:.2f} units = {total_time_per_unit * units_needed:.2f} min"
-                breakdown += f"\n+ Impacts: {impact_time:.2f} min → Total: {total_time:.2f} min"
-
-                if self.time_display_unit.get() == "hours":
-                    total_time /= 60
-                    breakdown += f"\n\nDisplayed in hours: {total_time:.2f} hours"
-
-                self.final_output_label.config(
-                    text=f"Total Time: {total_time:.2f} {self.time_display_unit.get()} to complete {target_length:.0f} lf"
-                )
-
-            elif mode == "Man Day (SF)":
-                # Calculate man-day as 8 hours per worker
-                hours_per_worker = 8
-                total_available_time = hours_per_worker * 60 * total_workers  # Convert to minutes
-                effective_time = total_available_time - impact_time
-                units_completed = effective_time / total_time_per_unit if total_time_per_unit > 0 else 0
-                sqft_completed = units_completed * unit_sqft
-
-                breakdown += f"\nCrew size: {total_workers} workers × 8 hours = {total_workers * 8} work hours"
-                breakdown += f"\nTotal available time: {total_available_time} minutes"
-                breakdown += f"\n- Impacts: {impact_time:.2f} min → Working time = {effective_time:.2f} min"
-                breakdown += f"\nTime per unit: {total_time_per_unit:.2f} min"
-                breakdown += f"\nUnits completed: {effective_time:.2f} ÷ {total_time_per_unit:.2f} = {units_completed:.2f}"
-                breakdown += f"\nUnit size: {unit_sqft:.2f} sqft → Total: {sqft_completed:.2f} sqft"
-
-                self.final_output_label.config(
-                    text=f"Total Production: {sqft_completed:.2f} sqft installed in 1 Man Day ({total_workers} workers)"
-                )
-                
-            elif mode == "Man Day (LF)":
-                # Calculate man-day as 8 hours per worker
-                hours_per_worker = 8
-                total_available_time = hours_per_worker * 60 * total_workers  # Convert to minutes
-                effective_time = total_available_time - impact_time
-                units_completed = effective_time / total_time_per_unit if total_time_per_unit > 0 else 0
-                lf_completed = units_completed * unit_length  # Linear feet completed
-
-                breakdown += f"\nCrew size: {total_workers} workers × 8 hours = {total_workers * 8} work hours"
-                breakdown += f"\nTotal available time: {total_available_time} minutes"
-                breakdown += f"\n- Impacts: {impact_time:.2f} min → Working time = {effective_time:.2f} min"
-                breakdown += f"\nTime per unit: {total_time_per_unit:.2f} min"
-                breakdown += f"\nUnits completed: {effective_time:.2f} ÷ {total_time_per_unit:.2f} = {units_completed:.2f}"
-                breakdown += f"\nUnit length: {unit_length:.2f} lf → Total: {lf_completed:.2f} linear feet"
-
-                self.final_output_label.config(
-                    text=f"Total Production: {lf_completed:.2f} linear feet installed in 1 Man Day ({total_workers} workers)"
-                )
-
-            self.breakdown_label.config(text=breakdown)
+            self.recalc.set_output(**dataclasses.asdict(self.read_output_settings()))
+            result = self.recalc.result()
+            if not result.valid:
+                raise ValueError("Calculation produced a non-finite result")
+
+            self.final_output_label.config(text=result.summary_text())
+            self.breakdown_label.config(text=result.breakdown_text())
 
         except Exception as e:
             self.final_output_label.config(text="Total Time: ???")
             self.breakdown_label.config(text="Calculation Error")
 
+    def show_refresh_stats(self, scheduler):
+        self.refresh_status_label.config(text=scheduler.status_text())
+
+    def profile_counters(self):
+        """Widget and trace counts for the profiler snapshots."""
+        return {
+            "widgets": widget_count(self.root),
+            "grid canvas items": len(self.task_grid.canvas.find_all()),
+            "open tabs": len(self.workspace.documents),
+            "tasks": len(self.recalc.model.tasks),
+            "workers": len(self.recalc.model.workers),
+            "refresh requests": self.refresh.requests,
+            "refresh runs": self.refresh.runs,
+            "refresh coalesced": self.refresh.coalesced,
+            "tasks recomputed": self.recalc.recompute_count,
+            "result cache": f"{len(self.recalc.cache)} entries, "
+                            f"{self.recalc.cache.hits} hits, {self.recalc.cache.misses} misses",
+            "background requests": f"{self.compute.submitted} submitted, {self.compute.superseded} superseded",
+        }
+
     def export_to_excel(self):
-        """Export the simulation data to an Excel file."""
-        if not self.tasks:
+        """Export the simulation data to an Excel file on a background thread."""
+        if self.export_job is not None:
+            return
+        if not self.recalc.model.tasks:
             messagebox.showwarning("Warning", "No tasks to export.")
             return
-            
+
+        # Ask for save location
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
+            initialfile=f"{self.sim_name_entry.get() or 'simulation'}.xlsx"
+        )
+        if not file_path:  # User cancelled
+            return
+
+        # Snapshot the widgets on the main thread; the worker only ever sees
+        # this copy, so editing during the export cannot tear the workbook.
+        # The results are the ones on screen, not a second evaluation.
+        self.refresh.flush()
+        sim = self.build_simulation()
         try:
-            # Ask for save location
-            file_path = filedialog.asksaveasfilename(
-                defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
-                initialfile=f"{self.sim_name_entry.get() or 'simulation'}.xlsx"
-            )
-            if not file_path:  # User cancelled
-                return
-                
-            # Create a dict to hold all dataframes for Excel
-            excel_data = {}
-            
-            # Workers data
-            worker_data = []
-            for i, worker in enumerate(self.workers):
-                worker_data.append({
-                    "Worker #": i+1,
-                    "Name": worker["name_var"].get(),
-                    "Efficiency": worker["efficiency_var"].get()
-                })
-            if worker_data:
-                excel_data["Workers"] = pd.DataFrame(worker_data)
-            
-            # Tasks data
-            task_data = []
-            for i, task in enumerate(self.tasks):
-                # Get assigned workers
-                assigned_workers = []
-                for j, var in enumerate(task["assigned_workers"]):
-                    if var.get():
-                        worker_name = self.workers[j]["name_var"].get() or f"Worker {j+1}"
-                        assigned_workers.append(worker_name)
-                
-                task_data.append({
-                    "Task #": i+1,
-                    "Name": task["task_name_var"].get(),
-                    "Base Time": task["base_time_var"].get(),
-                    "Time Unit": task["time_unit_var"].get(),
-                    "Material Unit": task["material_unit_var"].get(),
-                    "Assigned Workers": ", ".join(assigned_workers)
-                })
-            if task_data:
-                excel_data["Tasks"] = pd.DataFrame(task_data)
-            
-            # Impact data
-            impact_data = []
-            for i, (name_var, time_var) in enumerate(self.impact_entries):
-                impact_data.append({
-                    "Impact #": i+1,
-                    "Name": name_var.get(),
-                    "Time (min)": time_var.get()
-                })
-            if impact_data:
-                excel_data["Impacts"] = pd.DataFrame(impact_data)
-            
-            # Simulation settings
-            mode = self.output_type_var.get()
-            current_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            settings_data = [{
-                "Simulation Name": self.sim_name_entry.get(),
-                "Output Type": mode,
-                "Length (ft)": self.length_var.get(),
-                "Time Display Unit": self.time_display_unit.get(),
-                "Export Date": current_date,
-                "User": "Jmk125",  # Hardcoded username
-                "Version": self.VERSION
-            }]
-            
-            # Add height for Square-foot and Man Day (SF) modes
-            if mode in ["Square-foot", "Man Day (SF)"]:
-                settings_data[0]["Height (ft)"] = self.height_var.get()
-                
-            # Add target field with appropriate label
-            if mode == "Square-foot":
-                settings_data[0]["Target Area (sqft)"] = self.target_var.get()
-            elif mode == "Linear-Foot":
-                settings_data[0]["Target Length (lf)"] = self.target_var.get()
-                
-            excel_data["Settings"] = pd.DataFrame(settings_data)
-            
-            # Create a worksheet with calculation results
-            results_data = []
-            
-            material_unit = self.tasks[0]["material_unit_var"].get() if self.tasks else "unit"
-            unit_length = self.length_var.get()
-            unit_height = self.height_var.get()
-            unit_sqft = unit_length * unit_height
-            total_workers = len(self.workers)
-            total_time_per_unit = 0
-            
-            # Task time calculations
-            for task in self.tasks:
-                selected_efficiencies = []
-                worker_count = 0
-                for i, assigned in enumerate(task["assigned_workers"]):
-                    if assigned.get():
-                        eff = float(self.workers[i]["efficiency_var"].get())
-                        selected_efficiencies.append(eff)
-                        worker_count += 1
-
-                if selected_efficiencies and worker_count > 0:
-                    avg_eff = sum(selected_efficiencies) / len(selected_efficiencies)
-                    base_time = task["base_time_var"].get()
-                    time_unit = task["time_unit_var"].get().lower()
-                    unit_factor = 1 if time_unit == "minutes" else 60
-                    adjusted_time = (base_time * unit_factor / avg_eff) * worker_count
-                    total_time_per_unit += adjusted_time
-                    
-                    results_data.append({
-                        "Category": "Task",
-                        "Name": task["task_name_var"].get() or f"Task {len(results_data)+1}",
-                        "Time (min)": adjusted_time,
-                        "Notes": f"Base: {base_time} {time_unit}, Efficiency: {avg_eff:.2f}, Workers: {worker_count}"
-                    })
-            
-            # Impact times
-            impact_time = sum(t[1].get() * total_workers for t in self.impact_entries)
-            for name_var, time_var in self.impact_entries:
-                results_data.append({
-                    "Category": "Impact",
-                    "Name": name_var.get() or "Unnamed Impact",
-                    "Time (min)": time_var.get() * total_workers,
-                    "Notes": f"Per Worker: {time_var.get()} min × {total_workers} workers"
-                })
-            
-            # Final calculation based on output type
-            if mode == "Square-foot":
-                total_area = self.target_var.get()
-                units_needed = total_area / unit_sqft if unit_sqft > 0 else 0
-                total_time = total_time_per_unit * units_needed + impact_time
-                
-                results_data.append({
-                    "Category": "Summary",
-                    "Name": "Units Needed",
-                    "Time (min)": None,
-                    "Notes": f"{units_needed:.2f} units for {total_area:.2f} sqft"
-                })
-                results_data.append({
-                    "Category": "Summary",
-                    "Name": "Total Task Time",
-                    "Time (min)": total_time_per_unit * units_needed,
-                    "Notes": f"{total_time_per_unit:.2f} min/unit × {units_needed:.2f} units"
-                })
-                results_data.append({
-                    "Category": "Summary",
-                    "Name": "Total Impact Time",
-                    "Time (min)": impact_time,
-                    "Notes": "Sum of all impacts"
-                })
-                results_data.append({
-                    "Category": "Summary",
-                    "Name": "Total Time",
-                    "Time (min)": total_time,
-                    "Notes": f"To complete {total_area:.2f} sqft"
-                })
-                if self.time_display_unit.get() == "hours":
-                    results_data.append({
-                        "Category": "Summary",
-                        "Name": "Total Time (hours)",
-                        "Time (min)": total_time / 60,
-                        "Notes": f"Converted to hours: {total_time/60:.2f}"
-                    })
-            elif mode == "Linear-Foot":
-                target_length = self.target_var.get()
-                units_needed = target_length / unit_length if unit_length > 0 else 0
-                total_time = total_time_per_unit * units_needed + impact_time
-                
-                results_data.append({
-                    "Category": "Summary",
-                    "Name": "Target Length",
-                    "Time (min)": None,
-                    "Notes": f"{target_length:.2f} linear feet"
-                })
-                results_data.append({
-                    "Category": "Summary",
-                    "Name": "Unit Length",
-                    "Time (min)": None,
-                    "Notes": f"{unit_length:.2f} feet per unit"
-                })
-                results_data.append({
-                    "Category": "Summary",
-                    "Name": "Units Needed",
-                    "Time (min)": None,
-                    "Notes": f"{units_needed:.2f} units ({target_length:.2f} lf ÷ {unit_length:.2f} lf/unit)"
-                })
-                results_data.append({
-                    "Category": "Summary",
-                    "Name": "Total Task Time",
-                    "Time (min)": total_time_per_unit * units_needed,
-                    "Notes": f"{total_time_per_unit:.2f} min/unit × {units_needed:.2f} units"
-                })
-                results_data.append({
-                    "Category": "Summary",
-                    "Name": "Total Impact Time",
-                    "Time (min)": impact_time,
-                    "Notes": "Sum of all impacts"
-                })
-                results_data.append({
-                    "Category": "Summary",
-                    "Name": "Total Time",
-                    "Time (min)": total_time,
-                    "Notes": f"To complete {target_length:.2f} linear feet"
-                })
-                if self.time_display_unit.get() == "hours":
-                    results_data.append({
-                        "Category": "Summary",
-                        "Name": "Total Time (hours)",
-                        "Time (min)": total_time / 60,
-                        "Notes": f"Converted to hours: {total_time/60:.2f}"
-                    })
-            elif mode == "Man Day (SF)":
-                # Calculate man-day as 8 hours per worker
-                hours_per_worker = 8
-                total_available_time = hours_per_worker * 60 * total_workers  # Minutes
-                effective_time = total_available_time - impact_time
-                units_completed = effective_time / total_time_per_unit if total_time_per_unit > 0 else 0
-                sqft_completed = units_completed * unit_sqft
-                
-                results_data.append({
-                    "Category": "Summary",
-                    "Name": "Crew Size",
-                    "Time (min)": None,
-                    "Notes": f"{total_workers} workers × 8 hours = {total_workers * 8} work hours"
-                })
-                results_data.append({
-                    "Category": "Summary",
-                    "Name": "Available Time",
-                    "Time (min)": total_available_time,
-                    "Notes": f"{total_workers} workers × 8 hours = {total_available_time} minutes"
-                })
-                results_data.append({
-                    "Category": "Summary",
-                    "Name": "Effective Working Time",
-                    "Time (min)": effective_time,
-                    "Notes": f"Available time minus impacts: {total_available_time} - {impact_time:.2f}"
-                })
-                results_data.append({
-                    "Category": "Summary",
-                    "Name": "Units Completed",
-                    "Time (min)": None,
-                    "Notes": f"{units_completed:.2f} units ({effective_time:.2f} min ÷ {total_time_per_unit:.2f} min/unit)"
-                })
-                results_data.append({
-                    "Category": "Summary",
-                    "Name": "Total Production (SF)",
-                    "Time (min)": None,
-                    "Notes": f"{sqft_completed:.2f} sqft ({units_completed:.2f} units × {unit_sqft:.2f} sqft/unit)"
-                })
-            elif mode == "Man Day (LF)":
-                # Calculate man-day as 8 hours per worker
-                hours_per_worker = 8
-                total_available_time = hours_per_worker * 60 * total_workers  # Minutes
-                effective_time = total_available_time - impact_time
-                units_completed = effective_time / total_time_per_unit if total_time_per_unit > 0 else 0
-                lf_completed = units_completed * unit_length
-                
-                results_data.append({
-                    "Category": "Summary",
-                    "Name": "Crew Size",
-                    "Time (min)": None,
-                    "Notes": f"{total_workers} workers × 8 hours = {total_workers * 8} work hours"
-                })
-                results_data.append({
-                    "Category": "Summary",
-                    "Name": "Available Time",
-                    "Time (min)": total_available_time,
-                    "Notes": f"{total_workers} workers × 8 hours = {total_available_time} minutes"
-                })
-                results_data.append({
-                    "Category": "Summary",
-                    "Name": "Effective Working Time",
-                    "Time (min)": effective_time,
-                    "Notes": f"Available time minus impacts: {total_available_time} - {impact_time:.2f}"
-                })
-                results_data.append({
-                    "Category": "Summary",
-                    "Name": "Units Completed",
-                    "Time (min)": None,
-                    "Notes": f"{units_completed:.2f} units ({effective_time:.2f} min ÷ {total_time_per_unit:.2f} min/unit)"
-                })
-                results_data.append({
-                    "Category": "Summary",
-                    "Name": "Total Production (LF)",
-                    "Time (min)": None,
-                    "Notes": f"{lf_completed:.2f} linear feet ({units_completed:.2f} units × {unit_length:.2f} lf/unit)"
-                })
-            
-            excel_data["Results"] = pd.DataFrame(results_data)
-            
-            # Write to Excel file
-            with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                for sheet_name, df in excel_data.items():
-                    df.to_excel(writer, sheet_name=sheet_name, index=False)
-                    
-            messagebox.showinfo("Success", f"Data exported to {file_path}")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to export data: {str(e)}")
+            result = self.recalc.result_snapshot(sim)
+        except Exception:
+            result = None  # let the export thread evaluate it and report the error
+        self.export_job = ExportJob(file_path, sim, self.VERSION, result).start()
+        self.export_button.config(state="disabled")
+        self.export_progress["value"] = 0
+        self.export_progress.pack(side=tk.LEFT, padx=2)
+        self.cancel_export_button.pack(side=tk.LEFT, padx=2)
+        self.root.after(self.EXPORT_POLL_MS, self.poll_export)
+
+    def poll_export(self):
+        """Mirror the export thread's progress; report once it finishes."""
+        job = self.export_job
+        if job is None:
+            return
+        self.export_progress["value"] = 100 * job.fraction
+        if not job.done:
+            self.root.after(self.EXPORT_POLL_MS, self.poll_export)
+            return
 
+        self.export_job = None
+        self.export_progress.pack_forget()
+        self.cancel_export_button.pack_forget()
+        self.export_button.config(state="normal")
+        if job.cancelled:
+            self.refresh_status_label.config(text="Export cancelled")
+        elif job.error is not None:
+            messagebox.showerror("Error", f"Failed to export data: {str(job.error)}")
+        else:
+            messagebox.showinfo("Success", f"Data exported to {job.path}")
+
+    def toggle_risk_panel(self):
+        """Show or hide the Monte Carlo panel under the breakdown."""
+        if self.risk_panel is None:
+            from labor_risk_panel import RiskPanel
+            self.risk_panel = RiskPanel(self.output_frame, self.build_simulation)
+        self.risk_panel_shown = not self.risk_panel_shown
+        if self.risk_panel_shown:
+            self.risk_panel.grid(row=7, column=0, columnspan=6, sticky="we", pady=5)
+            self.risk_button.config(text="🎲 Risk Analysis ▾")
+        else:
+            self.risk_panel.grid_remove()
+            self.risk_button.config(text="🎲 Risk Analysis ▸")
+
+    def open_sweep(self):
+        """Open the parameter sweep window on the current simulation."""
+        if not self.recalc.model.tasks:
+            messagebox.showwarning("Warning", "No tasks to sweep.")
+            return
+        # NumPy and the sweep window are only loaded when asked for
+        from labor_sweep_dialog import SweepDialog
+        SweepDialog(self.root, self.build_simulation, self.compute)
+
+    def open_crew_optimizer(self):
+        """Open the crew assignment optimizer on the current simulation."""
+        if not self.recalc.model.tasks or not self.recalc.model.workers:
+            messagebox.showwarning("Warning", "Add workers and tasks before optimizing the crew.")
+            return
+        from labor_crew_dialog import CrewDialog
+        CrewDialog(self.root, self.build_simulation, self.apply_crew_plan, self.compute)
+
+    def open_schedule(self):
+        """Open the multi-day schedule on the current simulation."""
+        if not self.recalc.model.tasks or not self.recalc.model.workers:
+            messagebox.showwarning("Warning", "Add workers and tasks before scheduling.")
+            return
+        from labor_schedule_dialog import ScheduleDialog
+        ScheduleDialog(self.root, self.build_simulation, self.compute)
+
+    def open_library(self):
+        """Open the task and crew template library."""
+        from labor_library import TemplateLibrary
+        from labor_library_dialog import LibraryDialog
+        try:
+            library = TemplateLibrary()
+        except (sqlite3.Error, OSError) as e:
+            messagebox.showerror("Error", f"Failed to open the template library: {str(e)}")
+            return
+        LibraryDialog(self.root, self.build_simulation, self.insert_tasks, self.insert_workers, library)
+
+    def open_import(self):
+        """Import tasks and crew from a CSV or Excel takeoff."""
+        from labor_import_dialog import ImportDialog
+        ImportDialog(self.root, lambda: [worker.name for worker in self.recalc.model.workers],
+                     self.import_takeoff, self.compute)
+
+    def open_project(self):
+        """Open the project roll-up window (many simulation files, one estimate)."""
+        from labor_project_dialog import ProjectDialog
+        ProjectDialog(self.root, self.compute)
+
+    def open_profiler(self):
+        from labor_profile_dialog import ProfileDialog
+        ProfileDialog(self.root)
+
+    def apply_crew_plan(self, assignments):
+        """Replace every task's crew with the optimizer's plan."""
+        model = self.recalc.model
+        if len(assignments) != len(model.tasks) or \
+                any(w >= len(model.workers) for workers in assignments for w in workers):
+            messagebox.showerror("Error", "Tasks or workers changed since the crew was optimized.")
+            return
+        with self.refresh.suspended():
+            for t, workers in enumerate(assignments):
+                for w in range(len(model.workers)):
+                    self.recalc.set_assignment(t, w, w in workers)
+            self.refresh.request()
+        self.task_grid.refresh()
+
+    def cancel_export(self):
+        if self.export_job is not None:
+            self.export_job.cancel()
+
+    @timed("restart")
     def restart(self):
+        """Clear the active tab."""
+        self.current_file_path = None
+        self.recalc.reset(Simulation())
+        self.clear_widgets()
+        self.task_grid.refresh()
+        self.update_tabs()
+
+    def clear_widgets(self):
+        """Remove the worker and impact rows and blank the output; the model is untouched."""
         self.workers.clear()
-        self.tasks.clear()
         self.impact_entries.clear()
-        self.current_file_path = None
         for widget in self.worker_frame.winfo_children():
             widget.destroy()
-        for widget in self.task_frame.winfo_children():
-            widget.destroy()
         for widget in self.impact_frame.winfo_children():
             widget.destroy()
         self.sim_name_entry.delete(0, tk.END)
@@ -902,6 +946,9 @@ class LaborSimulatorApp:
         self.height_var.set(0)
         self.target_var.set(0)
         self.time_display_unit.set("minutes")
+        self.learning_model_var.set("None")
+        self.learning_rate_var.set(90)
+        self.learning_plateau_var.set(0)
         self.output_type_var.set("Square-foot")
         self.material_unit_display.config(state="normal")
         self.material_unit_display.delete(0, tk.END)
@@ -909,12 +956,186 @@ class LaborSimulatorApp:
         self.final_output_label.config(text="Total Time: ???")
         self.breakdown_label.config(text="")
         ttk.Button(self.impact_frame, text="➕ Add Impact", command=self.add_impact).grid(row=0, column=0)
-        self.update_output()
+        self.refresh.request()
+
+    def save_session_cache(self):
+        """Remember the current simulation so --restore-session can reopen it."""
+        try:
+            save_session(self.build_simulation().to_dict(), self.current_file_path)
+        except Exception:
+            pass  # the cache is a convenience; never block closing the window
+
+    def restore_session(self):
+        """Reopen the simulation cached by the last session, if any."""
+        cached = load_session()
+        if cached is None:
+            return False
+        simulation_data, file_path = cached
+        try:
+            self.load_simulation_data(simulation_data, file_path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to restore last session: {str(e)}")
+            return False
+        return True
+
+    def update_name(self, event=None):
+        self.recalc.set_name(self.sim_name_entry.get())
+        if self.tab_pages:
+            self.tab_bar.tab(self.tab_pages[self.workspace.active], text=self.workspace.current.title)
+
+    def start_autosave(self):
+        """Journal every edit of every open tab from now on so a crash loses nothing."""
+        try:
+            self.autosave_session = claim_session(self.autosave_dir)
+        except OSError as e:
+            messagebox.showwarning("Autosave", f"Autosave is off: {str(e)}")
+            return
+        self.autosave = True
+        for document in self.workspace.documents:
+            self.autosave_document(document)
+        # Recovered tabs are journaled again above, so their old autosaves can go now
+        for directory in self.autosave_leftovers:
+            discard(directory)
+        self.autosave_leftovers = []
+        self.root.after(self.AUTOSAVE_COMPACT_MS, self.compact_autosave)
+
+    def autosave_document(self, document):
+        """Give document a journal of its own, so other tabs never write over it."""
+        self.autosave_documents += 1
+        directory = document_directory(self.autosave_documents, self.autosave_session[0])
+        journal = ChangeJournal(directory, get_file_path=lambda: document.file_path)
+        journal.start(document.model.to_dict())
+        document.evaluator.journal = journal
+
+    def stop_autosave(self, remove=False):
+        """
+        Detach every journal and give up the session; remove=True also
+        deletes their files (a clean exit), else the next start can recover them.
+        """
+        self.autosave = False
+        for document in self.workspace.documents:
+            journal, document.evaluator.journal = document.evaluator.journal, None
+            if journal is None:
+                continue
+            if remove:
+                journal.discard()
+            else:
+                journal.close()
+        if self.autosave_session is not None:
+            release_session(*self.autosave_session)
+            self.autosave_session = None
+
+    def compact_autosave(self):
+        """Fold each edited tab's journal into a fresh snapshot."""
+        if not self.autosave:
+            return
+        for document in self.workspace.documents:
+            journal = document.evaluator.journal
+            if journal is not None and journal.pending:
+                journal.compact(document.model.to_dict())
+            if journal is not None and journal.error is not None:
+                self.stop_autosave()
+                messagebox.showwarning("Autosave", f"Autosave stopped: {str(journal.error)}")
+                return
+        self.root.after(self.AUTOSAVE_COMPACT_MS, self.compact_autosave)
 
-def main():
+    def recover_autosave(self):
+        """
+        Offer the autosaves of windows that crashed; True if any was loaded.
+        Those recovered or declined are removed once start_autosave() has
+        journaled the tabs; any that fail to load are kept for the next start.
+        """
+        directories = recoverable(self.autosave_dir)
+        if not directories:
+            return False
+        changes = f"the unsaved changes of its {len(directories)} tabs" if len(directories) > 1 \
+            else "its unsaved changes"
+        if not messagebox.askyesno("Recover", f"The last session did not close normally. Recover {changes}?"):
+            self.autosave_leftovers = directories
+            return False
+        failed = []
+        for directory in directories:
+            try:
+                recovered = recover(directory)
+                if recovered is None:
+                    raise ValueError(f"{directory} cannot be read")
+                sim, file_path, _ = recovered
+                self.load_simulation_data(sim, file_path)
+            except Exception as e:
+                failed.append(str(e))
+                continue
+            self.autosave_leftovers.append(directory)
+        if failed:
+            messagebox.showerror("Error", "Failed to recover the last session: " + "; ".join(failed) +
+                                 "\nIts autosave is kept and will be offered again next time.")
+        return bool(self.autosave_leftovers)
+
+    def on_close(self):
+        self.save_session_cache()
+        self.stop_autosave(remove=True)
+        self.cancel_export()
+        self.compute.shutdown()
+        if self.risk_panel is not None:
+            self.risk_panel.cancel()
+        # Counters read the widgets, so write the LABOR_PROFILE dump while they exist
+        profiler.dump_at_exit()
+        self.root.destroy()
+
+def report_startup(marks):
+    """Print the --profile-startup timing report."""
+    print("Startup profile:")
+    previous = marks[0][1]
+    for label, stamp in marks[1:]:
+        print(f"  {label:<22} {(stamp - previous) * 1000:8.1f} ms")
+        previous = stamp
+    print(f"  {'total':<22} {(marks[-1][1] - marks[0][1]) * 1000:8.1f} ms")
+    heavy = [name for name in ("numpy", "pandas", "openpyxl") if name in sys.modules]
+    print(f"  heavy modules loaded: {', '.join(heavy) or 'none'}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Construction Labor Simulator")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print a startup timing report once the window is up")
+    parser.add_argument("--restore-session", action="store_true",
+                        help="reopen the simulation from the last session")
+    parser.add_argument("--batch", nargs="+", metavar="PATH",
+                        help="evaluate simulation files, directories or globs without opening the window")
+    parser.add_argument("--output", default="totals.csv",
+                        help="with --batch: CSV or .xlsx file of per-file totals")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="with --batch: worker processes (default: one per core)")
+    parser.add_argument("--serve", action="store_true",
+                        help="run the local HTTP/JSON estimation service instead of the window")
+    parser.add_argument("--port", type=int, default=None,
+                        help="with --serve: port to listen on (default: 8765)")
+    args = parser.parse_args(argv)
+
+    if args.batch:
+        from labor_batch import run_batch
+        return run_batch(args.batch, args.output, args.jobs)
+    if args.serve:
+        from labor_service import DEFAULT_PORT, run_service
+        return run_service(port=args.port or DEFAULT_PORT)
+
+    marks = [("process start", _PROCESS_START), ("imports", _IMPORTS_DONE), ("arguments", time.perf_counter())]
     root = tk.Tk()
+    marks.append(("Tk root", time.perf_counter()))
     app = LaborSimulatorApp(root)
+    root.protocol("WM_DELETE_WINDOW", app.on_close)
+    marks.append(("build window", time.perf_counter()))
+
+    def first_idle():
+        root.update_idletasks()
+        marks.append(("first draw", time.perf_counter()))
+        if not app.recover_autosave() and args.restore_session:
+            app.restore_session()
+            marks.append(("restore session", time.perf_counter()))
+        app.start_autosave()
+        if args.profile_startup:
+            report_startup(marks)
+
+    root.after_idle(first_idle)
     root.mainloop()
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+Headless batch evaluation of saved simulations.
+
+Loads every simulation JSON file (the save_simulation format) matched by a
+set of directories and glob patterns, skipping project files, evaluates them in a process pool with
+the same incremental math the window's output panel uses, and writes one
+row of totals per file to a CSV or xlsx file:
+
+    python ProductionBuilder.py --batch "jobs/*.json" --output totals.csv
+    python labor_batch.py jobs/ archive/2024 --output totals.xlsx --jobs 8
+"""
+import argparse
+import csv
+import glob
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from labor_binary import BINARY_EXTENSION, is_binary_file, load_binary
+from labor_model import Simulation
+from labor_project import PROJECT_EXTENSION
+from labor_recalc import IncrementalEvaluator
+
+COLUMNS = [
+    "File", "Simulation Name", "Output Type", "Workers", "Tasks", "Impacts",
+    "Time per Unit (min)", "Impact Time (min)", "Units Needed",
+    "Total Time (min)", "Total Time (hours)", "Units Completed", "Production", "Error",
+]
+
+# A JSON file with none of these is something else, not an empty simulation
+SIMULATION_KEYS = ("simulation_name", "workers", "tasks", "impacts", "output_settings")
+
+
+def expand_paths(patterns):
+    """
+    Directories become their *.json and *.lsb files; anything else is a glob
+    pattern. Project files (*.project.json) are left out either way.
+    """
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(pattern, "*.json")) + \
+                glob.glob(os.path.join(pattern, "*" + BINARY_EXTENSION))
+        else:
+            matches = glob.glob(pattern)
+        for path in sorted(matches):
+            key = os.path.abspath(path)
+            if key not in seen and os.path.isfile(path) and not path.endswith(PROJECT_EXTENSION):
+                seen.add(key)
+                paths.append(path)
+    return paths
+
+
+def load_file(path):
+    """load_simulation_file, refusing JSON that is not a saved simulation."""
+    if is_binary_file(path):
+        return load_binary(path)
+    with open(path, "r") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not any(key in data for key in SIMULATION_KEYS):
+        raise ValueError("not a saved simulation (no workers, tasks, impacts or settings)")
+    return Simulation.from_dict(data)
+
+
+def evaluate_file(path):
+    """Totals row for one simulation file; errors are reported, not raised."""
+    row = dict.fromkeys(COLUMNS)
+    row["File"] = path
+    try:
+        sim = load_file(path)
+        result = IncrementalEvaluator(sim).result()
+    except Exception as e:
+        row["Error"] = f"{type(e).__name__}: {e}"
+        return row
+
+    row.update({
+        "Simulation Name": sim.simulation_name,
+        "Output Type": result.mode,
+        "Workers": result.total_workers,
+        "Tasks": len(sim.tasks),
+        "Impacts": len(sim.impacts),
+        "Time per Unit (min)": result.time_per_unit,
+        "Impact Time (min)": result.impact_time,
+    })
+    if result.mode in ("Square-foot", "Linear-Foot"):
+        row["Units Needed"] = result.units_needed
+        row["Total Time (min)"] = result.total_time
+        row["Total Time (hours)"] = result.total_time / 60
+    else:
+        row["Units Completed"] = result.units_completed
+        row["Production"] = result.production
+    if not result.valid:
+        row["Error"] = "Invalid input values"
+    return row
+
+
+def evaluate_files(paths, jobs=None):
+    """
+    Evaluate paths in a process pool, returning rows in input order.
+
+    Files are handed out in chunks so each worker process pays the pickling
+    and scheduling overhead once per chunk rather than once per file.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(paths) < 2:
+        return [evaluate_file(path) for path in paths]
+    chunksize = max(1, math.ceil(len(paths) / (jobs * 4)))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(evaluate_file, paths, chunksize=chunksize))
+
+
+def write_totals(rows, output_path):
+    """Write totals rows as xlsx if output_path ends in .xlsx, CSV otherwise."""
+    if output_path.lower().endswith(".xlsx"):
+        from openpyxl import Workbook
+
+        from labor_export import cell_value
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Totals")
+        sheet.append(COLUMNS)
+        for row in rows:
+            sheet.append([cell_value(row[c]) for c in COLUMNS])
+        workbook.save(output_path)
+    else:
+        with open(output_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate saved simulations without the GUI")
+    parser.add_argument("paths", nargs="+", help="simulation JSON files, directories or glob patterns")
+    parser.add_argument("-o", "--output", default="totals.csv", help="CSV or .xlsx file to write")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="worker processes (default: one per core)")
+    args = parser.parse_args(argv)
+    return run_batch(args.paths, args.output, args.jobs)
+
+
+def run_batch(patterns, output_path, jobs=None):
+    """Evaluate everything matched by patterns and write output_path; returns an exit code."""
+    paths = expand_paths(patterns)
+    if not paths:
+        print("No simulation files found.", file=sys.stderr)
+        return 1
+    start = time.perf_counter()
+    rows = evaluate_files(paths, jobs)
+    write_totals(rows, output_path)
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for row in rows if row["Error"])
+    print(f"Evaluated {len(rows)} simulations in {elapsed:.2f} s "
+          f"({failed} with errors) -> {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+"""
+Benchmark suite for the GUI's hot paths on synthetic simulations.
+
+For each size (tasks x workers x impacts) a simulation is generated in the
+save_simulation JSON schema and the window is driven through:
+
+    load_simulation    file dialog to a fully built window
+    update_output      a full recompute of every task and the totals
+    efficiency_edit    one worker efficiency change, through its trace
+    export_to_excel    the background export, start to finish
+    restart            clearing the window
+
+Each metric is the median of --repeat runs. Results can be saved as a
+baseline and later runs compared against it; the exit status is 1 when a
+metric is slower than its baseline by more than --threshold (and by more
+than --min-delta seconds, so timer noise on tiny metrics is ignored).
+
+Headless machines: --display auto uses $DISPLAY, else starts Xvfb if it is
+installed, else falls back to labor_tkstub (no rendering cost measured).
+
+    python labor_bench.py --size 500x20x4 --size 2000x40x6 --save-baseline bench.json
+    python labor_bench.py --baseline bench.json --threshold 0.25
+    python labor_bench.py --generate synthetic/ --size 10000x50x8
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+DEFAULT_SIZES = ["100x10x3", "1000x30x5", "5000x40x6"]
+METRICS = ["load_simulation", "update_output", "efficiency_edit", "export_to_excel", "restart"]
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_MIN_DELTA = 0.005  # seconds
+XVFB_TIMEOUT = 5.0
+
+
+def parse_size(text):
+    """'500x20x4' -> (500, 20, 4); the impact count may be left out."""
+    parts = [int(p) for p in text.lower().split("x")]
+    if len(parts) == 2:
+        parts.append(0)
+    if len(parts) != 3 or min(parts) < 0:
+        raise argparse.ArgumentTypeError(f"expected TASKSxWORKERSxIMPACTS, got '{text}'")
+    return tuple(parts)
+
+
+def generate_simulation(tasks, workers, impacts=0, seed=0, assign_fraction=0.3):
+    """A random simulation in the save_simulation JSON schema."""
+    rng = random.Random(seed)
+    units = ["unit", "sheet", "lf", "sqft", "each"]
+    return {
+        "simulation_name": f"synthetic {tasks}x{workers}x{impacts}",
+        "workers": [{"name": f"Worker {w + 1}", "efficiency": round(rng.uniform(0.6, 1.4), 2)}
+                    for w in range(workers)],
+        "tasks": [{
+            "name": f"Task {t + 1}",
+            "base_time": round(rng.uniform(0.5, 30), 2),
+            "time_unit": rng.choice(["Minutes", "Minutes", "Hours"]),
+            "material_unit": rng.choice(units),
+            "assigned_workers": sorted(w for w in range(workers) if rng.random() < assign_fraction)
+            or ([rng.randrange(workers)] if workers else []),
+        } for t in range(tasks)],
+        "impacts": [{"name": f"Impact {i + 1}", "time": round(rng.uniform(5, 60), 1)} for i in range(impacts)],
+        "output_settings": {
+            "output_type": "Square-foot",
+            "length": 4.0,
+            "height": 8.0,
+            "target": 1000.0,
+            "time_display_unit": "minutes",
+        },
+        "version": "V1.0",
+    }
+
+
+def size_label(size):
+    return "x".join(str(n) for n in size)
+
+
+# -- display ---------------------------------------------------------------
+
+def start_xvfb():
+    """Start Xvfb on a free display and point $DISPLAY at it; returns the process or None."""
+    if shutil.which("Xvfb") is None:
+        return None
+    for number in range(99, 120):
+        if os.path.exists(f"/tmp/.X11-unix/X{number}") or os.path.exists(f"/tmp/.X{number}-lock"):
+            continue
+        process = subprocess.Popen(["Xvfb", f":{number}", "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + XVFB_TIMEOUT
+        while time.monotonic() < deadline:
+            if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+                os.environ["DISPLAY"] = f":{number}"
+                return process
+            if process.poll() is not None:
+                break
+            time.sleep(0.05)
+        process.kill()
+    return None
+
+
+def setup_display(mode):
+    """Returns (description, Xvfb process or None); must run before tkinter is imported."""
+    if mode in ("auto", "current") and os.environ.get("DISPLAY"):
+        return f"display {os.environ['DISPLAY']}", None
+    if mode in ("auto", "xvfb"):
+        process = start_xvfb()
+        if process is not None:
+            return f"Xvfb {os.environ['DISPLAY']}", process
+        if mode == "xvfb":
+            raise SystemExit("Xvfb is not available")
+    if mode == "current":
+        raise SystemExit("$DISPLAY is not set")
+    import labor_tkstub
+    labor_tkstub.install()
+    return "stub Tk (no rendering)", None
+
+
+# -- measurements ----------------------------------------------------------
+
+class Bench:
+    """Drives one LaborSimulatorApp; dialogs are answered programmatically."""
+
+    def __init__(self, workdir):
+        import tkinter as tk
+        from tkinter import filedialog, messagebox
+        import ProductionBuilder
+
+        self.workdir = workdir
+        self.answers = {"open": "", "save": ""}
+        filedialog.askopenfilename = lambda **options: self.answers["open"]
+        filedialog.asksaveasfilename = lambda **options: self.answers["save"]
+        for name in ("showinfo", "showwarning", "showerror"):
+            setattr(messagebox, name, self.message)
+        self.messages = []
+        self.root = tk.Tk()
+        self.app = ProductionBuilder.LaborSimulatorApp(self.root)
+
+    def message(self, title, text, *args, **kwargs):
+        self.messages.append((title, text))
+
+    def settle(self):
+        """Let pending refreshes and idle redraws run."""
+        self.app.refresh.flush()
+        self.root.update_idletasks()
+
+    def timed(self, action):
+        start = time.perf_counter()
+        action()
+        self.settle()
+        return time.perf_counter() - start
+
+    def load(self, path):
+        self.answers["open"] = path
+        return self.timed(self.app.load_simulation)
+
+    def update_output(self):
+        self.app.recalc.invalidate_all()
+        return self.timed(self.app.update_output)
+
+    def efficiency_edit(self, repeat):
+        var = self.app.workers[0]["efficiency_var"]
+        return self.timed(lambda: var.set(round(0.9 + 0.01 * (repeat % 10), 2)))
+
+    def export(self, repeat):
+        path = os.path.join(self.workdir, f"export{repeat}.xlsx")
+        self.answers["save"] = path
+
+        def run():
+            self.app.export_to_excel()
+            job = self.app.export_job
+            while job is not None and not job.done:
+                time.sleep(0.002)
+            self.app.poll_export()
+            if job is not None and job.error is not None:
+                raise RuntimeError(job.error)
+
+        return self.timed(run)
+
+    def restart(self):
+        return self.timed(self.app.restart)
+
+    def close(self):
+        self.root.destroy()
+
+
+def run_suite(sizes, repeat=3, metrics=METRICS, progress=print):
+    """{"TxWxI/metric": median seconds or None if it could not run}."""
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="labor-bench-") as workdir:
+        bench = Bench(workdir)
+        try:
+            # One untimed pass so first-use imports (NumPy, openpyxl) are not measured
+            warmup = os.path.join(workdir, "warmup.json")
+            with open(warmup, "w") as f:
+                json.dump(generate_simulation(10, 3, 1), f)
+            bench.load(warmup)
+            if "export_to_excel" in metrics:
+                try:
+                    bench.export("warmup")
+                except Exception:
+                    pass
+            bench.restart()
+
+            for size in sizes:
+                label = size_label(size)
+                path = os.path.join(workdir, f"{label}.json")
+                with open(path, "w") as f:
+                    json.dump(generate_simulation(*size), f)
+                samples = {metric: [] for metric in metrics}
+                skipped = {}
+                for r in range(repeat):
+                    load_time = bench.load(path)
+                    if "load_simulation" in metrics:
+                        samples["load_simulation"].append(load_time)
+                    if "update_output" in metrics:
+                        samples["update_output"].append(bench.update_output())
+                    if "efficiency_edit" in metrics and size[1]:
+                        samples["efficiency_edit"].append(bench.efficiency_edit(r))
+                    if "export_to_excel" in metrics and "export_to_excel" not in skipped:
+                        try:
+                            samples["export_to_excel"].append(bench.export(r))
+                        except Exception as e:
+                            skipped["export_to_excel"] = str(e)
+                    if "restart" in metrics:
+                        samples["restart"].append(bench.restart())
+                for metric in metrics:
+                    key = f"{label}/{metric}"
+                    results[key] = statistics.median(samples[metric]) if samples[metric] else None
+                    note = f"skipped: {skipped[metric]}" if metric in skipped else ""
+                    value = results[key]
+                    progress(f"{key:<34} {'-' if value is None else f'{value * 1000:10.2f} ms'} {note}")
+        finally:
+            bench.close()
+    return results
+
+
+# -- baselines -------------------------------------------------------------
+
+def environment():
+    return {"python": platform.python_version(), "platform": platform.platform(), "machine": platform.machine()}
+
+
+def save_baseline(path, results, display):
+    with open(path, "w") as f:
+        json.dump({"created": time.strftime("%Y-%m-%d %H:%M:%S"), "display": display,
+                   "environment": environment(), "results": results}, f, indent=4)
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD, min_delta=DEFAULT_MIN_DELTA):
+    """Lines describing every metric that regressed past the threshold."""
+    regressions = []
+    for key, value in results.items():
+        before = baseline.get(key)
+        if value is None or before is None:
+            continue
+        if value > before * (1 + threshold) and value - before > min_delta:
+            regressions.append(f"{key}: {before * 1000:.2f} ms -> {value * 1000:.2f} ms "
+                               f"(+{(value / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Construction Labor Simulator")
+    parser.add_argument("--size", action="append", type=parse_size, metavar="TxWxI",
+                        help=f"simulation size, repeatable (default: {' '.join(DEFAULT_SIZES)})")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per metric; the median is reported")
+    parser.add_argument("--metric", action="append", choices=METRICS, help="only these metrics (repeatable)")
+    parser.add_argument("--display", choices=["auto", "current", "xvfb", "stub"], default="auto")
+    parser.add_argument("--output", help="write this run's results as JSON")
+    parser.add_argument("--save-baseline", metavar="PATH", help="store this run as the baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="fail if a metric regressed against this baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown as a fraction (default: 0.25)")
+    parser.add_argument("--min-delta", type=float, default=DEFAULT_MIN_DELTA,
+                        help="ignore slowdowns smaller than this many seconds")
+    parser.add_argument("--generate", metavar="DIR", help="only write the synthetic simulations to DIR")
+    args = parser.parse_args(argv)
+    sizes = args.size or [parse_size(s) for s in DEFAULT_SIZES]
+
+    if args.generate:
+        os.makedirs(args.generate, exist_ok=True)
+        for size in sizes:
+            path = os.path.join(args.generate, f"synthetic_{size_label(size)}.json")
+            with open(path, "w") as f:
+                json.dump(generate_simulation(*size), f, indent=4)
+            print(path)
+        return 0
+
+    display, xvfb = setup_display(args.display)
+    try:
+        print(f"Benchmarking on {display}, median of {args.repeat}")
+        results = run_suite(sizes, args.repeat, args.metric or METRICS)
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"display": display, "environment": environment(), "results": results}, f, indent=4)
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results, display)
+        print(f"Baseline saved to {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline["results"], args.threshold, args.min_delta)
+        if regressions:
+            print(f"{len(regressions)} metrics regressed more than {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
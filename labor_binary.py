@@ -0,0 +1,381 @@
+"""
+Compact binary simulation format (.lsb) with memory-mapped loading.
+
+Layout, little-endian:
+
+    b"LSIMBIN1"                 magic
+    uint32                      header length
+    header                      UTF-8 JSON: name, version, output settings,
+                                counts, unit vocabularies and a section table
+    sections, 8-byte aligned    efficiency      float64[W]
+                                base_time       float64[T]
+                                impact_time     float64[I]
+                                time_unit       uint16[T]   codes into the header's time_units
+                                material_unit   uint16[T]   codes into material_units
+                                assignments     uint8[T * row_bytes], one bit row per task,
+                                                bit w = worker w (AssignmentMatrix order)
+                                name_offsets    uint32[W + T + I + 1]
+                                names           UTF-8, workers then tasks then impacts
+                                override_task, override_worker  uint32[K]
+                                override_efficiency             float64[K]
+                                                per-task efficiencies as (task, worker,
+                                                value) cells; only present if any is set
+
+BinarySimulation maps a file and exposes the numeric columns as memoryviews
+straight over the mapping; nothing is parsed until a column or a name is
+asked for. to_simulation() and to_dict() round-trip to the JSON schema;
+files are always written from a normalized Simulation, so the legacy
+"Man Day" output type and "target_area" key are converted on the way in.
+
+    python labor_binary.py library.json library.lsb    # either direction,
+    python labor_binary.py library.lsb library.json    # by output extension
+
+This module is free of NumPy like labor_model; to_arrays() imports it only
+when called.
+"""
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+from labor_model import Impact, OutputSettings, Simulation, Task, Worker
+
+MAGIC = b"LSIMBIN1"
+BINARY_EXTENSION = ".lsb"
+ALIGNMENT = 8
+
+# (section, array typecode); the order sections are written in
+SECTIONS = [
+    ("efficiency", "d"),
+    ("base_time", "d"),
+    ("impact_time", "d"),
+    ("time_unit", "H"),
+    ("material_unit", "H"),
+    ("assignments", "B"),
+    ("name_offsets", "I"),
+    ("names", "B"),
+    ("override_task", "I"),
+    ("override_worker", "I"),
+    ("override_efficiency", "d"),
+]
+_TYPECODES = dict(SECTIONS)
+# Set bit positions of every byte value, for decoding assignment rows
+_BYTE_BITS = [tuple(b for b in range(8) if value >> b & 1) for value in range(256)]
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def is_binary_file(file_path):
+    """True if file_path starts with the .lsb magic bytes."""
+    with open(file_path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def _little_endian_bytes(values):
+    if not _LITTLE_ENDIAN and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def encode(sim):
+    """The .lsb bytes of a Simulation."""
+    worker_count, task_count = len(sim.workers), len(sim.tasks)
+    row_bytes = (worker_count + 7) // 8
+
+    time_units, material_units = {}, {}
+    assignments = bytearray()
+    for task in sim.tasks:
+        time_units.setdefault(task.time_unit, len(time_units))
+        material_units.setdefault(task.material_unit, len(material_units))
+        bits = 0
+        for w in task.assigned_workers:
+            if 0 <= w < worker_count:
+                bits |= 1 << w
+        assignments += bits.to_bytes(row_bytes, "little")
+
+    names = bytearray()
+    offsets = array("I", [0])
+    for item in (*sim.workers, *sim.tasks, *sim.impacts):
+        names += str(item.name).encode("utf-8")
+        offsets.append(len(names))
+
+    columns = {
+        "efficiency": array("d", [float(w.efficiency) for w in sim.workers]),
+        "base_time": array("d", [float(t.base_time) for t in sim.tasks]),
+        "impact_time": array("d", [float(i.time) for i in sim.impacts]),
+        "time_unit": array("H", [time_units[t.time_unit] for t in sim.tasks]),
+        "material_unit": array("H", [material_units[t.material_unit] for t in sim.tasks]),
+        "assignments": bytes(assignments),
+        "name_offsets": offsets,
+        "names": bytes(names),
+    }
+    overrides = [(t, w, float(e)) for t, task in enumerate(sim.tasks)
+                 for w, e in sorted(task.efficiency_overrides.items()) if 0 <= w < worker_count]
+    if overrides:
+        tasks, workers, values = zip(*overrides)
+        columns["override_task"] = array("I", tasks)
+        columns["override_worker"] = array("I", workers)
+        columns["override_efficiency"] = array("d", values)
+    payloads = [(name, column if isinstance(column, bytes) else _little_endian_bytes(column))
+                for name, column in columns.items()]
+
+    header = {
+        "simulation_name": sim.simulation_name,
+        "version": sim.version,
+        "output_settings": sim.output_settings.to_dict(),
+        "workers": worker_count,
+        "tasks": task_count,
+        "impacts": len(sim.impacts),
+        "row_bytes": row_bytes,
+        "time_units": list(time_units),
+        "material_units": list(material_units),
+    }
+    # Section offsets depend on the header length, which depends on the
+    # offsets; lay out with placeholders until the length stops changing
+    header_length = 0
+    while True:
+        position = _align(len(MAGIC) + 4 + header_length)
+        table = {}
+        for name, payload in payloads:
+            table[name] = [position, len(payload)]
+            position = _align(position + len(payload))
+        header["sections"] = table
+        header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        if len(header_bytes) == header_length:
+            break
+        header_length = len(header_bytes)
+
+    out = bytearray(MAGIC)
+    out += struct.pack("<I", header_length)
+    out += header_bytes
+    for name, payload in payloads:
+        out += bytes(table[name][0] - len(out))
+        out += payload
+    return bytes(out)
+
+
+def _align(position):
+    return -(-position // ALIGNMENT) * ALIGNMENT
+
+
+def save_binary(sim, file_path):
+    """Write sim to file_path in the .lsb format."""
+    data = encode(sim)
+    with open(file_path, "wb") as f:
+        f.write(data)
+
+
+class BinarySimulation:
+    """
+    Read-only view of an .lsb buffer (bytes, or an mmap via open()).
+
+    Column properties are memoryviews over the buffer; they stay valid only
+    while the view is open, so copy what must outlive close().
+    """
+
+    def __init__(self, buffer):
+        self._mmap = buffer if isinstance(buffer, mmap.mmap) else None
+        self._buffer = memoryview(buffer)
+        self._views = {}
+        try:
+            if self._buffer[:len(MAGIC)] != MAGIC:
+                raise ValueError("Not a binary simulation file")
+            (header_length,) = struct.unpack_from("<I", self._buffer, len(MAGIC))
+            start = len(MAGIC) + 4
+            self.header = json.loads(bytes(self._buffer[start:start + header_length]).decode("utf-8"))
+        except Exception:
+            # Let open() close the mapping
+            self._buffer.release()
+            raise
+        self.worker_count = self.header["workers"]
+        self.task_count = self.header["tasks"]
+        self.impact_count = self.header["impacts"]
+        self.row_bytes = self.header["row_bytes"]
+
+    @classmethod
+    def open(cls, file_path):
+        """Memory-map file_path; use as a context manager or call close()."""
+        with open(file_path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mapped)
+        except Exception:
+            mapped.close()
+            raise
+
+    def close(self):
+        for view in self._views.values():
+            view.release()
+        self._views.clear()
+        self._buffer.release()
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- columns -----------------------------------------------------------
+
+    def section(self, name):
+        """Column name as a typed memoryview over the buffer (zero-copy)."""
+        if name not in self._views:
+            offset, length = self.header["sections"][name]
+            raw = self._buffer[offset:offset + length]
+            typecode = _TYPECODES[name]
+            if typecode == "B":
+                view = raw
+            elif _LITTLE_ENDIAN:
+                view = raw.cast(typecode)
+            else:
+                values = array(typecode, raw)
+                values.byteswap()
+                view = memoryview(values)
+            self._views[name] = view
+        return self._views[name]
+
+    @property
+    def efficiencies(self):
+        return self.section("efficiency")
+
+    @property
+    def base_times(self):
+        return self.section("base_time")
+
+    @property
+    def impact_times(self):
+        return self.section("impact_time")
+
+    def assignment_row(self, t):
+        """Task t's crew as an AssignmentMatrix-style int bitset."""
+        start = t * self.row_bytes
+        return int.from_bytes(self.section("assignments")[start:start + self.row_bytes], "little")
+
+    def assigned_workers(self, t):
+        start = t * self.row_bytes
+        row = self.section("assignments")[start:start + self.row_bytes]
+        return [8 * k + b for k, value in enumerate(row) if value for b in _BYTE_BITS[value]]
+
+    def efficiency_overrides(self):
+        """[(task, worker, efficiency)] of the per-task efficiencies."""
+        if "override_efficiency" not in self.header["sections"]:
+            return []
+        return list(zip(self.section("override_task"), self.section("override_worker"),
+                        self.section("override_efficiency")))
+
+    def names(self):
+        """All names: workers, then tasks, then impacts."""
+        offsets = self.section("name_offsets")
+        blob = bytes(self.section("names"))
+        return [blob[offsets[k]:offsets[k + 1]].decode("utf-8") for k in range(len(offsets) - 1)]
+
+    # -- conversions -------------------------------------------------------
+
+    def to_simulation(self):
+        """Copy everything into a Simulation (safe to use after close())."""
+        names = self.names()
+        worker_names = names[:self.worker_count]
+        task_names = names[self.worker_count:self.worker_count + self.task_count]
+        impact_names = names[self.worker_count + self.task_count:]
+        time_units = self.header["time_units"]
+        material_units = self.header["material_units"]
+        time_codes = self.section("time_unit")
+        material_codes = self.section("material_unit")
+        base_times = self.base_times
+        tasks = [Task(name=task_names[t],
+                      base_time=base_times[t],
+                      time_unit=time_units[time_codes[t]],
+                      material_unit=material_units[material_codes[t]],
+                      assigned_workers=self.assigned_workers(t))
+                 for t in range(self.task_count)]
+        for t, w, efficiency in self.efficiency_overrides():
+            tasks[t].efficiency_overrides[w] = efficiency
+        return Simulation(
+            simulation_name=self.header["simulation_name"],
+            workers=[Worker(name=name, efficiency=efficiency)
+                     for name, efficiency in zip(worker_names, self.efficiencies)],
+            tasks=tasks,
+            impacts=[Impact(name=name, time=time) for name, time in zip(impact_names, self.impact_times)],
+            output_settings=OutputSettings.from_dict(self.header["output_settings"]),
+            version=self.header["version"],
+        )
+
+    def to_dict(self):
+        """The save_simulation JSON schema."""
+        return self.to_simulation().to_dict()
+
+    def to_arrays(self):
+        """
+        SimulationArrays for labor_engine. Efficiencies and impacts are NumPy
+        views over the buffer, so drop them before close(); base minutes and
+        the bool matrix are computed.
+        """
+        import numpy as np
+        from labor_engine import SimulationArrays
+        from labor_model import unit_factor
+
+        factors = np.array([unit_factor(u) for u in self.header["time_units"]] or [1], dtype=float)
+        codes = np.frombuffer(self.section("time_unit"), dtype="<u2")
+        bits = np.frombuffer(self.section("assignments"), dtype=np.uint8)
+        assignments = np.unpackbits(bits.reshape(self.task_count, self.row_bytes),
+                                    axis=1, bitorder="little")[:, :self.worker_count].astype(bool)
+        settings = OutputSettings.from_dict(self.header["output_settings"])
+        override_mask = override_efficiencies = None
+        if "override_efficiency" in self.header["sections"]:
+            cells = (np.frombuffer(self.section("override_task"), dtype="<u4"),
+                     np.frombuffer(self.section("override_worker"), dtype="<u4"))
+            override_mask = np.zeros(assignments.shape, dtype=bool)
+            override_efficiencies = np.zeros(assignments.shape)
+            override_mask[cells] = True
+            override_efficiencies[cells] = np.frombuffer(self.section("override_efficiency"), dtype="<f8")
+        return SimulationArrays(
+            base_minutes=np.frombuffer(self.section("base_time"), dtype="<f8") * factors[codes],
+            efficiencies=np.frombuffer(self.section("efficiency"), dtype="<f8"),
+            assignments=assignments,
+            impact_minutes=np.frombuffer(self.section("impact_time"), dtype="<f8"),
+            length=float(settings.length),
+            height=float(settings.height),
+            target=float(settings.target),
+            output_type=settings.output_type,
+            override_mask=override_mask,
+            override_efficiencies=override_efficiencies,
+            learning_model=settings.learning_model,
+            learning_rate=float(settings.learning_rate),
+            learning_plateau=float(settings.learning_plateau),
+        )
+
+
+def load_binary(file_path):
+    """Read an .lsb file into a Simulation."""
+    with BinarySimulation.open(file_path) as view:
+        return view.to_simulation()
+
+
+def convert(source, destination):
+    """Convert between JSON and .lsb; the destination extension picks the format."""
+    from labor_model import load_simulation_file
+
+    sim = load_simulation_file(source)
+    if destination.lower().endswith(BINARY_EXTENSION):
+        save_binary(sim, destination)
+    else:
+        with open(destination, "w") as f:
+            json.dump(sim.to_dict(), f, indent=4)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert simulations between JSON and the binary format")
+    parser.add_argument("source")
+    parser.add_argument("destination", help=f"*{BINARY_EXTENSION} for binary, anything else for JSON")
+    args = parser.parse_args(argv)
+    convert(args.source, args.destination)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
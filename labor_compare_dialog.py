@@ -0,0 +1,109 @@
+"""
+Compare window: pick two open simulations and see their totals and
+per-task adjusted times side by side, with b - a deltas.
+"""
+import csv
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from labor_workspace import TOTALS, compare
+
+COLUMNS = [("name", "Name", 220), ("unit", "Per", 70), ("a", "A", 100), ("b", "B", 100),
+           ("delta", "Δ (B - A)", 100), ("percent", "Δ %", 70)]
+
+
+def _number(value, digits=2):
+    return "—" if value is None else f"{value:,.{digits}f}"
+
+
+class CompareDialog(tk.Toplevel):
+    """get_workspace() returns the app's Workspace with its edits applied."""
+
+    def __init__(self, master, get_workspace):
+        super().__init__(master)
+        self.title("Compare Simulations")
+        self.get_workspace = get_workspace
+        self.comparison = None
+
+        pick = ttk.Frame(self)
+        pick.grid(row=0, column=0, sticky="w", padx=10, pady=(10, 5))
+        titles = self.tab_titles()
+        ttk.Label(pick, text="A:").pack(side=tk.LEFT)
+        self.a_combo = ttk.Combobox(pick, values=titles, state="readonly", width=28)
+        self.a_combo.pack(side=tk.LEFT, padx=(2, 10))
+        ttk.Label(pick, text="B:").pack(side=tk.LEFT)
+        self.b_combo = ttk.Combobox(pick, values=titles, state="readonly", width=28)
+        self.b_combo.pack(side=tk.LEFT, padx=2)
+        self.a_combo.current(0)
+        self.b_combo.current(min(1, len(titles) - 1))
+        for combo in (self.a_combo, self.b_combo):
+            combo.bind("<<ComboboxSelected>>", lambda e: self.run())
+        ttk.Button(pick, text="🔄 Refresh", command=self.run).pack(side=tk.LEFT, padx=(10, 2))
+        ttk.Button(pick, text="💾 Save CSV", command=self.save_csv).pack(side=tk.LEFT, padx=2)
+
+        totals_frame = ttk.LabelFrame(self, text="Totals")
+        totals_frame.grid(row=1, column=0, sticky="we", padx=10, pady=5)
+        self.totals_table = self.make_table(totals_frame, height=len(TOTALS))
+        tasks_frame = ttk.LabelFrame(self, text="Tasks (adjusted minutes per unit)")
+        tasks_frame.grid(row=2, column=0, sticky="nsew", padx=10, pady=(5, 10))
+        self.tasks_table = self.make_table(tasks_frame, height=14)
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(2, weight=1)
+
+        self.run()
+
+    def tab_titles(self):
+        return [f"{n + 1}: {title}" for n, title in enumerate(self.get_workspace().titles())]
+
+    @staticmethod
+    def make_table(parent, height):
+        table = ttk.Treeview(parent, columns=[key for key, _, _ in COLUMNS], show="headings", height=height)
+        for key, header, width in COLUMNS:
+            table.heading(key, text=header)
+            table.column(key, width=width, anchor="w" if key in ("name", "unit") else "e")
+        scroll = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=table.yview)
+        table.configure(yscrollcommand=scroll.set)
+        table.grid(row=0, column=0, sticky="nsew")
+        scroll.grid(row=0, column=1, sticky="ns")
+        parent.columnconfigure(0, weight=1)
+        parent.rowconfigure(0, weight=1)
+        return table
+
+    def run(self):
+        workspace = self.get_workspace()
+        titles = self.tab_titles()
+        self.a_combo["values"] = self.b_combo["values"] = titles
+        a, b = self.a_combo.current(), self.b_combo.current()
+        if not (0 <= a < len(titles) and 0 <= b < len(titles)):
+            return
+        self.comparison = compare(workspace.documents[a].evaluator, workspace.documents[b].evaluator)
+        self.fill(self.totals_table, self.comparison.totals)
+        self.fill(self.tasks_table, self.comparison.tasks)
+
+    @staticmethod
+    def fill(table, rows):
+        table.delete(*table.get_children())
+        for row in rows:
+            percent = row.percent
+            table.insert("", tk.END, values=(
+                row.name or "Task", row.material_unit, _number(row.a), _number(row.b), _number(row.delta),
+                "—" if percent is None else f"{percent:+.1f}%"))
+
+    def save_csv(self):
+        if self.comparison is None:
+            return
+        file_path = filedialog.asksaveasfilename(
+            parent=self, defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            initialfile="comparison.csv")
+        if not file_path:
+            return
+        try:
+            with open(file_path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["Section", "Name", "Per", "A", "B", "Delta", "Delta %"])
+                for section, rows in (("Total", self.comparison.totals), ("Task", self.comparison.tasks)):
+                    for row in rows:
+                        writer.writerow([section, row.name, row.material_unit, row.a, row.b, row.delta, row.percent])
+        except OSError as e:
+            messagebox.showerror("Compare", f"Failed to save: {str(e)}", parent=self)
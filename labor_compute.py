@@ -0,0 +1,150 @@
+"""
+Background compute service for the Tk window.
+
+Analyses (sweeps, schedules, crew searches) run on a thread pool, or a
+process pool for functions that can be pickled, so the mainloop keeps
+handling typing while they work. Every request has a key; submitting again
+under the same key supersedes the earlier request: it is dropped if it has
+not started, and its result is discarded if it has, so only the latest
+request's result ever reaches the widgets.
+
+Worker threads never touch Tk. Finished requests go on a queue that the Tk
+thread drains with after(), and on_done/on_error run there.
+
+    service = ComputeService(root)
+    service.submit(dialog, simulate_schedule, sim, settings,
+                   on_done=dialog.show, on_error=dialog.show_error)
+    ...
+    service.cancel(dialog)   # e.g. when the dialog closes
+"""
+import os
+import queue
+import threading
+from concurrent.futures import CancelledError, ProcessPoolExecutor, ThreadPoolExecutor
+
+POLL_MS = 30
+
+
+class ComputeRequest:
+    """One submitted computation."""
+
+    def __init__(self, key, on_done, on_error):
+        self.key = key
+        self.on_done = on_done
+        self.on_error = on_error
+        self.cancel_event = threading.Event()
+        self.future = None
+
+    def cancel(self):
+        """Drop the request; a running thread may watch cancel_event to stop early."""
+        self.cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    @property
+    def done(self):
+        return self.future is not None and self.future.done()
+
+
+class ComputeService:
+    """
+    Runs callables off the Tk thread; root is any widget, used for after().
+    processes=True uses a process pool (arguments, results and the function
+    itself must pickle; cancel_event cannot be passed).
+    """
+
+    def __init__(self, root, max_workers=None, processes=False):
+        self.root = root
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.processes = processes
+        self.latest = {}   # key -> the request whose result will be applied
+        self.submitted = 0
+        self.superseded = 0
+        self._executor = None
+        self._finished = queue.Queue()
+        self._poll_after = None
+
+    def executor(self):
+        if self._executor is None:
+            if self.processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="compute")
+        return self._executor
+
+    def submit(self, key, func, *args, on_done=None, on_error=None, pass_cancel=False, **kwargs):
+        """
+        Run func(*args, **kwargs) in the background and call on_done(result)
+        or on_error(exception) on the Tk thread, unless a later submit with
+        the same key (or cancel(key)) supersedes it first. pass_cancel=True
+        hands func the request's cancel_event as a keyword argument.
+        """
+        previous = self.latest.get(key)
+        if previous is not None:
+            previous.cancel()
+            self.superseded += 1
+        request = ComputeRequest(key, on_done, on_error)
+        if pass_cancel:
+            kwargs["cancel_event"] = request.cancel_event
+        self.latest[key] = request
+        request.future = self.executor().submit(func, *args, **kwargs)
+        # Runs on the worker (or immediately); Queue is the only thing it touches
+        request.future.add_done_callback(lambda future: self._finished.put(request))
+        self.submitted += 1
+        self._schedule_poll()
+        return request
+
+    def busy(self, key=None):
+        """True while a request (for key, or any) is waiting for its result."""
+        return key in self.latest if key is not None else bool(self.latest)
+
+    def cancel(self, key=None):
+        """Cancel the request for key, or every request."""
+        keys = [key] if key is not None else list(self.latest)
+        for k in keys:
+            request = self.latest.pop(k, None)
+            if request is not None:
+                request.cancel()
+
+    def shutdown(self):
+        self.cancel()
+        if self._poll_after is not None:
+            self.root.after_cancel(self._poll_after)
+            self._poll_after = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _schedule_poll(self):
+        if self._poll_after is None:
+            self._poll_after = self.root.after(POLL_MS, self.poll)
+
+    def poll(self):
+        """Deliver finished requests that are still the latest for their key."""
+        self._poll_after = None
+        try:
+            while True:
+                try:
+                    request = self._finished.get_nowait()
+                except queue.Empty:
+                    break
+                if request.cancelled or self.latest.get(request.key) is not request:
+                    continue
+                del self.latest[request.key]
+                try:
+                    result = request.future.result()
+                except CancelledError:
+                    continue
+                except Exception as e:
+                    if request.on_error is not None:
+                        request.on_error(e)
+                    continue
+                if request.on_done is not None:
+                    request.on_done(result)
+        finally:
+            if self.latest:
+                self._schedule_poll()
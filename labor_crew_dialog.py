@@ -0,0 +1,132 @@
+"""
+Optimize Crew window: constraint entry, a background search through
+labor_optimize on the app's ComputeService, and Apply to write the plan
+back to the task grid.
+"""
+import copy
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from labor_optimize import CrewConstraints, DEFAULT_TIME_LIMIT, optimize_crew, parse_rules
+from labor_recalc import IncrementalEvaluator
+
+EXAMPLE = """# task[N] min=2 max=4 require=1,3 exclude=5
+# worker[N] max_tasks=3
+"""
+
+
+class CrewDialog(tk.Toplevel):
+    """
+    get_simulation() snapshots the main window; apply_plan(assignments) is
+    called with one worker index list per task when the user applies. The
+    search is submitted to compute, a ComputeService.
+    """
+
+    def __init__(self, master, get_simulation, apply_plan, compute):
+        super().__init__(master)
+        self.title("Optimize Crew")
+        self.get_simulation = get_simulation
+        self.apply_plan = apply_plan
+        self.compute = compute
+        self.plan = None
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        limits = ttk.Frame(self)
+        limits.grid(row=0, column=0, sticky="w", padx=10, pady=(10, 5))
+        ttk.Label(limits, text="Workers per task: min").grid(row=0, column=0, sticky="e")
+        self.min_var = tk.StringVar(value="1")
+        ttk.Entry(limits, textvariable=self.min_var, width=5).grid(row=0, column=1, padx=(2, 8))
+        ttk.Label(limits, text="max").grid(row=0, column=2, sticky="e")
+        self.max_var = tk.StringVar(value="")
+        ttk.Entry(limits, textvariable=self.max_var, width=5).grid(row=0, column=3, padx=(2, 8))
+        ttk.Label(limits, text="Tasks per worker: max").grid(row=0, column=4, sticky="e")
+        self.capacity_var = tk.StringVar(value="")
+        ttk.Entry(limits, textvariable=self.capacity_var, width=5).grid(row=0, column=5, padx=(2, 8))
+        ttk.Label(limits, text="Time limit (s)").grid(row=0, column=6, sticky="e")
+        self.time_limit_var = tk.StringVar(value=f"{DEFAULT_TIME_LIMIT:g}")
+        ttk.Entry(limits, textvariable=self.time_limit_var, width=5).grid(row=0, column=7, padx=2)
+
+        ttk.Label(self, text="Rules:").grid(row=1, column=0, sticky="w", padx=10)
+        self.rules_text = tk.Text(self, width=70, height=6)
+        self.rules_text.grid(row=2, column=0, sticky="we", padx=10)
+        self.rules_text.insert("1.0", EXAMPLE)
+
+        buttons = ttk.Frame(self)
+        buttons.grid(row=3, column=0, sticky="w", padx=10, pady=5)
+        self.optimize_button = ttk.Button(buttons, text="⚙ Optimize", command=self.optimize)
+        self.optimize_button.pack(side=tk.LEFT, padx=(0, 4))
+        self.apply_button = ttk.Button(buttons, text="✔ Apply", command=self.apply, state="disabled")
+        self.apply_button.pack(side=tk.LEFT)
+
+        self.result_label = ttk.Label(self, text="", justify="left")
+        self.result_label.grid(row=4, column=0, sticky="w", padx=10, pady=(0, 10))
+
+    def read_constraints(self, sim):
+        def optional_int(var):
+            text = var.get().strip()
+            return int(text) if text else None
+
+        constraints = CrewConstraints(
+            min_workers=optional_int(self.min_var) or 1,
+            max_workers=optional_int(self.max_var),
+            max_tasks_per_worker=optional_int(self.capacity_var),
+        )
+        return parse_rules(self.rules_text.get("1.0", tk.END), constraints, sim)
+
+    def optimize(self):
+        if self.compute.busy(self):
+            return
+        sim = self.get_simulation()
+        try:
+            constraints = self.read_constraints(sim)
+            time_limit = float(self.time_limit_var.get())
+        except ValueError as e:
+            messagebox.showerror("Optimize Crew", str(e), parent=self)
+            return
+        self.compute.submit(self, optimize_crew, sim, constraints, time_limit,
+                            on_done=lambda plan: self.show_plan(plan, sim), on_error=self.show_error,
+                            pass_cancel=True)
+        self.optimize_button.config(state="disabled")
+        self.apply_button.config(state="disabled")
+        status = "Searching..."
+        if constraints.max_tasks_per_worker is not None or constraints.worker_max_tasks:
+            # The bound ignores capacity; such searches rarely finish before the limit
+            status += " With tasks-per-worker limits, expect the best plan found in the time limit" \
+                      " rather than a proven optimum."
+        self.result_label.config(text=status)
+
+    def show_plan(self, plan, sim):
+        self.optimize_button.config(state="normal")
+        self.plan = plan
+        self.result_label.config(text=self.describe(plan, sim))
+        self.apply_button.config(state="normal")
+
+    def show_error(self, error):
+        self.optimize_button.config(state="normal")
+        self.result_label.config(text="")
+        messagebox.showerror("Optimize Crew", str(error), parent=self)
+
+    def close(self):
+        self.compute.cancel(self)
+        self.destroy()
+
+    def describe(self, plan, sim):
+        """Before/after summary lines for a plan."""
+        before = IncrementalEvaluator(sim).result()
+        after_sim = copy.deepcopy(sim)
+        for task, workers in zip(after_sim.tasks, plan.assignments):
+            task.assigned_workers = list(workers)
+        after = IncrementalEvaluator(after_sim).result()
+        status = "optimal" if plan.optimal else "best found in the time limit, not proven optimal"
+        lines = [
+            f"Time per unit: {before.time_per_unit:.2f} → {after.time_per_unit:.2f} min "
+            f"({status}; {plan.nodes:,} nodes in {plan.elapsed:.2f} s)",
+            f"Before: {before.summary_text() if before.valid else '???'}",
+            f"After:  {after.summary_text() if after.valid else '???'}",
+        ]
+        return "\n".join(lines)
+
+    def apply(self):
+        if self.plan is not None:
+            self.apply_plan(self.plan.assignments)
+            self.apply_button.config(state="disabled")
@@ -0,0 +1,469 @@
+"""
+Headless calculation engine for the Construction Labor Simulator.
+
+The labor math used by the GUI, the Excel export and any scripts, written
+against NumPy arrays so the same code evaluates one scenario or thousands
+of scenarios in a single call. The data model it evaluates lives in
+labor_model and is re-exported here for scripts.
+"""
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+# The data model is re-exported so scripts only need this module
+from labor_model import (
+    HOURS_PER_MAN_DAY, LEARNING_MODELS, OUTPUT_TYPES, AssignmentMatrix, Impact, OutputSettings, Simulation,
+    SimulationResult, Task, TaskResult, Worker, load_simulation_file, simulation_result, unit_factor,
+)
+
+
+@dataclass
+class SimulationArrays:
+    """Column arrays of a simulation, as consumed by evaluate_scenarios."""
+    base_minutes: np.ndarray      # (T,) base time converted to minutes
+    efficiencies: np.ndarray      # (W,)
+    assignments: np.ndarray       # (T, W) bool
+    impact_minutes: np.ndarray    # (I,) per-worker impact minutes
+    length: float = 0.0
+    height: float = 0.0
+    target: float = 0.0
+    output_type: str = "Square-foot"
+    # Per-task efficiencies, None when no task has any: (T, W) bool cells
+    # that replace the worker's efficiency, and (T, W) values for them
+    override_mask: np.ndarray = None
+    override_efficiencies: np.ndarray = None
+    learning_model: str = "None"
+    learning_rate: float = 0.9
+    learning_plateau: float = 0.0
+
+    @classmethod
+    def from_simulation(cls, sim):
+        worker_count = len(sim.workers)
+        assignments = np.zeros((len(sim.tasks), worker_count), dtype=bool)
+        override_mask = override_efficiencies = None
+        for t, task in enumerate(sim.tasks):
+            for w in task.assigned_workers:
+                if 0 <= w < worker_count:
+                    assignments[t, w] = True
+            for w, efficiency in task.efficiency_overrides.items():
+                if 0 <= w < worker_count:
+                    if override_mask is None:
+                        override_mask = np.zeros(assignments.shape, dtype=bool)
+                        override_efficiencies = np.zeros(assignments.shape)
+                    override_mask[t, w] = True
+                    override_efficiencies[t, w] = efficiency
+        settings = sim.output_settings
+        return cls(
+            base_minutes=np.array(
+                [float(t.base_time) * unit_factor(t.time_unit) for t in sim.tasks], dtype=float),
+            efficiencies=np.array([float(w.efficiency) for w in sim.workers], dtype=float),
+            assignments=assignments,
+            impact_minutes=np.array([float(i.time) for i in sim.impacts], dtype=float),
+            length=float(settings.length),
+            height=float(settings.height),
+            target=float(settings.target),
+            output_type=settings.output_type,
+            override_mask=override_mask,
+            override_efficiencies=override_efficiencies,
+            learning_model=settings.learning_model,
+            learning_rate=float(settings.learning_rate),
+            learning_plateau=float(settings.learning_plateau),
+        )
+
+    def overrides(self, rows=None):
+        """
+        task_minutes keyword arguments for the per-task efficiencies of the
+        given task rows (an index or mask; default all), or {} if none are set.
+        """
+        if self.override_mask is None:
+            return {}
+        if rows is None:
+            return {"override_mask": self.override_mask, "override_efficiencies": self.override_efficiencies}
+        return {"override_mask": self.override_mask[rows], "override_efficiencies": self.override_efficiencies[rows]}
+
+    def learning(self):
+        """aggregate_totals keyword arguments for the learning curve, or {} if there is none."""
+        if self.learning_model == "None":
+            return {}
+        return {"learning_model": self.learning_model, "learning_rate": self.learning_rate,
+                "learning_plateau": self.learning_plateau}
+
+    def efficiency_matrix(self, efficiencies=None):
+        """
+        Dense (..., T, W) efficiency of every worker on every task: the
+        per-task value where one is set, else the worker's (efficiencies,
+        default this simulation's, may carry scenario axes).
+        """
+        efficiencies = np.asarray(self.efficiencies if efficiencies is None else efficiencies, dtype=float)
+        shape = efficiencies.shape[:-1] + self.assignments.shape
+        if self.override_mask is None:
+            return np.broadcast_to(efficiencies[..., None, :], shape)
+        return np.where(self.override_mask, self.override_efficiencies, efficiencies[..., None, :])
+
+
+@dataclass
+class ScenarioResult:
+    """Vectorized results; every field broadcasts over the scenario axes."""
+    task_minutes: np.ndarray      # (..., T) adjusted minutes per unit, 0 if unassigned
+    worker_counts: np.ndarray     # (..., T)
+    avg_efficiency: np.ndarray    # (..., T) nan if unassigned
+    time_per_unit: np.ndarray     # (...)
+    impact_time: np.ndarray       # (...)
+    total_workers: np.ndarray     # (...)
+    unit_sqft: np.ndarray         # (...)
+    units_needed: np.ndarray      # (...) Square-foot / Linear-Foot
+    total_time: np.ndarray        # (...) minutes, Square-foot / Linear-Foot
+    available_time: np.ndarray    # (...) minutes, Man Day modes
+    effective_time: np.ndarray    # (...) Man Day modes
+    units_completed: np.ndarray   # (...) Man Day modes
+    production: np.ndarray        # (...) sqft or lf installed, Man Day modes
+    is_man_day: bool = False
+
+    @property
+    def headline(self):
+        """Total time (minutes) for target modes, production for Man Day modes."""
+        return self.production if self.is_man_day else self.total_time
+
+
+def task_minutes(base_minutes, efficiencies, assignments, override_mask=None, override_efficiencies=None):
+    """
+    Adjusted minutes per unit for each task.
+
+    Implements (base_time * unit_factor / avg_eff) * worker_count, which is
+    base_minutes * count**2 / sum(assigned efficiencies). Unassigned tasks
+    contribute zero. All arguments broadcast over leading scenario axes:
+    base_minutes (..., T), efficiencies (..., W), assignments (..., T, W).
+    override_mask and override_efficiencies, (T, W), replace the worker's
+    efficiency on single tasks (see SimulationArrays.overrides) and are the
+    same in every scenario.
+    """
+    base_minutes = np.asarray(base_minutes, dtype=float)
+    efficiencies = np.asarray(efficiencies, dtype=float)
+    mask = np.asarray(assignments, dtype=bool)
+
+    counts = mask.sum(axis=-1)
+    if efficiencies.ndim <= 1 and mask.ndim <= 2:
+        # Single scenario: sum in crew order so averages round exactly as
+        # they always have in the breakdown and the Results sheet.
+        if override_mask is not None:
+            efficiencies = np.where(override_mask, override_efficiencies, efficiencies)
+        eff_sum = np.where(mask, efficiencies, 0.0).sum(axis=-1)
+    else:
+        # Overridden cells do not change between scenarios: total them once
+        # and leave only the worker-efficiency cells to the scenarios.
+        fixed_sum = 0.0
+        if override_mask is not None:
+            override_mask = np.asarray(override_mask, dtype=bool)
+            fixed_sum = np.where(mask & override_mask, override_efficiencies, 0.0).sum(axis=-1)
+            mask = mask & ~override_mask
+
+        # Matrix products instead of a broadcast (..., T, W) temporary. A nan
+        # efficiency (an entry being typed) must only poison the tasks it is
+        # actually assigned to, so nan cells are summed separately.
+        weights = mask.astype(float)
+        missing = np.isnan(efficiencies)
+
+        def assigned_sum(values):
+            if weights.ndim == 2:
+                # Shared assignments: one (..., W) x (W, T) product
+                return np.matmul(values, weights.T)
+            return np.matmul(weights, values[..., None])[..., 0]
+
+        eff_sum = assigned_sum(np.where(missing, 0.0, efficiencies)) + fixed_sum
+        if missing.any():
+            poisoned = assigned_sum(missing.astype(float)) > 0
+            eff_sum = np.where(poisoned, np.nan, eff_sum)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_eff = np.where(counts > 0, eff_sum / np.maximum(counts, 1), np.nan)
+        minutes = np.where(counts > 0, base_minutes * counts / avg_eff, 0.0)
+    return minutes, counts, avg_eff
+
+
+def evaluate_scenarios(base_minutes, efficiencies, assignments, impact_minutes,
+                       length, height, target, output_type, total_workers=None,
+                       override_mask=None, override_efficiencies=None,
+                       learning_model="None", learning_rate=0.9, learning_plateau=0.0):
+    """
+    Evaluate one or many scenarios in a single vectorized pass.
+
+    Inputs may carry any number of leading scenario axes and broadcast
+    against each other, e.g. efficiencies of shape (S, W) against shared
+    (T,) base times and (T, W) assignments. total_workers defaults to the
+    width of the efficiency columns (the whole crew), matching the GUI.
+    Per-task efficiencies (override_*) are shared by all scenarios; the
+    learning_* arguments are those of aggregate_totals.
+    """
+    if output_type not in OUTPUT_TYPES:
+        raise ValueError(f"Unknown output type: {output_type}")
+
+    efficiencies = np.asarray(efficiencies, dtype=float)
+    minutes, counts, avg_eff = task_minutes(base_minutes, efficiencies, assignments,
+                                            override_mask, override_efficiencies)
+    if total_workers is None:
+        total_workers = efficiencies.shape[-1]
+    totals = aggregate_totals(minutes.sum(axis=-1), impact_minutes, total_workers,
+                              length, height, target, output_type,
+                              learning_model, learning_rate, learning_plateau)
+    return ScenarioResult(task_minutes=minutes, worker_counts=counts, avg_efficiency=avg_eff,
+                          is_man_day=output_type.startswith("Man Day"), **totals)
+
+
+LEARNING_EXACT_UNITS = 16  # Crawford units summed term by term before the series takes over
+LEARNING_NEWTON_STEPS = 200
+
+
+def _learning_inputs(model, rate, plateau):
+    """(log2 of the rate, whole plateau unit) after checking them."""
+    if model not in LEARNING_MODELS or model == "None":
+        raise ValueError(f"Unknown learning model: {model}")
+    rate = np.asarray(rate, dtype=float)
+    if not np.all((rate > 0.5) & (rate <= 1)):
+        raise ValueError("Learning rate must be more than 50% and at most 100%")
+    plateau = np.asarray(plateau, dtype=float)
+    if not np.all((plateau >= 0) & np.isfinite(plateau)):
+        raise ValueError("Plateau unit must be 0 or greater")
+    return np.log2(rate), np.floor(plateau)
+
+
+def _crawford_sum(n, b):
+    """
+    1**b + 2**b + ... + n**b for whole n >= 0. The first LEARNING_EXACT_UNITS
+    terms are added up, the rest come from the Euler-Maclaurin series, whose
+    error past unit 16 is below 1e-12 of the sum for b in (-1, 0].
+    """
+    n = np.asarray(n, dtype=float)
+    b = np.asarray(b, dtype=float)
+    k = float(LEARNING_EXACT_UNITS)
+    terms = np.arange(1, LEARNING_EXACT_UNITS + 1) ** b[..., None]
+    prefix = np.concatenate([np.zeros(b.shape + (1,)), np.cumsum(terms, axis=-1)], axis=-1)
+    shape = np.broadcast_shapes(n.shape, b.shape)
+    index = np.clip(np.where(np.isfinite(n), n, 0), 0, k).astype(np.intp)
+    head = np.take_along_axis(np.broadcast_to(prefix, shape + prefix.shape[-1:]),
+                              np.broadcast_to(index, shape)[..., None], axis=-1)[..., 0]
+
+    # Sum of units k+1..m; zero when n <= k
+    m = np.maximum(n, k)
+    log_m, log_k = np.log(m), math.log(k)
+
+    def power(e):
+        # m**(b - e) - k**(b - e), without overflowing for huge m
+        return np.exp((b - e) * log_m) - np.exp((b - e) * log_k)
+
+    tail = (power(-1) / (b + 1) + power(0) / 2 + b * power(1) / 12
+            - b * (b - 1) * (b - 2) * power(3) / 720
+            + b * (b - 1) * (b - 2) * (b - 3) * (b - 4) * power(5) / 30240)
+    return head + np.where(n > k, tail, 0.0)
+
+
+def _cumulative(units, model, b):
+    """Minutes to build the first `units` units without a plateau, per first-unit minute."""
+    units = np.maximum(units, 0.0)
+    whole = np.floor(units)
+    built = whole ** (b + 1) if model == "Wright" else _crawford_sum(whole, b)
+    return built + (units - whole) * _unit(whole + 1, model, b)
+
+
+def _unit(n, model, b):
+    """Minutes of unit n (a whole number >= 1) without a plateau, per first-unit minute."""
+    n = np.asarray(n, dtype=float)
+    if model == "Wright":
+        # n**c - (n-1)**c without the cancellation for large n
+        c = b + 1
+        with np.errstate(divide="ignore"):
+            return -(n ** c) * np.expm1(c * np.log1p(-1 / n))
+    return n ** b
+
+
+def learning_minutes(units, model, rate, plateau=0.0):
+    """
+    Minutes to build the first units units on a learning curve, per minute
+    of first-unit time, in closed form. A fractional unit is the matching
+    share of the next one. From the plateau unit on (when it is 1 or more)
+    every unit takes as long as the plateau unit did.
+    """
+    b, plateau = _learning_inputs(model, rate, plateau)
+    units = np.asarray(units, dtype=float)
+    flat = plateau >= 1
+    minutes = _cumulative(np.where(flat, np.minimum(units, plateau), units), model, b)
+    if not np.any(flat):
+        return minutes
+    extra = np.maximum(units - plateau, 0.0) * _unit(np.maximum(plateau, 1), model, b)
+    return np.where(flat, minutes + extra, minutes)
+
+
+def learning_units(minutes, model, rate, plateau=0.0):
+    """
+    Units built in minutes (per minute of first-unit time) on a learning
+    curve: the inverse of learning_minutes. Wright inverts in closed form.
+    The Crawford total is concave and piecewise linear in units, so Newton
+    steps from below never overshoot and land on the exact segment within
+    a few steps, all scenarios at once.
+    """
+    b, plateau = _learning_inputs(model, rate, plateau)
+    minutes = np.asarray(minutes, dtype=float)
+    target = np.maximum(minutes, 0.0)
+    if model == "Wright":
+        # Whole units from the cumulative average, then a share of the next one
+        whole = np.floor(target ** (1 / (b + 1)))
+        units = whole + (target - whole ** (b + 1)) / _unit(whole + 1, model, b)
+    else:
+        units = target  # exact up to one unit, and never past the answer
+        for _ in range(LEARNING_NEWTON_STEPS):
+            step = (target - _cumulative(units, model, b)) / (np.floor(units) + 1) ** b
+            units = units + np.maximum(step, 0.0)
+            if not np.any(step > units * 1e-15):
+                break
+
+    flat = plateau >= 1
+    if np.any(flat):
+        first = np.maximum(plateau, 1)
+        at_plateau = _cumulative(first, model, b)
+        past = flat & (target > at_plateau)
+        units = np.where(past, first + (target - at_plateau) / _unit(first, model, b), units)
+    # No time left means no units, at the first unit's pace as without a curve
+    return np.where(minutes > 0, units, minutes)
+
+
+def learning_curve(time_per_unit, units, model, rate, plateau=0.0):
+    """
+    [(unit, minutes of that unit, cumulative minutes)] at units 1, 2, 4, 8,
+    ..., the plateau unit and the last unit, for a first unit of
+    time_per_unit minutes: the per-unit curve of the Results sheet.
+    """
+    b, plateau = _learning_inputs(model, rate, plateau)
+    if not (math.isfinite(units) and math.isfinite(time_per_unit)) or units <= 0:
+        return []
+    last = math.ceil(units)
+    points = {2 ** k for k in range(last.bit_length())} | {last}
+    plateau = int(plateau)
+    if 1 <= plateau <= last:
+        points.add(plateau)
+    n = np.array(sorted(points), dtype=float)
+    unit = _unit(np.minimum(n, plateau) if plateau >= 1 else n, model, b)
+    cumulative = learning_minutes(n, model, rate, plateau)
+    return [(int(u), time_per_unit * float(t), time_per_unit * float(total))
+            for u, t, total in zip(n, unit, cumulative)]
+
+
+def aggregate_totals(time_per_unit, impact_minutes, total_workers, length, height, target, output_type,
+                     learning_model="None", learning_rate=0.9, learning_plateau=0.0):
+    """
+    Roll per-unit task time and impacts up into the mode totals.
+
+    time_per_unit is the time of every unit, or of the first unit when a
+    learning_model is given (see learning_minutes). Returns a dict of the
+    ScenarioResult total fields, broadcast to a common scenario shape.
+    """
+    time_per_unit = np.asarray(time_per_unit, dtype=float)
+    total_workers = np.asarray(total_workers, dtype=float)
+    impact_minutes = np.asarray(impact_minutes, dtype=float)
+    impact_time = impact_minutes.sum(axis=-1) * total_workers
+
+    length = np.asarray(length, dtype=float)
+    height = np.asarray(height, dtype=float)
+    target = np.asarray(target, dtype=float)
+    unit_sqft = length * height
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if output_type == "Square-foot":
+            units_needed = np.where(unit_sqft > 0, target / np.where(unit_sqft > 0, unit_sqft, 1), 0.0)
+        elif output_type == "Linear-Foot":
+            units_needed = np.where(length > 0, target / np.where(length > 0, length, 1), 0.0)
+        else:
+            units_needed = np.zeros_like(target)
+        if learning_model == "None":
+            task_time = time_per_unit * units_needed
+        else:
+            task_time = time_per_unit * learning_minutes(units_needed, learning_model, learning_rate,
+                                                         learning_plateau)
+        total_time = task_time + impact_time
+
+        available_time = HOURS_PER_MAN_DAY * 60 * total_workers
+        effective_time = available_time - impact_time
+        safe_time = np.where(time_per_unit > 0, time_per_unit, 1)
+        if learning_model == "None" or not output_type.startswith("Man Day"):
+            # Only the Man Day modes report units completed; skip the inverse elsewhere
+            units_completed = np.where(time_per_unit > 0, effective_time / safe_time, 0.0)
+        else:
+            units_completed = np.where(time_per_unit > 0, learning_units(
+                effective_time / safe_time, learning_model, learning_rate, learning_plateau), 0.0)
+        unit_size = unit_sqft if output_type == "Man Day (SF)" else length
+        production = units_completed * unit_size
+
+    totals = {
+        "time_per_unit": time_per_unit,
+        "impact_time": impact_time,
+        "total_workers": total_workers,
+        "unit_sqft": unit_sqft,
+        "units_needed": units_needed,
+        "total_time": total_time,
+        "available_time": available_time,
+        "effective_time": effective_time,
+        "units_completed": units_completed,
+        "production": production,
+    }
+    shape = np.broadcast_shapes(*(np.shape(v) for v in totals.values()))
+    return {name: np.broadcast_to(value, shape) for name, value in totals.items()}
+
+
+def evaluate_batch(sim, **overrides):
+    """
+    Evaluate many variants of one simulation at once.
+
+    Any SimulationArrays field (base_minutes, efficiencies, assignments,
+    impact_minutes, length, height, target, learning_rate, learning_plateau)
+    may be overridden with an array carrying leading scenario axes, e.g.
+    efficiencies=np.random.rand(10000, W).
+    """
+    arrays = sim if isinstance(sim, SimulationArrays) else sim.to_arrays()
+    params = {
+        "base_minutes": arrays.base_minutes,
+        "efficiencies": arrays.efficiencies,
+        "assignments": arrays.assignments,
+        "impact_minutes": arrays.impact_minutes,
+        "length": arrays.length,
+        "height": arrays.height,
+        "target": arrays.target,
+        "output_type": arrays.output_type,
+        "total_workers": None,
+        "override_mask": arrays.override_mask,
+        "override_efficiencies": arrays.override_efficiencies,
+        "learning_model": arrays.learning_model,
+        "learning_rate": arrays.learning_rate,
+        "learning_plateau": arrays.learning_plateau,
+    }
+    unknown = set(overrides) - set(params)
+    if unknown:
+        raise TypeError(f"Unknown scenario inputs: {', '.join(sorted(unknown))}")
+    params.update(overrides)
+    if params["total_workers"] is None:
+        params["total_workers"] = len(arrays.efficiencies)
+    return evaluate_scenarios(**params)
+
+
+def evaluate(sim):
+    """Evaluate a single simulation and return a SimulationResult."""
+    arrays = sim.to_arrays()
+    result = evaluate_batch(arrays)
+    task_results = []
+    for t, task in enumerate(sim.tasks):
+        count = int(result.worker_counts[t])
+        if count == 0:
+            continue
+        task_results.append(TaskResult(
+            index=t,
+            name=task.name,
+            base_time=task.base_time,
+            time_unit=task.time_unit,
+            material_unit=task.material_unit,
+            adjusted_time=float(result.task_minutes[t]),
+            avg_efficiency=float(result.avg_efficiency[t]),
+            worker_count=count,
+        ))
+    return simulation_result(sim, task_results, {
+        name: getattr(result, name) for name in (
+            "time_per_unit", "impact_time", "unit_sqft", "units_needed", "total_time",
+            "effective_time", "units_completed", "production")
+    })
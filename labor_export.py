@@ -0,0 +1,218 @@
+"""
+Streaming Excel export.
+
+The export used to build a pandas DataFrame per sheet and write the lot on
+the Tk main thread, freezing the window until the file was saved. Here the
+sheets are generated row by row from a Simulation snapshot and streamed
+through openpyxl's write-only mode, so memory stays flat however many
+result rows there are. ExportJob runs that on a worker thread; the GUI
+polls its progress with after() and may cancel it at any time.
+"""
+import math
+import os
+import tempfile
+import threading
+from datetime import datetime
+
+from labor_profile import timed
+
+PROGRESS_EVERY = 200  # rows between progress updates / cancel checks
+
+
+class ExportCancelled(Exception):
+    """Raised inside the worker thread when the user cancels an export."""
+
+
+def settings_row(sim, version, export_date):
+    """The single row of the Settings sheet; columns depend on the mode."""
+    settings = sim.output_settings
+    mode = settings.output_type
+    row = {
+        "Simulation Name": sim.simulation_name,
+        "Output Type": mode,
+        "Length (ft)": settings.length,
+        "Time Display Unit": settings.time_display_unit,
+        "Export Date": export_date,
+        "User": "Jmk125",  # Hardcoded username
+        "Version": version,
+    }
+    # Add height for Square-foot and Man Day (SF) modes
+    if mode in ["Square-foot", "Man Day (SF)"]:
+        row["Height (ft)"] = settings.height
+    # Add target field with appropriate label
+    if mode == "Square-foot":
+        row["Target Area (sqft)"] = settings.target
+    elif mode == "Linear-Foot":
+        row["Target Length (lf)"] = settings.target
+    if settings.learning:
+        row["Learning Curve"] = settings.learning_model
+        row["Learning Rate"] = settings.learning_rate
+        row["Plateau Unit"] = settings.learning_plateau
+    return row
+
+
+def iter_sheets(sim, result, version, export_date):
+    """
+    Yield (sheet_name, header, rows) for every sheet of the workbook, in
+    the order the export has always written them. rows is a generator of
+    value lists, so no sheet is ever held in memory as a whole.
+    """
+    if sim.workers:
+        yield "Workers", ["Worker #", "Name", "Efficiency"], (
+            [i + 1, worker.name, worker.efficiency] for i, worker in enumerate(sim.workers))
+
+    def task_rows():
+        for i, task in enumerate(sim.tasks):
+            assigned_workers = [sim.workers[j].name or f"Worker {j+1}" for j in task.assigned_workers]
+            yield [i + 1, task.name, task.base_time, task.time_unit, task.material_unit,
+                   ", ".join(assigned_workers)]
+
+    if sim.tasks:
+        yield "Tasks", ["Task #", "Name", "Base Time", "Time Unit", "Material Unit", "Assigned Workers"], \
+            task_rows()
+
+    if any(task.efficiency_overrides for task in sim.tasks):
+        # Every worker's efficiency on every task, per-task values included
+        worker_names = [worker.name or f"Worker {j+1}" for j, worker in enumerate(sim.workers)]
+        yield "Efficiency Matrix", ["Task #", "Name"] + worker_names, (
+            [i + 1, task.name] + [task.efficiency(j, sim.workers) for j in range(len(sim.workers))]
+            for i, task in enumerate(sim.tasks))
+
+    if sim.impacts:
+        yield "Impacts", ["Impact #", "Name", "Time (min)"], (
+            [i + 1, impact.name, impact.time] for i, impact in enumerate(sim.impacts))
+
+    settings = settings_row(sim, version, export_date)
+    yield "Settings", list(settings), iter([list(settings.values())])
+
+    columns = ["Category", "Name", "Time (min)", "Notes"]
+    yield "Results", columns, ([row[c] for c in columns] for row in result.iter_result_rows())
+
+
+def row_count(sim, result):
+    """Number of data rows write_workbook will stream, for progress bars."""
+    matrix_rows = len(sim.tasks) if any(task.efficiency_overrides for task in sim.tasks) else 0
+    return (len(sim.workers) + len(sim.tasks) + matrix_rows + len(sim.impacts) + 1
+            + len(result.task_results) + len(sim.impacts) + len(result.learning_curve)
+            + len(result.summary_rows()))
+
+
+def cell_value(value):
+    """Blank out nan (an unparseable entry) the way pandas' to_excel did."""
+    if isinstance(value, float) and not math.isfinite(value):
+        if math.isnan(value):
+            return None
+        return "inf" if value > 0 else "-inf"
+    return value
+
+
+def write_workbook(path, sim, result, version, export_date=None, progress=None, cancel_event=None):
+    """
+    Stream the export workbook to path.
+
+    progress(rows_written) is called every PROGRESS_EVERY rows and once at
+    the end. If cancel_event gets set, ExportCancelled is raised and path is
+    left untouched: rows go to a temporary file that only replaces path once
+    the workbook is complete.
+    """
+    from openpyxl import Workbook
+
+    export_date = export_date or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    workbook = Workbook(write_only=True)
+    written = 0
+    try:
+        for sheet_name, header, rows in iter_sheets(sim, result, version, export_date):
+            sheet = workbook.create_sheet(sheet_name)
+            sheet.append(header)
+            for row in rows:
+                sheet.append([cell_value(v) for v in row])
+                written += 1
+                if written % PROGRESS_EVERY == 0:
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise ExportCancelled()
+                    if progress:
+                        progress(written)
+        if cancel_event is not None and cancel_event.is_set():
+            raise ExportCancelled()
+    except ExportCancelled:
+        # Release the sheets' temporary streams instead of leaving them to gc
+        for sheet in workbook.worksheets:
+            if not sheet.closed:
+                sheet.close()
+        raise
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(suffix=".xlsx", dir=directory)
+    os.close(fd)
+    try:
+        workbook.save(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    if progress:
+        progress(written)
+    return written
+
+
+class ExportJob:
+    """
+    One export running on a worker thread.
+
+    The thread never touches Tk; the GUI reads progress/done/error from the
+    main thread (typically from an after() poll) and calls cancel() from
+    its Cancel button. result is the SimulationResult of sim when the caller
+    already has it (the GUI's cached one); otherwise the thread evaluates sim.
+    """
+
+    def __init__(self, path, sim, version, result=None):
+        self.path = path
+        self.sim = sim
+        self.version = version
+        self.result = result
+        self.rows_written = 0
+        self.total_rows = 0
+        self.error = None
+        self.cancelled = False
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="excel-export", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    @property
+    def fraction(self):
+        """Share of rows written so far, 0.0 to 1.0."""
+        return self.rows_written / self.total_rows if self.total_rows else 0.0
+
+    def _progress(self, rows_written):
+        self.rows_written = rows_written
+
+    @timed("export thread")
+    def _run(self):
+        try:
+            result = self.result
+            if result is None:
+                # NumPy is only needed here, on the worker thread
+                from labor_engine import evaluate
+
+                result = evaluate(self.sim)
+            self.total_rows = row_count(self.sim, result)
+            write_workbook(self.path, self.sim, result, self.version,
+                           progress=self._progress, cancel_event=self._cancel)
+        except ExportCancelled:
+            self.cancelled = True
+        except Exception as e:
+            self.error = e
+        finally:
+            self._done.set()
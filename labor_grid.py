@@ -0,0 +1,258 @@
+"""
+Virtualized task/worker grid.
+
+The task list used to be one Frame per task holding Entries, a Combobox, a
+Label and one Checkbutton per worker. TaskGrid draws the same information
+on a single Canvas and only creates canvas items for the rows currently in
+view, so the widget count no longer grows with tasks x workers. Cell data
+is pulled from a source object on every redraw:
+
+    source.task_count()              -> int
+    source.worker_labels()           -> list of column headers
+    source.task_cells(t)             -> (name, base_time, time_unit, material_unit)
+    source.is_assigned(t, w)         -> bool
+    source.task_result_text(t)       -> "Adjusted Time: ..." text
+    source.task_efficiency_text(t, w) -> worker w's per-task efficiency as text, or ""
+    source.toggle_assignment(t, w)   -> called when a worker cell is clicked
+    source.edit_efficiency(t, w)     -> called when a worker cell is right-clicked
+    source.edit_task(t, field, text) -> called when an edited cell is committed;
+                                        returns False to reject the value
+"""
+import tkinter as tk
+from tkinter import ttk
+
+from labor_profile import timed
+
+ROW_HEIGHT = 24
+HEADER_HEIGHT = 26
+
+# (key, header, width); worker columns are inserted before "result"
+LEADING_COLUMNS = [
+    ("index", "#", 60),
+    ("name", "Task", 160),
+    ("base_time", "Base Time", 80),
+    ("time_unit", "Time Unit", 80),
+    ("material_unit", "Per", 80),
+]
+WORKER_COLUMN_WIDTH = 80
+RESULT_COLUMN = ("result", "Adjusted Time", 260)
+EDITABLE = {"name", "base_time", "material_unit"}
+TIME_UNITS = ["Minutes", "Hours"]
+
+
+class TaskGrid(ttk.Frame):
+    """Canvas-drawn, vertically virtualized task x worker matrix."""
+
+    def __init__(self, master, source, height=300, **kwargs):
+        super().__init__(master, **kwargs)
+        self.source = source
+        self.first_row = 0
+        self.x_offset = 0
+        self.editor = None
+
+        self.canvas = tk.Canvas(self, height=height, width=900, highlightthickness=0, background="white")
+        self.vbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.hbar = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.xview)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.vbar.grid(row=0, column=1, sticky="ns")
+        self.hbar.grid(row=1, column=0, sticky="ew")
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+        self.canvas.bind("<Configure>", lambda e: self.refresh())
+        self.canvas.bind("<Button-1>", self.on_click)
+        self.canvas.bind("<Button-3>", self.on_right_click)
+        self.canvas.bind("<MouseWheel>", self.on_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self.scroll_rows(-3))
+        self.canvas.bind("<Button-5>", lambda e: self.scroll_rows(3))
+
+    # -- geometry ----------------------------------------------------------
+
+    def columns(self):
+        worker_columns = [(("worker", w), label, WORKER_COLUMN_WIDTH)
+                          for w, label in enumerate(self.source.worker_labels())]
+        return LEADING_COLUMNS + worker_columns + [RESULT_COLUMN]
+
+    def visible_row_count(self):
+        height = max(self.canvas.winfo_height(), ROW_HEIGHT + HEADER_HEIGHT)
+        return max(1, (height - HEADER_HEIGHT) // ROW_HEIGHT)
+
+    def visible_rows(self):
+        stop = min(self.source.task_count(), self.first_row + self.visible_row_count())
+        return range(self.first_row, stop)
+
+    def column_at(self, x):
+        left = -self.x_offset
+        for key, _, width in self.columns():
+            if left <= x < left + width:
+                return key, left, width
+            left += width
+        return None, 0, 0
+
+    def row_at(self, y):
+        if y < HEADER_HEIGHT:
+            return None
+        t = self.first_row + int((y - HEADER_HEIGHT) // ROW_HEIGHT)
+        return t if t < self.source.task_count() else None
+
+    # -- drawing -----------------------------------------------------------
+
+    @timed("grid.refresh")
+    def refresh(self):
+        """Redraw the header and the rows currently in view."""
+        canvas = self.canvas
+        canvas.delete("all")
+        task_count = self.source.task_count()
+        self.first_row = max(0, min(self.first_row, task_count - self.visible_row_count()))
+
+        columns = self.columns()
+        total_width = sum(width for _, _, width in columns)
+        view_width = max(self.canvas.winfo_width(), 1)
+        self.x_offset = max(0, min(self.x_offset, total_width - view_width))
+
+        left = -self.x_offset
+        for key, header, width in columns:
+            canvas.create_rectangle(left, 0, left + width, HEADER_HEIGHT, fill="#e8e8e8", outline="#c0c0c0")
+            canvas.create_text(left + 4, HEADER_HEIGHT // 2, text=header, anchor="w")
+            left += width
+
+        for t in self.visible_rows():
+            self.draw_row(t, columns)
+
+        visible = self.visible_row_count()
+        if task_count:
+            self.vbar.set(self.first_row / task_count, min(1.0, (self.first_row + visible) / task_count))
+        else:
+            self.vbar.set(0.0, 1.0)
+        self.hbar.set(self.x_offset / total_width, min(1.0, (self.x_offset + view_width) / total_width))
+
+    def draw_row(self, t, columns):
+        canvas = self.canvas
+        top = HEADER_HEIGHT + (t - self.first_row) * ROW_HEIGHT
+        name, base_time, time_unit, material_unit = self.source.task_cells(t)
+        texts = {
+            "index": f"Task {t+1}",
+            "name": name,
+            "base_time": f"{base_time:g}" if isinstance(base_time, (int, float)) else str(base_time),
+            "time_unit": time_unit,
+            "material_unit": material_unit,
+            "result": self.source.task_result_text(t),
+        }
+        fill = "white" if t % 2 == 0 else "#f6f6f6"
+        left = -self.x_offset
+        for key, _, width in columns:
+            canvas.create_rectangle(left, top, left + width, top + ROW_HEIGHT, fill=fill, outline="#e0e0e0")
+            if isinstance(key, tuple):
+                checked = self.source.is_assigned(t, key[1])
+                box = left + width // 2 - 7, top + 5, left + width // 2 + 7, top + 19
+                canvas.create_rectangle(*box, outline="#606060", fill="#4a90d9" if checked else "white")
+                if checked:
+                    canvas.create_text(left + width // 2, top + 12, text="✓", fill="white")
+                efficiency = self.source.task_efficiency_text(t, key[1])
+                if efficiency:
+                    canvas.create_text(left + width - 4, top + 12, text=efficiency, anchor="e",
+                                       fill="#b05a00" if checked else "#a0a0a0")
+            else:
+                canvas.create_text(left + 4, top + ROW_HEIGHT // 2, text=texts[key], anchor="w")
+            left += width
+
+    def refresh_rows(self, rows):
+        """Redraw if any of the given task rows is on screen."""
+        visible = self.visible_rows()
+        if any(t in visible for t in rows):
+            self.refresh()
+
+    # -- scrolling ---------------------------------------------------------
+
+    def yview(self, *args):
+        self.commit_edit()
+        task_count = self.source.task_count()
+        if args[0] == "moveto":
+            self.first_row = int(float(args[1]) * task_count)
+        elif args[0] == "scroll":
+            step = self.visible_row_count() if args[2] == "pages" else 1
+            self.first_row += int(args[1]) * step
+        self.refresh()
+
+    def xview(self, *args):
+        self.commit_edit()
+        total_width = sum(width for _, _, width in self.columns())
+        if args[0] == "moveto":
+            self.x_offset = int(float(args[1]) * total_width)
+        elif args[0] == "scroll":
+            step = self.canvas.winfo_width() if args[2] == "pages" else WORKER_COLUMN_WIDTH
+            self.x_offset += int(args[1]) * step
+        self.refresh()
+
+    def scroll_rows(self, delta):
+        self.commit_edit()
+        self.first_row += delta
+        self.refresh()
+
+    def on_wheel(self, event):
+        self.scroll_rows(-3 if event.delta > 0 else 3)
+
+    def see(self, t):
+        """Scroll so task t is visible."""
+        visible = self.visible_row_count()
+        if t < self.first_row:
+            self.first_row = t
+        elif t >= self.first_row + visible:
+            self.first_row = t - visible + 1
+        self.refresh()
+
+    # -- editing -----------------------------------------------------------
+
+    def on_click(self, event):
+        t = self.row_at(event.y)
+        key, left, width = self.column_at(event.x)
+        if t is None or key is None:
+            return
+        if isinstance(key, tuple):
+            self.source.toggle_assignment(t, key[1])
+        elif key == "time_unit":
+            current = self.source.task_cells(t)[2]
+            next_unit = TIME_UNITS[(TIME_UNITS.index(current) + 1) % len(TIME_UNITS)] \
+                if current in TIME_UNITS else TIME_UNITS[0]
+            self.source.edit_task(t, "time_unit", next_unit)
+        elif key in EDITABLE:
+            self.begin_edit(t, key, left, width)
+
+    def on_right_click(self, event):
+        t = self.row_at(event.y)
+        key, _, _ = self.column_at(event.x)
+        if t is not None and isinstance(key, tuple):
+            self.commit_edit()
+            self.source.edit_efficiency(t, key[1])
+
+    def begin_edit(self, t, key, left, width):
+        self.cancel_edit()
+        name, base_time, _, material_unit = self.source.task_cells(t)
+        value = {"name": name, "base_time": base_time, "material_unit": material_unit}[key]
+        top = HEADER_HEIGHT + (t - self.first_row) * ROW_HEIGHT
+
+        editor = ttk.Entry(self.canvas)
+        editor.insert(0, str(value))
+        editor.place(x=left, y=top, width=width, height=ROW_HEIGHT)
+        editor.focus_set()
+        editor.bind("<Return>", lambda e: self.commit_edit())
+        editor.bind("<Tab>", lambda e: self.commit_edit())
+        editor.bind("<FocusOut>", lambda e: self.commit_edit())
+        editor.bind("<Escape>", lambda e: self.cancel_edit())
+        self.editor = (editor, t, key)
+
+    def commit_edit(self):
+        if self.editor is None:
+            return
+        editor, t, key = self.editor
+        text = editor.get()
+        self.editor = None
+        editor.destroy()
+        if self.source.edit_task(t, key, text) is False:
+            self.bell()
+
+    def cancel_edit(self):
+        if self.editor is not None:
+            editor = self.editor[0]
+            self.editor = None
+            editor.destroy()
@@ -0,0 +1,308 @@
+"""
+Bulk takeoff import from CSV or Excel.
+
+A takeoff is a spreadsheet of line items, one task per row: name, base time,
+time unit, material unit and the crew that does it. The source is streamed
+in chunks of CHUNK_ROWS rows (csv.reader, or openpyxl's read-only mode for
+.xlsx), each chunk is converted column by column into Tasks, and only the
+converted tasks are kept, so memory follows the number of tasks rather than
+the size of the file.
+
+A row without a time unit takes it from the base time column's header
+("Hours", "Labor Hrs"), else minutes. Rows that cannot be converted are
+skipped and reported one by one as RowErrors (row number, column, value,
+problem); at most MAX_ERRORS are kept, error_count counts them all. Crew
+cells list worker names separated by ";" or ","; names that are not in the
+simulation yet become new workers with efficiency 1.0.
+
+    mapping = guess_mapping(read_header("takeoff.xlsx"))
+    result = import_takeoff("takeoff.xlsx", mapping, worker_names=["Alex"])
+    result.tasks, result.workers, result.errors
+"""
+import csv
+import math
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+
+from labor_model import Simulation, Task, Worker
+
+CHUNK_ROWS = 2000
+MAX_ERRORS = 10000
+
+# (field, label, required)
+FIELDS = [
+    ("name", "Task Name", True),
+    ("base_time", "Base Time", True),
+    ("time_unit", "Time Unit", False),
+    ("material_unit", "Material Unit", False),
+    ("crew", "Crew", False),
+]
+
+# Header names guess_mapping recognizes, lowercased
+ALIASES = {
+    "name": ["name", "task", "task name", "item", "description", "line item"],
+    "base_time": ["base time", "base_time", "time", "duration", "minutes", "hours", "labor"],
+    "time_unit": ["time unit", "time_unit", "unit of time"],
+    "material_unit": ["material unit", "material_unit", "per", "unit", "uom"],
+    "crew": ["crew", "workers", "assigned", "assigned workers", "worker"],
+}
+
+TIME_UNITS = {
+    "": "Minutes", "m": "Minutes", "min": "Minutes", "mins": "Minutes", "minute": "Minutes", "minutes": "Minutes",
+    "h": "Hours", "hr": "Hours", "hrs": "Hours", "hour": "Hours", "hours": "Hours",
+}
+CREW_SEPARATOR = re.compile(r"[;,]")
+HOURS_HEADER = re.compile(r"\b(hours?|hrs?)\b", re.IGNORECASE)
+
+
+@dataclass
+class RowError:
+    row: int       # 1-based row number in the source, header included
+    column: str
+    value: str
+    message: str
+
+
+@dataclass
+class ImportResult:
+    tasks: list = field(default_factory=list)
+    workers: list = field(default_factory=list)  # new workers, to append after the existing ones
+    rows: int = 0
+    errors: list = field(default_factory=list)
+    error_count: int = 0
+    cancelled: bool = False
+
+    def add_error(self, row, column, value, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(RowError(row, column, "" if value is None else str(value), message))
+
+    def summary_text(self):
+        text = f"Imported {len(self.tasks):,} of {self.rows:,} rows"
+        if self.workers:
+            text += f", {len(self.workers)} new workers"
+        if self.error_count:
+            skipped = self.rows - len(self.tasks)
+            text += f"; {skipped:,} rows skipped with {self.error_count:,} errors"
+        if self.cancelled:
+            text += " (cancelled)"
+        return text
+
+
+def is_excel(path):
+    return os.path.splitext(path)[1].lower() in (".xlsx", ".xlsm")
+
+
+def iter_rows(path):
+    """Yield every row of path as a list of cell values, header first, without loading the whole file."""
+    if is_excel(path):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            for row in workbook.active.iter_rows(values_only=True):
+                yield list(row)
+        finally:
+            workbook.close()
+        return
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        sample = f.read(8192)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        yield from csv.reader(f, dialect)
+
+
+def read_header(path):
+    """Column names of path's first row."""
+    rows = iter_rows(path)
+    try:
+        header = next(rows, [])
+    finally:
+        rows.close()
+    return ["" if cell is None else str(cell).strip() for cell in header]
+
+
+def guess_mapping(header):
+    """{field: column index or None} from header names."""
+    names = [name.strip().lower() for name in header]
+    mapping = {}
+    for key, _, _ in FIELDS:
+        mapping[key] = next((names.index(alias) for alias in ALIASES[key]
+                             if alias in names and names.index(alias) not in mapping.values()), None)
+    return mapping
+
+
+def default_time_unit(header, mapping):
+    """
+    Time unit of rows without one: "Hours" when the base time column is
+    headed in hours (e.g. "Hours", "Labor Hrs"), else "Minutes".
+    """
+    index = mapping.get("base_time")
+    if index is not None and index < len(header) and HOURS_HEADER.search(header[index]):
+        return "Hours"
+    return "Minutes"
+
+
+def _column(chunk, index):
+    if index is None:
+        return [None] * len(chunk)
+    return [row[index] if index < len(row) else None for row in chunk]
+
+
+def _text(value):
+    return "" if value is None else str(value).strip()
+
+
+def _convert_chunk(chunk, first_row, mapping, header, workers, worker_count, result):
+    """
+    Append the tasks of chunk (rows starting at source row first_row) to
+    result. workers maps lowercased names to indices; worker_count is the
+    number of workers the simulation already has.
+    """
+    def label(key):
+        index = mapping.get(key)
+        return header[index] if index is not None and index < len(header) else key
+
+    names = _column(chunk, mapping.get("name"))
+    times = _column(chunk, mapping.get("base_time"))
+    time_units = _column(chunk, mapping.get("time_unit"))
+    material_units = _column(chunk, mapping.get("material_unit"))
+    crews = _column(chunk, mapping.get("crew"))
+    default_unit = default_time_unit(header, mapping)
+
+    for offset, (name, base_time, time_unit, material_unit, crew) in enumerate(
+            zip(names, times, time_units, material_units, crews)):
+        row = first_row + offset
+        if not any(_text(cell) for cell in chunk[offset]):
+            result.rows -= 1  # blank lines are not rows
+            continue
+        ok = True
+        name = _text(name)
+        if not name:
+            result.add_error(row, label("name"), name, "Task name is empty")
+            ok = False
+        try:
+            time_value = float(base_time)
+            if not math.isfinite(time_value) or time_value < 0:
+                raise ValueError
+        except (TypeError, ValueError):
+            result.add_error(row, label("base_time"), base_time, "Base time must be a number 0 or greater")
+            ok = False
+        unit = TIME_UNITS.get(_text(time_unit).lower()) if _text(time_unit) else default_unit
+        if unit is None:
+            result.add_error(row, label("time_unit"), time_unit, "Time unit must be Minutes or Hours")
+            ok = False
+        if not ok:
+            continue
+
+        assigned = []
+        for worker_name in CREW_SEPARATOR.split(_text(crew)):
+            worker_name = worker_name.strip()
+            if not worker_name:
+                continue
+            w = workers.get(worker_name.lower())
+            if w is None:
+                w = workers[worker_name.lower()] = worker_count + len(result.workers)
+                result.workers.append(Worker(worker_name, 1.0))
+            if w not in assigned:
+                assigned.append(w)
+        result.tasks.append(Task(name, time_value, unit, _text(material_unit) or "unit", sorted(assigned)))
+
+
+def import_takeoff(path, mapping, worker_names=(), chunk_rows=CHUNK_ROWS, progress=None, cancel_event=None):
+    """
+    Convert the takeoff at path into an ImportResult. mapping is
+    {field: column index or None} (see guess_mapping); worker_names are the
+    simulation's current workers, which crew cells are matched against
+    (case-insensitively), and new task assignments index into
+    worker_names + result.workers. progress(rows) is called after every
+    chunk, from whatever thread this runs on.
+    """
+    missing = [label for key, label, required in FIELDS if required and mapping.get(key) is None]
+    if missing:
+        raise ValueError(f"Map a column to {' and '.join(missing)}")
+
+    result = ImportResult()
+    workers = {}
+    for w, name in enumerate(worker_names):
+        workers.setdefault(name.strip().lower(), w)
+
+    rows = iter_rows(path)
+    try:
+        header = ["" if cell is None else str(cell).strip() for cell in next(rows, [])]
+        chunk, first_row = [], 2
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_rows:
+                result.rows += len(chunk)
+                _convert_chunk(chunk, first_row, mapping, header, workers, len(worker_names), result)
+                first_row += len(chunk)
+                chunk = []
+                if progress is not None:
+                    progress(result.rows)
+                if cancel_event is not None and cancel_event.is_set():
+                    result.cancelled = True
+                    return result
+        result.rows += len(chunk)
+        _convert_chunk(chunk, first_row, mapping, header, workers, len(worker_names), result)
+        if progress is not None:
+            progress(result.rows)
+    finally:
+        rows.close()
+    return result
+
+
+def save_error_report(result, path):
+    """Write result's row errors to a CSV file."""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Row", "Column", "Value", "Problem"])
+        for error in result.errors:
+            writer.writerow([error.row, error.column, error.value, error.message])
+        if result.error_count > len(result.errors):
+            writer.writerow(["", "", "", f"{result.error_count - len(result.errors)} more errors not listed"])
+
+
+def main(argv=None):
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Convert a CSV or Excel takeoff into a simulation file")
+    parser.add_argument("source", help=".csv or .xlsx takeoff; the first row names the columns")
+    parser.add_argument("destination", help="simulation JSON file to write")
+    parser.add_argument("--errors", help="write the per-row error report to this CSV file")
+    for key, label, _ in FIELDS:
+        parser.add_argument(f"--{key.replace('_', '-')}-column", dest=key, metavar="HEADER",
+                            help=f"column holding the {label.lower()} (default: guessed from the header)")
+    args = parser.parse_args(argv)
+
+    header = read_header(args.source)
+    mapping = guess_mapping(header)
+    for key, _, _ in FIELDS:
+        name = getattr(args, key)
+        if name is not None:
+            if name not in header:
+                parser.error(f"no column named {name!r}")
+            mapping[key] = header.index(name)
+
+    result = import_takeoff(args.source, mapping)
+    sim = Simulation(simulation_name=os.path.splitext(os.path.basename(args.source))[0],
+                     workers=result.workers, tasks=result.tasks)
+    with open(args.destination, "w") as f:
+        json.dump(sim.to_dict(), f, indent=4)
+    print(result.summary_text())
+    if args.errors:
+        save_error_report(result, args.errors)
+    else:
+        for error in result.errors[:20]:
+            print(f"  row {error.row}, {error.column}: {error.message} ({error.value!r})", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+Takeoff import window: pick a CSV or Excel file, map its columns to task
+fields, and import every row in one batch. The file is read in the
+background in chunks; rows that fail are listed with their problem instead
+of stopping the import.
+"""
+import os
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from labor_import import (FIELDS, default_time_unit, guess_mapping, import_takeoff, iter_rows, read_header,
+                          save_error_report)
+
+PREVIEW_ROWS = 8
+PROGRESS_MS = 100
+NOT_MAPPED = "(not mapped)"
+ERROR_COLUMNS = [("row", "Row", 60), ("column", "Column", 120), ("value", "Value", 160), ("message", "Problem", 280)]
+TAKEOFF_FILETYPES = [("Takeoffs", "*.csv *.xlsx *.xlsm"), ("CSV files", "*.csv"), ("Excel files", "*.xlsx"),
+                     ("All files", "*.*")]
+
+
+class ImportDialog(tk.Toplevel):
+    """
+    get_worker_names() returns the current crew's names; apply_import(tasks,
+    workers) appends the converted tasks and new workers in one batch.
+    compute is the ComputeService the file is read on.
+    """
+
+    def __init__(self, master, get_worker_names, apply_import, compute):
+        super().__init__(master)
+        self.title("Import Takeoff")
+        self.get_worker_names = get_worker_names
+        self.apply_import = apply_import
+        self.compute = compute
+        self.path = None
+        self.header = []
+        self.result = None
+        self.rows_read = 0
+        self.progress_after = None
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        file_frame = ttk.Frame(self)
+        file_frame.grid(row=0, column=0, sticky="we", padx=10, pady=(10, 5))
+        ttk.Button(file_frame, text="📂 Choose File", command=self.choose_file).pack(side=tk.LEFT)
+        self.file_label = ttk.Label(file_frame, text="No file chosen", foreground="gray")
+        self.file_label.pack(side=tk.LEFT, padx=10)
+
+        mapping_frame = ttk.LabelFrame(self, text="Columns")
+        mapping_frame.grid(row=1, column=0, sticky="we", padx=10, pady=5)
+        self.mapping_combos = {}
+        for n, (key, label, required) in enumerate(FIELDS):
+            ttk.Label(mapping_frame, text=f"{label}{' *' if required else ''}:").grid(
+                row=n // 3, column=(n % 3) * 2, sticky="e", padx=(5, 2), pady=2)
+            combo = ttk.Combobox(mapping_frame, values=[NOT_MAPPED], state="readonly", width=20)
+            combo.grid(row=n // 3, column=(n % 3) * 2 + 1, sticky="w", padx=(0, 10), pady=2)
+            combo.set(NOT_MAPPED)
+            self.mapping_combos[key] = combo
+
+        preview_frame = ttk.LabelFrame(self, text="Preview")
+        preview_frame.grid(row=2, column=0, sticky="nsew", padx=10, pady=5)
+        self.preview_table = ttk.Treeview(preview_frame, show="headings", height=PREVIEW_ROWS)
+        self.preview_table.grid(row=0, column=0, sticky="nsew")
+        preview_frame.columnconfigure(0, weight=1)
+
+        actions = ttk.Frame(self)
+        actions.grid(row=3, column=0, sticky="we", padx=10, pady=5)
+        self.import_button = ttk.Button(actions, text="📥 Import", command=self.run)
+        self.import_button.pack(side=tk.LEFT, padx=2)
+        self.cancel_button = ttk.Button(actions, text="✖ Cancel", command=self.cancel)
+        self.cancel_button.pack(side=tk.LEFT, padx=2)
+        ttk.Button(actions, text="💾 Save Error Report", command=self.save_errors).pack(side=tk.LEFT, padx=2)
+        self.status_label = ttk.Label(actions, text="", foreground="gray")
+        self.status_label.pack(side=tk.LEFT, padx=10)
+
+        errors_frame = ttk.LabelFrame(self, text="Rows not imported")
+        errors_frame.grid(row=4, column=0, sticky="nsew", padx=10, pady=(5, 10))
+        self.error_table = ttk.Treeview(errors_frame, columns=[key for key, _, _ in ERROR_COLUMNS],
+                                        show="headings", height=8)
+        for key, header, width in ERROR_COLUMNS:
+            self.error_table.heading(key, text=header)
+            self.error_table.column(key, width=width, anchor="e" if key == "row" else "w")
+        scroll = ttk.Scrollbar(errors_frame, orient=tk.VERTICAL, command=self.error_table.yview)
+        self.error_table.configure(yscrollcommand=scroll.set)
+        self.error_table.grid(row=0, column=0, sticky="nsew")
+        scroll.grid(row=0, column=1, sticky="ns")
+        errors_frame.columnconfigure(0, weight=1)
+        errors_frame.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(4, weight=1)
+
+    def choose_file(self):
+        path = filedialog.askopenfilename(parent=self, filetypes=TAKEOFF_FILETYPES)
+        if path:
+            self.open_file(path)
+
+    def open_file(self, path):
+        """Read path's header and first rows and guess the column mapping."""
+        try:
+            self.header = read_header(path)
+            preview = []
+            rows = iter_rows(path)
+            try:
+                next(rows, None)
+                for row in rows:
+                    preview.append(row)
+                    if len(preview) >= PREVIEW_ROWS:
+                        break
+            finally:
+                rows.close()
+        except ImportError:
+            messagebox.showerror("Import", "Reading Excel files requires openpyxl (pip install openpyxl).",
+                                 parent=self)
+            return
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Import", f"Failed to read {os.path.basename(path)}: {str(e)}", parent=self)
+            return
+        self.path = path
+        self.file_label.config(text=os.path.basename(path), foreground="")
+
+        choices = [NOT_MAPPED] + [f"{n + 1}: {name}" for n, name in enumerate(self.header)]
+        mapping = guess_mapping(self.header)
+        for key, combo in self.mapping_combos.items():
+            combo["values"] = choices
+            combo.current(0 if mapping[key] is None else mapping[key] + 1)
+
+        columns = [str(n) for n in range(len(self.header))]
+        table = self.preview_table
+        table.delete(*table.get_children())
+        table["columns"] = columns
+        for column, name in zip(columns, self.header):
+            table.heading(column, text=name)
+            table.column(column, width=110, anchor="w")
+        for row in preview:
+            table.insert("", tk.END, values=["" if cell is None else cell for cell in row])
+        status = "Check the column mapping, then Import."
+        if mapping["time_unit"] is None and default_time_unit(self.header, mapping) == "Hours":
+            status += " Base times are read as hours (from the column name)."
+        self.status_label.config(text=status)
+
+    def mapping(self):
+        return {key: (combo.current() - 1 if combo.current() > 0 else None)
+                for key, combo in self.mapping_combos.items()}
+
+    def run(self):
+        if self.path is None:
+            messagebox.showwarning("Import", "Choose a takeoff file first.", parent=self)
+            return
+        mapping = self.mapping()
+        missing = [label for key, label, required in FIELDS if required and mapping[key] is None]
+        if missing:
+            messagebox.showwarning("Import", f"Map a column to {' and '.join(missing)}.", parent=self)
+            return
+        self.rows_read = 0
+        self.import_button.config(state="disabled")
+        self.compute.submit(self, import_takeoff, self.path, mapping, self.get_worker_names(),
+                            progress=self.set_rows_read, pass_cancel=True,
+                            on_done=self.show_result, on_error=self.show_error)
+        self.show_progress()
+
+    def set_rows_read(self, rows):
+        # Called on the worker thread; show_progress picks it up
+        self.rows_read = rows
+
+    def show_progress(self):
+        self.progress_after = None
+        if not self.compute.busy(self):
+            return
+        self.status_label.config(text=f"Reading... {self.rows_read:,} rows")
+        self.progress_after = self.after(PROGRESS_MS, self.show_progress)
+
+    def stop_progress(self):
+        if self.progress_after is not None:
+            self.after_cancel(self.progress_after)
+            self.progress_after = None
+        self.import_button.config(state="normal")
+
+    def show_result(self, result):
+        self.stop_progress()
+        self.result = result
+        if result.tasks:
+            self.apply_import(result.tasks, result.workers)
+        table = self.error_table
+        table.delete(*table.get_children())
+        for error in result.errors:
+            table.insert("", tk.END, values=(error.row, error.column, error.value, error.message))
+        self.status_label.config(text=result.summary_text())
+
+    def show_error(self, error):
+        self.stop_progress()
+        self.status_label.config(text=f"Import failed: {error}")
+
+    def cancel(self):
+        if self.compute.busy(self):
+            self.compute.cancel(self)
+            self.stop_progress()
+            self.status_label.config(text="Import cancelled; nothing was added.")
+
+    def save_errors(self):
+        if self.result is None or not self.result.error_count:
+            return
+        path = filedialog.asksaveasfilename(parent=self, defaultextension=".csv", initialfile="import_errors.csv",
+                                            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            save_error_report(self.result, path)
+        except OSError as e:
+            messagebox.showerror("Import", f"Failed to save the error report: {str(e)}", parent=self)
+
+    def close(self):
+        self.compute.cancel(self)
+        self.stop_progress()
+        self.destroy()
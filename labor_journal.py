@@ -0,0 +1,289 @@
+"""
+Crash-safe autosave: a full snapshot plus an append-only change journal.
+
+IncrementalEvaluator reports every edit as (op, args, fields). ChangeJournal
+appends each one as a single JSON line, so an edit costs a write the size of
+the change. compact() periodically writes the whole simulation to a temp
+file, fsyncs it, renames it over the snapshot and starts an empty journal.
+Records are numbered and the snapshot remembers the last number it includes,
+so a crash between the rename and the truncation replays nothing twice.
+
+Each running window claims a session directory of its own inside the
+autosave directory (claim_session()) and holds an OS lock on a file in it
+for as long as it runs, so two windows never touch each other's autosaves.
+Every open document keeps its own pair of files in a subdirectory of the
+session (document_directory()), so editing one tab never overwrites another
+tab's journal. On a clean exit discard() and release_session() remove them.
+A session whose lock nobody holds belongs to a window that crashed:
+recoverable() lists its documents in tab order, and recover() rebuilds each
+simulation by replaying its journal over its snapshot. A torn final line
+from a crash mid-write is ignored.
+"""
+import json
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from labor_model import Impact, Simulation, Task, Worker
+
+AUTOSAVE_DIR = os.path.join(os.path.expanduser("~"), ".production_builder", "autosave")
+SNAPSHOT_NAME = "snapshot.json"
+JOURNAL_NAME = "journal.jsonl"
+DOCUMENT_PREFIX = "tab-"
+SESSION_PREFIX = "session-"
+LOCK_NAME = "owner.lock"
+
+
+def _encode(value):
+    return value.to_dict() if hasattr(value, "to_dict") else value
+
+
+class ChangeJournal:
+    """
+    Autosave files in directory. get_file_path() names the document being
+    edited, if any, so recovery can reopen it under the same path.
+    """
+
+    def __init__(self, directory=AUTOSAVE_DIR, get_file_path=None):
+        self.directory = directory
+        self.get_file_path = get_file_path or (lambda: None)
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_NAME)
+        self.journal_path = os.path.join(directory, JOURNAL_NAME)
+        self.sequence = 0
+        self.pending = 0      # records since the last snapshot
+        self.error = None     # first OSError; autosave stops after one
+        self._file = None
+
+    def start(self, simulation_data):
+        """Take over the directory with a fresh snapshot of simulation_data."""
+        os.makedirs(self.directory, exist_ok=True)
+        self.compact(simulation_data)
+
+    def __call__(self, op, args, fields):
+        """The IncrementalEvaluator journal callback."""
+        if self.error is not None or self._file is None:
+            return
+        if op == "reset":
+            # A new or loaded simulation: start over from its snapshot
+            self.compact(args[0].to_dict())
+            return
+        self.sequence += 1
+        record = {"seq": self.sequence, "op": op, "args": [_encode(a) for a in args]}
+        if fields:
+            record["fields"] = fields
+        try:
+            self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self._file.flush()
+        except OSError as e:
+            self.error = e
+            return
+        self.pending += 1
+
+    def compact(self, simulation_data):
+        """Atomically replace the snapshot and truncate the journal."""
+        if self.error is not None:
+            return
+        snapshot = {"sequence": self.sequence, "file_path": self.get_file_path(), "simulation": simulation_data}
+        tmp_path = self.snapshot_path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(snapshot, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            if self._file is not None:
+                self._file.close()
+            self._file = open(self.journal_path, "w")
+        except OSError as e:
+            self.error = e
+            return
+        self.pending = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self):
+        """Clean exit: nothing to recover next time."""
+        self.close()
+        discard(self.directory)
+
+
+def discard(directory):
+    """
+    Remove the autosave files in directory, and directory if that empties
+    it; likewise the crashed session it belonged to, once that is empty.
+    """
+    for name in (JOURNAL_NAME, SNAPSHOT_NAME):
+        try:
+            os.remove(os.path.join(directory, name))
+        except OSError:
+            pass
+    try:
+        os.rmdir(directory)
+    except OSError:
+        pass
+    session = os.path.dirname(directory)
+    if os.path.basename(session).startswith(SESSION_PREFIX):
+        lock = _lock(session)
+        if lock is not None:  # nobody is running in it
+            release_session(session, lock)
+
+
+def _lock(session):
+    """The session's lock file, opened and locked, or None if another process holds it."""
+    try:
+        f = open(os.path.join(session, LOCK_NAME), "a")
+    except OSError:
+        return None
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        f.close()
+        return None
+    return f
+
+
+def claim_session(directory=AUTOSAVE_DIR):
+    """
+    (session directory, lock) for this process: a new directory whose lock
+    file stays locked until release_session() or the process ends.
+    """
+    os.makedirs(directory, exist_ok=True)
+    attempt = 0
+    while True:
+        suffix = f"-{attempt}" if attempt else ""
+        session = os.path.join(directory, f"{SESSION_PREFIX}{os.getpid()}{suffix}")
+        attempt += 1
+        try:
+            # Never reuse a directory: a crashed process with the same pid may have left it
+            os.mkdir(session)
+        except FileExistsError:
+            continue
+        lock = _lock(session)
+        if lock is None:
+            raise OSError(f"Could not lock the autosave directory {session}")
+        return session, lock
+
+
+def release_session(session, lock):
+    """Unlock session, and remove it unless autosaves were left in it."""
+    lock.close()
+    try:
+        os.remove(os.path.join(session, LOCK_NAME))
+        os.rmdir(session)
+    except OSError:
+        pass
+
+
+def document_directory(number, session):
+    """Autosave subdirectory of the number-th document opened in a session."""
+    return os.path.join(session, f"{DOCUMENT_PREFIX}{number}")
+
+
+def _documents(directory):
+    """
+    Document autosave directories in directory, in tab order. directory
+    itself comes first if it holds a snapshot, as autosaves from before
+    documents had a directory each do.
+    """
+    found = []
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return found
+    for name in names:
+        number = name[len(DOCUMENT_PREFIX):]
+        if name.startswith(DOCUMENT_PREFIX) and number.isdigit() and \
+                os.path.exists(os.path.join(directory, name, SNAPSHOT_NAME)):
+            found.append((int(number), os.path.join(directory, name)))
+    if os.path.exists(os.path.join(directory, SNAPSHOT_NAME)):
+        found.append((0, directory))
+    return [path for _, path in sorted(found)]
+
+
+def recoverable(directory=AUTOSAVE_DIR):
+    """
+    Document autosave directories left behind by windows that are no longer
+    running: those of every unlocked session, plus any from before autosaves
+    had sessions. Sessions of running windows are skipped.
+    """
+    found = _documents(directory)
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return found
+    for name in names:
+        session = os.path.join(directory, name)
+        if not name.startswith(SESSION_PREFIX) or not os.path.isdir(session):
+            continue
+        lock = _lock(session)
+        if lock is None:
+            continue  # its window is still running
+        lock.close()
+        found.extend(_documents(session))
+    return found
+
+
+def has_recovery(directory=AUTOSAVE_DIR):
+    """True if a previous session left an autosave behind."""
+    return bool(recoverable(directory))
+
+
+def replay(evaluator, record):
+    """Apply one journal record to an IncrementalEvaluator."""
+    op, args, fields = record["op"], record.get("args", []), record.get("fields", {})
+    if op == "add_worker":
+        evaluator.add_worker(Worker.from_dict(args[0]))
+    elif op == "add_task":
+        evaluator.add_task(Task.from_dict(args[0], len(evaluator.model.workers)))
+    elif op == "add_impact":
+        evaluator.add_impact(Impact.from_dict(args[0]))
+    elif op == "set_name":
+        evaluator.set_name(args[0])
+    elif op == "set_assignment":
+        evaluator.set_assignment(*args)
+    elif op == "set_task_efficiency":
+        evaluator.set_task_efficiency(*args)
+    elif op in ("set_worker", "set_task", "set_impact", "set_output"):
+        getattr(evaluator, op)(*args, **fields)
+    else:
+        raise ValueError(f"Unknown journal operation '{op}'")
+
+
+def recover(directory=AUTOSAVE_DIR):
+    """
+    (Simulation, file_path, replayed record count) from the snapshot and
+    journal in directory, or None if there is nothing to recover.
+    """
+    from labor_recalc import IncrementalEvaluator
+
+    try:
+        with open(os.path.join(directory, SNAPSHOT_NAME), "r") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    evaluator = IncrementalEvaluator(Simulation.from_dict(snapshot["simulation"]))
+    replayed = 0
+    try:
+        with open(os.path.join(directory, JOURNAL_NAME), "r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # torn write at the moment of the crash
+                if record["seq"] <= snapshot["sequence"]:
+                    continue
+                replay(evaluator, record)
+                replayed += 1
+    except FileNotFoundError:
+        pass
+    return evaluator.model, snapshot.get("file_path"), replayed
@@ -0,0 +1,241 @@
+"""
+Task and crew template library.
+
+Templates live in a local SQLite database next to the session cache. Task
+templates are indexed on trade, material unit and name, and mirrored into
+an FTS5 table so a search over tens of thousands of them returns at once.
+Every insert from the library bumps a use count, and results are ranked by
+it so the tasks a user actually picks come first.
+
+    library = TemplateLibrary()
+    library.add_tasks([Task(name="Hang board", base_time=12, material_unit="sheet")], trade="Drywall")
+    for template in library.search("hang", trade="Drywall"):
+        ...
+    library.record_use([template.id for template in picked])
+
+SQLite builds without FTS5 fall back to LIKE matching on the name.
+"""
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field
+
+from labor_model import Task, Worker
+
+LIBRARY_PATH = os.path.join(os.path.expanduser("~"), ".production_builder", "library.sqlite3")
+SEARCH_LIMIT = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS task_templates (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    trade TEXT NOT NULL DEFAULT '',
+    base_time REAL NOT NULL DEFAULT 0,
+    time_unit TEXT NOT NULL DEFAULT 'Minutes',
+    material_unit TEXT NOT NULL DEFAULT 'unit',
+    uses INTEGER NOT NULL DEFAULT 0,
+    last_used REAL,
+    UNIQUE (trade, name, time_unit, material_unit)
+);
+CREATE INDEX IF NOT EXISTS task_templates_trade ON task_templates (trade, uses DESC, name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS task_templates_material_unit ON task_templates (material_unit);
+CREATE INDEX IF NOT EXISTS task_templates_name ON task_templates (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS task_templates_uses ON task_templates (uses DESC, name COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS crew_templates (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    trade TEXT NOT NULL DEFAULT '',
+    workers TEXT NOT NULL DEFAULT '[]',
+    uses INTEGER NOT NULL DEFAULT 0,
+    last_used REAL
+);
+"""
+
+# External-content FTS table kept in step with task_templates by triggers
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS task_templates_fts USING fts5(
+    name, trade, material_unit, content='task_templates', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS task_templates_ai AFTER INSERT ON task_templates BEGIN
+    INSERT INTO task_templates_fts (rowid, name, trade, material_unit)
+    VALUES (new.id, new.name, new.trade, new.material_unit);
+END;
+CREATE TRIGGER IF NOT EXISTS task_templates_ad AFTER DELETE ON task_templates BEGIN
+    INSERT INTO task_templates_fts (task_templates_fts, rowid, name, trade, material_unit)
+    VALUES ('delete', old.id, old.name, old.trade, old.material_unit);
+END;
+CREATE TRIGGER IF NOT EXISTS task_templates_au
+AFTER UPDATE OF name, trade, material_unit ON task_templates BEGIN
+    INSERT INTO task_templates_fts (task_templates_fts, rowid, name, trade, material_unit)
+    VALUES ('delete', old.id, old.name, old.trade, old.material_unit);
+    INSERT INTO task_templates_fts (rowid, name, trade, material_unit)
+    VALUES (new.id, new.name, new.trade, new.material_unit);
+END;
+"""
+
+_TASK_COLUMNS = "t.id, t.name, t.trade, t.base_time, t.time_unit, t.material_unit, t.uses"
+
+
+@dataclass
+class TaskTemplate:
+    id: int
+    name: str
+    trade: str
+    base_time: float
+    time_unit: str
+    material_unit: str
+    uses: int = 0
+
+    def to_task(self):
+        return Task(name=self.name, base_time=self.base_time, time_unit=self.time_unit,
+                    material_unit=self.material_unit)
+
+
+@dataclass
+class CrewTemplate:
+    id: int
+    name: str
+    trade: str
+    workers: list = field(default_factory=list)  # Worker
+    uses: int = 0
+
+
+def fts_query(text):
+    """Prefix-match every word of text, e.g. 'hang bo' -> '"hang"* "bo"*'."""
+    words = [word.replace('"', '""') for word in text.split()]
+    return " ".join(f'"{word}"*' for word in words)
+
+
+class TemplateLibrary:
+
+    def __init__(self, path=LIBRARY_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_SCHEMA)
+        try:
+            self.connection.executescript(_FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            self.has_fts = False
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- task templates ----------------------------------------------------
+
+    def add_tasks(self, tasks, trade=""):
+        """
+        Store Tasks (or TaskTemplates) as templates in one transaction. A
+        template with the same trade, name and units gets the new base time
+        and keeps its use count. Returns the number of rows written.
+        """
+        rows = [(str(task.name).strip(), getattr(task, "trade", None) or trade, float(task.base_time),
+                 task.time_unit, task.material_unit)
+                for task in tasks if str(task.name).strip()]
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO task_templates (name, trade, base_time, time_unit, material_unit) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (trade, name, time_unit, material_unit) DO UPDATE SET base_time = excluded.base_time",
+                rows)
+        return len(rows)
+
+    def search(self, text="", trade=None, material_unit=None, limit=SEARCH_LIMIT):
+        """Task templates matching text and the filters, most used first."""
+        where, params = [], []
+        source = "task_templates t"
+        order = "t.uses DESC, t.name COLLATE NOCASE"
+        if text.strip():
+            if self.has_fts:
+                source += " JOIN task_templates_fts f ON f.rowid = t.id"
+                where.append("task_templates_fts MATCH ?")
+                params.append(fts_query(text))
+                order = "t.uses DESC, f.rank, t.name COLLATE NOCASE"
+            else:
+                for word in text.split():
+                    where.append("(t.name LIKE ? OR t.trade LIKE ?)")
+                    params += [f"%{word}%"] * 2
+        if trade:
+            where.append("t.trade = ?")
+            params.append(trade)
+        if material_unit:
+            where.append("t.material_unit = ?")
+            params.append(material_unit)
+        sql = f"SELECT {_TASK_COLUMNS} FROM {source}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order} LIMIT ?"
+        params.append(limit)
+        return [TaskTemplate(*row) for row in self.connection.execute(sql, params)]
+
+    def get_tasks(self, ids):
+        """Templates by id, in the order given."""
+        ids = list(ids)
+        found = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            sql = f"SELECT {_TASK_COLUMNS} FROM task_templates t WHERE t.id IN ({','.join('?' * len(chunk))})"
+            for row in self.connection.execute(sql, chunk):
+                found[row[0]] = TaskTemplate(*row)
+        return [found[i] for i in ids if i in found]
+
+    def delete_tasks(self, ids):
+        with self.connection:
+            self.connection.executemany("DELETE FROM task_templates WHERE id = ?", [(i,) for i in ids])
+
+    def record_use(self, ids):
+        """Count one use of each task template id (repeats count again)."""
+        now = time.time()
+        with self.connection:
+            self.connection.executemany(
+                "UPDATE task_templates SET uses = uses + 1, last_used = ? WHERE id = ?",
+                [(now, i) for i in ids])
+
+    def trades(self):
+        return [row[0] for row in self.connection.execute(
+            "SELECT DISTINCT trade FROM task_templates WHERE trade != '' ORDER BY trade")]
+
+    def material_units(self):
+        return [row[0] for row in self.connection.execute(
+            "SELECT DISTINCT material_unit FROM task_templates ORDER BY material_unit")]
+
+    def task_count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM task_templates").fetchone()[0]
+
+    # -- crew templates ----------------------------------------------------
+
+    def save_crew(self, name, workers, trade=""):
+        """Store a list of Workers under name, replacing a crew of the same name."""
+        data = json.dumps([worker.to_dict() for worker in workers])
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO crew_templates (name, trade, workers) VALUES (?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET trade = excluded.trade, workers = excluded.workers",
+                (name, trade, data))
+
+    def crews(self):
+        rows = self.connection.execute(
+            "SELECT id, name, trade, workers, uses FROM crew_templates ORDER BY uses DESC, name COLLATE NOCASE")
+        return [CrewTemplate(id, name, trade, [Worker.from_dict(w) for w in json.loads(workers)], uses)
+                for id, name, trade, workers, uses in rows]
+
+    def delete_crew(self, crew_id):
+        with self.connection:
+            self.connection.execute("DELETE FROM crew_templates WHERE id = ?", (crew_id,))
+
+    def record_crew_use(self, crew_id):
+        with self.connection:
+            self.connection.execute("UPDATE crew_templates SET uses = uses + 1, last_used = ? WHERE id = ?",
+                                    (time.time(), crew_id))
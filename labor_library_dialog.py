@@ -0,0 +1,185 @@
+"""
+Library window: search the task template catalog and insert the selected
+templates into the simulation in one batch, save the current tasks or crew
+as templates, and insert saved crews. Storage is labor_library.
+"""
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from labor_library import TemplateLibrary
+
+SEARCH_DELAY_MS = 150  # wait for typing to pause before searching
+
+TASK_COLUMNS = [("name", "Task", 240), ("trade", "Trade", 110), ("base_time", "Base Time", 80),
+                ("time_unit", "Unit", 70), ("material_unit", "Per", 70), ("uses", "Uses", 50)]
+CREW_COLUMNS = [("name", "Crew", 200), ("trade", "Trade", 110), ("workers", "Workers", 260), ("uses", "Uses", 50)]
+
+
+class LibraryDialog(tk.Toplevel):
+    """
+    get_simulation() snapshots the main window; insert_tasks(tasks) and
+    insert_workers(workers) append to it in one batch each.
+    """
+
+    def __init__(self, master, get_simulation, insert_tasks, insert_workers, library=None):
+        super().__init__(master)
+        self.title("Template Library")
+        self.get_simulation = get_simulation
+        self.insert_tasks = insert_tasks
+        self.insert_workers = insert_workers
+        self.library = library or TemplateLibrary()
+        self.search_after = None
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        notebook = ttk.Notebook(self)
+        notebook.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+        task_tab = ttk.Frame(notebook)
+        crew_tab = ttk.Frame(notebook)
+        notebook.add(task_tab, text="Tasks")
+        notebook.add(crew_tab, text="Crews")
+        self.build_task_tab(task_tab)
+        self.build_crew_tab(crew_tab)
+        self.search_tasks()
+        self.show_crews()
+
+    def build_task_tab(self, tab):
+        filters = ttk.Frame(tab)
+        filters.grid(row=0, column=0, sticky="we", pady=5)
+        ttk.Label(filters, text="Search:").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        ttk.Entry(filters, textvariable=self.search_var, width=30).pack(side=tk.LEFT, padx=(2, 8))
+        ttk.Label(filters, text="Trade:").pack(side=tk.LEFT)
+        self.trade_var = tk.StringVar()
+        self.trade_combo = ttk.Combobox(filters, textvariable=self.trade_var, width=14, state="readonly")
+        self.trade_combo.pack(side=tk.LEFT, padx=(2, 8))
+        ttk.Label(filters, text="Per:").pack(side=tk.LEFT)
+        self.unit_var = tk.StringVar()
+        self.unit_combo = ttk.Combobox(filters, textvariable=self.unit_var, width=10, state="readonly")
+        self.unit_combo.pack(side=tk.LEFT, padx=2)
+        for var in (self.search_var, self.trade_var, self.unit_var):
+            var.trace_add("write", self.schedule_search)
+
+        self.task_table = self.make_table(tab, TASK_COLUMNS, row=1)
+
+        buttons = ttk.Frame(tab)
+        buttons.grid(row=2, column=0, sticky="we", pady=5)
+        ttk.Button(buttons, text="➕ Insert Selected", command=self.insert_selected_tasks).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="🗑 Delete", command=self.delete_selected_tasks).pack(side=tk.LEFT, padx=4)
+        ttk.Label(buttons, text="Save current tasks as trade:").pack(side=tk.LEFT, padx=(12, 2))
+        self.save_trade_var = tk.StringVar()
+        ttk.Entry(buttons, textvariable=self.save_trade_var, width=14).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="💾 Save", command=self.save_current_tasks).pack(side=tk.LEFT, padx=2)
+        self.task_status = ttk.Label(tab, text="", foreground="gray")
+        self.task_status.grid(row=3, column=0, sticky="w")
+
+    def build_crew_tab(self, tab):
+        self.crew_table = self.make_table(tab, CREW_COLUMNS, row=0)
+        buttons = ttk.Frame(tab)
+        buttons.grid(row=1, column=0, sticky="we", pady=5)
+        ttk.Button(buttons, text="➕ Insert Crew", command=self.insert_selected_crew).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="🗑 Delete", command=self.delete_selected_crew).pack(side=tk.LEFT, padx=4)
+        ttk.Label(buttons, text="Save current crew as:").pack(side=tk.LEFT, padx=(12, 2))
+        self.crew_name_var = tk.StringVar()
+        ttk.Entry(buttons, textvariable=self.crew_name_var, width=18).pack(side=tk.LEFT)
+        ttk.Label(buttons, text="Trade:").pack(side=tk.LEFT, padx=(6, 2))
+        self.crew_trade_var = tk.StringVar()
+        ttk.Entry(buttons, textvariable=self.crew_trade_var, width=12).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="💾 Save", command=self.save_current_crew).pack(side=tk.LEFT, padx=2)
+
+    @staticmethod
+    def make_table(parent, columns, row):
+        frame = ttk.Frame(parent)
+        frame.grid(row=row, column=0, sticky="nsew")
+        parent.columnconfigure(0, weight=1)
+        parent.rowconfigure(row, weight=1)
+        table = ttk.Treeview(frame, columns=[key for key, _, _ in columns], show="headings",
+                             height=16, selectmode="extended")
+        for key, header, width in columns:
+            table.heading(key, text=header)
+            table.column(key, width=width, anchor="w" if key in ("name", "trade", "workers") else "e")
+        scroll = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=table.yview)
+        table.configure(yscrollcommand=scroll.set)
+        table.grid(row=0, column=0, sticky="nsew")
+        scroll.grid(row=0, column=1, sticky="ns")
+        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(0, weight=1)
+        return table
+
+    def close(self):
+        self.library.close()
+        self.destroy()
+
+    # -- tasks -------------------------------------------------------------
+
+    def schedule_search(self, *args):
+        if self.search_after is not None:
+            self.after_cancel(self.search_after)
+        self.search_after = self.after(SEARCH_DELAY_MS, self.search_tasks)
+
+    def search_tasks(self):
+        self.search_after = None
+        self.trade_combo["values"] = [""] + self.library.trades()
+        self.unit_combo["values"] = [""] + self.library.material_units()
+        templates = self.library.search(self.search_var.get(), self.trade_var.get() or None,
+                                        self.unit_var.get() or None)
+        table = self.task_table
+        table.delete(*table.get_children())
+        for template in templates:
+            table.insert("", tk.END, iid=str(template.id), values=(
+                template.name, template.trade, f"{template.base_time:g}", template.time_unit,
+                template.material_unit, template.uses))
+        self.task_status.config(text=f"{len(templates)} shown of {self.library.task_count()} templates")
+
+    def insert_selected_tasks(self):
+        ids = [int(iid) for iid in self.task_table.selection()]
+        if not ids:
+            return
+        templates = self.library.get_tasks(ids)
+        self.insert_tasks([template.to_task() for template in templates])
+        self.library.record_use(ids)
+        self.task_status.config(text=f"Inserted {len(templates)} tasks")
+
+    def delete_selected_tasks(self):
+        ids = [int(iid) for iid in self.task_table.selection()]
+        if ids and messagebox.askyesno("Template Library", f"Delete {len(ids)} templates?", parent=self):
+            self.library.delete_tasks(ids)
+            self.search_tasks()
+
+    def save_current_tasks(self):
+        tasks = self.get_simulation().tasks
+        count = self.library.add_tasks(tasks, trade=self.save_trade_var.get().strip())
+        self.search_tasks()
+        self.task_status.config(text=f"Saved {count} tasks to the library")
+
+    # -- crews -------------------------------------------------------------
+
+    def show_crews(self):
+        self.crews = {crew.id: crew for crew in self.library.crews()}
+        table = self.crew_table
+        table.delete(*table.get_children())
+        for crew in self.crews.values():
+            members = ", ".join(f"{w.name or '?'} ({w.efficiency:g})" for w in crew.workers)
+            table.insert("", tk.END, iid=str(crew.id), values=(crew.name, crew.trade, members, crew.uses))
+
+    def insert_selected_crew(self):
+        for iid in self.crew_table.selection():
+            crew = self.crews[int(iid)]
+            self.insert_workers(crew.workers)
+            self.library.record_crew_use(crew.id)
+        self.show_crews()
+
+    def delete_selected_crew(self):
+        for iid in self.crew_table.selection():
+            self.library.delete_crew(int(iid))
+        self.show_crews()
+
+    def save_current_crew(self):
+        name = self.crew_name_var.get().strip()
+        workers = self.get_simulation().workers
+        if not name or not workers:
+            messagebox.showwarning("Template Library", "Name the crew and add workers first.", parent=self)
+            return
+        self.library.save_crew(name, workers, self.crew_trade_var.get().strip())
+        self.show_crews()
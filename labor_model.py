@@ -0,0 +1,546 @@
+"""
+Plain data model of a Construction Labor Simulator simulation.
+
+Workers, tasks, impacts and output settings as dataclasses that round-trip
+the save_simulation JSON schema, plus the result types and their GUI and
+export wording. This module is deliberately free of NumPy and pandas so the
+window can start without loading them; the vectorized math lives in
+labor_engine.
+"""
+import json
+import math
+from dataclasses import dataclass, field
+
+OUTPUT_TYPES = ["Square-foot", "Linear-Foot", "Man Day (SF)", "Man Day (LF)"]
+HOURS_PER_MAN_DAY = 8
+# "Wright": the average time of the first n units falls to rate x at every
+# doubling of n; "Crawford": the time of unit n itself does.
+LEARNING_MODELS = ["None", "Wright", "Crawford"]
+
+
+def unit_factor(time_unit):
+    """Minutes per base-time unit ("Minutes" -> 1, anything else -> 60)."""
+    return 1 if str(time_unit).lower() == "minutes" else 60
+
+
+@dataclass
+class Worker:
+    name: str = ""
+    efficiency: float = 1.0
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(name=data.get("name", ""), efficiency=float(data.get("efficiency", 1.0)))
+
+    def to_dict(self):
+        return {"name": self.name, "efficiency": self.efficiency}
+
+
+@dataclass
+class Task:
+    name: str = ""
+    base_time: float = 0.0
+    time_unit: str = "Minutes"
+    material_unit: str = "unit"
+    assigned_workers: list = field(default_factory=list)
+    # worker index -> efficiency on this task; other workers use Worker.efficiency
+    efficiency_overrides: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data, worker_count=None):
+        # A worker is either on the task or not; repeats in a file count once
+        assigned = sorted(set(data.get("assigned_workers", [])))
+        overrides = {int(w): float(e) for w, e in data.get("efficiency_overrides", {}).items()}
+        if worker_count is not None:
+            # Indices past the end of the crew were never shown as checkboxes
+            assigned = [i for i in assigned if 0 <= i < worker_count]
+            overrides = {w: e for w, e in overrides.items() if 0 <= w < worker_count}
+        return cls(
+            name=data.get("name", ""),
+            base_time=float(data.get("base_time", 0.0)),
+            time_unit=data.get("time_unit", "Minutes"),
+            material_unit=data.get("material_unit", "unit"),
+            assigned_workers=assigned,
+            efficiency_overrides=overrides,
+        )
+
+    def to_dict(self):
+        data = {
+            "name": self.name,
+            "base_time": self.base_time,
+            "time_unit": self.time_unit,
+            "material_unit": self.material_unit,
+            "assigned_workers": list(self.assigned_workers),
+        }
+        if self.efficiency_overrides:
+            # JSON object keys are strings; files without overrides keep the old schema
+            data["efficiency_overrides"] = {str(w): e for w, e in sorted(self.efficiency_overrides.items())}
+        return data
+
+    def efficiency(self, w, workers):
+        """Worker w's efficiency on this task."""
+        efficiency = self.efficiency_overrides.get(w)
+        return workers[w].efficiency if efficiency is None else efficiency
+
+
+@dataclass
+class Impact:
+    name: str = ""
+    time: float = 0.0
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(name=data.get("name", ""), time=float(data.get("time", 0.0)))
+
+    def to_dict(self):
+        return {"name": self.name, "time": self.time}
+
+
+@dataclass
+class OutputSettings:
+    output_type: str = "Square-foot"
+    length: float = 0.0
+    height: float = 0.0
+    target: float = 0.0
+    time_display_unit: str = "minutes"
+    learning_model: str = "None"
+    learning_rate: float = 0.9     # time multiplier per doubling of units
+    learning_plateau: float = 0.0  # unit after which the crew stops speeding up; 0 = never
+
+    @property
+    def learning(self):
+        return self.learning_model != "None"
+
+    @classmethod
+    def from_dict(cls, data):
+        # Handle backward compatibility for renamed "Man Day" option
+        output_type = data.get("output_type", "Square-foot")
+        if output_type == "Man Day":
+            output_type = "Man Day (SF)"
+
+        # Support for both old and new formats
+        if "target_area" in data:
+            target = float(data.get("target_area", 0))
+        else:
+            target = float(data.get("target", 0))
+
+        return cls(
+            output_type=output_type,
+            length=float(data.get("length", 0)),
+            height=float(data.get("height", 0)),
+            target=target,
+            time_display_unit=data.get("time_display_unit", "minutes"),
+            learning_model=data.get("learning_model", "None"),
+            learning_rate=float(data.get("learning_rate", 0.9)),
+            learning_plateau=float(data.get("learning_plateau", 0)),
+        )
+
+    def to_dict(self):
+        data = {
+            "output_type": self.output_type,
+            "length": self.length,
+            "height": self.height,
+            "target": self.target,
+            "time_display_unit": self.time_display_unit,
+        }
+        if self.learning:
+            # Files without a learning curve keep the old schema
+            data.update(learning_model=self.learning_model, learning_rate=self.learning_rate,
+                        learning_plateau=self.learning_plateau)
+        return data
+
+
+@dataclass
+class Simulation:
+    simulation_name: str = ""
+    workers: list = field(default_factory=list)
+    tasks: list = field(default_factory=list)
+    impacts: list = field(default_factory=list)
+    output_settings: OutputSettings = field(default_factory=OutputSettings)
+    version: str = "V1.0"
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a simulation from the save_simulation JSON schema."""
+        workers = [Worker.from_dict(w) for w in data.get("workers", [])]
+        return cls(
+            simulation_name=data.get("simulation_name", ""),
+            workers=workers,
+            tasks=[Task.from_dict(t, len(workers)) for t in data.get("tasks", [])],
+            impacts=[Impact.from_dict(i) for i in data.get("impacts", [])],
+            output_settings=OutputSettings.from_dict(data.get("output_settings", {})),
+            version=data.get("version", "V1.0"),
+        )
+
+    def to_dict(self):
+        """Serialize to the save_simulation JSON schema."""
+        return {
+            "simulation_name": self.simulation_name,
+            "workers": [w.to_dict() for w in self.workers],
+            "tasks": [t.to_dict() for t in self.tasks],
+            "impacts": [i.to_dict() for i in self.impacts],
+            "output_settings": self.output_settings.to_dict(),
+            "version": self.version,
+        }
+
+    def to_arrays(self):
+        from labor_engine import SimulationArrays
+        return SimulationArrays.from_simulation(self)
+
+
+class AssignmentMatrix:
+    """
+    Task x worker assignment bits.
+
+    Each task row and each worker column is a Python int used as a bitset,
+    so a 500 x 40 crew costs a few kilobytes instead of 20,000 BooleanVars,
+    and "which tasks use worker w" is a single int.
+    """
+
+    def __init__(self, task_count=0, worker_count=0):
+        self.rows = [0] * task_count
+        self.cols = [0] * worker_count
+
+    @classmethod
+    def from_tasks(cls, tasks, worker_count):
+        matrix = cls(0, worker_count)
+        for task in tasks:
+            matrix.add_task(task.assigned_workers)
+        return matrix
+
+    @property
+    def shape(self):
+        return len(self.rows), len(self.cols)
+
+    def add_task(self, workers=()):
+        t = len(self.rows)
+        self.rows.append(0)
+        for w in workers:
+            if 0 <= w < len(self.cols):
+                self.set(t, w, True)
+        return t
+
+    def add_worker(self):
+        self.cols.append(0)
+        return len(self.cols) - 1
+
+    def get(self, t, w):
+        return bool(self.rows[t] >> w & 1)
+
+    def set(self, t, w, assigned):
+        """Set one cell; returns True if it changed."""
+        if self.get(t, w) == bool(assigned):
+            return False
+        self.rows[t] ^= 1 << w
+        self.cols[w] ^= 1 << t
+        return True
+
+    def workers_of(self, t):
+        return _bit_indices(self.rows[t])
+
+    def tasks_of(self, w):
+        return _bit_indices(self.cols[w])
+
+    def to_numpy(self):
+        """Dense (T, W) bool matrix for the vectorized engine."""
+        import numpy as np
+
+        task_count, worker_count = self.shape
+        dense = np.zeros((task_count, worker_count), dtype=bool)
+        for t, bits in enumerate(self.rows):
+            if bits:
+                dense[t, _bit_indices(bits)] = True
+        return dense
+
+
+def _bit_indices(bits):
+    indices = []
+    while bits:
+        low = bits & -bits
+        indices.append(low.bit_length() - 1)
+        bits ^= low
+    return indices
+
+
+def load_simulation_file(file_path):
+    """Read a saved simulation, JSON or the binary format of labor_binary, into a Simulation."""
+    from labor_binary import is_binary_file, load_binary
+
+    if is_binary_file(file_path):
+        return load_binary(file_path)
+    with open(file_path, "r") as f:
+        return Simulation.from_dict(json.load(f))
+
+
+@dataclass
+class TaskResult:
+    index: int
+    name: str
+    base_time: float
+    time_unit: str
+    material_unit: str
+    adjusted_time: float
+    avg_efficiency: float
+    worker_count: int
+
+
+@dataclass
+class SimulationResult:
+    """Scalar result of one simulation, with the GUI and export wording."""
+    simulation: Simulation
+    task_results: list
+    time_per_unit: float
+    impact_time: float
+    total_workers: int
+    unit_sqft: float
+    units_needed: float
+    total_time: float
+    available_time: int
+    effective_time: float
+    units_completed: float
+    production: float
+    # [(unit, minutes of that unit, cumulative minutes)] with a learning curve
+    learning_curve: list = field(default_factory=list)
+
+    @property
+    def settings(self):
+        return self.simulation.output_settings
+
+    @property
+    def mode(self):
+        return self.settings.output_type
+
+    @property
+    def material_unit(self):
+        tasks = self.simulation.tasks
+        return tasks[0].material_unit if tasks else "unit"
+
+    @property
+    def valid(self):
+        values = [self.time_per_unit, self.impact_time, self.total_time, self.production]
+        return all(math.isfinite(v) for v in values)
+
+    @property
+    def task_time(self):
+        """Task minutes for the whole target, on the learning curve if there is one."""
+        if self.settings.learning:
+            return self.total_time - self.impact_time
+        return self.time_per_unit * self.units_needed
+
+    def learning_text(self):
+        """E.g. "90% Wright curve, plateau at unit 200"."""
+        settings = self.settings
+        text = f"{settings.learning_rate:.0%} {settings.learning_model} curve"
+        if settings.learning_plateau >= 1:
+            text += f", plateau at unit {math.floor(settings.learning_plateau):,}"
+        return text
+
+    def task_time_text(self):
+        """How the target's task time was worked out."""
+        time_per_unit = self.time_per_unit
+        units_needed = self.units_needed
+        if not self.settings.learning:
+            return f"{time_per_unit:.2f} min/unit × {units_needed:.2f} units"
+        average = self.task_time / units_needed if units_needed else 0.0
+        return (f"{units_needed:.2f} units on a {self.learning_text()}: first unit {time_per_unit:.2f} min, "
+                f"average {average:.2f} min/unit")
+
+    def units_completed_text(self):
+        """How the Man Day units completed were worked out."""
+        if not self.settings.learning:
+            return f"{self.effective_time:.2f} ÷ {self.time_per_unit:.2f}"
+        return f"{self.effective_time:.2f} min on a {self.learning_text()} from {self.time_per_unit:.2f} min/unit"
+
+    def display_time(self):
+        """Total time in the selected display unit."""
+        if self.settings.time_display_unit == "hours":
+            return self.total_time / 60
+        return self.total_time
+
+    def summary_text(self):
+        """Text of the final output label."""
+        settings = self.settings
+        total_workers = self.total_workers
+        if self.mode == "Square-foot":
+            return (f"Total Time: {self.display_time():.2f} {settings.time_display_unit} "
+                    f"to complete {settings.target:.0f} sqft")
+        if self.mode == "Linear-Foot":
+            return (f"Total Time: {self.display_time():.2f} {settings.time_display_unit} "
+                    f"to complete {settings.target:.0f} lf")
+        if self.mode == "Man Day (SF)":
+            return (f"Total Production: {self.production:.2f} sqft installed in 1 Man Day "
+                    f"({total_workers} workers)")
+        return (f"Total Production: {self.production:.2f} linear feet installed in 1 Man Day "
+                f"({total_workers} workers)")
+
+    def breakdown_text(self):
+        """Multi-line calculation breakdown shown under the output label."""
+        settings = self.settings
+        total_workers = self.total_workers
+        breakdown = ""
+        for task in self.task_results:
+            breakdown += f"- {task.name or 'Task'}: {task.adjusted_time:.2f} min/unit\n"
+        for impact in self.simulation.impacts:
+            breakdown += (f"- Impact '{impact.name or 'Unnamed'}': {impact.time:.2f} min × {total_workers} "
+                          f"workers = {impact.time * total_workers:.2f} min\n")
+
+        time_per_unit = self.time_per_unit
+        units_needed = self.units_needed
+        impact_time = self.impact_time
+        if self.mode == "Square-foot":
+            if settings.learning:
+                breakdown += (f"\nUnits needed: {units_needed:.2f} → Task time: {self.task_time_text()} = "
+                              f"{self.task_time:.2f} min")
+            else:
+                breakdown += (f"\nUnits needed: {units_needed:.2f} → Task time: {time_per_unit:.2f} × "
+                              f"{units_needed:.2f} = {time_per_unit * units_needed:.2f} min")
+            breakdown += f"\n+ Impacts: {impact_time:.2f} min → Total: {self.total_time:.2f} min"
+            if settings.time_display_unit == "hours":
+                breakdown += f"\n\nDisplayed in hours: {self.display_time():.2f} hours"
+        elif self.mode == "Linear-Foot":
+            target_length = settings.target
+            unit_length = settings.length
+            breakdown += f"\nTarget length: {target_length:.2f} lf"
+            breakdown += f"\nUnit length: {unit_length:.2f} lf"
+            breakdown += (f"\nUnits needed: {target_length:.2f} ÷ {unit_length:.2f} = "
+                          f"{units_needed:.2f} units")
+            breakdown += f"\nTask time: {self.task_time_text()} = {self.task_time:.2f} min"
+            breakdown += f"\n+ Impacts: {impact_time:.2f} min → Total: {self.total_time:.2f} min"
+            if settings.time_display_unit == "hours":
+                breakdown += f"\n\nDisplayed in hours: {self.display_time():.2f} hours"
+        else:
+            breakdown += (f"\nCrew size: {total_workers} workers × {HOURS_PER_MAN_DAY} hours = "
+                          f"{total_workers * HOURS_PER_MAN_DAY} work hours")
+            breakdown += f"\nTotal available time: {self.available_time} minutes"
+            breakdown += (f"\n- Impacts: {impact_time:.2f} min → Working time = "
+                          f"{self.effective_time:.2f} min")
+            breakdown += f"\nTime per unit: {time_per_unit:.2f} min"
+            breakdown += f"\nUnits completed: {self.units_completed_text()} = {self.units_completed:.2f}"
+            if self.mode == "Man Day (SF)":
+                breakdown += f"\nUnit size: {self.unit_sqft:.2f} sqft → Total: {self.production:.2f} sqft"
+            else:
+                breakdown += (f"\nUnit length: {settings.length:.2f} lf → Total: "
+                              f"{self.production:.2f} linear feet")
+        return breakdown
+
+    def result_rows(self):
+        """Rows of the Results sheet written by the Excel export."""
+        return list(self.iter_result_rows())
+
+    def iter_result_rows(self):
+        """Results sheet rows one at a time, for streaming writers."""
+        total_workers = self.total_workers
+
+        for n, task in enumerate(self.task_results):
+            yield {
+                "Category": "Task",
+                "Name": task.name or f"Task {n+1}",
+                "Time (min)": task.adjusted_time,
+                "Notes": (f"Base: {task.base_time} {task.time_unit.lower()}, "
+                          f"Efficiency: {task.avg_efficiency:.2f}, Workers: {task.worker_count}")
+            }
+
+        for impact in self.simulation.impacts:
+            yield {
+                "Category": "Impact",
+                "Name": impact.name or "Unnamed Impact",
+                "Time (min)": impact.time * total_workers,
+                "Notes": f"Per Worker: {impact.time} min × {total_workers} workers"
+            }
+
+        yield from self.learning_curve_rows()
+        yield from self.summary_rows()
+
+    def learning_curve_rows(self):
+        """The per-unit learning curve rows of the Results sheet; none without a curve."""
+        return [{
+            "Category": "Learning Curve",
+            "Name": f"Unit {unit:,}",
+            "Time (min)": minutes,
+            "Notes": f"Cumulative: {cumulative:.2f} min, average {cumulative / unit:.2f} min/unit",
+        } for unit, minutes, cumulative in self.learning_curve]
+
+    def summary_rows(self):
+        """The Summary rows closing the Results sheet."""
+        settings = self.settings
+        total_workers = self.total_workers
+        rows = []
+
+        def summary(name, time, notes):
+            rows.append({"Category": "Summary", "Name": name, "Time (min)": time, "Notes": notes})
+
+        time_per_unit = self.time_per_unit
+        units_needed = self.units_needed
+        if self.mode == "Square-foot":
+            total_area = settings.target
+            summary("Units Needed", None, f"{units_needed:.2f} units for {total_area:.2f} sqft")
+            summary("Total Task Time", self.task_time, self.task_time_text())
+            summary("Total Impact Time", self.impact_time, "Sum of all impacts")
+            summary("Total Time", self.total_time, f"To complete {total_area:.2f} sqft")
+        elif self.mode == "Linear-Foot":
+            target_length = settings.target
+            unit_length = settings.length
+            summary("Target Length", None, f"{target_length:.2f} linear feet")
+            summary("Unit Length", None, f"{unit_length:.2f} feet per unit")
+            summary("Units Needed", None,
+                    f"{units_needed:.2f} units ({target_length:.2f} lf ÷ {unit_length:.2f} lf/unit)")
+            summary("Total Task Time", self.task_time, self.task_time_text())
+            summary("Total Impact Time", self.impact_time, "Sum of all impacts")
+            summary("Total Time", self.total_time, f"To complete {target_length:.2f} linear feet")
+        else:
+            available_time = self.available_time
+            summary("Crew Size", None,
+                    f"{total_workers} workers × {HOURS_PER_MAN_DAY} hours = "
+                    f"{total_workers * HOURS_PER_MAN_DAY} work hours")
+            summary("Available Time", available_time,
+                    f"{total_workers} workers × {HOURS_PER_MAN_DAY} hours = {available_time} minutes")
+            summary("Effective Working Time", self.effective_time,
+                    f"Available time minus impacts: {available_time} - {self.impact_time:.2f}")
+            if settings.learning:
+                summary("Units Completed", None,
+                        f"{self.units_completed:.2f} units ({self.units_completed_text()})")
+            else:
+                summary("Units Completed", None,
+                        f"{self.units_completed:.2f} units ({self.effective_time:.2f} min ÷ "
+                        f"{time_per_unit:.2f} min/unit)")
+            if self.mode == "Man Day (SF)":
+                summary("Total Production (SF)", None,
+                        f"{self.production:.2f} sqft ({self.units_completed:.2f} units × "
+                        f"{self.unit_sqft:.2f} sqft/unit)")
+            else:
+                summary("Total Production (LF)", None,
+                        f"{self.production:.2f} linear feet ({self.units_completed:.2f} units × "
+                        f"{settings.length:.2f} lf/unit)")
+
+        if self.mode in ("Square-foot", "Linear-Foot") and settings.time_display_unit == "hours":
+            summary("Total Time (hours)", self.total_time / 60,
+                    f"Converted to hours: {self.total_time/60:.2f}")
+        return rows
+
+
+def simulation_result(sim, task_results, totals):
+    """Wrap aggregated totals (see aggregate_totals) in a SimulationResult."""
+    total_workers = len(sim.workers)
+    result = SimulationResult(
+        simulation=sim,
+        task_results=task_results,
+        time_per_unit=float(totals["time_per_unit"]),
+        impact_time=float(totals["impact_time"]),
+        total_workers=total_workers,
+        unit_sqft=float(totals["unit_sqft"]),
+        units_needed=float(totals["units_needed"]),
+        total_time=float(totals["total_time"]),
+        available_time=HOURS_PER_MAN_DAY * 60 * total_workers,
+        effective_time=float(totals["effective_time"]),
+        units_completed=float(totals["units_completed"]),
+        production=float(totals["production"]),
+    )
+    settings = sim.output_settings
+    if settings.learning:
+        from labor_engine import learning_curve
+
+        man_day = settings.output_type.startswith("Man Day")
+        result.learning_curve = learning_curve(
+            result.time_per_unit, result.units_completed if man_day else result.units_needed,
+            settings.learning_model, settings.learning_rate, settings.learning_plateau)
+    return result
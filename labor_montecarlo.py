@@ -0,0 +1,404 @@
+"""
+Monte Carlo risk analysis.
+
+Base times, worker efficiencies and impact minutes can each be given a
+distribution; the simulation is then evaluated for many random draws and
+the spread of the total time (or Man Day production) is reported as
+percentiles and a histogram.
+
+Distributions are written one per line as ``name[N] = kind(a, b, c)``:
+
+    base_time[3] = triangular(4, 5, 8)     low, most likely, high
+    efficiency[1] = normal(1.0, 0.1)       mean, standard deviation
+    impact[2] = pert(10, 15, 40)           low, most likely, high
+    base_time[*] = pert(0.9, 1.0, 1.3)     every task, as multiples of its own value
+
+Samples are drawn and evaluated in chunks, so memory depends on the chunk
+size and not on the number of samples, and chunks are spread over worker
+processes. Chunk i always draws from SeedSequence(seed, spawn_key=(i,)), so a
+given seed reproduces the same result however many processes are used.
+Outcomes are accumulated into a fine fixed-bin histogram whose range is
+set by the first chunk; percentiles are read off that histogram.
+"""
+import math
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+
+import numpy as np
+
+from labor_engine import aggregate_totals, task_minutes, unit_factor
+
+CHUNK_ELEMENTS = 4_000_000   # sample x task cells per chunk (about 32 MB of floats)
+MAX_CHUNK_SAMPLES = 100_000
+HISTOGRAM_BINS = 8192        # fine bins percentiles are interpolated from
+PERCENTILES = (10, 50, 80, 90)
+
+DISTRIBUTIONS = {"triangular": 3, "normal": 2, "pert": 3}
+TARGETS = {"base_time": "Task", "efficiency": "Worker", "impact": "Impact"}
+
+_LINE = re.compile(r"^\s*([a-z_]+)\s*\[\s*(\d+|\*)\s*\]\s*=\s*([a-z]+)\s*\((.*)\)\s*$")
+
+
+@dataclass
+class Distribution:
+    kind: str     # a DISTRIBUTIONS key
+    params: tuple
+
+    def validate(self):
+        if self.kind == "normal":
+            if self.params[1] < 0:
+                raise ValueError("normal standard deviation must not be negative")
+        else:
+            low, mode, high = self.params
+            if not low <= mode <= high or low == high:
+                raise ValueError(f"{self.kind} needs low <= most likely <= high with low < high")
+
+    def sample(self, rng, size):
+        if self.kind == "triangular":
+            return rng.triangular(*self.params, size=size)
+        if self.kind == "normal":
+            # A negative time or efficiency is meaningless; truncate at zero
+            return np.maximum(rng.normal(*self.params, size=size), 0.0)
+        low, mode, high = self.params
+        alpha = 1 + 4 * (mode - low) / (high - low)
+        beta = 1 + 4 * (high - mode) / (high - low)
+        return low + rng.beta(alpha, beta, size=size) * (high - low)
+
+
+@dataclass
+class UncertainInput:
+    name: str                  # a TARGETS key
+    index: int                 # 0-based, or None for every task/worker/impact
+    distribution: Distribution
+
+    @property
+    def label(self):
+        which = "all" if self.index is None else self.index + 1
+        return f"{self.name}[{which}] = {self.distribution.kind}{self.distribution.params}"
+
+    def targets(self, sim):
+        """Indices this input applies to."""
+        count = {"base_time": len(sim.tasks), "efficiency": len(sim.workers),
+                 "impact": len(sim.impacts)}[self.name]
+        if self.index is None:
+            return list(range(count))
+        if not 0 <= self.index < count:
+            raise ValueError(f"{TARGETS[self.name]} {self.index + 1} does not exist "
+                             f"(there are {count})")
+        return [self.index]
+
+
+def parse_inputs(text):
+    """Parse the one-distribution-per-line syntax (see module docstring)."""
+    inputs = []
+    for line_no, line in enumerate(text.splitlines(), 1):
+        line = line.split("#", 1)[0]
+        if not line.strip():
+            continue
+        match = _LINE.match(line)
+        if not match:
+            raise ValueError(f"Line {line_no}: expected 'name[N] = kind(a, b, c)', got '{line.strip()}'")
+        name, index, kind, args = match.groups()
+        if name not in TARGETS:
+            raise ValueError(f"Line {line_no}: unknown input '{name}'")
+        if kind not in DISTRIBUTIONS:
+            raise ValueError(f"Line {line_no}: unknown distribution '{kind}'")
+        try:
+            params = tuple(float(a) for a in args.split(",") if a.strip())
+        except ValueError:
+            raise ValueError(f"Line {line_no}: distribution parameters must be numbers") from None
+        if len(params) != DISTRIBUTIONS[kind]:
+            raise ValueError(f"Line {line_no}: {kind} takes {DISTRIBUTIONS[kind]} numbers")
+        distribution = Distribution(kind, params)
+        try:
+            distribution.validate()
+        except ValueError as e:
+            raise ValueError(f"Line {line_no}: {e}") from None
+        inputs.append(UncertainInput(name, None if index == "*" else int(index) - 1, distribution))
+    return inputs
+
+
+def chunk_sizes(samples, chunk_size):
+    full, rest = divmod(samples, chunk_size)
+    return [chunk_size] * full + ([rest] if rest else [])
+
+
+def default_chunk_size(sim):
+    return max(256, min(MAX_CHUNK_SAMPLES, CHUNK_ELEMENTS // max(1, len(sim.tasks) + len(sim.workers))))
+
+
+def sample_headline(sim, inputs, rng, n):
+    """Draw n samples of every uncertain input and return the n headline values."""
+    arrays = sim.to_arrays()
+    factors = np.array([unit_factor(t.time_unit) for t in sim.tasks], dtype=float)
+    base = arrays.base_minutes
+    efficiencies = arrays.efficiencies
+    impacts = arrays.impact_minutes
+
+    # Tasks whose minutes vary: sampled base times and tasks of sampled workers
+    varying = np.zeros(len(sim.tasks), dtype=bool)
+    for u in inputs:
+        targets = u.targets(sim)
+        if u.name == "base_time":
+            varying[targets] = True
+        elif u.name == "efficiency":
+            varying |= arrays.assignments[:, targets].any(axis=1)
+    fixed_minutes, _, _ = task_minutes(base[~varying], efficiencies, arrays.assignments[~varying],
+                                       **arrays.overrides(~varying))
+    time_per_unit = np.full(n, fixed_minutes.sum())
+
+    # Draw in declaration order so a seed always means the same samples
+    sub_base = np.repeat(base[varying][None, :], n, axis=0)
+    column = np.cumsum(varying) - 1
+    sampled_efficiencies = None
+    sampled_impacts = None
+    for u in inputs:
+        targets = u.targets(sim)
+        draws = u.distribution.sample(rng, (n, len(targets)))
+        if u.name == "base_time":
+            sub_base[:, column[targets]] = draws * (base[targets] if u.index is None else factors[targets])
+        elif u.name == "efficiency":
+            if sampled_efficiencies is None:
+                sampled_efficiencies = np.repeat(efficiencies[None, :], n, axis=0)
+            sampled_efficiencies[:, targets] = draws * efficiencies[targets] if u.index is None else draws
+        else:
+            if sampled_impacts is None:
+                sampled_impacts = np.repeat(impacts[None, :], n, axis=0)
+            sampled_impacts[:, targets] = draws * impacts[targets] if u.index is None else draws
+
+    if varying.any():
+        minutes, _, _ = task_minutes(
+            sub_base, efficiencies if sampled_efficiencies is None else sampled_efficiencies,
+            arrays.assignments[varying], **arrays.overrides(varying))
+        time_per_unit = time_per_unit + minutes.sum(axis=-1)
+    totals = aggregate_totals(time_per_unit, impacts if sampled_impacts is None else sampled_impacts,
+                              len(sim.workers), arrays.length, arrays.height, arrays.target,
+                              arrays.output_type, **arrays.learning())
+    return totals["production" if arrays.output_type.startswith("Man Day") else "total_time"]
+
+
+def chunk_rng(seed, index):
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+
+
+def chunk_stats(sim, inputs, seed, index, n, edges):
+    """Evaluate chunk `index` and fold it into histogram counts and moments."""
+    return fold(sample_headline(sim, inputs, chunk_rng(seed, index), n), edges)
+
+
+def fold(values, edges):
+    """Histogram counts and moments of one chunk's headline values."""
+    n = len(values)
+    finite = values[np.isfinite(values)]
+    counts, _ = np.histogram(finite, bins=edges)
+    return {
+        "counts": counts,
+        "below": int((finite < edges[0]).sum()),
+        "above": int((finite > edges[-1]).sum()),
+        "invalid": int(n - len(finite)),
+        "sum": float(finite.sum()),
+        "sum_sq": float(np.square(finite).sum()),
+        "min": float(finite.min()) if len(finite) else math.inf,
+        "max": float(finite.max()) if len(finite) else -math.inf,
+    }
+
+
+def _chunk_job(args):
+    return chunk_stats(*args)
+
+
+def histogram_edges(values):
+    """Bin edges covering the pilot chunk's range with room on either side."""
+    finite = values[np.isfinite(values)]
+    if not len(finite):
+        return np.linspace(0.0, 1.0, HISTOGRAM_BINS + 1)
+    low, high = float(finite.min()), float(finite.max())
+    pad = (high - low) * 0.5 or max(abs(low) * 0.01, 1.0)
+    return np.linspace(low - pad, high + pad, HISTOGRAM_BINS + 1)
+
+
+@dataclass
+class MonteCarloResult:
+    metric: str
+    samples: int
+    invalid: int
+    seed: int
+    edges: np.ndarray       # (HISTOGRAM_BINS + 1,)
+    counts: np.ndarray      # (HISTOGRAM_BINS,)
+    below: int
+    above: int
+    mean: float
+    std: float
+    min: float
+    max: float
+
+    @property
+    def valid(self):
+        return self.samples - self.invalid
+
+    def percentile(self, q):
+        """Value below which q percent of the valid samples fall."""
+        if not self.valid:
+            return math.nan
+        rank = q / 100 * self.valid
+        if rank <= self.below:
+            return self.min
+        cumulative = self.below + np.cumsum(self.counts)
+        b = int(np.searchsorted(cumulative, rank))
+        if b >= len(self.counts):
+            return self.max
+        before = cumulative[b] - self.counts[b]
+        fraction = (rank - before) / self.counts[b] if self.counts[b] else 0.0
+        value = self.edges[b] + fraction * (self.edges[b + 1] - self.edges[b])
+        return float(min(max(value, self.min), self.max))
+
+    def percentiles(self):
+        return {q: self.percentile(q) for q in PERCENTILES}
+
+    def histogram(self, bins=40):
+        """(counts, edges) regrouped into about `bins` bars spanning min..max."""
+        if not self.valid or not math.isfinite(self.min):
+            return np.zeros(0, dtype=int), np.zeros(1)
+        first = max(0, int(np.searchsorted(self.edges, self.min, side="right")) - 1)
+        last = min(len(self.counts), int(np.searchsorted(self.edges, self.max, side="left")))
+        last = max(last, first + 1)
+        group = max(1, math.ceil((last - first) / bins))
+        last = min(len(self.counts), first + group * math.ceil((last - first) / group))
+        counts = self.counts[first:last]
+        counts = np.add.reduceat(counts, np.arange(0, len(counts), group))
+        counts[0] += self.below
+        counts[-1] += self.above
+        return counts, self.edges[first:last + 1:group]
+
+    def summary_text(self):
+        if not self.valid:
+            return f"{self.samples:,} samples, no valid results"
+        p = self.percentiles()
+        text = " | ".join(f"P{q}: {p[q]:.2f}" for q in PERCENTILES)
+        text = f"{self.metric} — {text} | mean {self.mean:.2f}"
+        if self.invalid:
+            text += f" | {self.invalid:,} invalid samples"
+        return text
+
+
+def run_monte_carlo(sim, inputs, samples, seed=0, chunk_size=None, jobs=None,
+                    progress=None, cancel_event=None):
+    """
+    Evaluate `samples` random draws of the uncertain inputs.
+
+    progress(samples_done) is called as chunks finish; setting cancel_event
+    abandons the run and returns None.
+    """
+    if samples < 1:
+        raise ValueError("samples must be at least 1")
+    chunk_size = chunk_size or default_chunk_size(sim)
+    sizes = chunk_sizes(samples, chunk_size)
+    for u in inputs:
+        u.targets(sim)  # raises for out-of-range indices
+
+    # The first chunk runs here and fixes the histogram range for the rest
+    pilot = sample_headline(sim, inputs, chunk_rng(seed, 0), sizes[0])
+    edges = histogram_edges(pilot)
+    stats = [fold(pilot, edges)]
+    del pilot
+    done = sizes[0]
+    if progress:
+        progress(done)
+
+    rest = [(sim, inputs, seed, i, n, edges) for i, n in enumerate(sizes) if i > 0]
+    jobs = jobs or os.cpu_count() or 1
+    if rest and jobs > 1:
+        results = {}
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = {executor.submit(_chunk_job, args): args[3] for args in rest}
+            for future in as_completed(futures):
+                if cancel_event is not None and cancel_event.is_set():
+                    executor.shutdown(cancel_futures=True)
+                    return None
+                results[futures[future]] = future.result()
+                done += sizes[futures[future]]
+                if progress:
+                    progress(done)
+        # Combine in chunk order so floating point sums do not depend on timing
+        stats.extend(results[i] for i in sorted(results))
+    else:
+        for args in rest:
+            if cancel_event is not None and cancel_event.is_set():
+                return None
+            stats.append(_chunk_job(args))
+            done += args[4]
+            if progress:
+                progress(done)
+
+    valid = sum(s["counts"].sum() + s["below"] + s["above"] for s in stats)
+    total = sum(s["sum"] for s in stats)
+    total_sq = sum(s["sum_sq"] for s in stats)
+    mean = total / valid if valid else math.nan
+    variance = max(total_sq / valid - mean * mean, 0.0) if valid else math.nan
+    mode = sim.output_settings.output_type
+    metric = {"Man Day (SF)": "Production (sqft)", "Man Day (LF)": "Production (lf)"}.get(
+        mode, "Total Time (min)")
+    return MonteCarloResult(
+        metric=metric,
+        samples=samples,
+        invalid=sum(s["invalid"] for s in stats),
+        seed=seed,
+        edges=edges,
+        counts=sum(s["counts"] for s in stats),
+        below=sum(s["below"] for s in stats),
+        above=sum(s["above"] for s in stats),
+        mean=mean,
+        std=math.sqrt(variance),
+        min=min(s["min"] for s in stats),
+        max=max(s["max"] for s in stats),
+    )
+
+
+class MonteCarloJob:
+    """A run_monte_carlo call on a worker thread, polled from the Tk thread."""
+
+    def __init__(self, sim, inputs, samples, seed):
+        self.sim = sim
+        self.inputs = inputs
+        self.samples = samples
+        self.seed = seed
+        self.samples_done = 0
+        self.result = None
+        self.error = None
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="monte-carlo", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    @property
+    def fraction(self):
+        return self.samples_done / self.samples if self.samples else 0.0
+
+    def _progress(self, samples_done):
+        self.samples_done = samples_done
+
+    def _run(self):
+        try:
+            self.result = run_monte_carlo(self.sim, self.inputs, self.samples, self.seed,
+                                          progress=self._progress, cancel_event=self._cancel)
+        except Exception as e:
+            self.error = e
+        finally:
+            self._done.set()
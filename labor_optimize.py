@@ -0,0 +1,377 @@
+"""
+Crew assignment optimizer.
+
+A task's adjusted time is base * count / avg_eff = base * count**2 / S,
+where S is the summed efficiency of its crew on that task. Total time (target modes) and
+Man Day production both improve exactly when the summed per-task time
+falls, because impacts and the available day do not depend on who works
+on what. The optimizer therefore minimizes time per unit over worker
+subsets per task, subject to:
+
+    task[N] min=2 max=4 require=1,3 exclude=5    per-task rules
+    worker[N] max_tasks=3                          per-worker capacity
+    min_workers / max_workers / max_tasks_per_worker defaults for all
+
+Without capacities every task is independent and the search reaches the
+bound on its first descent. With capacities it is a depth-first branch and
+bound over tasks (largest first): each task's candidate crews are generated
+lazily in increasing cost, and the remaining tasks are bounded by their best
+crew from the workers that still have capacity, memoized per availability
+bitmask. A time limit turns it into an anytime search that returns the best
+plan found so far. That bound ignores how much capacity is left, so on large
+capacity-constrained problems (a hundred tasks over thirty workers) the
+search seldom proves the optimum in seconds: expect the plan found at the
+time limit, with optimal=False.
+"""
+import heapq
+import math
+import re
+import time
+from dataclasses import dataclass, field
+
+from labor_model import _bit_indices, unit_factor
+
+DEFAULT_TIME_LIMIT = 5.0  # seconds
+EPSILON = 1e-9  # relative; a plan must beat the incumbent by more than this
+
+_RULE = re.compile(r"^\s*(task|worker)\s*\[\s*(\d+)\s*\]\s*(.*)$")
+
+
+@dataclass
+class TaskRule:
+    min_workers: int = None   # None: use the CrewConstraints default
+    max_workers: int = None
+    required: set = field(default_factory=set)
+    excluded: set = field(default_factory=set)
+
+
+@dataclass
+class CrewConstraints:
+    min_workers: int = 1
+    max_workers: int = None          # None: the whole crew
+    max_tasks_per_worker: int = None  # None: unlimited
+    task_rules: dict = field(default_factory=dict)        # task index -> TaskRule
+    worker_max_tasks: dict = field(default_factory=dict)  # worker index -> int
+
+
+def parse_rules(text, constraints=None, sim=None):
+    """
+    Add the one-rule-per-line syntax (see module docstring) to constraints.
+    Task and worker numbers start at 1; given sim, they must also exist in it.
+    """
+    constraints = constraints or CrewConstraints()
+    counts = {"task": len(sim.tasks), "worker": len(sim.workers)} if sim is not None else {}
+
+    def check(kind, number):
+        count = counts.get(kind)
+        if number < 1 or count is not None and number > count:
+            limit = f" (there are {count})" if count is not None else ""
+            raise ValueError(f"{kind.capitalize()} {number} does not exist{limit}")
+        return number - 1
+
+    for line_no, line in enumerate(text.splitlines(), 1):
+        line = line.split("#", 1)[0]
+        if not line.strip():
+            continue
+        match = _RULE.match(line)
+        if not match:
+            raise ValueError(f"Line {line_no}: expected 'task[N] ...' or 'worker[N] ...', got '{line.strip()}'")
+        kind, number, settings = match.groups()
+        try:
+            index = check(kind, int(number))
+        except ValueError as e:
+            raise ValueError(f"Line {line_no}: {e}") from None
+        for item in settings.split():
+            key, _, value = item.partition("=")
+            try:
+                if kind == "worker" and key == "max_tasks":
+                    constraints.worker_max_tasks[index] = int(value)
+                elif kind == "task" and key in ("min", "max"):
+                    rule = constraints.task_rules.setdefault(index, TaskRule())
+                    setattr(rule, f"{key}_workers", int(value))
+                elif kind == "task" and key in ("require", "exclude"):
+                    rule = constraints.task_rules.setdefault(index, TaskRule())
+                    workers = {check("worker", int(w)) for w in value.split(",") if w.strip()}
+                    (rule.required if key == "require" else rule.excluded).update(workers)
+                else:
+                    raise ValueError(f"unknown {kind} setting '{key}'")
+            except ValueError as e:
+                raise ValueError(f"Line {line_no}: {e}") from None
+    return constraints
+
+
+@dataclass
+class CrewPlan:
+    assignments: list          # per task, sorted worker indices
+    time_per_unit: float
+    previous_time_per_unit: float
+    optimal: bool              # False if the time limit cut the search short
+    nodes: int
+    elapsed: float
+
+    @property
+    def improvement(self):
+        return self.previous_time_per_unit - self.time_per_unit
+
+
+class _TimeUp(Exception):
+    pass
+
+
+def task_cost(base_minutes, count, efficiency_sum):
+    """Adjusted minutes per unit, computed as compute_task does."""
+    avg_eff = efficiency_sum / count
+    return base_minutes * count / avg_eff
+
+
+class CrewOptimizer:
+
+    def __init__(self, sim, constraints=None, time_limit=DEFAULT_TIME_LIMIT):
+        self.sim = sim
+        self.constraints = constraints or CrewConstraints()
+        self.time_limit = time_limit
+        self.efficiencies = [float(w.efficiency) for w in sim.workers]
+        worker_count = len(sim.workers)
+
+        self.tasks = []
+        for t, task in enumerate(sim.tasks):
+            # Each worker's efficiency on this task; per-task values replace the worker's own
+            effs = [float(task.efficiency(w, sim.workers)) for w in range(worker_count)]
+            # Workers who cannot contribute (non-positive or unparsed efficiency)
+            usable = {w for w, e in enumerate(effs) if math.isfinite(e) and e > 0}
+            base = float(task.base_time) * unit_factor(task.time_unit)
+            if not math.isfinite(base):
+                raise ValueError(f"Task {t+1} has no valid base time")
+            rule = self.constraints.task_rules.get(t, TaskRule())
+            for w in rule.required | rule.excluded:
+                if not 0 <= w < worker_count:
+                    raise ValueError(f"Task {t+1}: worker {w+1} does not exist")
+            required = sorted(rule.required)
+            if set(required) & rule.excluded:
+                raise ValueError(f"Task {t+1}: a worker is both required and excluded")
+            if any(w not in usable for w in required):
+                raise ValueError(f"Task {t+1}: a required worker has no usable efficiency")
+            optional = sorted((w for w in usable if w not in rule.required and w not in rule.excluded),
+                              key=lambda w: -effs[w])
+            low = rule.min_workers if rule.min_workers is not None else self.constraints.min_workers
+            high = rule.max_workers if rule.max_workers is not None else self.constraints.max_workers
+            low = max(1, low, len(required))
+            high = min(len(required) + len(optional), worker_count if high is None else high)
+            if low > high:
+                raise ValueError(f"Task {t+1}: no crew size satisfies its limits")
+            self.tasks.append({
+                "base": base,
+                "required": required,
+                "required_bits": sum(1 << w for w in required),
+                "required_sum": sum(effs[w] for w in required),
+                "optional": optional,
+                "eligible_bits": sum(1 << w for w in set(required) | set(optional)),
+                "effs": effs,
+                "low": low,
+                "high": high,
+            })
+
+        # Rules for tasks or workers that do not exist would silently constrain nothing
+        for t in self.constraints.task_rules:
+            if not 0 <= t < len(sim.tasks):
+                raise ValueError(f"Task {t+1} has rules but does not exist (there are {len(sim.tasks)})")
+        for w in self.constraints.worker_max_tasks:
+            if not 0 <= w < worker_count:
+                raise ValueError(f"Worker {w+1} has a task limit but does not exist (there are {worker_count})")
+
+        default_cap = self.constraints.max_tasks_per_worker
+        self.capacity = [self.constraints.worker_max_tasks.get(w, default_cap) for w in range(worker_count)]
+        self._relaxed = {}
+        self._suffix = {}  # availability bitmask -> bound of order[i:] for every i
+
+    # -- bounds ------------------------------------------------------------
+
+    def relaxed(self, t, avail):
+        """Cheapest crew for task t from the available workers, ignoring capacity."""
+        info = self.tasks[t]
+        avail &= info["eligible_bits"]
+        key = (t, avail)
+        if key in self._relaxed:
+            return self._relaxed[key]
+        best = math.inf
+        if info["required_bits"] & avail == info["required_bits"]:
+            total = info["required_sum"]
+            count = len(info["required"])
+            if count >= info["low"]:
+                best = task_cost(info["base"], count, total)
+            for w in info["optional"]:
+                if count >= info["high"]:
+                    break
+                if avail >> w & 1:
+                    total += info["effs"][w]
+                    count += 1
+                    if count >= info["low"]:
+                        best = min(best, task_cost(info["base"], count, total))
+        self._relaxed[key] = best
+        return best
+
+    def bound(self, i, avail):
+        """Lower bound on tasks order[i:] given the workers still available."""
+        suffix = self._suffix.get(avail)
+        if suffix is None:
+            # Summed from the last task back, once per availability state
+            suffix = [0.0] * (len(self.order) + 1)
+            for j in range(len(self.order) - 1, -1, -1):
+                suffix[j] = self.relaxed(self.order[j], avail) + suffix[j + 1]
+            self._suffix[avail] = suffix
+        return suffix[i]
+
+    # -- candidates --------------------------------------------------------
+
+    def candidates(self, t, avail):
+        """Crews for task t from available workers, cheapest first: (cost, bits)."""
+        info = self.tasks[t]
+        if info["required_bits"] & avail != info["required_bits"]:
+            return iter(())
+        pool = [w for w in info["optional"] if avail >> w & 1]
+        r = len(info["required"])
+        streams = []
+        for count in range(info["low"], min(info["high"], r + len(pool)) + 1):
+            streams.append(self._crews_of_size(info, pool, count - r, count))
+        return heapq.merge(*streams)
+
+    def _crews_of_size(self, info, pool, k, count):
+        """k-subsets of pool (sorted by efficiency, descending) by decreasing sum."""
+        effs = [info["effs"][w] for w in pool]
+        start = tuple(range(k))
+        heap = [(-sum(effs[j] for j in start), start)]
+        seen = {start}
+        while heap:
+            negative_sum, picks = heapq.heappop(heap)
+            bits = info["required_bits"] | sum(1 << pool[j] for j in picks)
+            yield task_cost(info["base"], count, info["required_sum"] - negative_sum), bits
+            # Successors: move one pick to the next worker down the list
+            for position, j in enumerate(picks):
+                limit = picks[position + 1] if position + 1 < k else len(pool)
+                if j + 1 < limit:
+                    successor = picks[:position] + (j + 1,) + picks[position + 1:]
+                    if successor not in seen:
+                        seen.add(successor)
+                        heapq.heappush(heap, (negative_sum + effs[j] - effs[j + 1], successor))
+
+    # -- search ------------------------------------------------------------
+
+    def current_cost(self):
+        """Time per unit of the simulation's own assignment, or inf if it breaks a rule."""
+        cost = 0.0
+        used = [0] * len(self.efficiencies)
+        for t, (task, info) in enumerate(zip(self.sim.tasks, self.tasks)):
+            workers = task.assigned_workers
+            bits = sum(1 << w for w in workers)
+            if (not info["low"] <= len(workers) <= info["high"]
+                    or bits & ~info["eligible_bits"]
+                    or info["required_bits"] & bits != info["required_bits"]):
+                return math.inf
+            for w in workers:
+                used[w] += 1
+            cost += task_cost(info["base"], len(workers), sum(info["effs"][w] for w in workers))
+        if any(cap is not None and n > cap for n, cap in zip(used, self.capacity)):
+            return math.inf
+        return cost
+
+    def solve(self, cancel_event=None):
+        """
+        The best CrewPlan found. With worker capacities this is usually the
+        best plan at the time limit, not a proven optimum (plan.optimal is
+        False). Setting cancel_event stops the search like the time limit
+        does, so an abandoned run frees its thread early.
+        """
+        start = time.perf_counter()
+        deadline = start + self.time_limit
+        full = (1 << len(self.efficiencies)) - 1
+        # Largest tasks first: they decide the most and tighten the bound soonest
+        self.order = sorted(range(len(self.tasks)), key=lambda t: -self.relaxed(t, full))
+        remaining = [math.inf if cap is None else cap for cap in self.capacity]
+
+        previous = self.current_cost()
+        best = {"cost": previous, "plan": None}
+        choice = [0] * len(self.tasks)
+        nodes = 0
+
+        def cutoff():
+            # Ties with the incumbent are pruned too: only strictly better plans count
+            cost = best["cost"]
+            return cost - EPSILON * abs(cost) if math.isfinite(cost) else math.inf
+
+        # Tasks being branched on, deepest last: [i, acc, avail, rest, candidates,
+        # workers of the crew tried last]. An explicit stack, since takeoffs run
+        # to thousands of tasks and the search goes one level per task.
+        stack = []
+
+        def enter(i, acc, avail):
+            """Count a node; record a complete plan or push a frame for order[i]."""
+            nonlocal nodes
+            nodes += 1
+            if nodes % 1024 == 0 and (time.perf_counter() > deadline or
+                                      cancel_event is not None and cancel_event.is_set()):
+                raise _TimeUp()
+            if i == len(self.order):
+                if acc < cutoff():
+                    best["cost"] = acc
+                    best["plan"] = list(choice)
+                return
+            t = self.order[i]
+            rest = self.bound(i + 1, avail)
+            if acc + self.relaxed(t, avail) + rest >= cutoff():
+                return
+            stack.append([i, acc, avail, rest, self.candidates(t, avail), ()])
+
+        def search(avail):
+            enter(0, 0.0, avail)
+            while stack:
+                frame = stack[-1]
+                i, acc, avail, rest, candidates, members = frame
+                for w in members:
+                    remaining[w] += 1
+                step = next(candidates, None)
+                if step is None or acc + step[0] + rest >= cutoff():
+                    stack.pop()  # candidates only get more expensive
+                    continue
+                cost, bits = step
+                next_avail = avail
+                members = frame[5] = _bit_indices(bits)
+                for w in members:
+                    remaining[w] -= 1
+                    if remaining[w] <= 0:
+                        next_avail &= ~(1 << w)
+                choice[self.order[i]] = bits
+                enter(i + 1, acc + cost, next_avail)
+
+        initial = full
+        for w, cap in enumerate(remaining):
+            if cap <= 0:
+                initial &= ~(1 << w)
+        optimal = True
+        try:
+            search(initial)
+        except _TimeUp:
+            optimal = False
+
+        if best["plan"] is None:
+            if math.isfinite(previous):
+                # Nothing beat the current assignment; keep it
+                assignments = [sorted(task.assigned_workers) for task in self.sim.tasks]
+            else:
+                raise ValueError("No assignment satisfies the constraints" if optimal else
+                                 "No assignment satisfying the constraints was found in time")
+        else:
+            assignments = [_bit_indices(bits) for bits in best["plan"]]
+        return CrewPlan(
+            assignments=assignments,
+            time_per_unit=best["cost"],
+            previous_time_per_unit=previous,
+            optimal=optimal,
+            nodes=nodes,
+            elapsed=time.perf_counter() - start,
+        )
+
+
+def optimize_crew(sim, constraints=None, time_limit=DEFAULT_TIME_LIMIT, cancel_event=None):
+    """Best worker-to-task assignment for sim under constraints (a CrewPlan)."""
+    return CrewOptimizer(sim, constraints, time_limit).solve(cancel_event)
+
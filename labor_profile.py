@@ -0,0 +1,212 @@
+"""
+Hot-path instrumentation.
+
+Methods decorated with @timed(name) record call counts, cumulative, p95 and
+maximum durations into the shared profiler. Timings are inclusive, so
+load_simulation also contains the update_output it triggers. Sources
+registered with add_source() add counters such as widget and trace counts
+to every snapshot.
+
+Collection is off unless LABOR_PROFILE is set, and a disabled timer costs
+one attribute check per call:
+
+    LABOR_PROFILE=1 python ProductionBuilder.py            Ctrl+Shift+D opens the panel
+    LABOR_PROFILE=stats.json python ProductionBuilder.py   also writes JSON on exit
+    LABOR_TRACEMALLOC=1                                    adds allocation growth (slow)
+
+The debug panel (labor_profile_dialog) can also switch collection on and
+off and take tracemalloc snapshots while the window is running.
+"""
+import atexit
+import functools
+import json
+import math
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+SAMPLE_WINDOW = 2048   # most recent durations kept per timer for the p95
+MEMORY_TOP = 15        # allocation sites reported per memory snapshot
+
+
+class Timer:
+    """Durations recorded under one name."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=SAMPLE_WINDOW)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.samples.append(seconds)
+
+    def p95(self):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p95_ms": self.p95() * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+class Profiler:
+
+    def __init__(self, enabled=False, dump_path=None):
+        self.enabled = enabled
+        self.dump_path = dump_path
+        self.timers = {}
+        self.sources = []
+        self.started = time.time()
+        self._lock = threading.Lock()  # the export thread records too
+        self._memory_baseline = None
+        self._dumped = False
+
+    # -- recording ---------------------------------------------------------
+
+    def record(self, name, seconds):
+        with self._lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                timer = self.timers[name] = Timer()
+            timer.add(seconds)
+
+    def timed(self, name):
+        """Decorator recording every call of the function under name."""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def add_source(self, source):
+        """source() -> {counter: value}, merged into every snapshot."""
+        self.sources.append(source)
+
+    def reset(self):
+        with self._lock:
+            self.timers.clear()
+        self.started = time.time()
+        if tracemalloc.is_tracing():
+            self._memory_baseline = tracemalloc.take_snapshot()
+
+    # -- memory ------------------------------------------------------------
+
+    def start_memory(self, frames=1):
+        """Start tracemalloc; growth is reported against this moment."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self._memory_baseline = tracemalloc.take_snapshot()
+
+    def stop_memory(self):
+        tracemalloc.stop()
+        self._memory_baseline = None
+
+    def memory_growth(self, limit=MEMORY_TOP):
+        """
+        Allocation sites that grew most since the previous call (or since
+        start_memory), as dicts; None while tracemalloc is off.
+        """
+        if not tracemalloc.is_tracing():
+            return None
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)])
+        baseline, self._memory_baseline = self._memory_baseline, snapshot
+        if baseline is None:
+            stats = snapshot.statistics("lineno")
+        else:
+            stats = snapshot.compare_to(baseline, "lineno")
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "current_kb": current / 1024,
+            "peak_kb": peak / 1024,
+            "top": [{
+                "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_kb": stat.size / 1024,
+                "growth_kb": getattr(stat, "size_diff", stat.size) / 1024,
+                "count": stat.count,
+            } for stat in stats[:limit]],
+        }
+
+    # -- reporting ---------------------------------------------------------
+
+    def counters(self):
+        values = {}
+        for source in self.sources:
+            try:
+                values.update(source())
+            except Exception:
+                pass  # e.g. the window is already gone at exit
+        return values
+
+    def snapshot(self, memory=False):
+        with self._lock:
+            timers = {name: timer.to_dict() for name, timer in self.timers.items()}
+        data = {
+            "enabled": self.enabled,
+            "seconds": time.time() - self.started,
+            "timers": timers,
+            "counters": self.counters(),
+        }
+        if memory:
+            data["memory"] = self.memory_growth()
+        return data
+
+    def dump(self, path=None):
+        """Write the snapshot as JSON to path (default: the LABOR_PROFILE path)."""
+        path = path or self.dump_path
+        if not path:
+            return None
+        with open(path, "w") as f:
+            json.dump(self.snapshot(memory=tracemalloc.is_tracing()), f, indent=4)
+        if path == self.dump_path:
+            self._dumped = True
+        return path
+
+    def dump_at_exit(self):
+        if self.dump_path and not self._dumped:
+            try:
+                self.dump()
+            except OSError:
+                pass
+
+
+def widget_count(widget):
+    """Number of Tk widgets under widget, itself included."""
+    return 1 + sum(widget_count(child) for child in widget.winfo_children())
+
+
+def _from_environment():
+    setting = os.environ.get("LABOR_PROFILE", "").strip()
+    enabled = setting.lower() not in ("", "0", "false", "no", "off")
+    dump_path = setting if enabled and setting.lower() not in ("1", "true", "yes", "on") else None
+    result = Profiler(enabled, dump_path)
+    if os.environ.get("LABOR_TRACEMALLOC", "").strip() not in ("", "0"):
+        result.start_memory()
+    if dump_path:
+        atexit.register(result.dump_at_exit)
+    return result
+
+
+profiler = _from_environment()
+timed = profiler.timed
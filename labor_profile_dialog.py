@@ -0,0 +1,102 @@
+"""
+Hidden debug panel (Ctrl+Shift+D): live timer and counter tables from
+labor_profile, with switches for collection and tracemalloc snapshots.
+"""
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from labor_profile import profiler
+
+REFRESH_MS = 1000
+
+TIMER_COLUMNS = [("name", "Timer", 200), ("count", "Calls", 70), ("total_ms", "Total ms", 90),
+                 ("mean_ms", "Mean ms", 80), ("p95_ms", "p95 ms", 80), ("max_ms", "Max ms", 80)]
+MEMORY_COLUMNS = [("location", "Allocated at", 330), ("growth_kb", "Growth KB", 90),
+                  ("size_kb", "Size KB", 90), ("count", "Blocks", 70)]
+
+
+class ProfileDialog(tk.Toplevel):
+
+    def __init__(self, master):
+        super().__init__(master)
+        self.title("Profiler")
+        self.refresh_after = None
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        controls = ttk.Frame(self)
+        controls.grid(row=0, column=0, sticky="we", padx=10, pady=(10, 5))
+        self.enabled_var = tk.BooleanVar(value=profiler.enabled)
+        ttk.Checkbutton(controls, text="Collect timings", variable=self.enabled_var,
+                        command=self.toggle_enabled).pack(side=tk.LEFT)
+        ttk.Button(controls, text="Reset", command=self.reset).pack(side=tk.LEFT, padx=4)
+        ttk.Button(controls, text="Memory Snapshot", command=self.show_memory).pack(side=tk.LEFT, padx=4)
+        ttk.Button(controls, text="💾 Save JSON", command=self.save_json).pack(side=tk.LEFT, padx=4)
+
+        self.timer_table = self.make_table(TIMER_COLUMNS, row=1, height=12)
+        self.counter_label = ttk.Label(self, text="", justify=tk.LEFT, font=("Courier", 9))
+        self.counter_label.grid(row=2, column=0, sticky="w", padx=10, pady=5)
+        self.memory_table = self.make_table(MEMORY_COLUMNS, row=3, height=8)
+        self.memory_label = ttk.Label(self, text="Memory Snapshot starts tracemalloc; "
+                                                 "each later snapshot shows growth since the previous one.",
+                                      foreground="gray")
+        self.memory_label.grid(row=4, column=0, sticky="w", padx=10, pady=(0, 10))
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+
+        self.update_tables()
+
+    def make_table(self, columns, row, height):
+        table = ttk.Treeview(self, columns=[key for key, _, _ in columns], show="headings", height=height)
+        for key, header, width in columns:
+            table.heading(key, text=header)
+            table.column(key, width=width, anchor="w" if key in ("name", "location") else "e")
+        table.grid(row=row, column=0, sticky="nsew", padx=10)
+        return table
+
+    def update_tables(self):
+        snapshot = profiler.snapshot()
+        table = self.timer_table
+        table.delete(*table.get_children())
+        timers = sorted(snapshot["timers"].items(), key=lambda item: -item[1]["total_ms"])
+        for name, stats in timers:
+            table.insert("", tk.END, values=(
+                name, stats["count"], f"{stats['total_ms']:.1f}", f"{stats['mean_ms']:.3f}",
+                f"{stats['p95_ms']:.3f}", f"{stats['max_ms']:.3f}"))
+        self.counter_label.config(text="\n".join(
+            f"{name:<24} {value}" for name, value in snapshot["counters"].items()))
+        self.refresh_after = self.after(REFRESH_MS, self.update_tables)
+
+    def toggle_enabled(self):
+        profiler.enabled = self.enabled_var.get()
+
+    def reset(self):
+        profiler.reset()
+
+    def show_memory(self):
+        memory = profiler.memory_growth()
+        if memory is None:
+            profiler.start_memory()
+            self.memory_label.config(text="tracemalloc started; take another snapshot to see growth.")
+            return
+        table = self.memory_table
+        table.delete(*table.get_children())
+        for entry in memory["top"]:
+            table.insert("", tk.END, values=(entry["location"], f"{entry['growth_kb']:+.1f}",
+                                              f"{entry['size_kb']:.1f}", entry["count"]))
+        self.memory_label.config(
+            text=f"Traced {memory['current_kb']:.0f} KB now, {memory['peak_kb']:.0f} KB peak")
+
+    def save_json(self):
+        path = filedialog.asksaveasfilename(parent=self, defaultextension=".json", initialfile="profile.json",
+                                            filetypes=[("JSON files", "*.json"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            profiler.dump(path)
+        except OSError as e:
+            messagebox.showerror("Profiler", f"Failed to save profile: {str(e)}", parent=self)
+
+    def close(self):
+        if self.refresh_after is not None:
+            self.after_cancel(self.refresh_after)
+        self.destroy()
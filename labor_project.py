@@ -0,0 +1,401 @@
+"""
+Project roll-up: many scope simulations combined into one estimate.
+
+A project file lists the simulation files of a project, one per scope item
+(a wall type, a ceiling system, ...), each tagged with a trade and a crew:
+
+    {"project_name": "Tower B", "version": "V1.0", "members": [
+        {"path": "walls/type_a.json", "trade": "Drywall", "crew": "Crew 1"}, ...]}
+
+Member paths are stored relative to the project file. Every member is
+evaluated for its own target (or, in the Man Day modes, for one man day)
+into labor hours per task plus impact hours, and the whole project is then
+totalled in one vectorized group-by by trade, by task material unit and by
+crew. ProjectEvaluator remembers each member's evaluation together with
+the file's modification time and size, so re-evaluating a project only
+reloads the files that changed since the last run.
+
+    python labor_project.py tower_b.project.json --add "walls/*.json" --trade Drywall
+    python labor_project.py tower_b.project.json --output tower_b_rollup.xlsx
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from labor_model import load_simulation_file
+from labor_recalc import IncrementalEvaluator
+
+PROJECT_VERSION = "V1.0"
+PROJECT_EXTENSION = ".project.json"
+NO_LABEL = "(none)"
+
+GROUP_COLUMNS = ["Members", "Task Hours", "Impact Hours", "Total Hours", "Quantity (sqft)", "Quantity (lf)"]
+MEMBER_COLUMNS = ["File", "Simulation Name", "Trade", "Crew", "Output Type", "Quantity", "Unit",
+                  "Task Hours", "Impact Hours", "Total Hours", "Error"]
+
+
+@dataclass
+class ProjectMember:
+    path: str
+    trade: str = ""
+    crew: str = ""  # blank: named after the member's workers
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(path=data["path"], trade=data.get("trade", ""), crew=data.get("crew", ""))
+
+
+@dataclass
+class Project:
+    project_name: str = ""
+    members: list = field(default_factory=list)
+    path: str = None  # the project file; relative member paths start from its directory
+
+    def resolve(self, member):
+        """Absolute path of member's simulation file."""
+        if os.path.isabs(member.path) or not self.path:
+            return os.path.abspath(member.path)
+        return os.path.abspath(os.path.join(os.path.dirname(self.path), member.path))
+
+    def add(self, path, trade="", crew=""):
+        """
+        Append a member for the simulation at path unless it is already in the
+        project. Project files, this one included, are not simulations and
+        are skipped too, so adding a whole directory does not take them in.
+        """
+        absolute = os.path.abspath(path)
+        if absolute.endswith(PROJECT_EXTENSION) or (self.path and absolute == os.path.abspath(self.path)):
+            return None
+        if any(self.resolve(m) == absolute for m in self.members):
+            return None
+        if self.path:
+            try:
+                path = os.path.relpath(absolute, os.path.dirname(os.path.abspath(self.path)))
+            except ValueError:  # another drive on Windows
+                path = absolute
+        member = ProjectMember(path, trade, crew)
+        self.members.append(member)
+        return member
+
+    def to_dict(self):
+        return {
+            "project_name": self.project_name,
+            "members": [{"path": m.path.replace(os.sep, "/"), "trade": m.trade, "crew": m.crew}
+                        for m in self.members],
+            "version": PROJECT_VERSION,
+        }
+
+    @classmethod
+    def from_dict(cls, data, path=None):
+        return cls(project_name=data.get("project_name", ""),
+                   members=[ProjectMember.from_dict(m) for m in data.get("members", [])], path=path)
+
+
+def load_project(path):
+    with open(path, "r") as f:
+        return Project.from_dict(json.load(f), path)
+
+
+def save_project(project, path=None):
+    """Write project to path (default: where it was loaded from)."""
+    if path and project.path and os.path.abspath(path) != os.path.abspath(project.path):
+        # Keep relative member paths pointing at the same files from the new location
+        members = [(project.resolve(m), m.trade, m.crew) for m in project.members]
+        project.path, project.members = path, []
+        for member_path, trade, crew in members:
+            project.add(member_path, trade, crew)
+    project.path = path or project.path
+    with open(project.path, "w") as f:
+        json.dump(project.to_dict(), f, indent=4)
+
+
+# -- members ---------------------------------------------------------------
+
+@dataclass
+class MemberResult:
+    """Labor hours of one member file, as evaluated at file stamp."""
+    path: str
+    stamp: tuple = None
+    simulation_name: str = ""
+    output_type: str = ""
+    worker_names: list = field(default_factory=list)
+    quantity: float = 0.0
+    quantity_unit: str = ""      # "sqft" or "lf"
+    task_hours: list = field(default_factory=list)
+    task_units: list = field(default_factory=list)  # material unit of each task_hours entry
+    impact_hours: float = 0.0
+    error: str = None
+
+    @property
+    def total_hours(self):
+        return sum(self.task_hours) + self.impact_hours
+
+    def default_crew(self):
+        names = [name for name in self.worker_names if name]
+        return ", ".join(names) if names else f"{len(self.worker_names)} workers"
+
+
+def file_stamp(path):
+    """(mtime_ns, size) of path, or None if it cannot be read."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def evaluate_member(path):
+    """MemberResult for the simulation file at path; errors are recorded, not raised."""
+    member = MemberResult(path, file_stamp(path))
+    try:
+        sim = load_simulation_file(path)
+        result = IncrementalEvaluator(sim).result()
+    except Exception as e:
+        member.error = f"{type(e).__name__}: {e}"
+        return member
+    member.simulation_name = sim.simulation_name
+    member.output_type = result.mode
+    member.worker_names = [worker.name for worker in sim.workers]
+    member.quantity_unit = "sqft" if result.mode in ("Square-foot", "Man Day (SF)") else "lf"
+    if result.mode in ("Square-foot", "Linear-Foot"):
+        units, member.quantity = result.units_needed, result.settings.target
+    else:
+        units, member.quantity = result.units_completed, result.production
+    if result.settings.learning and result.time_per_unit > 0:
+        # The curve shortens the whole job, not each unit alike; every task keeps
+        # its share of the task time (or, in a man day, of the working time)
+        minutes = result.task_time if result.mode in ("Square-foot", "Linear-Foot") else result.effective_time
+        member.task_hours = [task.adjusted_time / result.time_per_unit * minutes / 60
+                             for task in result.task_results]
+    else:
+        member.task_hours = [task.adjusted_time * units / 60 for task in result.task_results]
+    member.task_units = [task.material_unit for task in result.task_results]
+    member.impact_hours = result.impact_time / 60
+    values = member.task_hours + [member.impact_hours, member.quantity]
+    if not result.valid or not all(math.isfinite(v) for v in values):
+        member.error = "Invalid input values"
+    return member
+
+
+# -- roll-up ---------------------------------------------------------------
+
+@dataclass
+class GroupRow:
+    label: str
+    members: int
+    task_hours: float
+    impact_hours: float
+    total_hours: float
+    sqft: float
+    lf: float
+
+    def values(self):
+        return [self.members, self.task_hours, self.impact_hours, self.total_hours, self.sqft, self.lf]
+
+
+@dataclass
+class Rollup:
+    project: Project
+    members: list          # (ProjectMember, MemberResult) in project order
+    by_trade: list         # GroupRow
+    by_material_unit: list
+    by_crew: list
+    total: GroupRow
+    evaluated: int = 0     # member files (re)loaded for this roll-up
+    elapsed: float = 0.0
+
+    @property
+    def errors(self):
+        return sum(1 for _, result in self.members if result.error)
+
+    def summary_text(self):
+        total = self.total
+        return (f"{len(self.members)} members ({self.errors} with errors): {total.total_hours:,.1f} labor hours "
+                f"({total.task_hours:,.1f} task + {total.impact_hours:,.1f} impact), "
+                f"{total.sqft:,.0f} sqft + {total.lf:,.0f} lf | "
+                f"{self.evaluated} re-evaluated in {self.elapsed:.2f} s")
+
+
+def group_rows(labels, counts, columns):
+    """
+    GroupRows for one group-by: labels and counts are per row of the input
+    (counts is what "Members" sums), columns the five value arrays.
+    """
+    import numpy as np
+
+    if not len(labels):
+        return []
+    keys, inverse = np.unique(np.asarray(labels, dtype=str), return_inverse=True)
+    sums = [np.bincount(inverse, weights=np.asarray(column, dtype=float), minlength=len(keys))
+            for column in [counts] + columns]
+    return [GroupRow(str(key), int(round(sums[0][g])), *(float(s[g]) for s in sums[1:]))
+            for g, key in enumerate(keys)]
+
+
+class ProjectEvaluator:
+    """Evaluates a Project, reloading only the member files that changed."""
+
+    def __init__(self, project, jobs=1):
+        self.project = project
+        self.jobs = jobs
+        self.cache = {}  # absolute path -> MemberResult
+        self._lock = threading.Lock()
+
+    def refresh(self, members=None):
+        """Bring the cached member results up to date; returns how many were (re)loaded."""
+        paths = [self.project.resolve(m) for m in (self.project.members if members is None else members)]
+        stale = sorted({path for path in paths
+                        if path not in self.cache or self.cache[path].stamp != file_stamp(path)
+                        or self.cache[path].stamp is None})
+        if self.jobs > 1 and len(stale) > 1:
+            chunksize = max(1, math.ceil(len(stale) / (self.jobs * 4)))
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                results = list(executor.map(evaluate_member, stale, chunksize=chunksize))
+        else:
+            results = [evaluate_member(path) for path in stale]
+        self.cache.update(zip(stale, results))
+        for path in set(self.cache) - set(paths):
+            del self.cache[path]
+        return len(stale)
+
+    def rollup(self, members=None):
+        """
+        Rollup of members (default: the project's). Pass a copy of the list
+        when the caller may edit the project while this runs on another thread.
+        """
+        import numpy as np
+
+        members = list(self.project.members if members is None else members)
+        start = time.perf_counter()
+        with self._lock:
+            evaluated = self.refresh(members)
+            pairs = [(m, self.cache[self.project.resolve(m)]) for m in members]
+
+        valid = [(m, r) for m, r in pairs if not r.error]
+        task_hours = np.array([sum(r.task_hours) for _, r in valid])
+        impact_hours = np.array([r.impact_hours for _, r in valid])
+        sqft = np.array([r.quantity if r.quantity_unit == "sqft" else 0.0 for _, r in valid])
+        lf = np.array([r.quantity if r.quantity_unit == "lf" else 0.0 for _, r in valid])
+        member_columns = [task_hours, impact_hours, task_hours + impact_hours, sqft, lf]
+        ones = np.ones(len(valid))
+
+        # Material units: one row per (member, unit) so "Members" counts users of the unit
+        unit_labels, unit_hours = [], []
+        for _, r in valid:
+            hours_by_unit = {}
+            for unit, hours in zip(r.task_units, r.task_hours):
+                hours_by_unit[unit or NO_LABEL] = hours_by_unit.get(unit or NO_LABEL, 0.0) + hours
+            unit_labels.extend(hours_by_unit)
+            unit_hours.extend(hours_by_unit.values())
+        unit_hours = np.array(unit_hours)
+        zeros = np.zeros(len(unit_labels))
+
+        return Rollup(
+            project=self.project,
+            members=pairs,
+            by_trade=group_rows([m.trade or NO_LABEL for m, _ in valid], ones, member_columns),
+            by_material_unit=group_rows(unit_labels, np.ones(len(unit_labels)), [unit_hours, zeros, unit_hours, zeros, zeros]),
+            by_crew=group_rows([m.crew or r.default_crew() for m, r in valid], ones, member_columns),
+            total=GroupRow("Project", len(valid), *(float(c.sum()) for c in member_columns)),
+            evaluated=evaluated,
+            elapsed=time.perf_counter() - start,
+        )
+
+
+# -- export ----------------------------------------------------------------
+
+def member_row(member, result):
+    return [member.path, result.simulation_name, member.trade, member.crew or result.default_crew(),
+            result.output_type, result.quantity, result.quantity_unit, sum(result.task_hours),
+            result.impact_hours, result.total_hours, result.error]
+
+
+def write_rollup(rollup, path):
+    """Write the roll-up workbook to path via a temporary file."""
+    from openpyxl import Workbook
+
+    from labor_export import cell_value
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Summary")
+    sheet.append(["Project", "Members", "Errors", "Task Hours", "Impact Hours", "Total Hours",
+                  "Quantity (sqft)", "Quantity (lf)", "Exported"])
+    total = rollup.total
+    sheet.append([rollup.project.project_name, len(rollup.members), rollup.errors, total.task_hours,
+                  total.impact_hours, total.total_hours, total.sqft, total.lf,
+                  time.strftime("%Y-%m-%d %H:%M:%S")])
+    for title, header, rows in (("By Trade", "Trade", rollup.by_trade),
+                                ("By Material Unit", "Material Unit", rollup.by_material_unit),
+                                ("By Crew", "Crew", rollup.by_crew)):
+        sheet = workbook.create_sheet(title)
+        sheet.append([header] + GROUP_COLUMNS)
+        for row in rows:
+            sheet.append([row.label] + row.values())
+    sheet = workbook.create_sheet("Members")
+    sheet.append(MEMBER_COLUMNS)
+    for member, result in rollup.members:
+        sheet.append([cell_value(v) for v in member_row(member, result)])
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(suffix=".xlsx", dir=directory)
+    os.close(fd)
+    try:
+        workbook.save(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Roll many simulations up into one project estimate")
+    parser.add_argument("project", help=f"project file (created by --add if missing, e.g. name{PROJECT_EXTENSION})")
+    parser.add_argument("--add", nargs="+", metavar="PATH",
+                        help="add simulation files, directories or glob patterns to the project")
+    parser.add_argument("--trade", default="", help="with --add: trade of the added members")
+    parser.add_argument("--crew", default="", help="with --add: crew of the added members")
+    parser.add_argument("--name", help="set the project name")
+    parser.add_argument("-o", "--output", help="write the roll-up workbook (.xlsx)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: one per core)")
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.project):
+        project = load_project(args.project)
+    elif args.add:
+        project = Project(path=args.project)
+    else:
+        print(f"No project file {args.project}; create one with --add.", file=sys.stderr)
+        return 1
+    if args.add or args.name is not None:
+        from labor_batch import expand_paths
+
+        added = [path for path in expand_paths(args.add or [])
+                 if project.add(path, args.trade, args.crew) is not None]
+        if args.name is not None:
+            project.project_name = args.name
+        save_project(project)
+        print(f"Added {len(added)} members; {len(project.members)} in {args.project}")
+
+    rollup = ProjectEvaluator(project, args.jobs or os.cpu_count() or 1).rollup()
+    print(rollup.summary_text())
+    for title, rows in (("trade", rollup.by_trade), ("material unit", rollup.by_material_unit),
+                        ("crew", rollup.by_crew)):
+        print(f"By {title}:")
+        for row in rows:
+            print(f"  {row.label:<30} {row.total_hours:12,.1f} h  ({row.members} members)")
+    if args.output:
+        write_rollup(rollup, args.output)
+        print(f"Roll-up written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
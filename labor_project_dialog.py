@@ -0,0 +1,204 @@
+"""
+Project window: list the simulation files of a project with their trade and
+crew, roll them up into one estimate and export the roll-up workbook.
+Evaluation runs on the app's ComputeService and only reloads changed files.
+"""
+import os
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from labor_project import (GROUP_COLUMNS, PROJECT_EXTENSION, Project, ProjectEvaluator,
+                           load_project, member_row, save_project, write_rollup)
+
+MEMBER_COLUMNS = [("path", "File", 220), ("name", "Simulation", 160), ("trade", "Trade", 100),
+                  ("crew", "Crew", 120), ("quantity", "Quantity", 100), ("hours", "Total Hours", 90),
+                  ("status", "Status", 160)]
+PROJECT_FILETYPES = [("Project files", f"*{PROJECT_EXTENSION}"), ("JSON files", "*.json"), ("All files", "*.*")]
+
+
+class ProjectDialog(tk.Toplevel):
+    """compute is the ComputeService roll-ups are submitted to."""
+
+    def __init__(self, master, compute):
+        super().__init__(master)
+        self.title("Project Roll-up")
+        self.compute = compute
+        self.project = Project()
+        self.evaluator = ProjectEvaluator(self.project)
+        self.rollup = None
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        toolbar = ttk.Frame(self)
+        toolbar.grid(row=0, column=0, sticky="we", padx=10, pady=(10, 5))
+        ttk.Label(toolbar, text="Project:").pack(side=tk.LEFT)
+        self.name_var = tk.StringVar()
+        ttk.Entry(toolbar, textvariable=self.name_var, width=24).pack(side=tk.LEFT, padx=(2, 10))
+        ttk.Button(toolbar, text="📂 Open", command=self.open_project).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="💾 Save", command=self.save).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="➕ Add Files", command=self.add_files).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="🗑 Remove", command=self.remove_selected).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="🔄 Evaluate", command=self.run).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="📊 Export Roll-up", command=self.export).pack(side=tk.LEFT, padx=2)
+
+        tags = ttk.Frame(self)
+        tags.grid(row=1, column=0, sticky="we", padx=10)
+        ttk.Label(tags, text="Trade:").pack(side=tk.LEFT)
+        self.trade_var = tk.StringVar()
+        ttk.Entry(tags, textvariable=self.trade_var, width=16).pack(side=tk.LEFT, padx=(2, 10))
+        ttk.Label(tags, text="Crew:").pack(side=tk.LEFT)
+        self.crew_var = tk.StringVar()
+        ttk.Entry(tags, textvariable=self.crew_var, width=16).pack(side=tk.LEFT, padx=2)
+        ttk.Button(tags, text="Apply to Selected", command=self.tag_selected).pack(side=tk.LEFT, padx=(10, 2))
+
+        members_frame = ttk.LabelFrame(self, text="Members")
+        members_frame.grid(row=2, column=0, sticky="nsew", padx=10, pady=5)
+        self.member_table = self.make_table(members_frame, MEMBER_COLUMNS, height=10)
+
+        groups = ttk.Notebook(self)
+        groups.grid(row=3, column=0, sticky="nsew", padx=10, pady=5)
+        self.group_tables = {}
+        for key, title in (("by_trade", "By Trade"), ("by_material_unit", "By Material Unit"), ("by_crew", "By Crew")):
+            page = ttk.Frame(groups)
+            groups.add(page, text=title)
+            columns = [("label", title[3:], 180)] + [(name, name, 100) for name in GROUP_COLUMNS]
+            self.group_tables[key] = self.make_table(page, columns, height=8)
+
+        self.status_label = ttk.Label(self, text="Add simulation files to start a project.", foreground="gray")
+        self.status_label.grid(row=4, column=0, sticky="w", padx=10, pady=(0, 10))
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(2, weight=1)
+        self.rowconfigure(3, weight=1)
+
+    @staticmethod
+    def make_table(parent, columns, height):
+        table = ttk.Treeview(parent, columns=[key for key, _, _ in columns], show="headings", height=height)
+        for n, (key, header, width) in enumerate(columns):
+            table.heading(key, text=header)
+            table.column(key, width=width, anchor="w" if n == 0 or key in ("name", "trade", "crew", "status") else "e")
+        scroll = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=table.yview)
+        table.configure(yscrollcommand=scroll.set)
+        table.grid(row=0, column=0, sticky="nsew")
+        scroll.grid(row=0, column=1, sticky="ns")
+        parent.columnconfigure(0, weight=1)
+        parent.rowconfigure(0, weight=1)
+        return table
+
+    def set_project(self, project):
+        self.compute.cancel(self)
+        self.project = project
+        self.evaluator = ProjectEvaluator(project)
+        self.name_var.set(project.project_name)
+        self.rollup = None
+        self.show_members()
+
+    def open_project(self):
+        path = filedialog.askopenfilename(parent=self, filetypes=PROJECT_FILETYPES)
+        if not path:
+            return
+        try:
+            project = load_project(path)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            messagebox.showerror("Project", f"Failed to open project: {str(e)}", parent=self)
+            return
+        self.set_project(project)
+        self.run()
+
+    def save(self):
+        path = self.project.path
+        if not path:
+            path = filedialog.asksaveasfilename(parent=self, defaultextension=PROJECT_EXTENSION,
+                                                filetypes=PROJECT_FILETYPES,
+                                                initialfile=f"{self.name_var.get() or 'project'}{PROJECT_EXTENSION}")
+            if not path:
+                return
+        self.project.project_name = self.name_var.get()
+        try:
+            save_project(self.project, path)
+        except OSError as e:
+            messagebox.showerror("Project", f"Failed to save project: {str(e)}", parent=self)
+            return
+        self.show_members()
+        self.status_label.config(text=f"Saved {os.path.basename(path)}")
+
+    def add_files(self):
+        paths = filedialog.askopenfilenames(parent=self, filetypes=[("JSON files", "*.json"), ("All files", "*.*")])
+        added = [p for p in paths if self.project.add(p, self.trade_var.get(), self.crew_var.get()) is not None]
+        if added:
+            self.run()
+
+    def selected_members(self):
+        return [self.project.members[int(item)] for item in self.member_table.selection()]
+
+    def remove_selected(self):
+        selected = self.selected_members()
+        if selected:
+            self.project.members = [m for m in self.project.members if m not in selected]
+            self.run()
+
+    def tag_selected(self):
+        for member in self.selected_members():
+            member.trade, member.crew = self.trade_var.get(), self.crew_var.get()
+        self.run()
+
+    def run(self):
+        """Roll the project up in the background; only changed files are reloaded."""
+        self.show_members()
+        if not self.project.members:
+            return
+        self.status_label.config(text="Evaluating...")
+        # The worker gets its own copy of the list; edits here resubmit
+        self.compute.submit(self, self.evaluator.rollup, list(self.project.members),
+                            on_done=self.show_rollup, on_error=self.show_error)
+
+    def show_members(self):
+        """Member rows, with results from the last roll-up where there is one."""
+        results = {}
+        if self.rollup is not None:
+            results = {id(member): result for member, result in self.rollup.members}
+        table = self.member_table
+        table.delete(*table.get_children())
+        for n, member in enumerate(self.project.members):
+            result = results.get(id(member))
+            if result is None:
+                values = (member.path, "", member.trade, member.crew, "", "", "…")
+            else:
+                _, name, trade, crew, _, quantity, unit, _, _, hours, error = member_row(member, result)
+                values = (member.path, name, trade, crew, f"{quantity:,.0f} {unit}" if not error else "",
+                          f"{hours:,.1f}" if not error else "", error or "OK")
+            table.insert("", tk.END, iid=str(n), values=values)
+
+    def show_rollup(self, rollup):
+        self.rollup = rollup
+        self.show_members()
+        for key, table in self.group_tables.items():
+            table.delete(*table.get_children())
+            for row in getattr(rollup, key) + [rollup.total]:
+                table.insert("", tk.END, values=(
+                    row.label, row.members, *(f"{value:,.1f}" for value in row.values()[1:])))
+        self.status_label.config(text=rollup.summary_text())
+
+    def show_error(self, error):
+        self.status_label.config(text=f"Roll-up failed: {error}")
+
+    def export(self):
+        if self.rollup is None:
+            messagebox.showwarning("Project", "Evaluate the project before exporting.", parent=self)
+            return
+        self.rollup.project.project_name = self.name_var.get()
+        path = filedialog.asksaveasfilename(parent=self, defaultextension=".xlsx",
+                                            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
+                                            initialfile=f"{self.name_var.get() or 'project'}_rollup.xlsx")
+        if not path:
+            return
+        try:
+            write_rollup(self.rollup, path)
+        except ImportError:
+            messagebox.showerror("Project", "Exporting requires openpyxl (pip install openpyxl).", parent=self)
+        except OSError as e:
+            messagebox.showerror("Project", f"Failed to export: {str(e)}", parent=self)
+        else:
+            self.status_label.config(text=f"Roll-up written to {os.path.basename(path)}")
+
+    def close(self):
+        self.compute.cancel(self)
+        self.destroy()
@@ -0,0 +1,326 @@
+"""
+Dependency-tracked incremental recalculation.
+
+The GUI edits one field at a time. Instead of re-evaluating every task on
+each keystroke, IncrementalEvaluator keeps the per-task results of the last
+pass and the assignment bit matrix, whose worker columns say which tasks
+depend on each worker.
+An edit invalidates only the task results that depend on it; refresh()
+recomputes those and re-aggregates the totals once.
+
+Recomputed task results are also memoized by their inputs in a bounded
+TaskResultCache, so a task whose inputs return to values seen before (an
+edit undone, a crew swapped back, the same template inserted many times)
+is not recomputed, and the aggregated SimulationResult is reused until an
+edit or the output settings change it. The display, the breakdown text and
+the Excel export all read that one result.
+
+Every edit is also reported to an optional journal callback as
+journal(op, args, fields), which labor_journal uses for autosave; fields
+only carry values that actually changed.
+"""
+import dataclasses
+import math
+import time
+from collections import OrderedDict
+
+from labor_model import (
+    AssignmentMatrix, Simulation, Worker, Task, Impact, TaskResult,
+    simulation_result, unit_factor,
+)
+from labor_profile import profiler
+
+
+def compute_task(task, efficiencies):
+    """
+    Scalar (adjusted_time, avg_efficiency, worker_count) for one task.
+
+    Follows the formula of labor_engine.task_minutes, so incremental and full
+    evaluations agree to rounding: the efficiency sums may run in a different
+    order. A zero average efficiency gives nan here where the engine gives inf.
+    """
+    worker_count = len(efficiencies)
+    if worker_count == 0:
+        return 0.0, float("nan"), 0
+    try:
+        base_minutes = float(task.base_time) * unit_factor(task.time_unit)
+        avg_eff = sum(efficiencies) / worker_count
+        return base_minutes * worker_count / avg_eff, avg_eff, worker_count
+    except (TypeError, ValueError, ZeroDivisionError):
+        return float("nan"), float("nan"), worker_count
+
+
+class TaskResultCache:
+    """
+    LRU map of task inputs -> compute_task result. A key is
+    (base_time, time_unit, tuple of assigned efficiencies); everything
+    compute_task reads.
+    """
+
+    def __init__(self, maxsize=100_000):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(task, efficiencies):
+        return task.base_time, task.time_unit, tuple(efficiencies)
+
+    def lookup(self, task, efficiencies):
+        """Cached or freshly computed result for task with these efficiencies."""
+        try:
+            key = self.key(task, efficiencies)
+            result = self.entries.get(key)
+        except TypeError:  # an unhashable base_time; just compute it
+            return compute_task(task, efficiencies)
+        if result is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = self.entries[key] = compute_task(task, efficiencies)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class IncrementalEvaluator:
+    """Holds a Simulation plus cached per-task results and their dependencies."""
+
+    def __init__(self, sim=None, journal=None, cache=None):
+        self.journal = None
+        self.cache = cache if cache is not None else TaskResultCache()
+        self.reset(sim or Simulation())
+        self.journal = journal
+
+    def reset(self, sim):
+        """Adopt a whole simulation; every task starts dirty."""
+        self.log("reset", sim)
+        self.model = sim
+        self.assignments = AssignmentMatrix.from_tasks(sim.tasks, len(sim.workers))
+        self.task_cache = [None] * len(sim.tasks)
+        self.dirty = set(range(len(sim.tasks)))
+        self.recompute_count = 0
+        self.version = 0  # bumped by every edit that can change the totals
+        self._result = None
+        self._result_key = None
+
+    # -- edits -------------------------------------------------------------
+
+    def log(self, op, *args, **fields):
+        if self.journal is not None:
+            self.journal(op, args, fields)
+
+    def log_changes(self, op, obj, fields, *args):
+        """Journal only the fields that differ from obj's current values."""
+        if self.journal is not None:
+            changed = _changed(obj, fields)
+            if changed:
+                self.journal(op, args, changed)
+
+    def add_worker(self, worker=None):
+        worker = worker or Worker()
+        self.log("add_worker", worker)
+        self.model.workers.append(worker)
+        self.version += 1
+        return self.assignments.add_worker()
+
+    def add_task(self, task=None):
+        task = task or Task()
+        self.log("add_task", task)
+        t = len(self.model.tasks)
+        self.model.tasks.append(task)
+        self.version += 1
+        self.task_cache.append(None)
+        self.assignments.add_task(task.assigned_workers)
+        self.dirty.add(t)
+        return t
+
+    def add_impact(self, impact=None):
+        impact = impact or Impact()
+        self.log("add_impact", impact)
+        self.model.impacts.append(impact)
+        self.version += 1
+        return len(self.model.impacts) - 1
+
+    def set_name(self, name):
+        if name != self.model.simulation_name:
+            self.log("set_name", name)
+            self.model.simulation_name = name
+
+    def set_worker(self, w, **fields):
+        worker = self.model.workers[w]
+        self.log_changes("set_worker", worker, fields, w)
+        old_efficiency = worker.efficiency
+        for name, value in fields.items():
+            setattr(worker, name, value)
+        if not _same(old_efficiency, worker.efficiency):
+            self.invalidate_worker(w)
+
+    def set_task(self, t, **fields):
+        task = self.model.tasks[t]
+        self.log_changes("set_task", task, fields, t)
+        for name, value in fields.items():
+            setattr(task, name, value)
+        self.version += 1
+        # The name does not feed the adjusted time; everything else does.
+        if set(fields) - {"name"}:
+            self.invalidate_task(t)
+
+    def set_assignment(self, t, w, assigned):
+        if not self.assignments.set(t, w, assigned):
+            return
+        self.log("set_assignment", t, w, bool(assigned))
+        # Keep the model's index list (the save_simulation schema) in step
+        self.model.tasks[t].assigned_workers = self.assignments.workers_of(t)
+        self.invalidate_task(t)
+
+    def set_task_efficiency(self, t, w, efficiency):
+        """Worker w's efficiency on task t only; None goes back to the worker's own."""
+        overrides = self.model.tasks[t].efficiency_overrides
+        if efficiency is None:
+            if w not in overrides:
+                return
+            del overrides[w]
+        elif w in overrides and _same(overrides[w], efficiency):
+            return
+        else:
+            overrides[w] = efficiency
+        self.log("set_task_efficiency", t, w, efficiency)
+        if self.assignments.get(t, w):
+            self.invalidate_task(t)
+
+    def set_impact(self, i, **fields):
+        impact = self.model.impacts[i]
+        self.log_changes("set_impact", impact, fields, i)
+        for name, value in fields.items():
+            setattr(impact, name, value)
+        self.version += 1
+
+    def set_output(self, **fields):
+        settings = self.model.output_settings
+        self.log_changes("set_output", settings, fields)
+        for name, value in fields.items():
+            setattr(settings, name, value)
+
+    # -- invalidation ------------------------------------------------------
+
+    def invalidate_task(self, t):
+        self.dirty.add(t)
+        self.version += 1
+
+    def invalidate_worker(self, w):
+        """Only tasks that actually use worker w depend on its efficiency."""
+        self.dirty.update(self.assignments.tasks_of(w))
+        self.version += 1
+
+    def invalidate_all(self):
+        self.dirty.update(range(len(self.model.tasks)))
+        self.version += 1
+
+    def clear_cache(self):
+        """Forget every memoized result; the next refresh recomputes all tasks."""
+        self.cache.clear()
+        self.invalidate_all()
+
+    # -- evaluation --------------------------------------------------------
+
+    def refresh(self):
+        """Recompute dirty tasks only; returns the indices that changed."""
+        workers = self.model.workers
+        recomputed = sorted(self.dirty)
+        timing = profiler.enabled  # per-task timings only while profiling
+        for t in recomputed:
+            task = self.model.tasks[t]
+            # The matrix holds each worker once, in crew order, like the checkboxes
+            assigned = self.assignments.workers_of(t)
+            if task.efficiency_overrides:
+                efficiencies = [task.efficiency(w, workers) for w in assigned]
+            else:
+                efficiencies = [workers[w].efficiency for w in assigned]
+            if timing:
+                start = time.perf_counter()
+                self.task_cache[t] = self.cache.lookup(task, efficiencies)
+                profiler.record("compute_task", time.perf_counter() - start)
+            else:
+                self.task_cache[t] = self.cache.lookup(task, efficiencies)
+        self.recompute_count += len(recomputed)
+        self.dirty.clear()
+        return recomputed
+
+    def task_result(self, t):
+        """Cached (adjusted_time, avg_efficiency, worker_count) of task t."""
+        if t in self.dirty or self.task_cache[t] is None:
+            self.refresh()
+        return self.task_cache[t]
+
+    def result(self):
+        """
+        The SimulationResult of the current model, aggregated from the cached
+        task results and reused until an edit or the output settings change.
+        """
+        self.refresh()
+        key = (self.version, dataclasses.astuple(self.model.output_settings))
+        if key != self._result_key:
+            self._result = self.aggregate()
+            self._result_key = key
+        return self._result
+
+    def result_snapshot(self, sim):
+        """
+        result() bound to sim, a copy of the model taken at the same moment
+        (e.g. for the export thread, which must not read the live model).
+        """
+        result = self.result()
+        return dataclasses.replace(result, simulation=sim, task_results=list(result.task_results))
+
+    def aggregate(self):
+        """Total the cached task results into a new SimulationResult."""
+        # NumPy is only loaded once there is something to total
+        from labor_engine import aggregate_totals
+
+        self.refresh()
+        sim = self.model
+        task_results = []
+        for t, task in enumerate(sim.tasks):
+            adjusted_time, avg_eff, worker_count = self.task_cache[t]
+            if worker_count == 0:
+                continue
+            task_results.append(TaskResult(
+                index=t,
+                name=task.name,
+                base_time=task.base_time,
+                time_unit=task.time_unit,
+                material_unit=task.material_unit,
+                adjusted_time=adjusted_time,
+                avg_efficiency=avg_eff,
+                worker_count=worker_count,
+            ))
+        settings = sim.output_settings
+        totals = aggregate_totals(
+            sum(r.adjusted_time for r in task_results),
+            [float(i.time) for i in sim.impacts],
+            len(sim.workers),
+            settings.length, settings.height, settings.target, settings.output_type,
+            settings.learning_model, settings.learning_rate, settings.learning_plateau,
+        )
+        return simulation_result(sim, task_results, totals)
+
+
+def _changed(obj, fields):
+    """The fields whose values differ from obj's current ones."""
+    return {name: value for name, value in fields.items() if not _same(getattr(obj, name), value)}
+
+
+def _same(a, b):
+    """Equality that treats two nans (two unparseable entries) as unchanged."""
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    return a == b
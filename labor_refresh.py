@@ -0,0 +1,102 @@
+"""
+Coalescing refresh scheduler for Tk trace callbacks.
+
+Variable traces fire once per write, and a single user action (typing a
+number, restart() resetting five variables) can write many variables in a
+row. RefreshScheduler turns any number of refresh requests made before Tk
+goes idle into a single call of the refresh callback.
+"""
+import time
+from contextlib import contextmanager
+
+
+class RefreshScheduler:
+    """Runs callback at most once per idle cycle (or per debounce window)."""
+
+    def __init__(self, root, callback, delay_ms=0, on_run=None):
+        self.root = root
+        self.callback = callback
+        self.delay_ms = delay_ms
+        self.on_run = on_run
+        self._pending = None
+        self._suspended = 0
+        self._deferred = False
+
+        self.requests = 0
+        self.runs = 0
+        self.coalesced = 0
+        self.last_duration = 0.0
+
+    @property
+    def pending(self):
+        return self._pending is not None
+
+    def request(self, *args):
+        """Mark the output dirty; accepts and ignores trace arguments."""
+        self.requests += 1
+        if self._suspended:
+            if self._deferred or self._pending is not None:
+                self.coalesced += 1
+            self._deferred = True
+            return
+        if self._pending is not None:
+            self.coalesced += 1
+            return
+        self._schedule()
+
+    def _schedule(self):
+        if self._pending is not None:
+            return
+        if self.delay_ms:
+            self._pending = self.root.after(self.delay_ms, self._run)
+        else:
+            self._pending = self.root.after_idle(self._run)
+
+    @contextmanager
+    def suspended(self):
+        """
+        Hold back refreshes, e.g. while bulk-building widgets. Requests made
+        meanwhile collapse into one refresh when the block exits.
+        """
+        self._suspended += 1
+        try:
+            yield self
+        finally:
+            self._suspended -= 1
+            if not self._suspended and self._deferred:
+                self._deferred = False
+                self._schedule()
+
+    def flush(self):
+        """Run a pending refresh immediately instead of waiting for idle."""
+        if self._pending is not None:
+            self.root.after_cancel(self._pending)
+            self._run()
+
+    def cancel(self):
+        if self._pending is not None:
+            self.root.after_cancel(self._pending)
+            self._pending = None
+
+    def _run(self):
+        self._pending = None
+        self.runs += 1
+        start = time.perf_counter()
+        try:
+            self.callback()
+        finally:
+            self.last_duration = time.perf_counter() - start
+        if self.on_run:
+            self.on_run(self)
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "runs": self.runs,
+            "coalesced": self.coalesced,
+            "last_duration_ms": self.last_duration * 1000,
+        }
+
+    def status_text(self):
+        return (f"Recalculated in {self.last_duration * 1000:.1f} ms | "
+                f"{self.coalesced} of {self.requests} refreshes coalesced")
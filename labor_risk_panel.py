@@ -0,0 +1,128 @@
+"""
+Monte Carlo panel for the output frame: distribution entry, run/cancel with
+progress, the P10/P50/P80/P90 line and a histogram. The sampling itself runs
+through labor_montecarlo on a worker thread; this widget only polls it.
+"""
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+POLL_MS = 100
+HISTOGRAM_BARS = 40
+HISTOGRAM_HEIGHT = 120
+
+EXAMPLE = """# name[N] = triangular(low, likely, high) | normal(mean, sd) | pert(low, likely, high)
+# base_time / efficiency / impact; [*] applies multipliers to every task / worker / impact
+base_time[*] = pert(0.9, 1.0, 1.3)
+"""
+
+
+class RiskPanel(ttk.LabelFrame):
+    """get_simulation() snapshots the window's inputs when Run is pressed."""
+
+    def __init__(self, master, get_simulation, **kwargs):
+        super().__init__(master, text="Risk (Monte Carlo)", **kwargs)
+        self.get_simulation = get_simulation
+        self.job = None
+        self.result = None
+
+        self.spec_text = tk.Text(self, width=80, height=4)
+        self.spec_text.grid(row=0, column=0, columnspan=8, sticky="we", padx=5, pady=5)
+        self.spec_text.insert("1.0", EXAMPLE)
+
+        ttk.Label(self, text="Samples:").grid(row=1, column=0, sticky="e")
+        self.samples_var = tk.StringVar(value="100000")
+        ttk.Entry(self, textvariable=self.samples_var, width=10).grid(row=1, column=1, sticky="w")
+        ttk.Label(self, text="Seed:").grid(row=1, column=2, sticky="e")
+        self.seed_var = tk.StringVar(value="0")
+        ttk.Entry(self, textvariable=self.seed_var, width=8).grid(row=1, column=3, sticky="w")
+
+        self.run_button = ttk.Button(self, text="▶ Run", command=self.run)
+        self.run_button.grid(row=1, column=4, padx=5)
+        self.cancel_button = ttk.Button(self, text="✖ Cancel", command=self.cancel, state="disabled")
+        self.cancel_button.grid(row=1, column=5)
+        self.progress = ttk.Progressbar(self, length=120, mode="determinate", maximum=100)
+        self.progress.grid(row=1, column=6, padx=5)
+
+        self.summary_label = ttk.Label(self, text="")
+        self.summary_label.grid(row=2, column=0, columnspan=8, sticky="w", padx=5)
+        self.histogram_canvas = tk.Canvas(self, width=600, height=HISTOGRAM_HEIGHT,
+                                          background="white", highlightthickness=0)
+        self.histogram_canvas.grid(row=3, column=0, columnspan=8, sticky="we", padx=5, pady=5)
+
+    def run(self):
+        if self.job is not None:
+            return
+        # NumPy is only loaded once a run is requested
+        from labor_montecarlo import MonteCarloJob, parse_inputs
+
+        try:
+            inputs = parse_inputs(self.spec_text.get("1.0", tk.END))
+            if not inputs:
+                raise ValueError("Enter at least one distribution.")
+            samples = int(self.samples_var.get())
+            seed = int(self.seed_var.get())
+            if samples < 1:
+                raise ValueError("Samples must be at least 1.")
+            sim = self.get_simulation()
+            for u in inputs:
+                u.targets(sim)
+        except ValueError as e:
+            messagebox.showerror("Monte Carlo", str(e))
+            return
+
+        self.job = MonteCarloJob(sim, inputs, samples, seed).start()
+        self.run_button.config(state="disabled")
+        self.cancel_button.config(state="normal")
+        self.progress["value"] = 0
+        self.summary_label.config(text=f"Sampling {samples:,} scenarios...")
+        self.after(POLL_MS, self.poll)
+
+    def cancel(self):
+        if self.job is not None:
+            self.job.cancel()
+
+    def poll(self):
+        job = self.job
+        if job is None:
+            return
+        self.progress["value"] = 100 * job.fraction
+        if not job.done:
+            self.after(POLL_MS, self.poll)
+            return
+
+        self.job = None
+        self.run_button.config(state="normal")
+        self.cancel_button.config(state="disabled")
+        if job.error is not None:
+            self.summary_label.config(text="")
+            messagebox.showerror("Monte Carlo", f"Simulation failed: {str(job.error)}")
+        elif job.result is None:
+            self.summary_label.config(text="Cancelled")
+        else:
+            self.result = job.result
+            self.summary_label.config(text=f"{job.result.summary_text()} (seed {job.seed})")
+            self.draw_histogram()
+
+    def draw_histogram(self):
+        canvas = self.histogram_canvas
+        canvas.delete("all")
+        result = self.result
+        counts, edges = result.histogram(HISTOGRAM_BARS)
+        if not len(counts):
+            return
+        width = max(canvas.winfo_width(), 600)
+        plot_height = HISTOGRAM_HEIGHT - 18
+        low, high = float(edges[0]), float(edges[-1])
+        span = (high - low) or 1.0
+        tallest = max(int(counts.max()), 1)
+
+        def x(value):
+            return 5 + (value - low) / span * (width - 10)
+
+        for b, count in enumerate(counts):
+            top = plot_height - count / tallest * (plot_height - 4)
+            canvas.create_rectangle(x(edges[b]), top, x(edges[b + 1]), plot_height,
+                                    fill="#4a90d9", outline="white")
+        for q, value in result.percentiles().items():
+            canvas.create_line(x(value), 0, x(value), plot_height, fill="#d9824a", dash=(3, 2))
+            canvas.create_text(x(value), plot_height + 9, text=f"P{q}", fill="#d9824a")
@@ -0,0 +1,286 @@
+"""
+Multi-day discrete-event schedule of the crew.
+
+The Man Day modes give one number for one 8-hour day. ScheduleSimulator
+instead walks the whole crew through the target quantity day by day: each
+working day is a sequence of events on a priority queue (shift start,
+per-day impacts, breaks, end of straight time, end of overtime) and
+production accrues between events at the crew's current rate,
+
+    units per minute = working crew x rate factor / time per unit
+
+where time per unit is the crew-minutes per unit from the calculation
+engine. With a learning curve the crew-minutes worked so far are turned
+into units through the curve instead (labor_engine.learning_units), so
+later days install more than the first. Events are per crew rather than
+per worker, so a six-month schedule is a few thousand heap operations.
+
+With the defaults (8-hour shift, no breaks, no overtime, impacts every
+day) one day produces exactly the Man Day production.
+"""
+import heapq
+import math
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from labor_model import HOURS_PER_MAN_DAY
+
+WEEKDAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+# Event kinds, in the order simultaneous events are handled
+IMPACT_START, WORK_START, BREAK_START, BREAK_END, STRAIGHT_END, OVERTIME_END, DAY_END = range(7)
+
+
+@dataclass
+class ScheduleSettings:
+    target: float = None              # sqft or lf to install; None: the simulation's target
+    shift_hours: float = HOURS_PER_MAN_DAY  # straight-time hours on site, breaks included
+    breaks: list = field(default_factory=list)  # (hours into the shift, minutes), unproductive
+    overtime_hours: float = 0.0       # per working day, after straight time
+    overtime_efficiency: float = 1.0  # productivity during overtime (fatigue)
+    workdays: tuple = (0, 1, 2, 3, 4)  # weekday numbers, Monday = 0
+    start_date: date = None           # None: today
+    daily_impacts: bool = True        # the simulation's impacts recur every working day
+    day_impacts: dict = field(default_factory=dict)  # working day number -> extra minutes per worker
+    max_days: int = 3650              # calendar days before giving up
+
+
+def parse_pairs(text, what):
+    """'4=30, 6.5=15' -> [(4.0, 30.0), (6.5, 15.0)]; what names the field in errors."""
+    pairs = []
+    for item in text.replace(";", ",").split(","):
+        if not item.strip():
+            continue
+        key, sep, value = item.partition("=")
+        try:
+            if not sep:
+                raise ValueError
+            pairs.append((float(key), float(value)))
+        except ValueError:
+            raise ValueError(f"{what}: expected 'a=b' pairs, got '{item.strip()}'") from None
+    return pairs
+
+
+@dataclass
+class ScheduleDay:
+    number: int              # working day, 1-based
+    date: date
+    impact_minutes: float    # per worker
+    straight_hours: float    # productive crew-hours
+    overtime_hours: float    # productive crew-hours
+    units: float
+    quantity: float          # sqft or lf installed this day
+    cumulative: float
+    percent_complete: float
+    finish_hour: float = None  # hours into the day the target was reached
+
+
+@dataclass
+class ScheduleResult:
+    days: list
+    target: float
+    quantity_unit: str       # "sqft" or "lf"
+    crew_size: int
+    finished: bool
+    events: int
+
+    @property
+    def finish_date(self):
+        return self.days[-1].date if self.finished and self.days else None
+
+    @property
+    def working_days(self):
+        return len(self.days)
+
+    @property
+    def calendar_days(self):
+        if not self.days:
+            return 0
+        return (self.days[-1].date - self.days[0].date).days + 1
+
+    def summary_text(self):
+        if not self.finished:
+            done = self.days[-1].cumulative if self.days else 0.0
+            return (f"Not finished: {done:.2f} of {self.target:.2f} {self.quantity_unit} installed "
+                    f"in {self.working_days} working days")
+        last = self.days[-1]
+        straight = sum(d.straight_hours for d in self.days)
+        overtime = sum(d.overtime_hours for d in self.days)
+        return (f"{self.target:.2f} {self.quantity_unit} finished on working day {last.number} "
+                f"({last.date.isoformat()}, {last.finish_hour:.2f} h into the day), "
+                f"{self.calendar_days} calendar days | crew of {self.crew_size}: "
+                f"{straight:.1f} straight + {overtime:.1f} overtime crew-hours")
+
+
+class ScheduleSimulator:
+
+    def __init__(self, sim, settings=None, time_per_unit=None):
+        """time_per_unit (crew-minutes) defaults to a fresh evaluation of sim."""
+        self.sim = sim
+        self.settings = settings or ScheduleSettings()
+        if time_per_unit is None:
+            from labor_recalc import IncrementalEvaluator
+            time_per_unit = IncrementalEvaluator(sim).result().time_per_unit
+        self.time_per_unit = time_per_unit
+
+        output = sim.output_settings
+        if output.output_type in ("Square-foot", "Man Day (SF)"):
+            self.unit_size = float(output.length) * float(output.height)
+            self.quantity_unit = "sqft"
+        else:
+            self.unit_size = float(output.length)
+            self.quantity_unit = "lf"
+        target = self.settings.target
+        self.target = float(output.target if target is None else target)
+
+    def validate(self):
+        s = self.settings
+        if not (math.isfinite(self.time_per_unit) and self.time_per_unit > 0):
+            raise ValueError("Time per unit must be positive; assign workers to the tasks first")
+        if not self.unit_size > 0:
+            raise ValueError("Unit dimensions must be positive")
+        if not self.target > 0:
+            raise ValueError("Target quantity must be positive")
+        if not self.sim.workers:
+            raise ValueError("The crew has no workers")
+        if not s.workdays:
+            raise ValueError("Pick at least one working weekday")
+        if s.shift_hours <= 0 or s.overtime_hours < 0 or s.overtime_efficiency < 0:
+            raise ValueError("Shift hours must be positive and overtime not negative")
+        for offset, minutes in s.breaks:
+            if offset < 0 or minutes < 0:
+                raise ValueError("Breaks need a non-negative start and length")
+
+    def day_events(self, start_minute, impact_minutes):
+        """Events of one working day, in minutes from the start of the shift."""
+        s = self.settings
+        straight_end = s.shift_hours * 60
+        overtime_end = straight_end + s.overtime_hours * 60
+        events = [(0.0, IMPACT_START if impact_minutes else WORK_START)]
+        if impact_minutes:
+            # Per-day impacts idle the crew from the start of the shift
+            events.append((min(impact_minutes, overtime_end), WORK_START))
+        for offset, minutes in s.breaks:
+            events.append((offset * 60, BREAK_START))
+            events.append((offset * 60 + minutes, BREAK_END))
+        events.append((straight_end, STRAIGHT_END))
+        if s.overtime_hours:
+            events.append((overtime_end, OVERTIME_END))
+        events.append((overtime_end, DAY_END))
+        return [(start_minute + t, kind) for t, kind in events]
+
+    def units_for(self, work):
+        """Units installed after work crew-minutes (at first-unit pace with a learning curve)."""
+        output = self.sim.output_settings
+        if not output.learning:
+            return work / self.time_per_unit
+        from labor_engine import learning_units
+        return float(learning_units(work / self.time_per_unit, output.learning_model,
+                                    output.learning_rate, output.learning_plateau))
+
+    def work_for(self, units):
+        """Crew-minutes to install units; the inverse of units_for."""
+        output = self.sim.output_settings
+        if not output.learning:
+            return units * self.time_per_unit
+        from labor_engine import learning_minutes
+        return self.time_per_unit * float(learning_minutes(units, output.learning_model,
+                                                           output.learning_rate, output.learning_plateau))
+
+    def run(self):
+        self.validate()
+        s = self.settings
+        crew = len(self.sim.workers)
+        units_needed = self.target / self.unit_size
+        work_needed = self.work_for(units_needed)
+        daily_impact = sum(float(i.time) for i in self.sim.impacts) if s.daily_impacts else 0.0
+        start = s.start_date or date.today()
+
+        queue = []
+        sequence = 0
+        days = []
+        units_done = 0.0
+        work_done = 0.0
+        events = 0
+        working_day = 0
+        finished = False
+
+        for offset in range(s.max_days):
+            day = start + timedelta(days=offset)
+            if day.weekday() not in s.workdays:
+                continue
+            working_day += 1
+            impact = daily_impact + float(s.day_impacts.get(working_day, 0.0))
+            day_start = offset * 24 * 60
+            for minute, kind in self.day_events(day_start, impact):
+                heapq.heappush(queue, (minute, kind, sequence))
+                sequence += 1
+
+            # Walk the day's events; production accrues between them
+            now = day_start
+            working = False
+            breaks_open = 0
+            overtime = False
+            idle = bool(impact)
+            straight_minutes = overtime_minutes = 0.0
+            finish_minute = None
+            while queue:
+                minute, kind, _ = heapq.heappop(queue)
+                events += 1
+                factor = s.overtime_efficiency if overtime else 1.0
+                if working and not breaks_open and not idle and minute > now and factor > 0:
+                    rate = crew * factor  # crew-minutes of work per minute
+                    remaining = work_needed - work_done
+                    span = minute - now
+                    if rate * span >= remaining:
+                        span = remaining / rate
+                        finish_minute = now + span
+                    work_done += rate * span
+                    if overtime:
+                        overtime_minutes += span
+                    else:
+                        straight_minutes += span
+                    if finish_minute is not None:
+                        finished = True
+                        queue.clear()
+                        break
+                now = max(now, minute)
+                if kind == WORK_START:
+                    working = True
+                    idle = False
+                elif kind == IMPACT_START:
+                    working = True
+                    idle = True
+                elif kind == BREAK_START:
+                    breaks_open += 1
+                elif kind == BREAK_END:
+                    breaks_open = max(0, breaks_open - 1)
+                elif kind == STRAIGHT_END:
+                    overtime = True
+                elif kind in (OVERTIME_END, DAY_END):
+                    working = False
+
+            day_units = units_needed - units_done if finished else self.units_for(work_done) - units_done
+            units_done = min(units_done + day_units, units_needed)
+            days.append(ScheduleDay(
+                number=working_day,
+                date=day,
+                impact_minutes=impact,
+                straight_hours=straight_minutes * crew / 60,
+                overtime_hours=overtime_minutes * crew / 60,
+                units=day_units,
+                quantity=day_units * self.unit_size,
+                cumulative=units_done * self.unit_size,
+                percent_complete=100 * units_done / units_needed,
+                finish_hour=None if finish_minute is None else (finish_minute - day_start) / 60,
+            ))
+            if finished:
+                break
+
+        return ScheduleResult(days=days, target=self.target, quantity_unit=self.quantity_unit,
+                              crew_size=crew, finished=finished, events=events)
+
+
+def simulate_schedule(sim, settings=None, time_per_unit=None):
+    """Day-by-day production timeline of sim under settings (a ScheduleResult)."""
+    return ScheduleSimulator(sim, settings, time_per_unit).run()
@@ -0,0 +1,186 @@
+"""
+Schedule window: shift, break and overtime settings, then the crew's
+day-by-day production timeline from labor_schedule. Runs go through the
+app's ComputeService; after the first one, editing any setting re-runs it
+in the background and only the latest edit's timeline is shown.
+"""
+import csv
+import time
+import tkinter as tk
+from datetime import date
+from tkinter import ttk, filedialog, messagebox
+
+from labor_schedule import WEEKDAY_NAMES, ScheduleSettings, parse_pairs, simulate_schedule
+
+RERUN_DELAY_MS = 300  # wait for typing to pause before re-running
+
+COLUMNS = ["Day", "Date", "Weekday", "Impact (min/worker)", "Straight Hours", "Overtime Hours",
+           "Installed", "Cumulative", "% Complete"]
+
+
+class ScheduleDialog(tk.Toplevel):
+    """
+    Non-modal schedule window; get_simulation() snapshots the main window
+    and compute is the ComputeService runs are submitted to.
+    """
+
+    def __init__(self, master, get_simulation, compute):
+        super().__init__(master)
+        self.title("Schedule")
+        self.get_simulation = get_simulation
+        self.compute = compute
+        self.result = None
+        self.started = None
+        self.rerun_after = None
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        sim = get_simulation()
+
+        form = ttk.Frame(self)
+        form.grid(row=0, column=0, sticky="w", padx=10, pady=(10, 5))
+
+        def field(row, column, label, value, width=8):
+            ttk.Label(form, text=label).grid(row=row, column=column, sticky="e", padx=(8, 2))
+            var = tk.StringVar(value=value)
+            ttk.Entry(form, textvariable=var, width=width).grid(row=row, column=column + 1, sticky="w")
+            return var
+
+        self.target_var = field(0, 0, "Target quantity", f"{sim.output_settings.target:g}", 10)
+        self.start_var = field(0, 2, "Start date", date.today().isoformat(), 11)
+        self.shift_var = field(0, 4, "Shift hours", "8")
+        self.breaks_var = field(1, 0, "Breaks (hour=min)", "", 16)
+        self.overtime_var = field(1, 2, "Overtime hours/day", "0")
+        self.overtime_efficiency_var = field(1, 4, "Overtime efficiency", "1.0")
+        self.day_impacts_var = field(2, 0, "Extra impacts (day=min)", "", 16)
+        self.daily_impacts_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(form, text="Impacts every day", variable=self.daily_impacts_var).grid(
+            row=2, column=2, columnspan=2, sticky="w", padx=(8, 0))
+
+        days = ttk.Frame(self)
+        days.grid(row=1, column=0, sticky="w", padx=10)
+        ttk.Label(days, text="Working days:").pack(side=tk.LEFT)
+        self.workday_vars = []
+        for number, name in enumerate(WEEKDAY_NAMES):
+            var = tk.BooleanVar(value=number < 5)
+            ttk.Checkbutton(days, text=name, variable=var).pack(side=tk.LEFT, padx=2)
+            self.workday_vars.append(var)
+
+        buttons = ttk.Frame(self)
+        buttons.grid(row=2, column=0, sticky="w", padx=10, pady=5)
+        ttk.Button(buttons, text="▶ Simulate", command=self.run).pack(side=tk.LEFT, padx=(0, 4))
+        self.save_button = ttk.Button(buttons, text="💾 Save CSV", command=self.save_csv, state="disabled")
+        self.save_button.pack(side=tk.LEFT)
+        self.summary_label = ttk.Label(self, text="", foreground="gray")
+        self.summary_label.grid(row=3, column=0, sticky="w", padx=10)
+
+        table_frame = ttk.LabelFrame(self, text="Timeline")
+        table_frame.grid(row=4, column=0, sticky="nsew", padx=10, pady=(5, 10))
+        keys = [f"c{k}" for k in range(len(COLUMNS))]
+        self.table = ttk.Treeview(table_frame, columns=keys, show="headings", height=15)
+        for key, header in zip(keys, COLUMNS):
+            self.table.heading(key, text=header)
+            self.table.column(key, width=95, anchor="e")
+        table_scroll = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.table.yview)
+        self.table.configure(yscrollcommand=table_scroll.set)
+        self.table.grid(row=0, column=0, sticky="nsew")
+        table_scroll.grid(row=0, column=1, sticky="ns")
+        table_frame.columnconfigure(0, weight=1)
+        table_frame.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(4, weight=1)
+
+        for var in (self.target_var, self.start_var, self.shift_var, self.breaks_var, self.overtime_var,
+                    self.overtime_efficiency_var, self.day_impacts_var, self.daily_impacts_var,
+                    *self.workday_vars):
+            var.trace_add("write", self.schedule_rerun)
+
+    def read_settings(self):
+        return ScheduleSettings(
+            target=float(self.target_var.get()),
+            start_date=date.fromisoformat(self.start_var.get().strip()),
+            shift_hours=float(self.shift_var.get()),
+            breaks=parse_pairs(self.breaks_var.get(), "Breaks"),
+            overtime_hours=float(self.overtime_var.get() or 0),
+            overtime_efficiency=float(self.overtime_efficiency_var.get() or 1),
+            workdays=tuple(n for n, var in enumerate(self.workday_vars) if var.get()),
+            daily_impacts=self.daily_impacts_var.get(),
+            day_impacts={int(day): minutes
+                         for day, minutes in parse_pairs(self.day_impacts_var.get(), "Extra impacts")},
+        )
+
+    def run(self, live=False):
+        """Submit a run; live runs (from edits) report bad input in the status line."""
+        self.rerun_after = None
+        try:
+            settings = self.read_settings()
+        except ValueError as e:
+            self.report_error(e, live)
+            return
+        self.started = time.perf_counter()
+        self.summary_label.config(text="Simulating...")
+        self.compute.submit(self, simulate_schedule, self.get_simulation(), settings,
+                            on_done=self.show_result, on_error=lambda e: self.report_error(e, live))
+
+    def schedule_rerun(self, *args):
+        if self.result is None and self.started is None:
+            return  # nothing shown yet; wait for Simulate
+        if self.rerun_after is not None:
+            self.after_cancel(self.rerun_after)
+        self.rerun_after = self.after(RERUN_DELAY_MS, lambda: self.run(live=True))
+
+    def report_error(self, error, live):
+        if live:
+            self.summary_label.config(text=f"⚠ {str(error)}")
+        else:
+            self.summary_label.config(text="")
+            messagebox.showerror("Schedule", str(error), parent=self)
+
+    def show_result(self, result):
+        elapsed = time.perf_counter() - self.started
+        self.result = result
+        self.summary_label.config(text=f"{result.summary_text()} | {elapsed * 1000:.1f} ms")
+        self.save_button.config(state="normal")
+        self.table.delete(*self.table.get_children())
+        for row in self.rows():
+            self.table.insert("", tk.END, values=row)
+
+    def close(self):
+        if self.rerun_after is not None:
+            self.after_cancel(self.rerun_after)
+        self.compute.cancel(self)
+        self.destroy()
+
+    def rows(self):
+        unit = self.result.quantity_unit
+        for day in self.result.days:
+            yield [
+                day.number,
+                day.date.isoformat(),
+                WEEKDAY_NAMES[day.date.weekday()],
+                f"{day.impact_minutes:.1f}",
+                f"{day.straight_hours:.2f}",
+                f"{day.overtime_hours:.2f}",
+                f"{day.quantity:.2f} {unit}",
+                f"{day.cumulative:.2f} {unit}",
+                f"{day.percent_complete:.1f}%",
+            ]
+
+    def save_csv(self):
+        if self.result is None:
+            return
+        file_path = filedialog.asksaveasfilename(
+            parent=self, defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            initialfile="schedule.csv")
+        if not file_path:
+            return
+        try:
+            with open(file_path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(COLUMNS[:6] + [f"Installed ({self.result.quantity_unit})",
+                                               f"Cumulative ({self.result.quantity_unit})", "% Complete"])
+                for day in self.result.days:
+                    writer.writerow([day.number, day.date.isoformat(), WEEKDAY_NAMES[day.date.weekday()],
+                                     day.impact_minutes, day.straight_hours, day.overtime_hours,
+                                     day.quantity, day.cumulative, day.percent_complete])
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to save schedule: {str(e)}", parent=self)
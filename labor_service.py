@@ -0,0 +1,328 @@
+"""
+Headless estimation service: the window's calculation engine over local HTTP/JSON.
+
+    python labor_service.py [--host 127.0.0.1] [--port 8765]
+    python ProductionBuilder.py --serve [--port 8765]
+
+POST /evaluate takes one simulation in the save_simulation JSON schema, or a
+JSON array of them, and answers with the same totals, per-task times and
+Results-sheet rows the window and the Excel export show (see
+result_payload). An array gets {"results": [...]} in the same order, with
+{"error": ...} in place of any simulation that could not be evaluated.
+GET /health reports the request, batch and cache counters.
+
+The server is a single asyncio loop speaking HTTP/1.1 with keep-alive.
+Simulations waiting at the same time are evaluated together as one batch on
+a worker thread, so the loop keeps accepting requests while a batch runs,
+and identical payloads in a batch are evaluated once. Results are cached as
+encoded JSON under a hash of the canonical payload, so repeated requests
+skip the engine and the encoder entirely. SIGINT/SIGTERM (or close()) stop
+accepting connections, let in-flight requests finish and close idle
+keep-alive connections.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import signal
+import sys
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from labor_model import Simulation
+from labor_recalc import IncrementalEvaluator, TaskResultCache
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 64 * 1024 * 1024
+MAX_BATCH = 512
+CACHE_SIZE = 4096
+
+TOTALS = ["time_per_unit", "impact_time", "total_workers", "unit_sqft", "units_needed", "total_time",
+          "available_time", "effective_time", "units_completed", "production"]
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error"}
+
+
+def _finite(value):
+    """JSON has no NaN or infinity; they come out as null."""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def result_payload(result):
+    """JSON-ready dict of a SimulationResult."""
+    return {
+        "simulation_name": result.simulation.simulation_name,
+        "output_type": result.mode,
+        "valid": result.valid,
+        "summary": result.summary_text(),
+        "totals": {name: _finite(getattr(result, name)) for name in TOTALS},
+        "tasks": [{
+            "name": task.name,
+            "material_unit": task.material_unit,
+            "adjusted_time": _finite(task.adjusted_time),
+            "avg_efficiency": _finite(task.avg_efficiency),
+            "worker_count": task.worker_count,
+        } for task in result.task_results],
+        "breakdown": [{
+            "category": row["Category"],
+            "name": row["Name"],
+            "time": _finite(row["Time (min)"]),
+            "notes": row["Notes"],
+        } for row in result.iter_result_rows()],
+    }
+
+
+def payload_key(payload):
+    """Cache key of one simulation payload: a hash of its canonical JSON."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), allow_nan=True)
+    return hashlib.blake2b(canonical.encode(), digest_size=16).digest()
+
+
+class EstimationService:
+    """The HTTP server, its evaluation batcher and result cache."""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, cache_size=CACHE_SIZE):
+        self.host = host
+        self.port = port
+        self.cache_size = cache_size
+        # payload_key, or b"body:" + hash of a request body -> encoded result JSON
+        self.cache = OrderedDict()
+        self.task_cache = TaskResultCache()  # only touched by the evaluation thread
+        self.requests = 0
+        self.evaluated = 0
+        self.batches = 0
+        self.cache_hits = 0
+        self.server = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="estimate")
+        self._pending = []  # (key, payload, future) waiting for the next batch
+        self._draining = False
+        self._connections = {}  # writer -> True while a request on it is being handled
+        self._handlers = set()  # handle_connection tasks, awaited by close()
+        self.closing = False
+
+    # -- evaluation ------------------------------------------------------
+
+    def evaluate(self, payload):
+        """Encoded JSON result of one simulation payload; errors become {"error": ...}."""
+        try:
+            if not isinstance(payload, dict):
+                raise ValueError("a simulation must be a JSON object")
+            sim = Simulation.from_dict(payload)
+            result = IncrementalEvaluator(sim, cache=self.task_cache).result()
+            body = result_payload(result)
+        except Exception as e:
+            body = {"error": f"{type(e).__name__}: {e}"}
+        return json.dumps(body, separators=(",", ":"))
+
+    def evaluate_batch(self, items):
+        """{key: encoded result} for [(key, payload)]; runs on the evaluation thread."""
+        return {key: self.evaluate(payload) for key, payload in items}
+
+    def store(self, key, text):
+        self.cache[key] = text
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    async def result_for(self, payload):
+        """Encoded result of payload, from the cache or the next batch."""
+        key = payload_key(payload)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.move_to_end(key)
+            self.cache_hits += 1
+            return cached
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((key, payload, future))
+        if not self._draining:
+            self._draining = True
+            asyncio.get_running_loop().create_task(self._drain())
+        return await future
+
+    async def _drain(self):
+        """Evaluate pending payloads in batches until none are left."""
+        loop = asyncio.get_running_loop()
+        try:
+            while self._pending:
+                # Let every request already readable on this loop iteration join the batch
+                await asyncio.sleep(0)
+                batch, self._pending = self._pending[:MAX_BATCH], self._pending[MAX_BATCH:]
+                unique = {}
+                for key, payload, _ in batch:
+                    unique.setdefault(key, payload)
+                try:
+                    results = await loop.run_in_executor(self._executor, self.evaluate_batch, list(unique.items()))
+                except Exception as e:
+                    for _, _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                self.batches += 1
+                self.evaluated += len(unique)
+                for key, text in results.items():
+                    self.store(key, text)
+                for key, _, future in batch:
+                    if not future.done():
+                        future.set_result(results[key])
+        finally:
+            self._draining = False
+
+    # -- HTTP ------------------------------------------------------------
+
+    def stats(self):
+        return {"status": "ok", "requests": self.requests, "evaluated": self.evaluated,
+                "batches": self.batches, "cache_hits": self.cache_hits, "cached": len(self.cache)}
+
+    async def respond(self, method, path, body):
+        """(status, encoded JSON body) for one request."""
+        if path == "/health":
+            if method != "GET":
+                return 405, '{"error":"use GET"}'
+            return 200, json.dumps(self.stats())
+        if path != "/evaluate":
+            return 404, '{"error":"not found"}'
+        if method != "POST":
+            return 405, '{"error":"use POST"}'
+        # A byte-identical single-simulation body needs neither parsing nor hashing of canonical JSON
+        body_key = b"body:" + hashlib.blake2b(body, digest_size=16).digest()
+        cached = self.cache.get(body_key)
+        if cached is not None:
+            self.cache.move_to_end(body_key)
+            self.cache_hits += 1
+            return (422 if cached.startswith('{"error"') else 200), cached
+        try:
+            payload = json.loads(body)
+        except (UnicodeDecodeError, ValueError) as e:
+            return 400, json.dumps({"error": f"invalid JSON: {e}"})
+        if isinstance(payload, list):
+            results = await asyncio.gather(*(self.result_for(item) for item in payload))
+            return 200, '{"results":[' + ",".join(results) + "]}"
+        text = await self.result_for(payload)
+        self.store(body_key, text)
+        return (422 if text.startswith('{"error"') else 200), text
+
+    async def handle_connection(self, reader, writer):
+        self._connections[writer] = False
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                self._connections[writer] = True
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, path, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self.send(writer, 400, '{"error":"bad request line"}', keep_alive=False)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    length = -1
+                if not 0 <= length <= MAX_BODY_BYTES:
+                    await self.send(writer, 413 if length > 0 else 400, '{"error":"bad Content-Length"}',
+                                    keep_alive=False)
+                    break
+                try:
+                    body = await reader.readexactly(length) if length else b""
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                self.requests += 1
+                try:
+                    status, text = await self.respond(method, path.split("?", 1)[0], body)
+                except Exception as e:
+                    status, text = 500, json.dumps({"error": f"{type(e).__name__}: {e}"})
+                keep_alive = keep_alive and not self.closing
+                await self.send(writer, status, text, keep_alive)
+                self._connections[writer] = False
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            self._handlers.discard(handler)
+            writer.close()
+
+    @staticmethod
+    async def send(writer, status, text, keep_alive):
+        body = text.encode()
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+            .encode() + body)
+        await writer.drain()
+
+    # -- lifecycle -------------------------------------------------------
+
+    async def start(self):
+        self.closing = False
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]  # the real one if port was 0
+        return self
+
+    async def close(self):
+        """Stop accepting, let in-flight requests finish and drop idle keep-alive connections."""
+        self.closing = True
+        if self.server is not None:
+            self.server.close()
+        for writer, busy in list(self._connections.items()):
+            if not busy:
+                writer.close()  # its handler wakes from readuntil() at EOF and returns
+        # Busy handlers answer with Connection: close, then return as well. They
+        # are awaited rather than left for asyncio.run() to cancel mid-read.
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        while self._draining:
+            await asyncio.sleep(0.01)
+        if self.server is not None:
+            await self.server.wait_closed()
+            self.server = None
+        self._executor.shutdown(wait=True)
+
+    async def serve_until_signalled(self):
+        await self.start()
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, stop.set)
+            except (NotImplementedError, RuntimeError):  # Windows, or not the main thread
+                pass
+        print(f"Estimation service listening on http://{self.host}:{self.port} (Ctrl+C to stop)")
+        try:
+            await stop.wait()
+        finally:
+            await self.close()
+            print(f"Stopped after {self.requests} requests")
+
+
+def run_service(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    try:
+        asyncio.run(EstimationService(host, port).serve_until_signalled())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the labor calculation engine over local HTTP/JSON")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+    return run_service(args.host, args.port)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,30 @@
+"""
+Last-session cache.
+
+When the window closes, the current simulation is written to a small cache
+file; starting with --restore-session reopens it right after the window is
+first drawn, without going through the file dialog.
+"""
+import json
+import os
+
+SESSION_CACHE = os.path.join(os.path.expanduser("~"), ".production_builder", "last_session.json")
+
+
+def save_session(simulation_data, file_path=None, cache_path=SESSION_CACHE):
+    """Write the simulation (save_simulation schema) and its file path."""
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"file_path": file_path, "simulation": simulation_data}, f, separators=(",", ":"))
+    os.replace(tmp_path, cache_path)
+
+
+def load_session(cache_path=SESSION_CACHE):
+    """Return (simulation_data, file_path), or None if there is no usable cache."""
+    try:
+        with open(cache_path, "r") as f:
+            cached = json.load(f)
+        return cached["simulation"], cached.get("file_path")
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
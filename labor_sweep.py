@@ -0,0 +1,317 @@
+"""
+Parameter sweeps and one-at-a-time sensitivity.
+
+A sweep declares a list of values for any number of inputs; every point of
+their Cartesian grid is evaluated in vectorized chunks rather than through
+the GUI. Tasks are grouped by the swept inputs that can change them (their
+workers' efficiencies, their own base time) and each group is evaluated
+only across those axes, then broadcast; dimension, impact and crew size
+axes are applied to the totals alone.
+
+Parameters are written one per line as ``name = values``:
+
+    length = 8, 10, 12            explicit values
+    efficiency[2] = 0.8:1.2:9     9 evenly spaced values from 0.8 to 1.2
+    base_time[1] = 3:6:4          base time of task 1, in the task's time unit
+    impact[1] = 0:60:7            per-worker minutes of impact 1
+    crew_size = 3:8:6             workers multiplying impacts / man-day time
+
+Worker, task and impact numbers are 1-based, as in the window. Each
+parameter may be given once.
+"""
+import math
+import re
+from dataclasses import dataclass
+
+import numpy as np
+
+from labor_engine import aggregate_totals, task_minutes, unit_factor
+
+CHUNK_SIZE = 16384  # grid points evaluated per vectorized pass
+
+SCALAR_PARAMETERS = {"length": "Length (ft)", "height": "Height (ft)", "target": "Target",
+                     "crew_size": "Crew Size"}
+INDEXED_PARAMETERS = {"efficiency": "Worker", "base_time": "Task", "impact": "Impact"}
+
+_LINE = re.compile(r"^\s*([a-z_]+)\s*(?:\[\s*(\d+)\s*\])?\s*=\s*(.+?)\s*$")
+
+
+@dataclass
+class SweepParameter:
+    name: str            # a SCALAR_PARAMETERS or INDEXED_PARAMETERS key
+    index: int = None    # 0-based worker/task/impact index for indexed names
+    values: np.ndarray = None
+
+    @property
+    def label(self):
+        if self.index is None:
+            return SCALAR_PARAMETERS[self.name]
+        kind = INDEXED_PARAMETERS[self.name]
+        field = {"efficiency": "efficiency", "base_time": "base time", "impact": "minutes"}[self.name]
+        return f"{kind} {self.index + 1} {field}"
+
+    def baseline(self, sim):
+        """The simulation's own value for this input."""
+        settings = sim.output_settings
+        if self.name == "crew_size":
+            return float(len(sim.workers))
+        if self.name == "efficiency":
+            return float(sim.workers[self.index].efficiency)
+        if self.name == "base_time":
+            return float(sim.tasks[self.index].base_time)
+        if self.name == "impact":
+            return float(sim.impacts[self.index].time)
+        return float(getattr(settings, self.name))
+
+    def validate(self, sim):
+        limits = {"efficiency": len(sim.workers), "base_time": len(sim.tasks), "impact": len(sim.impacts)}
+        if self.name in limits and not 0 <= self.index < limits[self.name]:
+            raise ValueError(f"{self.label}: there are only {limits[self.name]} "
+                             f"{INDEXED_PARAMETERS[self.name].lower()}s")
+        if not len(self.values):
+            raise ValueError(f"{self.label}: no values")
+
+
+def parse_values(text):
+    """'a, b, c' or 'start:stop:count' into a float array."""
+    if ":" in text:
+        parts = [p.strip() for p in text.split(":")]
+        if len(parts) != 3:
+            raise ValueError(f"Ranges are start:stop:count, got '{text}'")
+        start, stop, count = float(parts[0]), float(parts[1]), int(parts[2])
+        if count < 1:
+            raise ValueError(f"Range count must be at least 1, got {count}")
+        return np.linspace(start, stop, count)
+    return np.array([float(v) for v in text.split(",") if v.strip()], dtype=float)
+
+
+def parse_parameters(text):
+    """Parse the one-parameter-per-line sweep syntax (see module docstring)."""
+    parameters = []
+    seen = {}  # (name, index) -> line it was given on
+    for line_no, line in enumerate(text.splitlines(), 1):
+        line = line.split("#", 1)[0]
+        if not line.strip():
+            continue
+        match = _LINE.match(line)
+        if not match:
+            raise ValueError(f"Line {line_no}: expected 'name = values', got '{line.strip()}'")
+        name, index, values = match.groups()
+        if name in INDEXED_PARAMETERS:
+            if index is None:
+                raise ValueError(f"Line {line_no}: {name} needs a number, e.g. {name}[1]")
+            index = int(index) - 1
+        elif name in SCALAR_PARAMETERS:
+            if index is not None:
+                raise ValueError(f"Line {line_no}: {name} does not take a number")
+        else:
+            raise ValueError(f"Line {line_no}: unknown parameter '{name}'")
+        if (name, index) in seen:
+            label = name if index is None else f"{name}[{index + 1}]"
+            raise ValueError(f"Line {line_no}: {label} is already swept on line {seen[name, index]}")
+        seen[name, index] = line_no
+        try:
+            parameters.append(SweepParameter(name, index, parse_values(values)))
+        except ValueError as e:
+            raise ValueError(f"Line {line_no}: {e}") from None
+    return parameters
+
+
+def grid_points(parameters):
+    """(S, K) array holding every combination of the parameters' values."""
+    if not parameters:
+        return np.empty((1, 0))
+    axes = np.meshgrid(*(p.values for p in parameters), indexing="ij")
+    return np.stack([axis.ravel() for axis in axes], axis=-1)
+
+
+def _arrays(sim):
+    """SimulationArrays plus each task's base-time-to-minutes factor."""
+    factors = np.array([unit_factor(t.time_unit) for t in sim.tasks], dtype=float)
+    return sim.to_arrays(), factors
+
+
+def task_groups(arrays, parameters):
+    """
+    Group tasks by the parameters that can move their minutes.
+
+    Returns {tuple of parameter positions: task indices}; tasks no
+    parameter touches are grouped under the empty tuple.
+    """
+    influences = [[] for _ in range(len(arrays.base_minutes))]
+    for k, p in enumerate(parameters):
+        if p.name == "base_time":
+            influences[p.index].append(k)
+        elif p.name == "efficiency":
+            for t in np.flatnonzero(arrays.assignments[:, p.index]):
+                influences[t].append(k)
+    groups = {}
+    for t, keys in enumerate(influences):
+        groups.setdefault(tuple(keys), []).append(t)
+    return groups
+
+
+def group_minutes(arrays, factors, tasks, parameters, points, chunk_size=CHUNK_SIZE):
+    """
+    Summed minutes per unit of the given tasks at each row of points, whose
+    columns follow parameters (efficiency and base_time parameters only).
+    factors converts each task's base time to minutes.
+    """
+    column = {t: a for a, t in enumerate(tasks)}
+    sub_base = arrays.base_minutes[tasks]
+    sub_mask = arrays.assignments[tasks]
+    if not parameters:
+        minutes, _, _ = task_minutes(sub_base, arrays.efficiencies, sub_mask, **arrays.overrides(tasks))
+        return np.full(len(points), minutes.sum())
+    points = np.asarray(points, dtype=float).reshape(-1, len(parameters))
+
+    overrides = arrays.overrides(tasks)
+    result = np.empty(len(points))
+    for start in range(0, len(points), chunk_size):
+        chunk = points[start:start + chunk_size]
+        base = np.repeat(sub_base[None, :], len(chunk), axis=0)
+        efficiencies = np.repeat(arrays.efficiencies[None, :], len(chunk), axis=0)
+        for k, p in enumerate(parameters):
+            if p.name == "base_time":
+                base[:, column[p.index]] = chunk[:, k] * factors[p.index]
+            else:
+                efficiencies[:, p.index] = chunk[:, k]
+        minutes, _, _ = task_minutes(base, efficiencies, sub_mask, **overrides)
+        result[start:start + len(chunk)] = minutes.sum(axis=-1)
+    return result
+
+
+def headline_totals(arrays, parameters, columns, task_time):
+    """
+    Headline (total minutes, or production in Man Day modes) from task time
+    per unit and the remaining parameters; columns[k] holds parameter k's
+    values and everything broadcasts together.
+    """
+    inputs = {
+        "length": arrays.length,
+        "height": arrays.height,
+        "target": arrays.target,
+        "crew_size": float(len(arrays.efficiencies)),
+    }
+    impact_total = arrays.impact_minutes.sum()
+    for p, values in zip(parameters, columns):
+        if p.name == "impact":
+            impact_total = impact_total + (values - arrays.impact_minutes[p.index])
+        elif p.name in inputs:
+            inputs[p.name] = values
+    totals = aggregate_totals(task_time, np.asarray(impact_total)[..., None], inputs["crew_size"],
+                              inputs["length"], inputs["height"], inputs["target"], arrays.output_type,
+                              **arrays.learning())
+    return totals["production" if arrays.output_type.startswith("Man Day") else "total_time"]
+
+
+def evaluate_points(sim, parameters, points, chunk_size=CHUNK_SIZE):
+    """Headline value at each row of points, whose columns follow parameters."""
+    arrays, factors = _arrays(sim)
+    points = np.asarray(points, dtype=float).reshape(-1, len(parameters))
+    task_time = np.zeros(len(points))
+    for keys, tasks in task_groups(arrays, parameters).items():
+        task_time += group_minutes(arrays, factors, tasks, [parameters[k] for k in keys],
+                                   points[:, list(keys)], chunk_size)
+    return np.asarray(headline_totals(arrays, parameters, points.T, task_time)).reshape(-1)
+
+
+def evaluate_grid(sim, parameters, chunk_size=CHUNK_SIZE):
+    """
+    Headline value at every point of the parameters' Cartesian grid, in
+    grid_points order.
+
+    Each group of tasks is only evaluated on the sub-grid of the axes that
+    can move it, then broadcast across the others; dimension, impact and
+    crew size axes never reach the per-task math at all.
+    """
+    arrays, factors = _arrays(sim)
+    shape = tuple(len(p.values) for p in parameters)
+    task_time = np.zeros([1] * len(parameters))
+    for keys, tasks in task_groups(arrays, parameters).items():
+        group_parameters = [parameters[k] for k in keys]
+        minutes = group_minutes(arrays, factors, tasks, group_parameters,
+                                grid_points(group_parameters), chunk_size)
+        task_time = task_time + minutes.reshape(
+            [shape[k] if k in keys else 1 for k in range(len(parameters))])
+
+    columns = []
+    for k, p in enumerate(parameters):
+        axis_shape = [1] * len(parameters)
+        axis_shape[k] = shape[k]
+        columns.append(p.values.reshape(axis_shape))
+    headline = headline_totals(arrays, parameters, columns, task_time)
+    return np.broadcast_to(headline, shape).reshape(-1)
+
+
+@dataclass
+class Sensitivity:
+    """One tornado bar: the headline at a parameter's lowest and highest value."""
+    parameter: SweepParameter
+    low_value: float
+    high_value: float
+    low: float
+    high: float
+
+    @property
+    def swing(self):
+        return abs(self.high - self.low)
+
+
+@dataclass
+class SweepResult:
+    simulation: object
+    parameters: list
+    points: np.ndarray      # (S, K)
+    headline: np.ndarray    # (S,)
+    baseline: float
+    tornado: list           # Sensitivity, largest swing first
+
+    @property
+    def metric(self):
+        mode = self.simulation.output_settings.output_type
+        if mode == "Man Day (SF)":
+            return "Production (sqft)"
+        if mode == "Man Day (LF)":
+            return "Production (lf)"
+        return "Total Time (min)"
+
+    @property
+    def columns(self):
+        return [p.label for p in self.parameters] + [self.metric]
+
+    def rows(self, limit=None):
+        """Table rows (parameter values then headline), optionally the first limit only."""
+        stop = len(self.headline) if limit is None else min(limit, len(self.headline))
+        for s in range(stop):
+            yield [float(v) for v in self.points[s]] + [float(self.headline[s])]
+
+    def summary_text(self):
+        finite = self.headline[np.isfinite(self.headline)]
+        if not len(finite):
+            return f"{len(self.headline):,} points, no valid results"
+        return (f"{len(self.headline):,} points | {self.metric}: min {finite.min():.2f}, "
+                f"mean {finite.mean():.2f}, max {finite.max():.2f} (baseline {self.baseline:.2f})")
+
+
+def sweep(sim, parameters, chunk_size=CHUNK_SIZE):
+    """Evaluate the full grid of parameters plus the one-at-a-time tornado."""
+    for p in parameters:
+        p.validate(sim)
+    points = grid_points(parameters)
+    headline = evaluate_grid(sim, parameters, chunk_size)
+
+    # One-at-a-time: every other input held at the simulation's own value
+    baseline_point = np.array([p.baseline(sim) for p in parameters], dtype=float)
+    oat = np.repeat(baseline_point[None, :], 2 * len(parameters) + 1, axis=0)
+    for k, p in enumerate(parameters):
+        oat[2 * k, k] = p.values.min()
+        oat[2 * k + 1, k] = p.values.max()
+    oat_headline = evaluate_points(sim, parameters, oat, chunk_size)
+    tornado = [
+        Sensitivity(p, float(oat[2 * k, k]), float(oat[2 * k + 1, k]),
+                    float(oat_headline[2 * k]), float(oat_headline[2 * k + 1]))
+        for k, p in enumerate(parameters)
+    ]
+    tornado.sort(key=lambda s: -s.swing if math.isfinite(s.swing) else 0.0)
+    return SweepResult(sim, parameters, points, headline, float(oat_headline[-1]), tornado)
@@ -0,0 +1,160 @@
+"""
+Sweep window: declare parameter ranges, see the grid results as a table and
+the one-at-a-time sensitivities as a tornado chart. The math is in
+labor_sweep and runs on the app's ComputeService; this module only lays it
+out.
+"""
+import csv
+import time
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from labor_sweep import parse_parameters, sweep
+
+TABLE_LIMIT = 1000  # grid rows shown in the window; Save CSV writes them all
+BAR_HEIGHT = 22
+LABEL_WIDTH = 170
+
+EXAMPLE = """# one parameter per line: name = a, b, c  or  name = start:stop:count
+# length, height, target, crew_size, efficiency[N], base_time[N], impact[N]
+length = 8:12:5
+efficiency[1] = 0.8:1.2:5
+"""
+
+
+class SweepDialog(tk.Toplevel):
+    """
+    Non-modal sweep window; get_simulation() snapshots the main window and
+    compute is the ComputeService sweeps are submitted to.
+    """
+
+    def __init__(self, master, get_simulation, compute):
+        super().__init__(master)
+        self.title("Parameter Sweep")
+        self.get_simulation = get_simulation
+        self.compute = compute
+        self.result = None
+        self.started = None
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        ttk.Label(self, text="Parameters:").grid(row=0, column=0, sticky="w", padx=10, pady=(10, 0))
+        self.spec_text = tk.Text(self, width=70, height=7)
+        self.spec_text.grid(row=1, column=0, columnspan=3, sticky="we", padx=10)
+        self.spec_text.insert("1.0", EXAMPLE)
+
+        self.run_button = ttk.Button(self, text="▶ Run Sweep", command=self.run)
+        self.run_button.grid(row=2, column=0, sticky="w", padx=10, pady=5)
+        self.save_button = ttk.Button(self, text="💾 Save CSV", command=self.save_csv, state="disabled")
+        self.save_button.grid(row=2, column=1, sticky="w", pady=5)
+        self.summary_label = ttk.Label(self, text="", foreground="gray")
+        self.summary_label.grid(row=3, column=0, columnspan=3, sticky="w", padx=10)
+
+        tornado_frame = ttk.LabelFrame(self, text="Sensitivity (one at a time, others at current values)")
+        tornado_frame.grid(row=4, column=0, columnspan=3, sticky="we", padx=10, pady=5)
+        self.tornado_canvas = tk.Canvas(tornado_frame, width=620, height=BAR_HEIGHT * 4,
+                                        background="white", highlightthickness=0)
+        self.tornado_canvas.pack(fill=tk.X, expand=True)
+
+        table_frame = ttk.LabelFrame(self, text="Results")
+        table_frame.grid(row=5, column=0, columnspan=3, sticky="nsew", padx=10, pady=(5, 10))
+        self.table = ttk.Treeview(table_frame, show="headings", height=12)
+        table_scroll = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.table.yview)
+        self.table.configure(yscrollcommand=table_scroll.set)
+        self.table.grid(row=0, column=0, sticky="nsew")
+        table_scroll.grid(row=0, column=1, sticky="ns")
+        table_frame.columnconfigure(0, weight=1)
+        table_frame.rowconfigure(0, weight=1)
+        self.columnconfigure(2, weight=1)
+        self.rowconfigure(5, weight=1)
+
+    def run(self):
+        """Start a sweep; running again supersedes one still in progress."""
+        try:
+            parameters = parse_parameters(self.spec_text.get("1.0", tk.END))
+            if not parameters:
+                raise ValueError("Enter at least one parameter.")
+        except ValueError as e:
+            messagebox.showerror("Sweep", str(e), parent=self)
+            return
+        self.started = time.perf_counter()
+        self.summary_label.config(text="Sweeping...")
+        self.compute.submit(self, sweep, self.get_simulation(), parameters,
+                            on_done=self.show_result, on_error=self.show_error)
+
+    def show_result(self, result):
+        elapsed = time.perf_counter() - self.started
+        self.result = result
+        self.summary_label.config(text=f"{result.summary_text()} | {elapsed:.2f} s")
+        self.save_button.config(state="normal")
+        self.show_tornado()
+        self.show_table()
+
+    def show_error(self, error):
+        self.summary_label.config(text="")
+        messagebox.showerror("Sweep", str(error), parent=self)
+
+    def close(self):
+        self.compute.cancel(self)
+        self.destroy()
+
+    def show_table(self):
+        result = self.result
+        columns = [f"c{k}" for k in range(len(result.columns))]
+        self.table.delete(*self.table.get_children())
+        self.table.configure(columns=columns)
+        for key, header in zip(columns, result.columns):
+            self.table.heading(key, text=header)
+            self.table.column(key, width=110, anchor="e")
+        for row in result.rows(TABLE_LIMIT):
+            self.table.insert("", tk.END, values=[f"{v:.4g}" for v in row[:-1]] + [f"{row[-1]:.2f}"])
+
+    def show_tornado(self):
+        """Horizontal bars from the baseline to each parameter's low and high result."""
+        canvas = self.tornado_canvas
+        canvas.delete("all")
+        tornado = self.result.tornado
+        baseline = self.result.baseline
+        height = BAR_HEIGHT * (len(tornado) + 1)
+        canvas.configure(height=height)
+        width = max(canvas.winfo_width(), 620)
+        chart_left, chart_right = LABEL_WIDTH, width - 10
+
+        values = [baseline] + [v for s in tornado for v in (s.low, s.high)]
+        finite = [v for v in values if v == v and abs(v) != float("inf")]
+        if not finite:
+            canvas.create_text(10, BAR_HEIGHT // 2, text="No valid results", anchor="w")
+            return
+        lo, hi = min(finite), max(finite)
+        span = (hi - lo) or 1.0
+
+        def x(value):
+            return chart_left + (value - lo) / span * (chart_right - chart_left)
+
+        for row, s in enumerate(tornado):
+            top = row * BAR_HEIGHT + 3
+            canvas.create_text(4, top + BAR_HEIGHT // 2 - 3, anchor="w",
+                               text=f"{s.parameter.label} ({s.low_value:g}–{s.high_value:g})")
+            for value, colour in ((s.low, "#d9824a"), (s.high, "#4a90d9")):
+                if value == value and abs(value) != float("inf"):
+                    canvas.create_rectangle(x(baseline), top, x(value), top + BAR_HEIGHT - 6,
+                                            fill=colour, outline="")
+        base_x = x(baseline)
+        canvas.create_line(base_x, 0, base_x, height - BAR_HEIGHT, fill="#404040")
+        canvas.create_text(base_x, height - BAR_HEIGHT // 2, text=f"baseline {baseline:.2f}")
+
+    def save_csv(self):
+        if self.result is None:
+            return
+        file_path = filedialog.asksaveasfilename(
+            parent=self, defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            initialfile="sweep.csv")
+        if not file_path:
+            return
+        try:
+            with open(file_path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(self.result.columns)
+                writer.writerows(self.result.rows())
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to save sweep: {str(e)}", parent=self)
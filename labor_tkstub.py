@@ -0,0 +1,308 @@
+"""
+Headless stand-in for tkinter, for labor_bench on machines with no display.
+
+install() puts fake tkinter, tkinter.ttk, tkinter.filedialog and
+tkinter.messagebox modules in sys.modules; it must run before
+ProductionBuilder is imported. Variables, traces, after() callbacks and the
+entry/canvas/treeview calls the app makes behave like Tk's, but nothing is
+drawn, so benchmarks under the stub measure the model, trace and widget
+bookkeeping work without Tk's own rendering cost.
+
+update() and update_idletasks() run the after() callbacks that are due.
+filedialog answers come from ANSWERS; message boxes are silent and
+askyesno() says yes.
+"""
+import sys
+import time
+import types
+
+ANSWERS = {"open": "", "save": "", "directory": ""}
+
+
+class TclError(Exception):
+    pass
+
+
+_pending = {}   # after id -> (due time, callback, args)
+_next_after = 0
+
+
+def _run_due():
+    now = time.perf_counter()
+    due = sorted((when, ident) for ident, (when, _, _) in _pending.items() if when <= now)
+    for _, ident in due:
+        entry = _pending.pop(ident, None)
+        if entry is not None:
+            _, callback, args = entry
+            callback(*args)
+
+
+class Variable:
+    _default = ""
+
+    def __init__(self, master=None, value=None, name=None):
+        self._value = self._default if value is None else value
+        self._traces = {}
+
+    def set(self, value):
+        self._value = value
+        for callback in list(self._traces.values()):
+            callback("PY_VAR", "", "write")
+
+    def get(self):
+        return self._value
+
+    def trace_add(self, mode, callback):
+        name = f"trace{len(self._traces) + 1}"
+        self._traces[name] = callback
+        return name
+
+    def trace_remove(self, mode, name):
+        self._traces.pop(name, None)
+
+
+class StringVar(Variable):
+    def get(self):
+        return str(self._value)
+
+
+class DoubleVar(Variable):
+    _default = 0.0
+
+    def get(self):
+        try:
+            return float(self._value)
+        except (TypeError, ValueError):
+            raise TclError(f'expected floating-point number but got "{self._value}"') from None
+
+
+class IntVar(Variable):
+    _default = 0
+
+    def get(self):
+        try:
+            return int(self._value)
+        except (TypeError, ValueError):
+            raise TclError(f'expected integer but got "{self._value}"') from None
+
+
+class BooleanVar(Variable):
+    _default = False
+
+    def get(self):
+        return bool(self._value)
+
+
+class Misc:
+    def __init__(self, master=None, **options):
+        self.master = master
+        self.children = []
+        self.options = dict(options)
+        self.text = ""
+        self.destroyed = False
+        if isinstance(master, Misc):
+            master.children.append(self)
+
+    # geometry managers and window-manager calls are accepted and ignored
+    def _ignore(self, *args, **kwargs):
+        pass
+
+    grid = grid_remove = grid_forget = pack = pack_forget = place = _ignore
+    columnconfigure = rowconfigure = grid_columnconfigure = grid_rowconfigure = _ignore
+    bind = bind_all = unbind = focus_set = event_generate = protocol = _ignore
+    geometry = transient = grab_set = wait_window = title = mainloop = _ignore
+
+    def config(self, **options):
+        self.options.update(options)
+
+    configure = config
+
+    def cget(self, key):
+        return self.options.get(key)
+
+    def __getitem__(self, key):
+        return self.options.get(key)
+
+    def __setitem__(self, key, value):
+        self.options[key] = value
+
+    def winfo_children(self):
+        return [child for child in self.children if not child.destroyed]
+
+    def winfo_width(self):
+        return 800
+
+    def winfo_height(self):
+        return 400
+
+    def winfo_exists(self):
+        return not self.destroyed
+
+    def destroy(self):
+        self.destroyed = True
+        for child in self.children:
+            child.destroy()
+        if isinstance(self.master, Misc) and self in self.master.children:
+            self.master.children.remove(self)
+
+    def after(self, ms, func=None, *args):
+        global _next_after
+        _next_after += 1
+        ident = f"after#{_next_after}"
+        _pending[ident] = (time.perf_counter() + ms / 1000, func, args)
+        return ident
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def after_cancel(self, ident):
+        _pending.pop(ident, None)
+
+    def update(self):
+        _run_due()
+
+    update_idletasks = update
+
+    # Entry
+    def get(self, *args):
+        return self.text
+
+    def insert(self, index, text, *args):
+        self.text += str(text)
+
+    def delete(self, *args):
+        self.text = ""
+
+    def yview(self, *args):
+        return 0.0, 1.0
+
+    xview = yview
+    set = _ignore  # Scrollbar
+
+
+class Canvas(Misc):
+    def __init__(self, master=None, **options):
+        super().__init__(master, **options)
+        self.items = 0
+
+    def _create(self, *args, **kwargs):
+        self.items += 1
+        return self.items
+
+    create_rectangle = create_text = create_line = create_window = create_oval = _create
+
+    def delete(self, *tags):
+        if "all" in tags:
+            self.items = 0
+
+    def find_all(self):
+        return tuple(range(1, self.items + 1))
+
+    def canvasx(self, x):
+        return x
+
+    canvasy = canvasx
+    coords = itemconfig = yview_moveto = yview_scroll = Misc._ignore
+
+
+class Treeview(Misc):
+    def __init__(self, master=None, **options):
+        super().__init__(master, **options)
+        self.rows = {}
+
+    heading = column = Misc._ignore
+
+    def insert(self, parent, index, iid=None, **options):
+        iid = iid or f"I{len(self.rows) + 1:03d}"
+        self.rows[iid] = options
+        return iid
+
+    def delete(self, *items):
+        for iid in items:
+            self.rows.pop(iid, None)
+
+    def get_children(self, item=""):
+        return tuple(self.rows)
+
+    def selection(self):
+        return ()
+
+
+class Notebook(Misc):
+    def __init__(self, master=None, **options):
+        super().__init__(master, **options)
+        self.pages = []
+        self.selected = None
+
+    def add(self, page, **options):
+        self.pages.append(page)
+        if self.selected is None:
+            self.selected = page
+
+    def forget(self, page):
+        self.pages.remove(page)
+        if self.selected is page:
+            self.selected = self.pages[0] if self.pages else None
+
+    def select(self, page=None):
+        if page is None:
+            return self.selected
+        self.selected = page
+
+    def index(self, key):
+        if key == "end":
+            return len(self.pages)
+        return self.pages.index(self.selected) if key == "current" else self.pages.index(key)
+
+    def tabs(self):
+        return tuple(self.pages)
+
+    tab = Misc._ignore
+
+
+class Combobox(Misc):
+    selected = 0
+
+    def current(self, index=None):
+        if index is None:
+            return self.selected
+        self.selected = index
+
+
+def _module(name, **attributes):
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    return module
+
+
+def install():
+    """Register the stub modules as tkinter; returns the tkinter stub."""
+    plain = {name: type(name, (Misc,), {}) for name in (
+        "Tk", "Toplevel", "Frame", "Label", "Entry", "Button", "Text", "Scrollbar", "Listbox", "Menu",
+        "Checkbutton", "Radiobutton", "LabelFrame")}
+    constants = {name.upper(): name for name in (
+        "end", "left", "right", "top", "bottom", "both", "x", "y", "vertical", "horizontal",
+        "normal", "disabled", "center", "none", "all")}
+    constants.update(N="n", S="s", E="e", W="w", NW="nw", NE="ne", SW="sw", SE="se")
+    tkinter = _module("tkinter", TclError=TclError, Variable=Variable, StringVar=StringVar,
+                      DoubleVar=DoubleVar, IntVar=IntVar, BooleanVar=BooleanVar, Misc=Misc,
+                      Canvas=Canvas, **plain, **constants)
+    ttk_widgets = {name: type(name, (Misc,), {}) for name in (
+        "Frame", "LabelFrame", "Label", "Button", "Entry", "Checkbutton", "Radiobutton", "Scrollbar",
+        "Progressbar", "Separator", "Spinbox", "Style")}
+    ttk = _module("tkinter.ttk", Treeview=Treeview, Notebook=Notebook, Combobox=Combobox, **ttk_widgets)
+    filedialog = _module(
+        "tkinter.filedialog",
+        askopenfilename=lambda **options: ANSWERS["open"],
+        asksaveasfilename=lambda **options: ANSWERS["save"],
+        askdirectory=lambda **options: ANSWERS["directory"],
+    )
+    def silent(*args, **kwargs):
+        return None
+
+    messagebox = _module("tkinter.messagebox", showinfo=silent, showwarning=silent, showerror=silent,
+                         askyesno=lambda *args, **kwargs: True)
+    tkinter.ttk, tkinter.filedialog, tkinter.messagebox = ttk, filedialog, messagebox
+    sys.modules.update({"tkinter": tkinter, "tkinter.ttk": ttk, "tkinter.filedialog": filedialog,
+                        "tkinter.messagebox": messagebox})
+    return tkinter
@@ -0,0 +1,136 @@
+"""
+Several simulations open at once, and the deltas between any two.
+
+A Workspace holds one Document per tab. A document is only its
+IncrementalEvaluator (the model plus cached task results) and file path;
+the window builds widgets for the active document alone. All evaluators
+share one TaskResultCache, and an inactive document is never refreshed
+until it is shown or compared.
+
+compare() lines two evaluated simulations up task by task, matching tasks
+by name and material unit (the n-th duplicate with the n-th), and lists
+the total figures side by side.
+"""
+import math
+import os
+from dataclasses import dataclass
+
+from labor_recalc import IncrementalEvaluator, TaskResultCache
+
+# (SimulationResult attribute, label) for the totals of a comparison
+TOTALS = [
+    ("time_per_unit", "Time per unit (min)"),
+    ("impact_time", "Impact time (min)"),
+    ("total_time", "Total time (min)"),
+    ("total_workers", "Workers"),
+    ("units_completed", "Units per man day"),
+    ("production", "Production"),
+]
+
+
+class Document:
+    def __init__(self, evaluator, file_path=None):
+        self.evaluator = evaluator
+        self.file_path = file_path
+
+    @property
+    def model(self):
+        return self.evaluator.model
+
+    @property
+    def title(self):
+        if self.model.simulation_name:
+            return self.model.simulation_name
+        if self.file_path:
+            return os.path.splitext(os.path.basename(self.file_path))[0]
+        return "Untitled"
+
+    def is_blank(self):
+        """True for a tab nothing has been entered in yet."""
+        sim = self.model
+        return not (self.file_path or sim.simulation_name or sim.workers or sim.tasks or sim.impacts)
+
+
+class Workspace:
+
+    def __init__(self, cache=None):
+        self.cache = cache if cache is not None else TaskResultCache()
+        self.documents = []
+        self.active = 0
+
+    @property
+    def current(self):
+        return self.documents[self.active]
+
+    def add(self, sim=None, file_path=None):
+        """Append a document for sim (default: empty); returns its index."""
+        self.documents.append(Document(IncrementalEvaluator(sim, cache=self.cache), file_path))
+        return len(self.documents) - 1
+
+    def remove(self, index):
+        """Drop document index; the active index moves to a neighbour."""
+        del self.documents[index]
+        if self.active >= len(self.documents) or self.active > index:
+            self.active = max(0, self.active - 1)
+
+    def titles(self):
+        return [document.title for document in self.documents]
+
+
+@dataclass
+class TaskDelta:
+    name: str
+    material_unit: str
+    a: float   # adjusted minutes per unit; None if the task is missing or unassigned
+    b: float
+
+    @property
+    def delta(self):
+        if self.a is None or self.b is None:
+            return None
+        return self.b - self.a
+
+    @property
+    def percent(self):
+        delta = self.delta
+        if delta is None or not self.a:
+            return None
+        return 100 * delta / self.a
+
+
+@dataclass
+class Comparison:
+    tasks: list    # TaskDelta
+    totals: list   # TaskDelta with the totals' labels as names
+    result_a: object
+    result_b: object
+
+
+def _task_minutes(evaluator):
+    """[(name, material_unit, adjusted minutes or None)] in task order."""
+    rows = []
+    for t, task in enumerate(evaluator.model.tasks):
+        adjusted_time, _, worker_count = evaluator.task_result(t)
+        rows.append((task.name, task.material_unit, adjusted_time if worker_count else None))
+    return rows
+
+
+def compare(evaluator_a, evaluator_b):
+    """Comparison of b against a (deltas are b - a)."""
+    result_a, result_b = evaluator_a.result(), evaluator_b.result()
+    rows_b = {}
+    for name, unit, minutes in _task_minutes(evaluator_b):
+        rows_b.setdefault((name, unit), []).append(minutes)
+
+    tasks = []
+    for name, unit, minutes in _task_minutes(evaluator_a):
+        matches = rows_b.get((name, unit))
+        tasks.append(TaskDelta(name, unit, minutes, matches.pop(0) if matches else None))
+    for (name, unit), remaining in rows_b.items():
+        tasks.extend(TaskDelta(name, unit, None, minutes) for minutes in remaining)
+
+    totals = []
+    for attribute, label in TOTALS:
+        a, b = getattr(result_a, attribute), getattr(result_b, attribute)
+        totals.append(TaskDelta(label, "", a if math.isfinite(a) else None, b if math.isfinite(b) else None))
+    return Comparison(tasks, totals, result_a, result_b)
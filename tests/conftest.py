@@ -0,0 +1,39 @@
+import os
+import sys
+
+import pytest
+
+# The modules live at the top of the repository, not in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from labor_model import Simulation  # noqa: E402
+
+
+def simulation_data(output_type="Square-foot", **settings):
+    """A small simulation in the save file schema: 3 workers, 4 tasks, 2 impacts."""
+    data = {
+        "simulation_name": "Wall Type A",
+        "workers": [{"name": "Alex", "efficiency": 1.0}, {"name": "Blair", "efficiency": 0.8},
+                    {"name": "Casey", "efficiency": 1.25}],
+        "tasks": [
+            {"name": "Layout", "base_time": 2.0, "time_unit": "Minutes", "material_unit": "sqft",
+             "assigned_workers": [0]},
+            {"name": "Framing", "base_time": 0.1, "time_unit": "Hours", "material_unit": "sqft",
+             "assigned_workers": [0, 1]},
+            {"name": "Board", "base_time": 3.0, "time_unit": "Minutes", "material_unit": "sqft",
+             "assigned_workers": [1, 2]},
+            {"name": "Unassigned", "base_time": 5.0, "time_unit": "Minutes", "material_unit": "sqft",
+             "assigned_workers": []},
+        ],
+        "impacts": [{"name": "Setup", "time": 30.0}, {"name": "Cleanup", "time": 15.0}],
+        "output_settings": {"output_type": output_type, "length": 4.0, "height": 8.0, "target": 3200.0,
+                            "time_display_unit": "minutes"},
+        "version": "V1.0",
+    }
+    data["output_settings"].update(settings)
+    return data
+
+
+@pytest.fixture
+def sim():
+    return Simulation.from_dict(simulation_data())
@@ -0,0 +1,87 @@
+import os
+
+import labor_tkstub
+
+tk = labor_tkstub.install()
+
+import ProductionBuilder  # noqa: E402
+from labor_journal import SNAPSHOT_NAME, recoverable  # noqa: E402
+
+from conftest import simulation_data  # noqa: E402
+
+
+def window(directory):
+    app = ProductionBuilder.LaborSimulatorApp(tk.Tk())
+    app.autosave_dir = str(directory)
+    return app
+
+
+def crash(app):
+    """Drop the session lock the way a dying process would, leaving its files."""
+    app.autosave_session[1].close()
+
+
+def test_every_tab_survives_a_crash(tmp_path):
+    app = window(tmp_path)
+    app.start_autosave()
+    app.load_simulation_data(simulation_data(), "a.json")
+    app.recalc.set_worker(0, efficiency=0.5)
+    app.load_simulation_data(simulation_data("Man Day (SF)"), "b.json")
+    app.recalc.set_task(1, base_time=0.25)
+    app.switch_document(0)  # switching tabs must not write over either journal
+    app.new_document()
+    app.recalc.set_name("Scratch")
+    expected = [document.model.to_dict() for document in app.workspace.documents]
+    crash(app)
+
+    assert len(recoverable(str(tmp_path))) == 3
+    recovered = window(tmp_path)
+    assert recovered.recover_autosave()
+    assert [document.model.to_dict() for document in recovered.workspace.documents] == expected
+    assert [document.file_path for document in recovered.workspace.documents] == ["a.json", "b.json", None]
+    recovered.start_autosave()
+    assert recoverable(str(tmp_path)) == []
+
+
+def test_running_window_is_not_recovered(tmp_path):
+    first = window(tmp_path)
+    first.start_autosave()
+    first.load_simulation_data(simulation_data(), "a.json")
+
+    second = window(tmp_path)
+    assert not second.recover_autosave()
+    second.start_autosave()
+    first.recalc.set_worker(0, efficiency=0.5)
+    crash(first)
+    # The second window's start left the first one's journal alone
+    assert second.recover_autosave()
+    assert second.workspace.documents[0].model.workers[0].efficiency == 0.5
+
+
+def test_failed_recovery_keeps_the_autosave(tmp_path):
+    app = window(tmp_path)
+    app.start_autosave()
+    app.load_simulation_data(simulation_data(), "a.json")
+    app.load_simulation_data(simulation_data(), "b.json")
+    crash(app)
+    broken = recoverable(str(tmp_path))[1]
+    with open(os.path.join(broken, SNAPSHOT_NAME), "w") as f:
+        f.write("{not json")
+
+    recovered = window(tmp_path)
+    assert recovered.recover_autosave()
+    assert [document.file_path for document in recovered.workspace.documents] == ["a.json"]
+    recovered.start_autosave()
+    assert recoverable(str(tmp_path)) == [broken]
+
+
+def test_closed_tab_and_clean_exit_leave_nothing(tmp_path):
+    app = window(tmp_path)
+    app.start_autosave()
+    app.load_simulation_data(simulation_data(), "a.json")
+    app.load_simulation_data(simulation_data(), "b.json")
+    app.close_document()
+    assert len(os.listdir(app.autosave_session[0])) == 2  # the lock and one tab
+    app.stop_autosave(remove=True)
+    assert os.listdir(tmp_path) == []
+    assert not window(tmp_path).recover_autosave()
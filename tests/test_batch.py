@@ -0,0 +1,69 @@
+import csv
+import json
+import os
+
+import pytest
+
+from labor_batch import COLUMNS, evaluate_file, evaluate_files, expand_paths, run_batch
+from labor_binary import save_binary
+from labor_engine import evaluate
+from labor_model import Simulation
+
+from conftest import simulation_data
+
+
+@pytest.fixture
+def jobs(tmp_path):
+    """A directory of two JSON simulations, one .lsb and one broken file."""
+    (tmp_path / "a.json").write_text(json.dumps(simulation_data()))
+    (tmp_path / "b.json").write_text(json.dumps(simulation_data("Man Day (LF)")))
+    save_binary(Simulation.from_dict(simulation_data("Linear-Foot")), str(tmp_path / "c.lsb"))
+    (tmp_path / "d.json").write_text("{broken")
+    (tmp_path / "notes.txt").write_text("not a simulation")
+    return tmp_path
+
+
+def test_expand_paths_skips_project_files(jobs):
+    (jobs / "site.project.json").write_text(json.dumps({"members": []}))
+    names = [os.path.basename(p) for p in expand_paths([str(jobs), str(jobs / "*.json")])]
+    assert names == ["a.json", "b.json", "c.lsb", "d.json"]
+
+
+@pytest.mark.parametrize("content", ['{"members": []}', "{}", "[1, 2]", '"text"'])
+def test_other_json_is_an_error_row(tmp_path, content):
+    path = tmp_path / "other.json"
+    path.write_text(content)
+    row = evaluate_file(str(path))
+    assert row["Error"].startswith("ValueError: not a saved simulation")
+    assert row["Total Time (min)"] is None and row["Tasks"] is None
+
+
+def test_expand_paths(jobs):
+    names = [os.path.basename(p) for p in expand_paths([str(jobs), str(jobs / "*.json")])]
+    assert names == ["a.json", "b.json", "c.lsb", "d.json"]  # each file once
+
+
+def test_rows_match_the_engine(jobs):
+    row = evaluate_file(str(jobs / "a.json"))
+    result = evaluate(Simulation.from_dict(simulation_data()))
+    assert row["Error"] is None
+    assert row["Total Time (min)"] == pytest.approx(result.total_time)
+    assert row["Total Time (hours)"] == pytest.approx(result.total_time / 60)
+    man_day = evaluate_file(str(jobs / "b.json"))
+    assert man_day["Total Time (min)"] is None and man_day["Production"] > 0
+
+
+def test_pool_keeps_input_order(jobs):
+    paths = expand_paths([str(jobs)])
+    assert evaluate_files(paths, jobs=2) == evaluate_files(paths, jobs=1)
+
+
+def test_run_batch_writes_a_row_per_file(jobs, tmp_path, capsys):
+    output = str(tmp_path / "totals.csv")
+    assert run_batch([str(jobs)], output, jobs=1) == 0
+    with open(output, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == COLUMNS
+    assert [bool(row["Error"]) for row in rows] == [False, False, False, True]
+    assert "(1 with errors)" in capsys.readouterr().out
+    assert run_batch([str(tmp_path / "missing*.json")], output) == 1
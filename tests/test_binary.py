@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from labor_binary import BinarySimulation, is_binary_file, save_binary
+from labor_model import Simulation, load_simulation_file
+
+from conftest import simulation_data
+
+
+def test_round_trip(sim, tmp_path):
+    sim.tasks[1].efficiency_overrides = {1: 1.5}
+    path = str(tmp_path / "wall.lsb")
+    save_binary(sim, path)
+    assert is_binary_file(path)
+    assert load_simulation_file(path).to_dict() == sim.to_dict()
+
+
+def test_columns_are_read_in_place(sim, tmp_path):
+    path = str(tmp_path / "wall.lsb")
+    save_binary(sim, path)
+    with BinarySimulation.open(path) as binary:
+        assert list(binary.efficiencies) == [1.0, 0.8, 1.25]
+        assert list(binary.base_times) == [2.0, 0.1, 3.0, 5.0]
+        assert binary.assigned_workers(2) == [1, 2]
+        assert binary.assigned_workers(3) == []
+
+
+@pytest.mark.parametrize("key", ["target", "target_area"])
+def test_legacy_settings_are_normalized(key, tmp_path):
+    data = simulation_data("Man Day")
+    settings = data["output_settings"]
+    settings[key] = settings.pop("target")
+    json_path = tmp_path / "legacy.json"
+    json_path.write_text(json.dumps(data))
+
+    sim = load_simulation_file(str(json_path))
+    assert sim.output_settings.output_type == "Man Day (SF)"
+    assert sim.output_settings.target == 3200.0
+
+    path = str(tmp_path / "legacy.lsb")
+    save_binary(sim, path)
+    loaded = load_simulation_file(path)
+    assert loaded.output_settings.output_type == "Man Day (SF)"
+    assert loaded.output_settings.target == 3200.0
+    assert loaded.to_dict() == Simulation.from_dict(data).to_dict()
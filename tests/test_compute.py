@@ -0,0 +1,90 @@
+import threading
+
+import pytest
+
+from labor_compute import ComputeService
+
+
+class Root:
+    """Just enough of a Tk widget for ComputeService: after() callbacks run when the test says."""
+
+    def __init__(self):
+        self.pending = {}
+        self.count = 0
+
+    def after(self, ms, func):
+        self.count += 1
+        self.pending[self.count] = func
+        return self.count
+
+    def after_cancel(self, ident):
+        self.pending.pop(ident, None)
+
+    def run(self):
+        while self.pending:
+            _, func = self.pending.popitem()
+            func()
+
+
+@pytest.fixture
+def service():
+    root = Root()
+    service = ComputeService(root, max_workers=2)
+    yield service, root
+    service.shutdown()
+
+
+def test_results_arrive_on_the_polling_thread(service):
+    service, root = service
+    results = []
+    request = service.submit("a", sum, [1, 2, 3], on_done=lambda value: results.append(
+        (value, threading.current_thread() is threading.main_thread())))
+    request.future.result(timeout=10)
+    assert results == []  # nothing is delivered until Tk polls
+    assert service.busy("a")
+    root.run()
+    assert results == [(6, True)]
+    assert not service.busy()
+
+
+def test_errors_go_to_on_error(service):
+    service, root = service
+    errors = []
+    request = service.submit("a", int, "not a number", on_done=pytest.fail, on_error=errors.append)
+    request.future.exception(timeout=10)
+    root.run()
+    assert isinstance(errors[0], ValueError)
+
+
+def test_newer_request_supersedes_and_cancels_the_older(service):
+    service, root = service
+    release = threading.Event()
+    seen = []
+
+    def slow(value, cancel_event):
+        release.wait(10)
+        seen.append((value, cancel_event.is_set()))
+        return value
+
+    results = []
+    first = service.submit("k", slow, 1, on_done=results.append, pass_cancel=True)
+    second = service.submit("k", slow, 2, on_done=results.append, pass_cancel=True)
+    release.set()
+    first.future.result(timeout=10)
+    second.future.result(timeout=10)
+    root.run()
+    assert results == [2]
+    assert sorted(seen) == [(1, True), (2, False)]
+    assert service.superseded == 1
+
+
+def test_cancel_drops_the_result(service):
+    service, root = service
+    release = threading.Event()
+    results = []
+    request = service.submit("k", lambda: release.wait(10), on_done=results.append)
+    service.cancel("k")
+    release.set()
+    request.future.result(timeout=10)
+    root.run()
+    assert results == [] and request.cancelled and not service.busy()
@@ -0,0 +1,125 @@
+import math
+
+import numpy as np
+import pytest
+
+from labor_engine import evaluate, evaluate_batch, learning_curve, learning_minutes, learning_units
+from labor_model import Simulation, unit_factor
+from labor_recalc import IncrementalEvaluator
+
+from conftest import simulation_data
+
+
+def original_minutes(sim):
+    """The original formula: (base_time * unit_factor / avg_eff) * worker_count."""
+    minutes = []
+    for task in sim.tasks:
+        if not task.assigned_workers:
+            continue
+        efficiencies = [sim.workers[w].efficiency for w in task.assigned_workers]
+        avg_eff = sum(efficiencies) / len(efficiencies)
+        minutes.append(task.base_time * unit_factor(task.time_unit) / avg_eff * len(efficiencies))
+    return minutes
+
+
+def test_task_minutes_match_the_original_formula(sim):
+    result = evaluate(sim)
+    assert [task.adjusted_time for task in result.task_results] == pytest.approx(original_minutes(sim))
+    assert [task.index for task in result.task_results] == [0, 1, 2]
+
+
+@pytest.mark.parametrize("output_type", ["Square-foot", "Linear-Foot", "Man Day (SF)", "Man Day (LF)"])
+def test_mode_totals(output_type):
+    sim = Simulation.from_dict(simulation_data(output_type))
+    result = evaluate(sim)
+    per_unit = sum(original_minutes(sim))
+    impact_time = 45.0 * 3
+    assert result.time_per_unit == pytest.approx(per_unit)
+    assert result.impact_time == pytest.approx(impact_time)
+    if output_type == "Square-foot":
+        assert result.units_needed == pytest.approx(3200 / 32)
+        assert result.total_time == pytest.approx(per_unit * 100 + impact_time)
+    elif output_type == "Linear-Foot":
+        assert result.units_needed == pytest.approx(3200 / 4)
+        assert result.total_time == pytest.approx(per_unit * 800 + impact_time)
+    else:
+        units = (8 * 60 * 3 - impact_time) / per_unit
+        assert result.units_completed == pytest.approx(units)
+        assert result.production == pytest.approx(units * (32 if output_type == "Man Day (SF)" else 4))
+
+
+def test_batch_scenarios_match_single_evaluations(sim):
+    efficiencies = np.array([[1.0, 0.8, 1.25], [0.5, 1.0, 1.0], [2.0, 2.0, 2.0]])
+    totals = evaluate_batch(sim, efficiencies=efficiencies).total_time
+    for row, total in zip(efficiencies, totals):
+        for worker, efficiency in zip(sim.workers, row):
+            worker.efficiency = float(efficiency)
+        assert total == pytest.approx(evaluate(sim).total_time)
+
+
+def test_incremental_and_full_evaluation_agree(sim):
+    assert IncrementalEvaluator(sim).result().total_time == pytest.approx(evaluate(sim).total_time)
+
+
+def brute_learning_minutes(units, model, rate, plateau=0):
+    """Unit by unit: Wright's cumulative average n**(b+1), or Crawford's unit time n**b."""
+    b = math.log2(rate)
+
+    def unit(n):
+        if plateau >= 1:
+            n = min(n, int(plateau))
+        return n ** (b + 1) - (n - 1) ** (b + 1) if model == "Wright" else n ** b
+
+    whole = math.floor(units)
+    return sum(unit(n) for n in range(1, whole + 1)) + (units - whole) * unit(whole + 1)
+
+
+@pytest.mark.parametrize("model", ["Wright", "Crawford"])
+@pytest.mark.parametrize("rate", [0.7, 0.85, 1.0])
+@pytest.mark.parametrize("plateau", [0, 10])
+def test_learning_minutes_match_a_unit_by_unit_sum(model, rate, plateau):
+    units = [0, 0.5, 1, 2.5, 16, 17, 100.25, 5000]
+    expected = [brute_learning_minutes(u, model, rate, plateau) for u in units]
+    assert learning_minutes(units, model, rate, plateau) == pytest.approx(expected, rel=1e-10)
+
+
+@pytest.mark.parametrize("model", ["Wright", "Crawford"])
+@pytest.mark.parametrize("plateau", [0, 10])
+def test_learning_units_inverts_learning_minutes(model, plateau):
+    units = np.array([0.5, 1, 2.5, 16, 17, 100.25, 5000, 1e7])
+    minutes = learning_minutes(units, model, 0.8, plateau)
+    assert learning_units(minutes, model, 0.8, plateau) == pytest.approx(units, rel=1e-9)
+    assert learning_units([0.0, -3.0], model, 0.8, plateau).tolist() == [0.0, -3.0]
+
+
+def test_learning_curve_points():
+    points = learning_curve(2.0, 20.5, "Crawford", 0.8, plateau=6)
+    assert [unit for unit, _, _ in points] == [1, 2, 4, 6, 8, 16, 21]
+    for unit, minutes, total in points:
+        assert minutes == pytest.approx(2.0 * min(unit, 6) ** math.log2(0.8))
+        assert total == pytest.approx(2.0 * brute_learning_minutes(unit, "Crawford", 0.8, 6))
+    assert learning_curve(2.0, 0, "Wright", 0.8) == []
+
+
+def test_learning_input_checks():
+    with pytest.raises(ValueError, match="Unknown learning model"):
+        learning_minutes(10, "None", 0.8)
+    with pytest.raises(ValueError, match="Learning rate"):
+        learning_minutes(10, "Wright", 0.5)
+    with pytest.raises(ValueError, match="Plateau"):
+        learning_minutes(10, "Wright", 0.8, plateau=-1)
+
+
+def test_no_learning_model_leaves_totals_alone(sim):
+    plain = evaluate(sim)
+    sim.output_settings.learning_model = "None"
+    sim.output_settings.learning_rate = 0.7
+    assert evaluate(sim).total_time == pytest.approx(plain.total_time)
+
+
+@pytest.mark.parametrize("model", ["Wright", "Crawford"])
+def test_learning_model_in_evaluate(model):
+    sim = Simulation.from_dict(simulation_data(learning_model=model, learning_rate=0.8, learning_plateau=50))
+    result = evaluate(sim)
+    expected = result.time_per_unit * brute_learning_minutes(100, model, 0.8, 50) + result.impact_time
+    assert result.total_time == pytest.approx(expected)
@@ -0,0 +1,50 @@
+import os
+import threading
+
+import pytest
+from openpyxl import load_workbook
+
+from labor_engine import evaluate
+from labor_export import ExportCancelled, ExportJob, row_count, write_workbook
+
+
+def sheet_rows(path):
+    workbook = load_workbook(path)
+    return {name: [list(row) for row in workbook[name].iter_rows(values_only=True)]
+            for name in workbook.sheetnames}
+
+
+def test_workbook_sheets_and_row_count(sim, tmp_path):
+    sim.tasks[2].efficiency_overrides = {1: 1.5}
+    sim.workers[0].efficiency = float("nan")  # an entry being typed is left blank
+    result = evaluate(sim)
+    path = str(tmp_path / "out.xlsx")
+    written = write_workbook(path, sim, result, "V1.0", export_date="2026-10-18 09:00:00")
+
+    sheets = sheet_rows(path)
+    assert list(sheets) == ["Workers", "Tasks", "Efficiency Matrix", "Impacts", "Settings", "Results"]
+    assert written == row_count(sim, result) == sum(len(rows) - 1 for rows in sheets.values())
+    assert sheets["Workers"][1] == [1, "Alex", None]
+    assert sheets["Tasks"][3][5] == "Blair, Casey"
+    assert sheets["Efficiency Matrix"][3][2:] == [None, 1.5, 1.25]
+    assert sheets["Settings"][1][sheets["Settings"][0].index("Export Date")] == "2026-10-18 09:00:00"
+
+
+def test_cancel_leaves_the_target_alone(sim, tmp_path):
+    path = tmp_path / "out.xlsx"
+    path.write_text("previous export")
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(ExportCancelled):
+        write_workbook(str(path), sim, evaluate(sim), "V1.0", cancel_event=cancel)
+    assert path.read_text() == "previous export"
+    assert os.listdir(tmp_path) == ["out.xlsx"]
+
+
+def test_job_runs_on_a_thread(sim, tmp_path):
+    path = str(tmp_path / "out.xlsx")
+    job = ExportJob(path, sim, "V1.0").start()
+    job._thread.join(10)
+    assert job.done and job.error is None and not job.cancelled
+    assert job.fraction == 1.0
+    assert "Results" in sheet_rows(path)
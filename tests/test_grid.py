@@ -0,0 +1,160 @@
+from types import SimpleNamespace
+
+import labor_tkstub
+
+tk = labor_tkstub.install()
+
+from labor_grid import HEADER_HEIGHT, LEADING_COLUMNS, ROW_HEIGHT, WORKER_COLUMN_WIDTH, TaskGrid  # noqa: E402
+
+
+class Source:
+    """A task list of the given size with two workers."""
+
+    def __init__(self, tasks):
+        self.names = [f"T{t}" for t in range(tasks)]
+        self.units = ["Minutes"] * tasks
+        self.assigned = set()
+        self.cells_read = []
+        self.edits = []
+
+    def task_count(self):
+        return len(self.names)
+
+    def worker_labels(self):
+        return ["Alex", "Blair"]
+
+    def task_cells(self, t):
+        self.cells_read.append(t)
+        return self.names[t], 1.5, self.units[t], "Per Unit"
+
+    def is_assigned(self, t, w):
+        return (t, w) in self.assigned
+
+    def task_result_text(self, t):
+        return ""
+
+    def task_efficiency_text(self, t, w):
+        return ""
+
+    def toggle_assignment(self, t, w):
+        self.assigned ^= {(t, w)}
+
+    def edit_efficiency(self, t, w):
+        self.edits.append((t, "efficiency", w))
+
+    def edit_task(self, t, field, text):
+        self.edits.append((t, field, text))
+        if field == "time_unit":
+            self.units[t] = text
+        elif field == "name":
+            self.names[t] = text
+
+
+def grid(tasks):
+    source = Source(tasks)
+    return TaskGrid(tk.Tk(), source), source
+
+
+def click(x, y):
+    return SimpleNamespace(x=x, y=y)
+
+
+def column_x(key):
+    left = 0
+    for column, _, width in LEADING_COLUMNS:
+        if column == key:
+            return left + 4
+        left += width
+    return left + WORKER_COLUMN_WIDTH * key[1] + 4
+
+
+def row_y(t):
+    return HEADER_HEIGHT + t * ROW_HEIGHT + 4
+
+
+def test_only_visible_rows_are_drawn():
+    view, source = grid(5000)
+    view.refresh()
+    visible = view.visible_row_count()
+    assert sorted(set(source.cells_read)) == list(range(visible))
+    assert visible < 50
+
+    source.cells_read.clear()
+    view.see(4000)
+    assert 4000 in view.visible_rows()
+    assert set(source.cells_read) == set(view.visible_rows())
+
+
+def test_scrolling_stops_at_the_last_row():
+    view, _ = grid(30)
+    view.scroll_rows(1000)
+    assert view.visible_rows()[-1] == 29
+    view.scroll_rows(-1000)
+    assert view.first_row == 0
+
+
+def test_row_and_column_at():
+    view, _ = grid(3)
+    view.refresh()
+    assert view.row_at(HEADER_HEIGHT - 1) is None
+    assert view.row_at(row_y(0)) == 0
+    assert view.row_at(row_y(2)) == 2
+    assert view.row_at(row_y(3)) is None
+    assert view.column_at(column_x("name"))[0] == "name"
+    assert view.column_at(column_x(("worker", 1)))[0] == ("worker", 1)
+    assert view.column_at(10 ** 6)[0] is None
+
+
+def test_click_toggles_assignment():
+    view, source = grid(3)
+    view.refresh()
+    view.on_click(click(column_x(("worker", 1)), row_y(2)))
+    assert source.assigned == {(2, 1)}
+    view.on_click(click(column_x(("worker", 1)), row_y(2)))
+    assert source.assigned == set()
+
+
+def test_click_cycles_time_unit():
+    view, source = grid(3)
+    view.refresh()
+    view.on_click(click(column_x("time_unit"), row_y(1)))
+    assert source.units[1] == "Hours"
+    view.on_click(click(column_x("time_unit"), row_y(1)))
+    assert source.units[1] == "Minutes"
+
+
+def test_edit_is_committed_through_the_source():
+    view, source = grid(3)
+    view.refresh()
+    view.on_click(click(column_x("name"), row_y(1)))
+    editor = view.editor[0]
+    assert editor.get() == "T1"
+    editor.delete(0, "end")
+    editor.insert(0, "Hang board")
+    view.commit_edit()
+    assert source.edits == [(1, "name", "Hang board")]
+    assert view.editor is None and editor.destroyed
+
+
+def test_cancelled_edit_is_dropped():
+    view, source = grid(3)
+    view.refresh()
+    view.on_click(click(column_x("name"), row_y(0)))
+    view.cancel_edit()
+    view.commit_edit()
+    assert source.edits == []
+
+
+def test_scrolling_commits_an_open_edit():
+    view, source = grid(100)
+    view.refresh()
+    view.on_click(click(column_x("name"), row_y(0)))
+    view.scroll_rows(3)
+    assert source.edits == [(0, "name", "T0")]
+
+
+def test_right_click_edits_efficiency():
+    view, source = grid(3)
+    view.refresh()
+    view.on_right_click(click(column_x(("worker", 0)), row_y(1)))
+    assert source.edits == [(1, "efficiency", 0)]
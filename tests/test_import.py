@@ -0,0 +1,41 @@
+import pytest
+
+from labor_import import guess_mapping, import_takeoff, read_header
+
+
+def takeoff(tmp_path, text):
+    path = tmp_path / "takeoff.csv"
+    path.write_text(text)
+    return str(path)
+
+
+def test_hours_column_without_unit_column_is_read_as_hours(tmp_path):
+    path = takeoff(tmp_path, "Task,Hours,Per,Crew\nFrame wall,1.5,lf,Alex;Blair\n")
+    mapping = guess_mapping(read_header(path))
+    assert mapping == {"name": 0, "base_time": 1, "time_unit": None, "material_unit": 2, "crew": 3}
+    result = import_takeoff(path, mapping, worker_names=["Alex"])
+    task = result.tasks[0]
+    assert (task.base_time, task.time_unit, task.material_unit) == (1.5, "Hours", "lf")
+    assert task.assigned_workers == [0, 1]
+    assert [w.name for w in result.workers] == ["Blair"]
+
+
+def test_unit_column_wins_and_blank_unit_defaults_to_minutes(tmp_path):
+    path = takeoff(tmp_path, "Name,Base Time,Time Unit\nA,3,hrs\nB,4,\n")
+    result = import_takeoff(path, guess_mapping(read_header(path)))
+    assert [(t.base_time, t.time_unit) for t in result.tasks] == [(3.0, "Hours"), (4.0, "Minutes")]
+
+
+def test_bad_rows_are_reported_not_imported(tmp_path):
+    path = takeoff(tmp_path, "Name,Minutes,Time Unit\nA,-3,\n,2,\nC,2,weeks\nD,2,min\n\n")
+    result = import_takeoff(path, guess_mapping(read_header(path)))
+    assert [t.name for t in result.tasks] == ["D"]
+    assert result.rows == 4
+    assert [(e.row, e.value) for e in result.errors] == [(2, "-3"), (3, ""), (4, "weeks")]
+    assert "3 rows skipped" in result.summary_text()
+
+
+def test_missing_required_column_is_an_error(tmp_path):
+    path = takeoff(tmp_path, "Name,Notes\nA,x\n")
+    with pytest.raises(ValueError):
+        import_takeoff(path, guess_mapping(read_header(path)))
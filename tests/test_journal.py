@@ -0,0 +1,70 @@
+import json
+
+from labor_journal import ChangeJournal, has_recovery, recover
+from labor_recalc import IncrementalEvaluator
+
+
+def journaled(sim, directory):
+    journal = ChangeJournal(str(directory), get_file_path=lambda: "wall.json")
+    journal.start(sim.to_dict())
+    return IncrementalEvaluator(sim, journal=journal), journal
+
+
+def edit(evaluator):
+    evaluator.set_name("Wall Type B")
+    evaluator.set_worker(1, efficiency=0.6)
+    evaluator.add_worker()
+    evaluator.set_assignment(3, 3, True)
+    evaluator.set_task(2, base_time=4.5)
+    evaluator.set_task_efficiency(0, 0, 1.4)
+    evaluator.set_impact(1, time=20.0)
+    evaluator.set_output(output_type="Linear-Foot", target=640.0)
+
+
+def test_replay_rebuilds_the_edited_simulation(sim, tmp_path):
+    evaluator, journal = journaled(sim, tmp_path)
+    edit(evaluator)
+    journal.close()  # a crash: nothing is discarded
+
+    assert has_recovery(str(tmp_path))
+    recovered, file_path, replayed = recover(str(tmp_path))
+    assert file_path == "wall.json"
+    assert replayed == journal.pending
+    assert recovered.to_dict() == evaluator.model.to_dict()
+
+
+def test_compacted_records_are_not_replayed_twice(sim, tmp_path):
+    evaluator, journal = journaled(sim, tmp_path)
+    evaluator.add_worker()
+    journal.compact(evaluator.model.to_dict())
+    evaluator.set_worker(3, efficiency=0.7)
+    # A crash after the snapshot was renamed but before the journal was truncated
+    with open(journal.journal_path, "r") as f:
+        kept = f.read()
+    with open(journal.journal_path, "w") as f:
+        f.write(json.dumps({"seq": 1, "op": "add_worker", "args": [{"name": "", "efficiency": 1.0}]}) + "\n")
+        f.write(kept)
+    journal.close()
+
+    recovered, _, replayed = recover(str(tmp_path))
+    assert replayed == 1
+    assert recovered.to_dict() == evaluator.model.to_dict()
+
+
+def test_torn_final_line_is_ignored(sim, tmp_path):
+    evaluator, journal = journaled(sim, tmp_path)
+    evaluator.set_worker(0, efficiency=0.9)
+    journal.close()
+    with open(journal.journal_path, "a") as f:
+        f.write('{"seq": 2, "op": "set_wor')
+
+    recovered, _, replayed = recover(str(tmp_path))
+    assert replayed == 1
+    assert recovered.workers[0].efficiency == 0.9
+
+
+def test_clean_exit_leaves_nothing(sim, tmp_path):
+    _, journal = journaled(sim, tmp_path)
+    journal.discard()
+    assert not has_recovery(str(tmp_path))
+    assert recover(str(tmp_path)) is None
@@ -0,0 +1,58 @@
+import pytest
+
+from labor_library import TemplateLibrary, fts_query
+from labor_model import Task, Worker
+
+
+@pytest.fixture
+def library():
+    with TemplateLibrary(":memory:") as library:
+        library.add_tasks([Task(name="Hang board", base_time=12, material_unit="sheet"),
+                           Task(name="Hang door", base_time=45, material_unit="each"),
+                           Task(name="Tape joints", base_time=3, material_unit="sqft")], trade="Drywall")
+        library.add_tasks([Task(name="Hang cabinets", base_time=30, material_unit="each")], trade="Millwork")
+        yield library
+
+
+def names(templates):
+    return [t.name for t in templates]
+
+
+def test_prefix_search_ranks_by_use_count(library):
+    assert names(library.search("hang")) == ["Hang board", "Hang cabinets", "Hang door"]
+    cabinets, = library.search("cab")
+    door, = library.search("hang do")
+    library.record_use([door.id, door.id, cabinets.id])
+    assert names(library.search("hang")) == ["Hang door", "Hang cabinets", "Hang board"]
+    assert library.search("hang")[0].uses == 2
+
+
+def test_filters(library):
+    assert names(library.search("hang", trade="Drywall")) == ["Hang board", "Hang door"]
+    assert names(library.search(material_unit="each")) == ["Hang cabinets", "Hang door"]
+    assert library.trades() == ["Drywall", "Millwork"]
+
+
+def test_saving_again_updates_the_time_and_keeps_uses(library):
+    board, = library.search("board")
+    library.record_use([board.id])
+    library.add_tasks([Task(name="Hang board", base_time=10, material_unit="sheet")], trade="Drywall")
+    board, = library.search("board")
+    assert (board.base_time, board.uses) == (10, 1)
+    assert library.task_count() == 4
+    assert library.get_tasks([board.id])[0].to_task().base_time == 10
+
+
+def test_quotes_cannot_break_the_query(library):
+    assert fts_query('hang "bo') == '"hang"* """bo"*'
+    assert library.search('"') == []
+
+
+def test_crews(library):
+    library.save_crew("Crew A", [Worker("Alex", 1.1)], trade="Drywall")
+    library.save_crew("Crew B", [Worker("Blair", 0.9)])
+    crew_b = library.crews()[1]
+    library.record_crew_use(crew_b.id)
+    crews = library.crews()
+    assert [c.name for c in crews] == ["Crew B", "Crew A"]
+    assert crews[1].workers[0].efficiency == 1.1
@@ -0,0 +1,32 @@
+import pytest
+
+from labor_engine import evaluate
+from labor_montecarlo import parse_inputs, run_monte_carlo
+
+
+def test_same_seed_same_result_in_any_number_of_processes(sim):
+    inputs = parse_inputs("efficiency[1] = normal(1.0, 0.1)\nbase_time[*] = pert(0.9, 1.0, 1.3)")
+    serial = run_monte_carlo(sim, inputs, 2000, seed=7, chunk_size=500, jobs=1)
+    parallel = run_monte_carlo(sim, inputs, 2000, seed=7, chunk_size=500, jobs=4)
+    assert serial.samples == parallel.samples == 2000
+    assert serial.percentiles() == parallel.percentiles()
+    assert serial.mean == parallel.mean
+    assert serial.counts.tolist() == parallel.counts.tolist()
+
+
+def test_different_seeds_differ(sim):
+    inputs = parse_inputs("efficiency[1] = normal(1.0, 0.1)")
+    first = run_monte_carlo(sim, inputs, 1000, seed=1, jobs=1)
+    second = run_monte_carlo(sim, inputs, 1000, seed=2, jobs=1)
+    assert first.mean != second.mean
+
+
+def test_no_uncertainty_gives_the_point_estimate(sim):
+    result = run_monte_carlo(sim, [], 10, jobs=1)
+    assert result.percentile(10) == pytest.approx(evaluate(sim).total_time, rel=1e-3)
+
+
+@pytest.mark.parametrize("samples", [0, -5])
+def test_samples_must_be_positive(sim, samples):
+    with pytest.raises(ValueError, match="samples must be at least 1"):
+        run_monte_carlo(sim, [], samples)
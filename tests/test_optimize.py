@@ -0,0 +1,69 @@
+import random
+import re
+import threading
+
+import pytest
+
+from labor_engine import evaluate
+from labor_model import Simulation, Task, Worker
+from labor_optimize import CrewConstraints, optimize_crew, parse_rules
+
+
+def crew_simulation(tasks, workers, seed=1):
+    rng = random.Random(seed)
+    return Simulation(workers=[Worker(f"W{w + 1}", rng.uniform(0.6, 1.4)) for w in range(workers)],
+                      tasks=[Task(f"T{t + 1}", rng.uniform(1, 20), assigned_workers=[0])
+                             for t in range(tasks)])
+
+
+def test_plan_time_matches_the_engine(sim):
+    plan = optimize_crew(sim, parse_rules("task[1] min=2\ntask[4] exclude=1"))
+    assert plan.optimal
+    assert plan.time_per_unit <= plan.previous_time_per_unit
+    for task, workers in zip(sim.tasks, plan.assignments):
+        task.assigned_workers = workers
+    assert evaluate(sim).time_per_unit == pytest.approx(plan.time_per_unit)
+    assert len(plan.assignments[0]) >= 2
+    assert 0 not in plan.assignments[3]
+
+
+def test_capacities_are_respected():
+    sim = crew_simulation(12, 5)
+    plan = optimize_crew(sim, CrewConstraints(max_tasks_per_worker=3), time_limit=2.0)
+    load = [sum(w in crew for crew in plan.assignments) for w in range(5)]
+    assert max(load) <= 3
+
+
+def test_cancel_event_stops_the_search():
+    cancel = threading.Event()
+    cancel.set()
+    sim = crew_simulation(100, 30)
+    plan = optimize_crew(sim, CrewConstraints(max_tasks_per_worker=4), time_limit=30.0, cancel_event=cancel)
+    assert not plan.optimal
+    assert plan.nodes <= 1024
+
+
+def test_takeoff_sized_simulation_does_not_recurse_per_task():
+    sim = crew_simulation(2500, 12)
+    plan = optimize_crew(sim, time_limit=30.0)
+    assert plan.optimal
+    assert len(plan.assignments) == 2500
+    capped = optimize_crew(sim, CrewConstraints(max_tasks_per_worker=1000), time_limit=1.0)
+    load = [sum(w in crew for crew in capped.assignments) for w in range(12)]
+    assert max(load) <= 1000
+
+
+@pytest.mark.parametrize("text, message", [
+    ("task[0] max=1", "Line 1: Task 0 does not exist"),
+    ("# comment\ntask[50] min=2", "Line 2: Task 50 does not exist (there are 4)"),
+    ("worker[9] max_tasks=1", "Line 1: Worker 9 does not exist (there are 3)"),
+    ("task[1] require=4", "Line 1: Worker 4 does not exist (there are 3)"),
+])
+def test_rules_must_name_existing_tasks_and_workers(sim, text, message):
+    with pytest.raises(ValueError, match=re.escape(message)):
+        parse_rules(text, sim=sim)
+
+
+def test_rules_built_in_code_are_checked_too(sim):
+    with pytest.raises(ValueError, match="Task 5 has rules but does not exist"):
+        optimize_crew(sim, parse_rules("task[5] min=2"))
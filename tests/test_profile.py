@@ -0,0 +1,108 @@
+import json
+
+import labor_tkstub
+from labor_profile import SAMPLE_WINDOW, Profiler, Timer, _from_environment, widget_count
+
+tk = labor_tkstub.install()
+
+
+def test_disabled_timer_records_nothing():
+    profiler = Profiler()
+
+    @profiler.timed("work")
+    def work(x):
+        return x * 2
+
+    assert work(21) == 42
+    assert work.__name__ == "work"
+    assert profiler.snapshot()["timers"] == {}
+
+
+def test_enabled_timer_records_calls_and_failures():
+    profiler = Profiler(enabled=True)
+
+    @profiler.timed("work")
+    def work(fail=False):
+        if fail:
+            raise ValueError("bad")
+
+    work()
+    try:
+        work(fail=True)
+    except ValueError:
+        pass
+    timer = profiler.snapshot()["timers"]["work"]
+    assert timer["count"] == 2
+    assert 0 <= timer["max_ms"] <= timer["total_ms"]
+
+
+def test_timer_statistics():
+    timer = Timer()
+    for ms in range(1, 101):
+        timer.add(ms / 1000)
+    stats = timer.to_dict()
+    assert stats["count"] == 100
+    assert round(stats["mean_ms"], 6) == 50.5
+    assert round(stats["p95_ms"], 6) == 95
+    assert round(stats["max_ms"], 6) == 100
+
+
+def test_p95_uses_recent_samples_only():
+    timer = Timer()
+    timer.add(10.0)
+    for _ in range(SAMPLE_WINDOW):
+        timer.add(0.001)
+    assert timer.p95() == 0.001
+    assert timer.max == 10.0
+
+
+def test_counters_from_sources():
+    profiler = Profiler()
+    profiler.add_source(lambda: {"widgets": 3})
+    profiler.add_source(lambda: 1 / 0)
+    profiler.add_source(lambda: {"traces": 5})
+    assert profiler.snapshot()["counters"] == {"widgets": 3, "traces": 5}
+
+
+def test_reset_clears_timers():
+    profiler = Profiler(enabled=True)
+    profiler.record("work", 0.5)
+    profiler.reset()
+    assert profiler.snapshot()["timers"] == {}
+
+
+def test_dump_writes_json(tmp_path):
+    path = tmp_path / "stats.json"
+    profiler = Profiler(enabled=True, dump_path=str(path))
+    profiler.record("work", 0.25)
+    assert Profiler().dump() is None
+    assert profiler.dump() == str(path)
+    data = json.loads(path.read_text())
+    assert data["timers"]["work"]["total_ms"] == 250
+
+    path.unlink()
+    profiler.dump_at_exit()
+    assert not path.exists()
+
+
+def test_environment_settings(monkeypatch, tmp_path):
+    monkeypatch.delenv("LABOR_TRACEMALLOC", raising=False)
+    monkeypatch.setenv("LABOR_PROFILE", "0")
+    assert not _from_environment().enabled
+    monkeypatch.setenv("LABOR_PROFILE", "1")
+    profiler = _from_environment()
+    assert profiler.enabled and profiler.dump_path is None
+
+    path = str(tmp_path / "stats.json")
+    monkeypatch.setattr("atexit.register", lambda func: None)
+    monkeypatch.setenv("LABOR_PROFILE", path)
+    profiler = _from_environment()
+    assert profiler.enabled and profiler.dump_path == path
+
+
+def test_widget_count():
+    root = tk.Tk()
+    frame = tk.Frame(root)
+    tk.Label(frame)
+    tk.Button(root)
+    assert widget_count(root) == 4
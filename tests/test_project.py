@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from conftest import simulation_data
+from labor_model import OUTPUT_TYPES, Simulation
+from labor_project import Project, ProjectEvaluator, evaluate_member, load_project, main
+from labor_recalc import IncrementalEvaluator
+
+
+def write(path, data):
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+@pytest.mark.parametrize("output_type", OUTPUT_TYPES)
+@pytest.mark.parametrize("learning_model", ["None", "Wright", "Crawford"])
+def test_member_hours_match_the_window(tmp_path, output_type, learning_model):
+    data = simulation_data(output_type, learning_model=learning_model, learning_rate=0.8, target=32000)
+    member = evaluate_member(write(tmp_path / "a.json", data))
+    result = IncrementalEvaluator(Simulation.from_dict(data)).result()
+    # A Man Day member is one man day: working time plus impacts
+    expected = result.total_time if output_type in ("Square-foot", "Linear-Foot") else result.available_time
+    assert member.error is None
+    assert member.total_hours * 60 == pytest.approx(expected)
+
+
+def test_rollup_totals_and_reevaluates_only_changed_files(tmp_path):
+    project = Project("Tower B", path=str(tmp_path / "p.project.json"))
+    project.add(write(tmp_path / "a.json", simulation_data()), "Drywall", "Crew 1")
+    project.add(write(tmp_path / "b.json", simulation_data("Linear-Foot")), "Framing", "Crew 2")
+    evaluator = ProjectEvaluator(project)
+
+    rollup = evaluator.rollup(project.members)
+    assert rollup.evaluated == 2
+    assert rollup.total.total_hours == pytest.approx(sum(r.total_hours for _, r in rollup.members))
+    assert [row.label for row in rollup.by_trade] == ["Drywall", "Framing"]
+    assert evaluator.rollup(project.members).evaluated == 0
+
+
+def test_unreadable_member_is_reported(tmp_path):
+    member = evaluate_member(str(tmp_path / "missing.json"))
+    assert member.error and member.total_hours == 0
+
+
+def test_adding_a_directory_skips_project_files(tmp_path, capsys):
+    write(tmp_path / "a.json", simulation_data())
+    write(tmp_path / "other.project.json", {"project_name": "Other", "members": []})
+    project_path = str(tmp_path / "p.project.json")
+    assert main([project_path, "--add", str(tmp_path), "--trade", "A", "-j", "1"]) == 0
+    assert main([project_path, "--add", str(tmp_path), "--trade", "B", "-j", "1"]) == 0
+
+    project = load_project(project_path)
+    assert [member.path for member in project.members] == ["a.json"]
+    assert "Added 0 members" in capsys.readouterr().out
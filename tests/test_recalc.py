@@ -0,0 +1,57 @@
+import pytest
+
+from labor_engine import evaluate
+from labor_model import Simulation
+from labor_recalc import IncrementalEvaluator
+
+
+def test_repeated_worker_counts_once():
+    data = {"workers": [{"name": "Alex", "efficiency": 1.0}],
+            "tasks": [{"name": "Layout", "base_time": 10, "assigned_workers": [0, 0]}]}
+    sim = Simulation.from_dict(data)
+    assert sim.tasks[0].assigned_workers == [0]
+    assert IncrementalEvaluator(sim).result().task_results[0].adjusted_time == 10.0
+    assert evaluate(sim).task_results[0].adjusted_time == 10.0
+
+    sim.tasks[0].assigned_workers = [0, 0]  # a model built in code
+    assert IncrementalEvaluator(sim).result().task_results[0].adjusted_time == pytest.approx(10.0)
+
+
+def assert_matches_full(evaluator):
+    full = evaluate(evaluator.model)
+    result = evaluator.result()
+    assert [t.index for t in result.task_results] == [t.index for t in full.task_results]
+    assert [t.adjusted_time for t in result.task_results] == pytest.approx(
+        [t.adjusted_time for t in full.task_results])
+    for name in ("time_per_unit", "impact_time", "total_time", "units_completed", "production"):
+        assert getattr(result, name) == pytest.approx(getattr(full, name))
+
+
+def test_edits_match_a_full_evaluation(sim):
+    evaluator = IncrementalEvaluator(sim)
+    assert_matches_full(evaluator)
+    evaluator.set_worker(1, efficiency=0.5)
+    assert_matches_full(evaluator)
+    evaluator.set_task(0, base_time=4.0, time_unit="Hours")
+    assert_matches_full(evaluator)
+    evaluator.set_assignment(3, 2, True)
+    assert_matches_full(evaluator)
+    evaluator.set_task_efficiency(2, 1, 1.5)
+    assert_matches_full(evaluator)
+    evaluator.add_worker()
+    evaluator.set_assignment(0, 3, True)
+    assert_matches_full(evaluator)
+    evaluator.set_impact(0, time=90.0)
+    evaluator.set_output(output_type="Man Day (LF)")
+    assert_matches_full(evaluator)
+
+
+def test_undone_edit_is_served_from_the_memo(sim):
+    evaluator = IncrementalEvaluator(sim)
+    before = evaluator.result().total_time
+    evaluator.set_worker(0, efficiency=2.0)
+    evaluator.result()
+    cached = len(evaluator.cache)
+    evaluator.set_worker(0, efficiency=1.0)
+    assert evaluator.result().total_time == before
+    assert len(evaluator.cache) == cached
@@ -0,0 +1,68 @@
+from labor_refresh import RefreshScheduler
+
+
+class Root:
+    """after()/after_idle() that only run when the test goes idle."""
+
+    def __init__(self):
+        self.pending = {}
+        self.count = 0
+
+    def after(self, ms, func):
+        self.count += 1
+        self.pending[self.count] = (ms, func)
+        return self.count
+
+    def after_idle(self, func):
+        return self.after(0, func)
+
+    def after_cancel(self, ident):
+        self.pending.pop(ident, None)
+
+    def idle(self):
+        while self.pending:
+            _, (_, func) = self.pending.popitem()
+            func()
+
+
+def scheduler(**options):
+    root, calls = Root(), []
+    return RefreshScheduler(root, lambda: calls.append(1), **options), root, calls
+
+
+def test_requests_before_idle_run_once():
+    refresh, root, calls = scheduler()
+    for _ in range(5):
+        refresh.request("var", "", "write")  # trace arguments are ignored
+    assert calls == [] and refresh.pending
+    root.idle()
+    assert calls == [1]
+    assert refresh.stats()["requests"] == 5 and refresh.stats()["coalesced"] == 4
+    root.idle()
+    assert calls == [1]
+
+
+def test_suspended_requests_collapse_into_one_refresh():
+    refresh, root, calls = scheduler()
+    with refresh.suspended():
+        with refresh.suspended():
+            refresh.request()
+        refresh.request()
+        assert not refresh.pending
+    assert refresh.pending
+    root.idle()
+    assert calls == [1] and refresh.runs == 1
+
+
+def test_flush_runs_now_and_cancel_drops():
+    refresh, root, calls = scheduler(delay_ms=250)
+    refresh.request()
+    assert list(root.pending.values())[0][0] == 250
+    refresh.flush()
+    assert calls == [1] and not root.pending
+    refresh.request()
+    refresh.cancel()
+    root.idle()
+    assert calls == [1]
+    refresh.flush()  # nothing pending: no run
+    assert refresh.runs == 1
@@ -0,0 +1,55 @@
+from datetime import date
+
+import pytest
+
+from labor_engine import evaluate
+from labor_model import Simulation
+from labor_schedule import ScheduleSettings, parse_pairs, simulate_schedule
+
+from conftest import simulation_data
+
+FRIDAY = date(2026, 10, 16)
+
+
+def man_day(**settings):
+    return Simulation.from_dict(simulation_data("Man Day (SF)", **settings))
+
+
+def test_default_day_is_one_man_day():
+    sim = man_day()
+    result = simulate_schedule(sim, ScheduleSettings(target=1e6, max_days=10, start_date=FRIDAY))
+    assert result.days[0].quantity == pytest.approx(evaluate(sim).production)
+
+
+def test_default_day_follows_the_learning_curve():
+    sim = man_day(learning_model="Wright", learning_rate=0.85)
+    result = simulate_schedule(sim, ScheduleSettings(target=1e6, max_days=10, start_date=FRIDAY))
+    assert result.days[0].quantity == pytest.approx(evaluate(sim).production)
+    assert result.days[1].quantity > result.days[0].quantity
+
+
+def test_weekends_and_day_impacts():
+    sim = man_day()
+    result = simulate_schedule(sim, ScheduleSettings(target=1e6, max_days=10, start_date=FRIDAY,
+                                                     day_impacts={2: 240}))
+    first, second = result.days[:2]
+    assert second.date == date(2026, 10, 19)  # the Monday after
+    per_minute = first.quantity / (480 - 45)
+    assert second.impact_minutes == 45 + 240
+    assert second.quantity == pytest.approx(per_minute * (480 - 45 - 240))
+
+
+def test_finishes_at_the_target():
+    sim = man_day()
+    production = evaluate(sim).production
+    result = simulate_schedule(sim, ScheduleSettings(target=2.5 * production, start_date=FRIDAY))
+    assert result.finished
+    assert result.working_days == 3
+    assert result.days[-1].cumulative == pytest.approx(2.5 * production)
+    assert result.days[-1].percent_complete == pytest.approx(100)
+
+
+def test_parse_pairs():
+    assert parse_pairs("4=30; 6.5=15", "Breaks") == [(4.0, 30.0), (6.5, 15.0)]
+    with pytest.raises(ValueError, match="Breaks: expected 'a=b' pairs, got '4'"):
+        parse_pairs("4", "Breaks")
@@ -0,0 +1,93 @@
+import asyncio
+import json
+
+import pytest
+
+from labor_engine import evaluate
+from labor_model import Simulation
+from labor_service import EstimationService
+
+from conftest import simulation_data
+
+
+async def request(port, method, path, body=None):
+    """(status, decoded JSON) of one request on a fresh connection."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = json.dumps(body).encode() if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(data)}\r\nConnection: close\r\n\r\n"
+                 .encode() + data)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split(b" ")[1]), json.loads(payload)
+
+
+def serve(*requests):
+    """Responses to requests, made one after another against a fresh service."""
+    async def run():
+        service = await EstimationService(port=0).start()
+        try:
+            return [await request(service.port, *r) for r in requests], service.stats()
+        finally:
+            await service.close()
+    return asyncio.run(run())
+
+
+def test_evaluate_matches_the_engine():
+    data = simulation_data()
+    (status, body), = serve(("POST", "/evaluate", data))[0]
+    expected = evaluate(Simulation.from_dict(data))
+    assert status == 200
+    assert body["totals"]["total_time"] == pytest.approx(expected.total_time)
+    assert [t["adjusted_time"] for t in body["tasks"]] == pytest.approx(
+        [t.adjusted_time for t in expected.task_results])
+
+
+def test_array_body_keeps_order_and_reports_errors():
+    items = [simulation_data(), "not a simulation", simulation_data("Man Day (LF)")]
+    (status, body), = serve(("POST", "/evaluate", items))[0]
+    assert status == 200
+    first, bad, man_day = body["results"]
+    assert first["output_type"] == "Square-foot"
+    assert "error" in bad
+    assert man_day["output_type"] == "Man Day (LF)"
+
+
+def test_repeated_request_is_cached():
+    data = simulation_data()
+    responses, stats = serve(("POST", "/evaluate", data), ("POST", "/evaluate", data),
+                             ("GET", "/health"))
+    assert responses[0] == responses[1]
+    assert responses[2][1]["cache_hits"] == 1
+    assert stats["evaluated"] == 1
+
+
+def test_unknown_path_and_wrong_method():
+    responses, _ = serve(("GET", "/nowhere"), ("GET", "/evaluate"), ("POST", "/health", {}))
+    assert [status for status, _ in responses] == [404, 405, 405]
+
+
+def test_close_with_idle_keep_alive_clients():
+    async def run():
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+        service = await EstimationService(port=0).start()
+        clients = []
+        for _ in range(3):
+            reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+            writer.write(b"GET /health HTTP/1.1\r\nContent-Length: 0\r\n\r\n")
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            assert b"Connection: keep-alive" in head
+            await reader.readuntil(b"}")
+            clients.append((reader, writer))
+        await service.close()
+        # Nothing is left running for asyncio.run() to cancel, and every client was hung up on
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+        for reader, writer in clients:
+            assert await reader.read() == b""
+            writer.close()
+        return errors
+
+    assert asyncio.run(run()) == []
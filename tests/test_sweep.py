@@ -0,0 +1,76 @@
+import copy
+
+import numpy as np
+import pytest
+
+from labor_engine import evaluate, evaluate_batch
+from labor_model import Simulation
+from labor_sweep import parse_parameters, sweep
+
+from conftest import simulation_data
+
+TEXT = """
+length = 4, 6
+efficiency[2] = 0.6:1.0:3
+base_time[1] = 2, 5    # task 1
+impact[1] = 0, 60
+"""
+
+
+def direct(sim, point):
+    """Headline of sim with one sweep point applied by hand."""
+    sim = copy.deepcopy(sim)
+    length, efficiency, base_time, impact = point
+    sim.output_settings.length = length
+    sim.workers[1].efficiency = efficiency
+    sim.tasks[0].base_time = base_time
+    sim.impacts[0].time = impact
+    result = evaluate(sim)
+    return result.production if result.mode.startswith("Man Day") else result.total_time
+
+
+@pytest.mark.parametrize("output_type", ["Square-foot", "Man Day (LF)"])
+def test_sweep_matches_direct_evaluation(output_type):
+    sim = Simulation.from_dict(simulation_data(output_type))
+    result = sweep(sim, parse_parameters(TEXT), chunk_size=5)
+    assert len(result.headline) == 2 * 3 * 2 * 2
+    for point, headline in zip(result.points, result.headline):
+        assert headline == pytest.approx(direct(sim, point))
+    assert result.baseline == pytest.approx(direct(sim, [4, 0.8, 2, 30]))
+
+
+def test_crew_size_scales_impacts():
+    sim = Simulation.from_dict(simulation_data())
+    result = sweep(sim, parse_parameters("crew_size = 3:8:6"))
+    expected = evaluate_batch(sim, total_workers=np.arange(3, 9)).total_time
+    assert result.headline == pytest.approx(expected)
+
+
+def test_tornado_ranks_by_swing():
+    sim = Simulation.from_dict(simulation_data())
+    result = sweep(sim, parse_parameters(TEXT))
+    swings = [bar.swing for bar in result.tornado]
+    assert swings == sorted(swings, reverse=True)
+    length = next(bar for bar in result.tornado if bar.parameter.name == "length")
+    assert (length.low_value, length.high_value) == (4, 6)
+    assert length.high == pytest.approx(direct(sim, [6, 0.8, 2, 30]))
+
+
+@pytest.mark.parametrize("text, message", [
+    ("width = 3", "Line 1: unknown parameter 'width'"),
+    ("efficiency = 1", "Line 1: efficiency needs a number"),
+    ("length[1] = 3", "Line 1: length does not take a number"),
+    ("\nlength = 1:2", "Line 2: Ranges are start:stop:count"),
+    ("efficiency[1] = 1, 2\nefficiency[1] = 3", r"Line 2: efficiency\[1\] is already swept on line 1"),
+    ("impact[2] = 5\nlength = 4\n\nimpact[2] = 10", r"Line 4: impact\[2\] is already swept on line 1"),
+    ("length = 4, 6\n# length = 8\nlength = 5", "Line 3: length is already swept on line 1"),
+])
+def test_bad_lines(text, message):
+    with pytest.raises(ValueError, match=message):
+        parse_parameters(text)
+
+
+def test_out_of_range_index():
+    sim = Simulation.from_dict(simulation_data())
+    with pytest.raises(ValueError, match="Worker 4 efficiency: there are only 3 workers"):
+        sweep(sim, parse_parameters("efficiency[4] = 1, 2"))